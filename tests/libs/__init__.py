@@ -6,8 +6,40 @@ framework:
 - video_test_config_base: Base configuration classes and platform utilities
 - video_test_fetch_sample: Asset download and verification system
 - video_test_framework_base: Base test framework class and common utilities
+- video_test_framework_devices: Result analysis and device support state
+- video_test_framework_results: Result export, run history and journal
+- video_test_framework_process: Test command execution and its monitoring
+- video_test_framework_benchmark: Benchmark suites of the test commands
 - video_test_framework_decode: Decoder test sample and framework classes
 - video_test_framework_encode: Encoder test sample and framework classes
+- video_test_run_journal: Checkpoint journal used to resume interrupted runs
+- video_test_run_history: SQLite store of per-test results across runs
+- video_test_regression: Duration regression detection against run history
+- video_test_trace: Timeline spans exported as Chrome trace-event JSON
+- video_test_capabilities: Device capability probe and NOT_SUPPORTED cache
+- video_test_output_analyzer: Analyzers run over captured test output
+- video_test_process: Test process execution with per-process rusage
+- video_test_memory: procfs memory sampler and --loop leak detection
+- video_test_timeout: Static, per-sample and adaptive timeout policies
+- video_test_benchmark: Benchmark statistics and baseline comparison
+- video_test_throughput: Decode frame rate, pixel rate and frame times
+- video_test_scaling: Concurrent decoder instances and scaling efficiency
+- video_test_tuning: Decoder option search and tuning profiles
+- video_test_sweep: Encoder option matrix and speed/size Pareto front
+- video_test_frames: Memory-mapped YUV/Y4M frames and NumPy plane views
+- video_test_quality: PSNR and SSIM of decoded frames against a source
+- video_test_synthetic: Generated YUV/Y4M encode sources and their cache
+- video_test_convert: Cached conversion of sources to other input formats
+- video_test_bitstream: Annex-B, IVF and OBU frame and unit parsing over mmap
+- video_test_structure: Encoder output structure checks before decoding
+- video_test_stream_index: Cached stream metadata, test filters and costs
+- video_test_rd: RD curves, BD-rate/BD-PSNR and RD anchor files
+- video_test_cli: Test runner options and their validation
+- video_test_mode_benchmark: --benchmark options and driver
+- video_test_mode_scaling: --scaling-benchmark options and driver
+- video_test_mode_tuning: --tune-decoder options and driver
+- video_test_mode_sweep: --encode-sweep options and driver
+- video_test_mode_rd: --rd-benchmark options and driver
 
 Copyright 2025 Igalia S.L.
 Licensed under the Apache License, Version 2.0
@@ -0,0 +1,204 @@
+"""
+Video Test Benchmarks
+Statistics and baseline handling for --benchmark runs: each test command
+is run a number of warm-up and measured repetitions, summarised with the
+median, the median absolute deviation and a distribution-free confidence
+interval of the median, and compared with a stored baseline.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import math
+import statistics
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_regression import median_and_mad
+from tests.libs.video_test_utils import write_json_atomic
+
+BASELINE_VERSION = 1
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+DEFAULT_CONFIDENCE = 0.95
+# A benchmark fails the baseline gate when its median is more than this
+# fraction slower than the baseline median
+DEFAULT_THRESHOLD = 0.10
+
+
+def median_ci(samples: List[float],
+              confidence: float = DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+    """Distribution-free confidence interval of the median.
+
+    Uses the order statistics x(k) and x(n-k+1), where k is the largest
+    rank with P(Binomial(n, 0.5) < k) <= (1 - confidence) / 2. Small
+    samples, for which no such rank exists, get the full range.
+
+    Returns:
+        Tuple of (low, high)
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    alpha = (1.0 - confidence) / 2
+    k = 0
+    cumulative = 0.0
+    while k < n // 2:
+        cumulative += math.comb(n, k) / 2 ** n
+        if cumulative > alpha:
+            break
+        k += 1
+    if k == 0:
+        return ordered[0], ordered[-1]
+    return ordered[k - 1], ordered[n - k]
+
+
+def outcome_to_dict(result, comparison_key: str) -> dict:
+    """Error, not-supported flag and reference comparison of a benchmark
+    or RD result, as serialized by its to_dict()."""
+    data = {}
+    if result.error:
+        data["error"] = result.error
+    if result.not_supported:
+        data["not_supported"] = True
+    if result.comparison:
+        data[comparison_key] = result.comparison
+    return data
+
+
+@dataclass
+class BenchmarkStats:  # pylint: disable=too-many-instance-attributes
+    """Summary of the measured repetitions of one benchmark."""
+    samples_ms: List[float]
+    median_ms: float
+    mad_ms: float
+    mean_ms: float
+    min_ms: float
+    max_ms: float
+    ci_low_ms: float
+    ci_high_ms: float
+
+    @classmethod
+    def from_samples(cls, samples_ms: List[float],
+                     confidence: float = DEFAULT_CONFIDENCE
+                     ) -> "BenchmarkStats":
+        """Compute the statistics of the measured durations."""
+        median, mad = median_and_mad(samples_ms)
+        low, high = median_ci(samples_ms, confidence)
+        return cls(samples_ms=list(samples_ms), median_ms=median,
+                   mad_ms=mad, mean_ms=statistics.fmean(samples_ms),
+                   min_ms=min(samples_ms), max_ms=max(samples_ms),
+                   ci_low_ms=low, ci_high_ms=high)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable dictionary with rounded values."""
+        return {key: ([round(v, 3) for v in value]
+                      if isinstance(value, list) else round(value, 3))
+                for key, value in asdict(self).items()}
+
+
+@dataclass
+class BenchmarkResult:  # pylint: disable=too-many-instance-attributes
+    """Outcome of benchmarking one test."""
+    name: str
+    test_type: str
+    codec: str
+    command_line: str = ""
+    stats: Optional[BenchmarkStats] = None
+    error: str = ""
+    # The test reported NOT_SUPPORTED; not counted as a failure
+    not_supported: bool = False
+    comparison: Optional[dict] = None
+
+    @property
+    def key(self) -> str:
+        """Key of this benchmark in a baseline file."""
+        return f"{self.test_type}:{self.name}"
+
+    @property
+    def failed(self) -> bool:
+        """Whether the benchmark could not be measured."""
+        return bool(self.error) and not self.not_supported
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the baseline comparison failed."""
+        return bool(self.comparison and self.comparison["regressed"])
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export and baseline files."""
+        data = {
+            "name": self.name,
+            "test_type": self.test_type,
+            "codec": self.codec,
+            "command_line": self.command_line,
+        }
+        if self.stats:
+            data.update(self.stats.to_dict())
+            data["repeats"] = len(self.stats.samples_ms)
+        data.update(outcome_to_dict(self, "baseline"))
+        return data
+
+
+def compare_with_baseline(result: BenchmarkResult, baseline: dict,
+                          threshold: float = DEFAULT_THRESHOLD
+                          ) -> Optional[dict]:
+    """Compare a benchmark with its baseline entry.
+
+    A benchmark regresses when its median is more than `threshold` slower
+    than the baseline median and the lower bound of its confidence
+    interval is above the baseline median, so noise within the measured
+    spread does not fail the gate.
+
+    Returns:
+        Comparison dictionary, or None if either side has no statistics
+    """
+    if result.stats is None or "median_ms" not in baseline:
+        return None
+    baseline_ms = baseline["median_ms"]
+    ratio = (result.stats.median_ms / baseline_ms
+             if baseline_ms > 0 else float("inf"))
+    regressed = (ratio > 1.0 + threshold
+                 and result.stats.ci_low_ms > baseline_ms)
+    return {
+        "median_ms": round(baseline_ms, 3),
+        "ratio": round(ratio, 4),
+        "threshold": threshold,
+        "regressed": regressed,
+    }
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """Load the benchmarks of a baseline file, keyed by BenchmarkResult.key.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or is not a baseline
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version in {path}")
+    return data.get("benchmarks", {})
+
+
+def write_baseline(path: str, results: List[BenchmarkResult],
+                   system_info: SystemInfo) -> None:
+    """Write benchmark results as a baseline file (atomic replace)."""
+    data = {
+        "version": BASELINE_VERSION,
+        "system_info": system_info.to_dict(),
+        "benchmarks": {r.key: r.to_dict() for r in results if r.stats},
+    }
+    write_json_atomic(path, data)
@@ -0,0 +1,496 @@
+"""
+Video Test Bitstream Parsing
+Walks H.264/H.265 Annex-B byte streams, IVF files (AV1, VP9) and AV1
+low-overhead OBU streams without decoding them, and reports their frames:
+offset, size, key frame flag and the NAL units or OBUs they hold.
+
+Files are memory-mapped and walked in place; NAL start codes are found
+with mmap.find() and only the first bytes of unit headers are read, so
+multi-GB streams are parsed without copying their payload.
+
+Frames are:
+
+- Annex-B: access units. A picture starts at the first slice of a picture
+  (H.264 first_mb_in_slice 0, H.265 first_slice_segment_in_pic_flag),
+  together with the parameter sets, SEI and delimiters before it. Key
+  frames are H.264 IDR and H.265 IRAP pictures.
+- IVF: the container's frames. VP9 key frames are read from the
+  uncompressed header, AV1 ones from the frame header OBUs.
+- OBU streams: temporal units, started by temporal delimiter OBUs.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import mmap
+import struct
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+CONTAINER_ANNEXB = "annexb"
+CONTAINER_IVF = "ivf"
+CONTAINER_OBU = "obu"
+
+IVF_SIGNATURE = b"DKIF"
+IVF_FRAME_HEADER = struct.Struct("<IQ")
+START_CODE = b"\x00\x00\x01"
+
+# Annex-B stream file extensions of each codec
+ANNEXB_EXTENSIONS = {
+    ".264": "h264", ".h264": "h264", ".avc": "h264", ".jsv": "h264",
+    ".jvt": "h264", ".26l": "h264",
+    ".265": "h265", ".h265": "h265", ".hevc": "h265",
+}
+IVF_FOURCCS = {b"AV01": "av1", b"VP90": "vp9"}
+
+# NAL unit types (H.264 Table 7-1, H.265 Table 7-1)
+H264_VCL_TYPES = range(1, 6)
+H264_IDR = 5
+# Non-VCL units that belong to the next picture: SEI, SPS, PPS, AUD,
+# SPS extension, prefix NAL, subset SPS
+H264_AU_START_TYPES = {6, 7, 8, 9, 13, 14, 15}
+H265_VCL_TYPES = range(0, 32)
+H265_IRAP_TYPES = range(16, 24)
+# VPS, SPS, PPS, AUD, prefix SEI and reserved/unspecified prefix types
+H265_AU_START_TYPES = {32, 33, 34, 35, 39, 41, 42, 43, 44, *range(48, 56)}
+
+# AV1 OBU types (AV1 specification 6.2.2)
+OBU_SEQUENCE_HEADER = 1
+OBU_TEMPORAL_DELIMITER = 2
+OBU_FRAME_HEADER = 3
+OBU_TILE_GROUP = 4
+OBU_FRAME = 6
+AV1_KEY_FRAME = 0
+AV1_INTER_FRAME = 1
+AV1_INTRA_ONLY_FRAME = 2
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class BitReader:
+    """Reads big-endian bit fields and Exp-Golomb codes from bytes."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def u(self, bits: int) -> int:
+        """Unsigned integer of a number of bits.
+
+        Raises:
+            ValueError: Past the end of the data
+        """
+        value = 0
+        for _ in range(bits):
+            byte = self.pos >> 3
+            if byte >= len(self.data):
+                raise ValueError("bitstream header truncated")
+            value = (value << 1) | (
+                (self.data[byte] >> (7 - (self.pos & 7))) & 1)
+            self.pos += 1
+        return value
+
+    def ue(self) -> int:
+        """Unsigned Exp-Golomb code."""
+        zeros = 0
+        while self.u(1) == 0:
+            zeros += 1
+            if zeros > 31:
+                raise ValueError("invalid Exp-Golomb code")
+        return (1 << zeros) - 1 + self.u(zeros)
+
+    def se(self) -> int:
+        """Signed Exp-Golomb code."""
+        value = self.ue()
+        return (value + 1) // 2 if value & 1 else -(value // 2)
+
+
+def unescape(data: Buffer, limit: int = 64) -> bytes:
+    """RBSP of the first `limit` bytes of a NAL unit payload (emulation
+    prevention bytes removed)."""
+    raw = bytes(data[:limit])
+    return raw.replace(b"\x00\x00\x03", b"\x00\x00") if b"\x00\x00\x03" \
+        in raw else raw
+
+
+def read_leb128(data: Buffer, pos: int) -> Tuple[int, int]:
+    """Value of an LEB128 number and the position after it.
+
+    Raises:
+        ValueError: Truncated or longer than 8 bytes
+    """
+    value = 0
+    for i in range(8):
+        if pos + i >= len(data):
+            raise ValueError("truncated leb128")
+        byte = data[pos + i]
+        value |= (byte & 0x7f) << (7 * i)
+        if not byte & 0x80:
+            return value, pos + i + 1
+    raise ValueError("leb128 longer than 8 bytes")
+
+
+@dataclass
+class StreamUnit:
+    """One NAL unit or OBU: offset and size of its header and payload."""
+    offset: int
+    size: int
+    type: int
+    temporal_id: int = 0
+    layer_id: int = 0
+
+
+@dataclass
+class StreamFrame:
+    """One access unit, IVF frame or temporal unit."""
+    offset: int
+    size: int
+    key: bool = False
+    units: List[StreamUnit] = field(default_factory=list)
+
+
+@dataclass
+class StreamInfo:
+    """Frames of a parsed stream."""
+    container: str
+    codec: str
+    frames: List[StreamFrame] = field(default_factory=list)
+    width: int = 0  # from the IVF header
+    height: int = 0
+    # Bytes after the last complete frame or unit
+    trailing_bytes: int = 0
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames."""
+        return len(self.frames)
+
+    @property
+    def key_frames(self) -> List[int]:
+        """Indices of the key frames."""
+        return [i for i, f in enumerate(self.frames) if f.key]
+
+    @property
+    def frame_sizes(self) -> List[int]:
+        """Size in bytes of each frame."""
+        return [f.size for f in self.frames]
+
+    def unit_type_counts(self) -> Dict[int, int]:
+        """Number of NAL units or OBUs of each type."""
+        return dict(Counter(u.type for f in self.frames for u in f.units))
+
+    def to_dict(self) -> dict:
+        """Summary for JSON export."""
+        sizes = self.frame_sizes
+        data = {
+            "container": self.container,
+            "codec": self.codec,
+            "frames": self.frame_count,
+            "key_frames": self.key_frames,
+            "total_bytes": sum(sizes),
+            "max_frame_bytes": max(sizes, default=0),
+            "unit_types": {str(k): v for k, v in
+                           sorted(self.unit_type_counts().items())},
+        }
+        if self.width:
+            data.update({"width": self.width, "height": self.height})
+        if self.trailing_bytes:
+            data["trailing_bytes"] = self.trailing_bytes
+        return data
+
+
+def iter_nal_units(data: Buffer, codec: str) -> Iterator[StreamUnit]:
+    """NAL units of an Annex-B byte stream; offsets point at the NAL
+    header (after the start code), sizes exclude trailing zero bytes."""
+    pos = data.find(START_CODE)
+    h265 = codec == "h265"
+    while pos >= 0:
+        start = pos + 3
+        pos = data.find(START_CODE, start)
+        end = len(data) if pos < 0 else pos
+        # Zero bytes before the next start code (trailing_zero_8bits and
+        # the zero_byte of 4-byte start codes) are not part of the unit
+        while end > start and data[end - 1] == 0:
+            end -= 1
+        if end - start < (2 if h265 else 1):
+            continue
+        header = data[start]
+        if h265:
+            layer = ((header & 1) << 5) | (data[start + 1] >> 3)
+            yield StreamUnit(start, end - start, (header >> 1) & 0x3f,
+                             temporal_id=(data[start + 1] & 7) - 1,
+                             layer_id=layer)
+        else:
+            yield StreamUnit(start, end - start, header & 0x1f)
+
+
+def _first_slice(data: Buffer, unit: StreamUnit, h265: bool) -> bool:
+    """Whether a VCL NAL unit holds the first slice of a picture."""
+    if h265:
+        # first_slice_segment_in_pic_flag
+        return unit.size > 2 and bool(data[unit.offset + 2] & 0x80)
+    # first_mb_in_slice == 0 is ue(v) "1"
+    return unit.size > 1 and bool(data[unit.offset + 1] & 0x80)
+
+
+def parse_annexb(data: Buffer, codec: str) -> StreamInfo:
+    """Access units of an H.264 or H.265 Annex-B byte stream."""
+    h265 = codec == "h265"
+    vcl = H265_VCL_TYPES if h265 else H264_VCL_TYPES
+    au_start = H265_AU_START_TYPES if h265 else H264_AU_START_TYPES
+    info = StreamInfo(CONTAINER_ANNEXB, codec)
+    # Units of the next picture seen before its first slice
+    pending: List[StreamUnit] = []
+    for unit in iter_nal_units(data, codec):
+        if unit.type in vcl and (not h265 or unit.layer_id == 0):
+            if not info.frames or _first_slice(data, unit, h265):
+                units = pending + [unit]
+                info.frames.append(StreamFrame(
+                    offset=_start_code_offset(data, units[0].offset),
+                    size=0, units=units))
+            else:
+                info.frames[-1].units.extend(pending + [unit])
+            pending = []
+            frame = info.frames[-1]
+            frame.key = frame.key or (unit.type in H265_IRAP_TYPES if h265
+                                      else unit.type == H264_IDR)
+        elif unit.type in au_start or pending or not info.frames:
+            pending.append(unit)
+        else:
+            # End of sequence/stream, filler, suffix SEI, other layers:
+            # part of the current picture
+            info.frames[-1].units.append(unit)
+    if pending and info.frames:
+        info.frames[-1].units.extend(pending)
+    for frame, following in zip(info.frames, info.frames[1:]):
+        frame.size = following.offset - frame.offset
+    if info.frames:
+        info.frames[-1].size = len(data) - info.frames[-1].offset
+    return info
+
+
+def _start_code_offset(data: Buffer, nal_offset: int) -> int:
+    """Offset of the start code (with a leading zero byte) of a NAL
+    unit."""
+    offset = nal_offset - 3
+    if offset > 0 and data[offset - 1] == 0:
+        offset -= 1
+    return offset
+
+
+def iter_obus(data: Buffer, start: int = 0,
+              end: Optional[int] = None) -> Iterator[StreamUnit]:
+    """OBUs of a low-overhead bitstream between two offsets; an OBU
+    without a size field extends to `end`.
+
+    Raises:
+        ValueError: Forbidden bit set, or an OBU past `end`
+    """
+    end = len(data) if end is None else end
+    pos = start
+    while pos < end:
+        header = data[pos]
+        if header & 0x80:
+            raise ValueError(f"OBU forbidden bit set at offset {pos}")
+        obu_type = (header >> 3) & 0xf
+        header_size = 2 if header & 0x04 else 1
+        if pos + header_size > end:
+            raise ValueError(f"OBU at offset {pos} truncated")
+        temporal_id = data[pos + 1] >> 5 if header & 0x04 else 0
+        if header & 0x02:
+            payload, payload_pos = read_leb128(data, pos + header_size)
+            size = payload_pos - pos + payload
+        else:
+            size = end - pos
+        if pos + size > end:
+            raise ValueError(f"OBU at offset {pos} truncated")
+        yield StreamUnit(pos, size, obu_type, temporal_id=temporal_id)
+        pos += size
+
+
+def _obu_payload(data: Buffer, unit: StreamUnit, limit: int = 16) -> bytes:
+    """First bytes of an OBU's payload."""
+    pos = unit.offset + (2 if data[unit.offset] & 0x04 else 1)
+    if data[unit.offset] & 0x02:
+        _, pos = read_leb128(data, pos)
+    return bytes(data[pos:min(pos + limit, unit.offset + unit.size)])
+
+
+class Av1State:  # pylint: disable=too-few-public-methods
+    """Sequence header fields needed to read AV1 frame types."""
+
+    def __init__(self):
+        self.reduced_still_picture_header = False
+
+    def frame_types(self, data: Buffer,
+                    units: List[StreamUnit]) -> List[Optional[int]]:
+        """Read the sequence headers of a temporal unit and return the
+        frame_type of each frame header in it (None for frames showing an
+        existing frame)."""
+        types: List[Optional[int]] = []
+        for unit in units:
+            payload = _obu_payload(data, unit)
+            if not payload:
+                continue
+            if unit.type == OBU_SEQUENCE_HEADER:
+                # seq_profile f(3), still_picture f(1),
+                # reduced_still_picture_header f(1)
+                self.reduced_still_picture_header = bool(payload[0] & 0x04)
+            elif unit.type in (OBU_FRAME, OBU_FRAME_HEADER):
+                if self.reduced_still_picture_header:
+                    types.append(AV1_KEY_FRAME)
+                    continue
+                # show_existing_frame f(1), frame_type f(2)
+                bits = BitReader(payload)
+                types.append(None if bits.u(1) else bits.u(2))
+        return types
+
+    def update(self, data: Buffer, units: List[StreamUnit]) -> bool:
+        """Read the sequence headers of a temporal unit and return whether
+        it holds a key frame."""
+        return AV1_KEY_FRAME in self.frame_types(data, units)
+
+
+def _vp9_key_frame(payload: bytes) -> bool:
+    """Whether a VP9 frame is a key frame (uncompressed header)."""
+    bits = BitReader(payload)
+    if bits.u(2) != 2:  # frame_marker
+        return False
+    profile = bits.u(1) | (bits.u(1) << 1)
+    if profile == 3:
+        bits.u(1)  # reserved_zero
+    if bits.u(1):  # show_existing_frame
+        return False
+    return bits.u(1) == 0  # frame_type
+
+
+def parse_ivf(data: Buffer) -> StreamInfo:
+    """Frames of an IVF file with AV1 or VP9 payload.
+
+    Raises:
+        ValueError: Not an IVF file
+    """
+    if bytes(data[:4]) != IVF_SIGNATURE or len(data) < 32:
+        raise ValueError("not an IVF file")
+    header_size, = struct.unpack_from("<H", data, 6)
+    fourcc = bytes(data[8:12])
+    width, height = struct.unpack_from("<HH", data, 12)
+    codec = IVF_FOURCCS.get(fourcc, fourcc.decode("ascii", "replace"))
+    info = StreamInfo(CONTAINER_IVF, codec, width=width, height=height)
+    av1 = Av1State()
+    pos = header_size
+    while pos + IVF_FRAME_HEADER.size <= len(data):
+        size, _ = IVF_FRAME_HEADER.unpack_from(data, pos)
+        start = pos + IVF_FRAME_HEADER.size
+        if start + size > len(data):
+            break
+        frame = StreamFrame(offset=pos, size=IVF_FRAME_HEADER.size + size)
+        if codec == "av1":
+            frame.units = list(iter_obus(data, start, start + size))
+            frame.key = av1.update(data, frame.units)
+        elif codec == "vp9" and size:
+            frame.key = _vp9_key_frame(bytes(data[start:start + 8]))
+        info.frames.append(frame)
+        pos = start + size
+    info.trailing_bytes = len(data) - pos
+    return info
+
+
+def parse_obu_stream(data: Buffer) -> StreamInfo:
+    """Temporal units of an AV1 low-overhead OBU stream.
+
+    Raises:
+        ValueError: Malformed OBUs
+    """
+    info = StreamInfo(CONTAINER_OBU, "av1")
+    av1 = Av1State()
+    for unit in iter_obus(data):
+        if unit.type == OBU_TEMPORAL_DELIMITER or not info.frames:
+            info.frames.append(StreamFrame(offset=unit.offset, size=0))
+        info.frames[-1].units.append(unit)
+    for frame in info.frames:
+        last = frame.units[-1]
+        frame.size = last.offset + last.size - frame.offset
+        frame.key = av1.update(data, frame.units)
+    return info
+
+
+def unit_payload(data: Buffer, unit: StreamUnit) -> memoryview:
+    """Bytes of a NAL unit or OBU, without copying."""
+    return memoryview(data)[unit.offset:unit.offset + unit.size]
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[Buffer]:
+    """Read-only memory map of a file (empty bytes for an empty file).
+    Views into it must be released before the block ends."""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def detect_codec(path: Path, data: Buffer) -> Tuple[str, str]:
+    """(container, codec) of a stream from its content and extension."""
+    if bytes(data[:4]) == IVF_SIGNATURE:
+        return CONTAINER_IVF, ""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".obu":
+        return CONTAINER_OBU, "av1"
+    if suffix in ANNEXB_EXTENSIONS:
+        return CONTAINER_ANNEXB, ANNEXB_EXTENSIONS[suffix]
+    start = data.find(START_CODE, 0, 64)
+    if start < 0:
+        return CONTAINER_OBU, "av1"
+    header = data[start + 3: start + 5]
+    # H.265 parameter sets and delimiters have types 32-35 and a
+    # temporal id plus one of at least 1; in H.264 these bytes would be
+    # rare or forbidden NAL types
+    if len(header) == 2 and 32 <= (header[0] >> 1) & 0x3f <= 40 \
+            and header[1] & 7:
+        return CONTAINER_ANNEXB, "h265"
+    return CONTAINER_ANNEXB, "h264"
+
+
+def parse_stream(path: Path, codec: Optional[str] = None) -> StreamInfo:
+    """Parse a stream file through a memory map.
+
+    Args:
+        path: Annex-B, IVF or OBU file
+        codec: "h264" or "h265" for Annex-B streams (default: from the
+            extension or the first NAL unit)
+
+    Raises:
+        OSError, ValueError: The file cannot be read or parsed
+    """
+    with map_file(path) as data:
+        return parse_buffer(data, path, codec)
+
+
+def parse_buffer(data: Buffer, path: Path,
+                 codec: Optional[str] = None) -> StreamInfo:
+    """Parse a mapped stream; the path gives its extension."""
+    if not data:
+        return StreamInfo(CONTAINER_ANNEXB, codec or "")
+    container, detected = detect_codec(path, data)
+    if container == CONTAINER_IVF:
+        return parse_ivf(data)
+    if container == CONTAINER_OBU and codec in (None, "av1"):
+        return parse_obu_stream(data)
+    return parse_annexb(data, codec or detected)
@@ -0,0 +1,249 @@
+"""
+Video Device Capability Probe
+Detects the GPU, driver and supported video codec operations once at
+start-up, and remembers tests that reported EX_UNAVAILABLE, so that tests
+which cannot run are classified as NOT_SUPPORTED without being launched.
+
+Capabilities are probed with vulkaninfo when it is available. The cache is
+keyed by GPU name and driver version, so a driver update invalidates it.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.libs.video_test_driver_detect import (
+    DriverMapping,
+    parse_device_id_option,
+    parse_driver_info,
+)
+from tests.libs.video_test_utils import load_json_entries, save_json_entries
+
+CACHE_VERSION = 1
+PROBE_TIMEOUT = 30  # seconds
+
+_GPU_HEADER_RE = re.compile(r'^GPU(\d+):\s*$')
+_PROPERTY_RE = re.compile(
+    r'^\s*(deviceName|vendorID|deviceID|driverID|driverName|driverInfo)'
+    r'\s*=\s*(.+?)\s*$')
+_CODEC_OP_RE = re.compile(
+    r'VIDEO_CODEC_OPERATION_(DECODE|ENCODE)_(H264|H265|AV1|VP9)_BIT_KHR')
+
+
+@dataclass
+class DeviceCapabilities:
+    """GPU, driver and video codec operations reported for one device."""
+    gpu_name: str = ""
+    driver_name: str = ""
+    driver_version: str = ""
+    driver: str = ""
+    vendor_id: int = 0
+    device_id: int = 0
+    # Supported operations as "<test_type>_<codec>", e.g. "decode_h265"
+    codec_operations: List[str] = field(default_factory=list)
+
+    @property
+    def cache_key(self) -> str:
+        """Key identifying this GPU and driver version in the cache."""
+        return f"{self.gpu_name}|{self.driver_version}"
+
+    def supports(self, test_type: str, codec: str) -> bool:
+        """Whether the device reports the codec operation."""
+        return f"{test_type}_{codec}" in self.codec_operations
+
+
+def _normalize_vk_driver_id(driver_id: str) -> Optional[str]:
+    """Map a VkDriverId enum name (DRIVER_ID_MESA_RADV) to a driver."""
+    name = re.sub(r'^DRIVER_ID_', '', driver_id.strip())
+    normalized = DriverMapping.normalize_driver_name(
+        name.replace('_', ' '))
+    if normalized in DriverMapping.DRIVER_NAME_MAPPING.values():
+        return normalized
+    return None
+
+
+def parse_vulkaninfo_output(output: str) -> List[DeviceCapabilities]:
+    """Parse the text output of vulkaninfo into per-GPU capabilities.
+
+    Args:
+        output: Standard output of "vulkaninfo"
+
+    Returns:
+        One DeviceCapabilities per GPU section, in enumeration order
+    """
+    devices: List[DeviceCapabilities] = []
+    properties: Dict[str, str] = {}
+    operations: List[str] = []
+
+    def finish_device():
+        if not properties:
+            return
+        vendor_id = int(properties.get("vendorID", "0"), 0)
+        device_id = int(properties.get("deviceID", "0"), 0)
+        driver = (_normalize_vk_driver_id(properties.get("driverID", ""))
+                  or parse_driver_info(
+                      vendor_id, device_id,
+                      driver_name=properties.get("driverName")))
+        devices.append(DeviceCapabilities(
+            gpu_name=properties.get("deviceName", ""),
+            driver_name=properties.get("driverName", ""),
+            driver_version=properties.get("driverInfo", ""),
+            driver=driver,
+            vendor_id=vendor_id,
+            device_id=device_id,
+            codec_operations=sorted(set(operations)),
+        ))
+
+    for line in output.splitlines():
+        if _GPU_HEADER_RE.match(line):
+            finish_device()
+            properties, operations = {}, []
+            continue
+        match = _PROPERTY_RE.match(line)
+        if match:
+            # Keep the first value; later sections may repeat a key
+            key, value = match.groups()
+            value = re.sub(r'\s+\(\d+\)$', '', value)
+            properties.setdefault(key, value)
+            continue
+        for direction, codec in _CODEC_OP_RE.findall(line):
+            operations.append(f"{direction.lower()}_{codec.lower()}")
+    finish_device()
+    return devices
+
+
+def select_device(devices: List[DeviceCapabilities],
+                  device_id: Optional[str] = None
+                  ) -> Optional[DeviceCapabilities]:
+    """Pick the device selected with --deviceID.
+
+    Without --deviceID the executables choose the device themselves, so
+    it is only known once a test reports it.
+
+    Args:
+        devices: Devices parsed from vulkaninfo
+        device_id: Value of --deviceID (hex, optional 0x prefix)
+
+    Returns:
+        The matching device, or None if it cannot be determined
+    """
+    if device_id is None:
+        return None
+    wanted = parse_device_id_option(device_id)
+    return next((d for d in devices if d.device_id == wanted), None)
+
+
+def probe_devices() -> Optional[List[DeviceCapabilities]]:
+    """Run vulkaninfo once and return the capabilities of every device.
+
+    Returns:
+        List of DeviceCapabilities, or None if vulkaninfo is unavailable
+        or fails
+    """
+    vulkaninfo = shutil.which("vulkaninfo")
+    if not vulkaninfo:
+        return None
+    try:
+        result = subprocess.run([vulkaninfo], capture_output=True,
+                                text=True, errors="replace",
+                                timeout=PROBE_TIMEOUT, check=False)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_vulkaninfo_output(result.stdout)
+
+
+def default_cache_path() -> Path:
+    """Per-user location of the capability cache."""
+    base = (os.environ.get("XDG_CACHE_HOME")
+            or os.environ.get("LOCALAPPDATA")
+            or str(Path.home() / ".cache"))
+    return Path(base) / "vulkan-video-samples" / "capabilities.json"
+
+
+def unsupported_test_key(config, test_type: str) -> str:
+    """Identify a test and its arguments in the learned unsupported set."""
+    name = getattr(config, 'display_name', config.name)
+    digest = hashlib.sha256(json.dumps([
+        config.codec.value,
+        getattr(config, 'profile', None),
+        config.extra_args or [],
+        getattr(config, 'source_checksum', ""),
+    ], sort_keys=True).encode()).hexdigest()[:16]
+    return f"{test_type}:{name}:{digest}"
+
+
+class CapabilityCache:
+    """On-disk cache of device capabilities and learned unsupported tests.
+
+    Entries are keyed by DeviceCapabilities.cache_key (GPU name and driver
+    version).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict] = load_json_entries(
+            self.path, CACHE_VERSION, "devices")
+        self._dirty = False
+
+    def _entry(self, cache_key: str) -> Dict:
+        return self._entries.setdefault(
+            cache_key, {"capabilities": None, "unsupported_tests": []})
+
+    def get_capabilities(self, cache_key: str
+                         ) -> Optional[DeviceCapabilities]:
+        """Return cached capabilities for a GPU and driver version."""
+        data = self._entries.get(cache_key, {}).get("capabilities")
+        return DeviceCapabilities(**data) if data else None
+
+    def set_capabilities(self, capabilities: DeviceCapabilities) -> None:
+        """Store probed capabilities."""
+        entry = self._entry(capabilities.cache_key)
+        data = capabilities.__dict__.copy()
+        if entry["capabilities"] != data:
+            entry["capabilities"] = data
+            self._dirty = True
+
+    def is_known_unsupported(self, cache_key: str, test_key: str) -> bool:
+        """Whether the test reported EX_UNAVAILABLE on this GPU/driver."""
+        return test_key in self._entries.get(cache_key, {}).get(
+            "unsupported_tests", [])
+
+    def set_unsupported(self, cache_key: str, test_key: str,
+                        unsupported: bool) -> None:
+        """Add or remove a test from the learned unsupported set."""
+        tests = self._entry(cache_key)["unsupported_tests"]
+        if unsupported and test_key not in tests:
+            tests.append(test_key)
+            self._dirty = True
+        elif not unsupported and test_key in tests:
+            tests.remove(test_key)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed."""
+        if self._dirty:
+            self._dirty = not save_json_entries(
+                self.path, CACHE_VERSION, "devices", self._entries,
+                "capability cache")
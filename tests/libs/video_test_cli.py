@@ -0,0 +1,319 @@
+"""
+Video Test Command Line
+Command line options of vvs_test_runner.py, added and validated per
+feature: general options, run history and monitoring, stream filters,
+encoder and decoder options, and the options of each run mode.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+
+from tests.libs.video_test_mode_benchmark import (
+    add_benchmark_arguments,
+    validate_benchmark_arguments,
+)
+from tests.libs.video_test_mode_rd import (
+    add_rd_arguments,
+    validate_rd_arguments,
+)
+from tests.libs.video_test_mode_scaling import (
+    add_scaling_arguments,
+    validate_scaling_arguments,
+)
+from tests.libs.video_test_mode_sweep import (
+    add_sweep_arguments,
+    validate_sweep_arguments,
+)
+from tests.libs.video_test_mode_tuning import (
+    add_tuning_arguments,
+    validate_tuning_arguments,
+)
+from tests.libs.video_test_platform_utils import PlatformUtils
+from tests.libs.video_test_quality import HAS_NUMPY
+from tests.libs.video_test_stream_index import parse_resolution
+from tests.libs.video_test_utils import DEFAULT_TEST_TIMEOUT
+
+
+def add_general_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options that select, run and export the tests"""
+    parser.add_argument(
+        "--work-dir", "-w",
+        help="Working directory for test files")
+    parser.add_argument(
+        "--export-json", "-j",
+        help="Export results to JSON file")
+    parser.add_argument(
+        "--export-csv",
+        help="Export results to CSV file")
+    parser.add_argument(
+        "--codec", "-c",
+        choices=["h264", "h265", "av1", "vp9"],
+        help="Test only specific codec")
+    parser.add_argument(
+        "--test", "-t",
+        help="Filter tests by name pattern (supports wildcards "
+             "like 'h264_*' or 'av1_*')")
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="Show command lines being executed")
+    parser.add_argument(
+        "--validate", action="store_true",
+        help="Enable the Vulkan validation layer for each test by exporting "
+             "VK_INSTANCE_LAYERS=VK_LAYER_KHRONOS_validation")
+    parser.add_argument(
+        "--keep-files", action="store_true",
+        help="Keep output artifacts after testing")
+    parser.add_argument(
+        "--no-auto-download", action="store_true",
+        help="Skip automatic download of missing/corrupt sample files")
+    parser.add_argument(
+        "--download-only", action="store_true",
+        help="Download all test resources (encode and decode) and exit "
+             "without running tests")
+    parser.add_argument(
+        "--deviceID",
+        help="Vulkan device ID to use for testing "
+             "(hex, with an optional 0x prefix)")
+    parser.add_argument(
+        "--list-samples", action="store_true",
+        help="List all available test samples and exit")
+    parser.add_argument(
+        "--skip-list",
+        help="Path to custom skip list JSON (default: skipped_samples.json)")
+    parser.add_argument(
+        "--ignore-skip-list", action="store_true",
+        help="Ignore the skip list and run all tests")
+    parser.add_argument(
+        "--only-skipped", action="store_true",
+        help="Run only skipped tests (excludes non-skipped tests)")
+    parser.add_argument(
+        "--show-skipped", action="store_true",
+        help="Show skipped tests in summary output")
+    parser.add_argument(
+        "--extended", action="store_true",
+        help="Include extended tests (e.g., resolution boundary tests with "
+             "large files)")
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=DEFAULT_TEST_TIMEOUT,
+        help=f"Per-test timeout in seconds (default: {DEFAULT_TEST_TIMEOUT})")
+
+
+def add_history_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the run history, tracing and process monitoring options"""
+    group = parser.add_argument_group("run history and monitoring options")
+    group.add_argument(
+        "--resume", action="store_true",
+        help="Resume an interrupted run from its journal, skipping tests "
+             "that already completed")
+    group.add_argument(
+        "--history-db",
+        help="Record every test result in this SQLite run history database "
+             "(query it with vvs_run_history.py)")
+    group.add_argument(
+        "--recheck-unsupported", action="store_true",
+        help="Launch tests that the capability probe or an earlier run "
+             "classified as not supported on this GPU and driver")
+    group.add_argument(
+        "--trace-file", metavar="FILE",
+        help="Write a Chrome trace-event JSON timeline of the run "
+             "(open with https://ui.perfetto.dev)")
+    group.add_argument(
+        "--adaptive-timeouts", action="store_true",
+        help="Derive each test's timeout from its durations in the run "
+             "history (needs --history-db); tests without enough history "
+             "keep --timeout")
+    group.add_argument(
+        "--memory-sample-interval", type=int, default=0, metavar="MS",
+        help="Sample the memory and CPU time of each test process every MS "
+             "milliseconds and flag memory growth across --loop iterations "
+             "(Linux only)")
+    group.add_argument(
+        "--detect-regressions", action="store_true",
+        help="Flag tests that are significantly slower than their history "
+             "on the same GPU, driver and executable (needs --history-db)")
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the stream metadata filters and ordering"""
+    group = parser.add_argument_group("stream filter options")
+    group.add_argument(
+        "--max-resolution", metavar="WxH",
+        help="Run only tests whose stream or source fits this resolution "
+             "(e.g. 1920x1080)")
+    group.add_argument(
+        "--max-frames", type=int, metavar="N",
+        help="Run only tests that process at most N frames")
+    group.add_argument(
+        "--bitdepth", type=int, choices=(8, 10, 12),
+        help="Run only tests of streams or sources of this bit depth")
+    group.add_argument(
+        "--cheapest-first", action="store_true",
+        help="Run the tests in order of their estimated cost (pixels "
+             "processed) from the stream metadata index")
+
+
+def add_encoder_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the encoder-specific options"""
+    # Platform-specific default executable name using PlatformUtils
+    encoder_default = ("vk-video-enc-test" +
+                       PlatformUtils.get_executable_extension())
+    encoder_group = parser.add_argument_group("encoder options")
+    encoder_group.add_argument(
+        "--encoder", "-e",
+        default=encoder_default,
+        help="Path to vk-video-enc-test executable")
+    encoder_group.add_argument(
+        "--encoder-only", action="store_true",
+        help="Run only encoder tests")
+    encoder_group.add_argument(
+        "--encode-test-suite",
+        help="Path to custom encode test suite JSON file")
+    encoder_group.add_argument(
+        "--no-validate-with-decoder", action="store_true",
+        help="Disable validation of encoder output with decoder "
+             "(validation enabled by default)")
+    encoder_group.add_argument(
+        "--encode-quality", choices=("psnr", "ssim"),
+        help="Keep the decoded output of encoder validation and compare it "
+             "with the source: per-frame and per-plane PSNR, plus luma "
+             "SSIM with 'ssim' (needs NumPy). Samples can set min_psnr "
+             "and min_ssim")
+    encoder_group.add_argument(
+        "--structure-check", action="store_true",
+        help="Check the structure of encoder output (frame count, IDR "
+             "period, GOP, B frames, slices, temporal layers) against the "
+             "encoder options before decoder validation")
+    encoder_group.add_argument(
+        "--decoder-sample-rate", type=float, default=1.0, metavar="RATE",
+        help="Fraction of encoder tests (0-1, chosen by test name) also "
+             "validated with the decoder after --structure-check "
+             "(default: 1, all)")
+    encoder_group.add_argument(
+        "--decoder-args", nargs="+",
+        help="Additional arguments to pass to decoder during "
+             "encoder validation")
+
+
+def add_decoder_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the decoder-specific options"""
+    # Platform-specific default executable name using PlatformUtils
+    decoder_default = ("vk-video-dec-test" +
+                       PlatformUtils.get_executable_extension())
+    decoder_group = parser.add_argument_group("decoder options")
+    decoder_group.add_argument(
+        "--decoder", "-d",
+        default=decoder_default,
+        help="Path to vk-video-dec-test executable")
+    decoder_group.add_argument(
+        "--decoder-only", action="store_true",
+        help="Run only decoder tests")
+    decoder_group.add_argument(
+        "--decode-test-suite",
+        help="Path to custom decode test suite JSON file")
+    decoder_group.add_argument(
+        "--decode-display", action="store_true",
+        help="Enable display output for decode tests "
+             "(removes --noPresent from decoder commands)")
+    decoder_group.add_argument(
+        "--no-verify-md5", action="store_true",
+        help="Disable MD5 verification of decoded output "
+             "(enabled by default when expected_output_md5 is present)")
+
+
+# Option groups of the runner, in the order of the help output
+ARGUMENT_GROUPS = (
+    add_general_arguments,
+    add_history_arguments,
+    add_filter_arguments,
+    add_benchmark_arguments,
+    add_scaling_arguments,
+    add_tuning_arguments,
+    add_rd_arguments,
+    add_sweep_arguments,
+    add_encoder_arguments,
+    add_decoder_arguments,
+)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create and configure the argument parser"""
+    parser = argparse.ArgumentParser(
+        description="Vulkan Video Samples Test Framework")
+    for add_arguments in ARGUMENT_GROUPS:
+        add_arguments(parser)
+    return parser
+
+
+def validate_history_arguments(args: argparse.Namespace,
+                               parser: argparse.ArgumentParser) -> None:
+    """Reject run history and process monitoring options that cannot
+    work"""
+    if args.detect_regressions and not args.history_db:
+        parser.error("--detect-regressions requires --history-db")
+    if args.adaptive_timeouts and not args.history_db:
+        parser.error("--adaptive-timeouts requires --history-db")
+    if args.memory_sample_interval < 0:
+        parser.error("--memory-sample-interval must not be negative")
+
+
+def validate_filter_arguments(args: argparse.Namespace,
+                              parser: argparse.ArgumentParser) -> None:
+    """Reject invalid stream metadata filters"""
+    if args.max_resolution:
+        try:
+            parse_resolution(args.max_resolution)
+        except ValueError as e:
+            parser.error(f"--max-resolution: {e}")
+    if args.max_frames is not None and args.max_frames < 1:
+        parser.error("--max-frames must be at least 1")
+
+
+def validate_encoder_arguments(args: argparse.Namespace,
+                               parser: argparse.ArgumentParser) -> None:
+    """Reject invalid or conflicting encoder output checks"""
+    if args.encode_quality and args.no_validate_with_decoder:
+        parser.error("--encode-quality compares the validation decode and "
+                     "cannot be combined with --no-validate-with-decoder")
+    if not 0.0 <= args.decoder_sample_rate <= 1.0:
+        parser.error("--decoder-sample-rate must be between 0 and 1")
+    if args.decoder_sample_rate < 1.0 and not args.structure_check:
+        parser.error("--decoder-sample-rate relies on the structure check "
+                     "and requires --structure-check")
+    if args.encode_quality == "ssim" and not HAS_NUMPY:
+        parser.error("--encode-quality ssim requires NumPy")
+
+
+# Validation of each feature's options, run after parsing
+ARGUMENT_VALIDATORS = (
+    validate_history_arguments,
+    validate_filter_arguments,
+    validate_encoder_arguments,
+    validate_benchmark_arguments,
+    validate_scaling_arguments,
+    validate_tuning_arguments,
+    validate_rd_arguments,
+    validate_sweep_arguments,
+)
+
+
+def validate_arguments(args: argparse.Namespace,
+                       parser: argparse.ArgumentParser) -> None:
+    """Validate the parsed options of every feature, exiting through
+    parser.error() on the first invalid one"""
+    for validate in ARGUMENT_VALIDATORS:
+        validate(args, parser)
@@ -27,6 +27,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from tests.libs.video_test_fetch_sample import FetchableResource, SampleFetcher
+from tests.libs.video_test_process import ProcessUsage
+from tests.libs.video_test_trace import CATEGORY_SETUP, trace_span
 from tests.libs.video_test_utils import (
     normalize_test_name,
     verify_file_checksum,
@@ -260,6 +262,12 @@ class BaseTestConfig:  # pylint: disable=too-many-instance-attributes
         }
 
 
+# Result meta entries exported as they are by result_to_dict, when set,
+# and restored from the run journal
+EXPORTED_META = ("memory", "throughput", "encode_stats", "quality",
+                 "structure", "timeout", "kill")
+
+
 @dataclass(init=False)
 class TestResult:
     """Result of a single test execution with compact attribute set.
@@ -350,6 +358,26 @@ class TestResult:
         """Set the command line recorded for this result."""
         self.meta["command_line"] = value
 
+    @property
+    def phases(self) -> Dict[str, float]:
+        """Time spent in each phase of the test, in seconds."""
+        return self.meta.get("phases", {})
+
+    @phases.setter
+    def phases(self, value: Dict[str, float]) -> None:
+        """Set the phase breakdown for this result."""
+        self.meta["phases"] = dict(value)
+
+    @property
+    def usage(self) -> Optional[ProcessUsage]:
+        """Resource usage of the test process, if it was measured."""
+        return self.meta.get("usage")
+
+    @usage.setter
+    def usage(self, value: Optional[ProcessUsage]) -> None:
+        """Set the resource usage of the test process."""
+        self.meta["usage"] = value
+
 
 def create_error_result(config: BaseTestConfig, error_message: str,
                         command_line: str = "") -> TestResult:
@@ -376,7 +404,8 @@ def create_error_result(config: BaseTestConfig, error_message: str,
 
 
 def check_sample_resources(samples, sample_type: str = "resource",
-                           auto_download: bool = True) -> bool:
+                           auto_download: bool = True,
+                           tracer=None) -> bool:
     """
     Check if required sample files are available and have correct checksums
 
@@ -385,6 +414,7 @@ def check_sample_resources(samples, sample_type: str = "resource",
                  and to_fetchable_resource() methods
         sample_type: Type description for error messages
         auto_download: Whether to automatically download missing/corrupt files
+        tracer: Optional TraceRecorder receiving hashing and download spans
 
     Returns:
         True if all samples are valid, False otherwise
@@ -397,7 +427,11 @@ def check_sample_resources(samples, sample_type: str = "resource",
             missing_files.add(str(sample.full_path))
         elif hasattr(sample, 'checksum') and sample.checksum:
             # Verify checksum if available
-            if not verify_file_checksum(sample.full_path, sample.checksum):
+            with trace_span(tracer, "hash", CATEGORY_SETUP,
+                            file=Path(sample.full_path).name):
+                valid = verify_file_checksum(sample.full_path,
+                                             sample.checksum)
+            if not valid:
                 corrupt_files.add(str(sample.full_path))
 
     if missing_files or corrupt_files:
@@ -413,7 +447,9 @@ def check_sample_resources(samples, sample_type: str = "resource",
 
         if auto_download:
             print(f"📥 Attempting to download {sample_type} files...")
-            return download_sample_assets(samples, sample_type)
+            with trace_span(tracer, "download", CATEGORY_SETUP,
+                            files=len(missing_files | corrupt_files)):
+                return download_sample_assets(samples, sample_type)
 
         print("Missing test resources - automatic download is disabled")
         return False
@@ -0,0 +1,164 @@
+"""
+Video Test Input Conversion
+Derives encoder inputs in other pixel formats (NV12, P010, 4:2:2, 4:4:4,
+10-bit) from an existing raw YUV or Y4M source, so that the encoder's
+input options can be tested without downloading more sources.
+
+Chroma is upsampled by repeating samples and downsampled by averaging
+(rounded), per axis. Bit depth is raised by a left shift and lowered by
+a rounded right shift. MSB-aligned samples (P010) are shifted in the
+file as the layout says. Frames are converted with NumPy in batches of
+at most CONVERT_BATCH_BYTES of source frames.
+
+Converted files are cached by a hash of the source identity (e.g. its
+checksum, else its name, size and modification time), both layouts and the
+converter version, so each source is converted at most once per format.
+A file is written under a temporary name and renamed when complete.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from tests.libs.video_test_frames import (
+    CHROMA_SUBSAMPLING,
+    FrameLayout,
+    FrameReader,
+    pack_planes,
+)
+
+# Part of the cache key: bump when converted frames change
+CONVERTER_VERSION = 1
+CONVERT_DIR = Path(__file__).parent.parent / "resources" / "converted"
+CONVERT_BATCH_BYTES = 64 * 1024 * 1024
+
+
+def source_identity(path: Path, identity: str = "") -> str:
+    """Identity of a source file: the given one (e.g. its checksum) if
+    known, else its name, size and modification time."""
+    if identity:
+        return identity
+    stat = Path(path).stat()
+    return f"{Path(path).name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def converted_path(identity: str, source: FrameLayout, target: FrameLayout,
+                   cache_dir: Path = CONVERT_DIR) -> Path:
+    """Cache file of a source converted to another layout."""
+    params = {"version": CONVERTER_VERSION, "source": identity,
+              "from": dataclasses.asdict(source),
+              "to": dataclasses.asdict(target)}
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()
+                         ).hexdigest()[:16]
+    return Path(cache_dir) / (
+        f"{target.width}x{target.height}_{target.chroma}p"
+        f"{target.bit_depth}_{target.num_planes}pl_{key}.yuv")
+
+
+def _resample(plane, axis: int, source: int, target: int, size: int):
+    """Resample one axis of (n, height, width) samples from a subsampling
+    factor to another, giving `size` samples."""
+    if target < source:
+        factor = source // target
+        plane = np.repeat(plane, factor, axis=axis)
+    elif target > source:
+        factor = target // source
+        pad = -plane.shape[axis] % factor
+        if pad:
+            widths = [(0, 0)] * plane.ndim
+            widths[axis] = (0, pad)
+            plane = np.pad(plane, widths, mode="edge")
+        shape = list(plane.shape)
+        shape[axis:axis + 1] = [shape[axis] // factor, factor]
+        plane = (plane.reshape(shape).sum(axis=axis + 1)
+                 + factor // 2) // factor
+    return plane.take(np.arange(size), axis=axis)
+
+
+def convert_planes(planes, source: FrameLayout, target: FrameLayout) -> List:
+    """Y, U and V of (n, height, width) frames in the source layout as
+    sample values in the target layout (before its sample shift)."""
+    (sub_x, sub_y), (to_x, to_y) = (CHROMA_SUBSAMPLING[source.chroma],
+                                    CHROMA_SUBSAMPLING[target.chroma])
+    c_width, c_height = target.chroma_dimensions
+    converted = []
+    for index, plane in enumerate(planes):
+        plane = plane.astype(np.int32) >> source.sample_shift
+        if index:
+            plane = _resample(plane, 1, sub_y, to_y, c_height)
+            plane = _resample(plane, 2, sub_x, to_x, c_width)
+        shift = target.bit_depth - source.bit_depth
+        if shift > 0:
+            plane = plane << shift
+        elif shift < 0:
+            plane = np.minimum((plane + (1 << (-shift - 1))) >> -shift,
+                               target.peak)
+        converted.append(plane)
+    return converted
+
+
+def convert_source(source_path: Path, source: FrameLayout, path: Path,
+                   target: FrameLayout) -> None:
+    """Convert a raw YUV or Y4M file to a raw file in another layout
+    (atomic replace).
+
+    Raises:
+        OSError: A file cannot be read or written
+        ValueError: NumPy is missing, or the sizes differ
+    """
+    if np is None:
+        raise ValueError("input conversion needs NumPy")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with FrameReader(source_path, source) as reader:
+        source = reader.layout
+        if (source.width, source.height) != (target.width, target.height):
+            raise ValueError(f"{source_path} is {source.width}x"
+                             f"{source.height}, not {target.width}x"
+                             f"{target.height}")
+        batch = max(1, CONVERT_BATCH_BYTES // source.frame_size)
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(reader), batch):
+                count = min(batch, len(reader) - start)
+                f.write(pack_planes(convert_planes(
+                    reader.batch_planes(start, count), source, target),
+                    target))
+    os.replace(tmp_path, path)
+
+
+def ensure_converted(source_path: Path, source: FrameLayout,
+                     target: FrameLayout, identity: str = "",
+                     cache_dir: Path = CONVERT_DIR) -> Path:
+    """Cache file of a source converted to a layout, converted if missing.
+
+    Raises:
+        OSError, ValueError: See convert_source()
+    """
+    path = converted_path(source_identity(source_path, identity), source,
+                          target, cache_dir)
+    if not path.exists():
+        convert_source(source_path, source, path, target)
+    return path
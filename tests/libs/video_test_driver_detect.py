@@ -17,10 +17,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import functools
 import platform
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -30,6 +31,10 @@ class SystemInfo:
     driver_name: str = ""
     driver_version: str = ""
     os_name: str = ""
+    device_id: Optional[int] = None  # PCI device ID of the GPU
+    # Video queues of the device as reported by the test executable
+    decode_queues: Optional[int] = None
+    encode_queues: Optional[int] = None
 
     def get_header(self) -> str:
         """Generate header string: GPU Model / Driver Version / OS"""
@@ -46,14 +51,21 @@ class SystemInfo:
             parts.append(self.os_name)
         return " / ".join(parts) if parts else "Unknown System"
 
+    def to_dict(self) -> dict:
+        """Serialize the device and OS identification for JSON files."""
+        return {"gpu_name": self.gpu_name, "driver_name": self.driver_name,
+                "driver_version": self.driver_version,
+                "os_name": self.os_name}
+
     def is_empty(self) -> bool:
         """Check if system info has any data."""
         return not any([self.gpu_name, self.driver_name,
                        self.driver_version, self.os_name])
 
 
+@functools.lru_cache(maxsize=None)
 def get_os_info() -> str:
-    """Get OS name and version string."""
+    """Get OS name and version string (looked up once per process)."""
     system = platform.system()
     if system == "Linux":
         try:
@@ -304,11 +316,99 @@ class DriverMapping:
         return vendor_names.get(vendor_id, f"Unknown (0x{vendor_id:04X})")
 
 
+# The test executables print the selected device on a single line:
+#   *** Selected Vulkan physical device with name: NVIDIA GeForce RTX 3080,
+#   vendor ID: 0x10de, device UUID: ..., and device ID: 0x2206,
+#   driver ID: 4, driver name: NVIDIA, driver info: 550.120,
+#   Num Decode Queues: 16, Num Encode Queues: 3 ***
+DEVICE_LINE_MARKER = "vendor ID:"
+_GPU_NAME_RE = re.compile(r'device with name:\s*([^,]+)', re.IGNORECASE)
+_VENDOR_ID_RE = re.compile(r'vendor ID:\s*(?:0x)?([0-9a-fA-F]+)',
+                           re.IGNORECASE)
+_DEVICE_ID_RE = re.compile(r'device ID:\s*(?:0x)?([0-9a-fA-F]+)',
+                           re.IGNORECASE)
+_DRIVER_ID_RE = re.compile(r'driver ID:\s*(\d+)', re.IGNORECASE)
+_DRIVER_NAME_RE = re.compile(r'driver name:\s*([^,\n*]+)', re.IGNORECASE)
+# NVIDIA format: "driver version: 550.120"
+# Mesa format: "driver info: Mesa 24.0.0"
+_DRIVER_VERSION_RE = re.compile(r'driver version:\s*([^\n,*]+)',
+                                re.IGNORECASE)
+_DRIVER_INFO_RE = re.compile(r'driver info:\s*([^\n,*]+)', re.IGNORECASE)
+_DECODE_QUEUES_RE = re.compile(r'Num Decode Queues:\s*(\d+)', re.IGNORECASE)
+_ENCODE_QUEUES_RE = re.compile(r'Num Encode Queues:\s*(\d+)', re.IGNORECASE)
+
+
+def parse_device_id_option(value) -> Optional[int]:
+    """Parse a --deviceID value: hex with an optional 0x prefix, as the
+    sample executables read it."""
+    if value is None or value == "":
+        return None
+    try:
+        return int(str(value), 16)
+    except ValueError:
+        return None
+
+
+def find_device_line(*outputs: str) -> Optional[str]:
+    """Return the first device selection line found in the outputs."""
+    for output in outputs:
+        index = output.find(DEVICE_LINE_MARKER) if output else -1
+        if index >= 0:
+            start = output.rfind('\n', 0, index) + 1
+            end = output.find('\n', index)
+            return output[start:end if end >= 0 else len(output)]
+    return None
+
+
+def _search(pattern: re.Pattern, line: str) -> Optional[str]:
+    match = pattern.search(line)
+    return match.group(1).strip() if match else None
+
+
+def parse_device_line(line: str) -> Tuple[Optional[str], SystemInfo]:
+    """
+    Parse the device selection line printed by the test executables.
+
+    Args:
+        line: The "*** Selected Vulkan physical device ..." line
+
+    Returns:
+        Tuple of (normalized driver name or None, SystemInfo)
+    """
+    info = SystemInfo(
+        gpu_name=_search(_GPU_NAME_RE, line) or "",
+        driver_name=_search(_DRIVER_NAME_RE, line) or "",
+        driver_version=(_search(_DRIVER_VERSION_RE, line)
+                        or _search(_DRIVER_INFO_RE, line) or ""),
+        os_name=get_os_info(),
+    )
+
+    driver = None
+    vendor_id = _search(_VENDOR_ID_RE, line)
+    device_id = _search(_DEVICE_ID_RE, line)
+    if device_id:
+        info.device_id = int(device_id, 16)
+    decode_queues = _search(_DECODE_QUEUES_RE, line)
+    if decode_queues:
+        info.decode_queues = int(decode_queues)
+    encode_queues = _search(_ENCODE_QUEUES_RE, line)
+    if encode_queues:
+        info.encode_queues = int(encode_queues)
+    if vendor_id and device_id:
+        driver_id = _search(_DRIVER_ID_RE, line)
+        driver = parse_driver_info(
+            int(vendor_id, 16), int(device_id, 16),
+            driver_id=int(driver_id) if driver_id else None,
+            driver_name=info.driver_name or None)
+    return driver, info
+
+
 def parse_system_info_from_output(stdout: str, stderr: str = "") -> SystemInfo:
     """
     Parse full system information from test executable output.
 
-    Extracts GPU name, driver name, driver version, and OS info.
+    Extracts GPU name, driver name, driver version, and OS info from the
+    device selection line.
 
     Args:
         stdout: Standard output from test executable
@@ -316,60 +416,19 @@ def parse_system_info_from_output(stdout: str, stderr: str = "") -> SystemInfo:
 
     Returns:
         SystemInfo object with detected information
-
-    Example output line:
-        *** Selected Vulkan physical device with name: NVIDIA GeForce RTX 3080,
-        vendor ID: 0x10de, device UUID: ..., and device ID: 0x2206,
-        driver ID: 5, driver name: NVIDIA,
-        Num Decode Queues: 16, Num Encode Queues: 3 ***
     """
-    combined_output = stdout + "\n" + stderr
-    info = SystemInfo(os_name=get_os_info())
-
-    # Extract GPU name from "device with name: XXX,"
-    gpu_pattern = r'device with name:\s*([^,]+)'
-    gpu_match = re.search(gpu_pattern, combined_output, re.IGNORECASE)
-    if gpu_match:
-        info.gpu_name = gpu_match.group(1).strip()
-
-    # Extract driver name
-    driver_name_pattern = r'driver name:\s*([^,\n*]+)'
-    driver_match = re.search(driver_name_pattern, combined_output,
-                             re.IGNORECASE)
-    if driver_match:
-        info.driver_name = driver_match.group(1).strip()
-
-    # Extract driver version if present (format varies by vendor)
-    # NVIDIA format: "driver version: 550.120"
-    # Mesa format: "driver info: Mesa 24.0.0"
-    version_pattern = r'driver version:\s*([^\n,*]+)'
-    version_match = re.search(version_pattern, combined_output, re.IGNORECASE)
-    if version_match:
-        info.driver_version = version_match.group(1).strip()
-    else:
-        # Try driver info pattern (Mesa)
-        driver_info_pattern = r'driver info:\s*([^\n,*]+)'
-        info_match = re.search(driver_info_pattern, combined_output,
-                               re.IGNORECASE)
-        if info_match:
-            info.driver_version = info_match.group(1).strip()
-
-    return info
+    line = find_device_line(stdout, stderr)
+    if line is None:
+        return SystemInfo(os_name=get_os_info())
+    return parse_device_line(line)[1]
 
 
 def parse_driver_from_output(stdout: str, stderr: str = "") -> Optional[str]:
     """
     Parse driver information from test executable output.
 
-    Looks for the line:
-    "*** Selected Vulkan physical device with name: ...
-    vendor ID: 0xXXXX ... device ID: 0xXXXX ***"
-
-    Preferably with driver ID and driver name for more accurate
-    detection (Vulkan 1.2+):
-    "*** Selected Vulkan physical device with name: ...,
-    vendor ID: 0x10de, device UUID: ..., device ID: 0x2206,
-    driver ID: 5, driver name: NVIDIA ***"
+    Uses the device selection line, preferring its driver ID and driver
+    name (Vulkan 1.2+) over the vendor ID.
 
     Args:
         stdout: Standard output from test executable
@@ -377,48 +436,11 @@ def parse_driver_from_output(stdout: str, stderr: str = "") -> Optional[str]:
 
     Returns:
         Detected driver name (e.g., "nvidia", "radv", "anv") or None
-
-    Example output line:
-        *** Selected Vulkan physical device with name: NVIDIA GeForce RTX 3080,
-        vendor ID: 0x10de, device UUID: ..., and device ID: 0x2206,
-        driver ID: 5, driver name: NVIDIA,
-        Num Decode Queues: 16, Num Encode Queues: 3 ***
     """
-    # Combine stdout and stderr for searching
-    combined_output = stdout + "\n" + stderr
-
-    # Pattern to match the device selection line with optional driver info
-    # Looks for: vendor ID: 0xXXXX, device ID: 0xXXXX,
-    # optionally driver ID and driver name
-    pattern = (r'vendor ID:\s*(?:0x)?([0-9a-fA-F]+).*?'
-               r'device ID:\s*(?:0x)?([0-9a-fA-F]+)'
-               r'(?:.*?driver ID:\s*(\d+))?'
-               r'(?:.*?driver name:\s*([^,\n]+))?')
-
-    match = re.search(pattern, combined_output, re.IGNORECASE | re.DOTALL)
-    if not match:
-        return None
-
-    try:
-        vendor_id = int(match.group(1), 16)
-        device_id = int(match.group(2), 16)
-
-        # Extract driver ID and driver name if available (groups 3 and 4)
-        driver_id = None
-        driver_name = None
-
-        if match.group(3):  # driver ID
-            driver_id = int(match.group(3))
-
-        if match.group(4):  # driver name
-            driver_name = match.group(4).strip()
-
-        # Use parse_driver_info with all available information
-        return parse_driver_info(vendor_id, device_id,
-                                 driver_id=driver_id,
-                                 driver_name=driver_name)
-    except (ValueError, IndexError):
+    line = find_device_line(stdout, stderr)
+    if line is None:
         return None
+    return parse_device_line(line)[0]
 
 
 def parse_driver_info(vendor_id: int,
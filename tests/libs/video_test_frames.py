@@ -0,0 +1,377 @@
+"""
+Video Test Frame Access
+Random access to the frames of raw YUV and Y4M files through a memory
+map, so that analyses only read the frames they touch.
+
+Layouts cover 3-plane (I420, I422, I444) and 2-plane (NV12, NV16, P010)
+formats at 8 bits or 16-bit little-endian samples. High bit depth samples
+are either LSB-aligned (yuv420p10le, the encoder's default input) or
+MSB-aligned (P010); sample_shift gives the shift to undo. Y4M files are
+recognised by their header, which gives the size, frame rate and colour
+space; each frame is preceded by a FRAME marker.
+
+With NumPy installed, planes are returned as array views into the map
+(no copy). 2-plane chroma is returned as strided U and V views of the
+interleaved plane.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import mmap
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Chroma subsampling factors (horizontal, vertical)
+CHROMA_SUBSAMPLING = {"420": (2, 2), "422": (2, 1), "444": (1, 1)}
+# Frame rate of the encoder when the source does not give one
+DEFAULT_FRAME_RATE = 30000 / 1001
+# Encoder options giving the layout of a raw input
+INPUT_LAYOUT_OPTIONS = ("--inputChromaSubsampling", "--inputBpp",
+                        "--inputNumPlanes", "--msbShift")
+Y4M_MAGIC = b"YUV4MPEG2"
+Y4M_FRAME = b"FRAME"
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    """YUV frame layout; samples above 8 bits are 16-bit little-endian."""
+    width: int
+    height: int
+    chroma: str = "420"
+    bit_depth: int = 8
+    num_planes: int = 3  # 2: interleaved UV plane (NV12, P010)
+    sample_shift: int = 0  # left shift of the samples in the file
+
+    @property
+    def bytes_per_sample(self) -> int:
+        """Bytes of one sample."""
+        return 1 if self.bit_depth <= 8 else 2
+
+    @property
+    def chroma_dimensions(self) -> Tuple[int, int]:
+        """(width, height) of a chroma component."""
+        sub_x, sub_y = CHROMA_SUBSAMPLING[self.chroma]
+        return -(-self.width // sub_x), -(-self.height // sub_y)
+
+    @property
+    def plane_dimensions(self) -> List[Tuple[int, int]]:
+        """(width, height) in samples of the Y, U and V components."""
+        chroma = self.chroma_dimensions
+        return [(self.width, self.height), chroma, chroma]
+
+    @property
+    def plane_sizes(self) -> List[int]:
+        """Bytes of the Y, U and V components."""
+        return [w * h * self.bytes_per_sample
+                for w, h in self.plane_dimensions]
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes of one frame."""
+        return sum(self.plane_sizes)
+
+    @property
+    def peak(self) -> int:
+        """Largest sample value."""
+        return (1 << self.bit_depth) - 1
+
+
+# Named layouts: chroma, bit depth, planes, sample shift
+PIXEL_FORMATS = {
+    "i420": ("420", 8, 3, 0),
+    "i422": ("422", 8, 3, 0),
+    "i444": ("444", 8, 3, 0),
+    "nv12": ("420", 8, 2, 0),
+    "nv16": ("422", 8, 2, 0),
+    "i420p10": ("420", 10, 3, 0),
+    "i422p10": ("422", 10, 3, 0),
+    "i444p10": ("444", 10, 3, 0),
+    "p010": ("420", 10, 2, 6),
+}
+
+
+def layout_for_format(pixel_format: str, width: int,
+                      height: int) -> FrameLayout:
+    """Layout of a named pixel format (see PIXEL_FORMATS).
+
+    Raises:
+        ValueError: Unknown pixel format
+    """
+    if pixel_format not in PIXEL_FORMATS:
+        raise ValueError(f"unknown pixel format {pixel_format}")
+    chroma, bit_depth, num_planes, shift = PIXEL_FORMATS[pixel_format]
+    return FrameLayout(width, height, chroma, bit_depth, num_planes, shift)
+
+
+def layout_from_args(width: int, height: int,
+                     args: Optional[Sequence[str]]) -> FrameLayout:
+    """Layout of a raw encoder input from its encoder arguments
+    (--inputChromaSubsampling, --inputBpp, --inputNumPlanes and
+    --msbShift)."""
+    args = list(args or [])
+
+    def value(option: str, default: str) -> str:
+        return args[args.index(option) + 1] if option in args else default
+
+    chroma = value("--inputChromaSubsampling", "420")
+    bit_depth = int(value("--inputBpp", "8"))
+    num_planes = int(value("--inputNumPlanes", "3"))
+    if chroma not in CHROMA_SUBSAMPLING:
+        raise ValueError(f"unsupported chroma subsampling {chroma}")
+    sample_shift = 0
+    if bit_depth > 8:
+        # The encoder shifts samples left by --msbShift (default
+        # 16 - bpp) to MSB-align them; the rest of the shift is in the file
+        msb_shift = int(value("--msbShift", str(16 - bit_depth)))
+        sample_shift = 16 - bit_depth - msb_shift
+    return FrameLayout(width, height, chroma, bit_depth, num_planes,
+                       sample_shift)
+
+
+def encoder_input_args(layout: FrameLayout) -> List[str]:
+    """Encoder arguments reading a raw file in a layout (the inverse of
+    layout_from_args())."""
+    args = ["--inputChromaSubsampling", layout.chroma,
+            "--inputBpp", str(layout.bit_depth),
+            "--inputNumPlanes", str(layout.num_planes)]
+    if layout.bit_depth > 8:
+        msb_shift = 16 - layout.bit_depth - layout.sample_shift
+        args.extend(["--msbShift", str(msb_shift)])
+    return args
+
+
+def pack_planes(planes: Sequence, layout: FrameLayout) -> bytes:
+    """Samples of Y, U and V arrays of shape (height, width) or
+    (frames, height, width) stored in a layout: planes, sample shift and
+    sample size."""
+    dtype = np.uint8 if layout.bytes_per_sample == 1 else np.dtype("<u2")
+    y, u, v = (np.asarray(p).astype(dtype) << layout.sample_shift
+               for p in planes)
+    frames = y.reshape(-1, y.shape[-2] * y.shape[-1]).shape[0]
+    if layout.num_planes == 2:
+        uv = np.empty(u.shape[:-1] + (2 * u.shape[-1],), dtype=dtype)
+        uv[..., 0::2], uv[..., 1::2] = u, v
+        parts = (y, uv)
+    else:
+        parts = (y, u, v)
+    return np.concatenate([p.reshape(frames, -1) for p in parts],
+                          axis=1).tobytes()
+
+
+def parse_y4m_header(line: bytes) -> Tuple[FrameLayout, float]:
+    """Layout and frame rate of a Y4M stream header line.
+
+    Raises:
+        ValueError: Not a supported Y4M header
+    """
+    if not line.startswith(Y4M_MAGIC) or not line.endswith(b"\n"):
+        raise ValueError("not a Y4M file")
+    width = height = 0
+    frame_rate = DEFAULT_FRAME_RATE
+    chroma, bit_depth = "420", 8
+    for token in line.split()[1:]:
+        key, value = chr(token[0]), token[1:].decode("ascii")
+        if key == "W":
+            width = int(value)
+        elif key == "H":
+            height = int(value)
+        elif key == "F":
+            num, den = (int(v) for v in value.split(":"))
+            frame_rate = num / den if den else frame_rate
+        elif key == "C":
+            # e.g. 420jpeg, 420mpeg2, 422, 444p10
+            chroma = value[:3]
+            depth = re.search(r"p(\d+)$", value)
+            if depth:
+                bit_depth = int(depth.group(1))
+    if not width or not height or chroma not in CHROMA_SUBSAMPLING:
+        raise ValueError(f"unsupported Y4M header {line!r}")
+    return FrameLayout(width, height, chroma, bit_depth), frame_rate
+
+
+def read_y4m_header(path: Path) -> Tuple[FrameLayout, float]:
+    """Layout and frame rate of a Y4M file.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or is not Y4M
+    """
+    with open(path, "rb") as f:
+        line = f.readline(1024)
+    try:
+        return parse_y4m_header(line)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+@dataclass
+class FrameIndex:
+    """Location of the frames in a file: the offset of frame 0 and the
+    distance between frames, or the offsets of every frame when Y4M frame
+    markers differ in length."""
+    first: int = 0
+    stride: int = 0
+    offsets: Optional[List[int]] = None
+    count: int = 0
+
+    def offset(self, index: int) -> int:
+        """Byte offset of a frame's samples."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"frame {index} out of range "
+                             f"(0-{self.count - 1})")
+        if self.offsets is not None:
+            return self.offsets[index]
+        return self.first + index * self.stride
+
+
+class FrameReader:
+    """Memory-mapped frames of a raw YUV or Y4M file.
+
+    Views returned by the reader point into the map and are valid until
+    close(). A truncated last frame is not counted.
+    """
+
+    def __init__(self, path: Path, layout: Optional[FrameLayout] = None):
+        """Map a file.
+
+        Args:
+            path: Raw YUV or Y4M file; Y4M is recognised by its header
+            layout: Layout of a raw file (ignored for Y4M)
+
+        Raises:
+            OSError, ValueError: The file cannot be read, or a raw file
+            has no layout
+        """
+        self.path = Path(path)
+        self.frame_rate: Optional[float] = None
+        self._map: Optional[mmap.mmap] = None
+        self._index = FrameIndex()
+
+        with open(self.path, "rb") as f:
+            head = f.readline(1024)
+            if head.startswith(Y4M_MAGIC):
+                layout, self.frame_rate = parse_y4m_header(head)
+            elif layout is None:
+                raise ValueError(f"{path}: layout of raw file not given")
+            self.layout = layout
+            size = f.seek(0, 2)
+            if size:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map is None:
+            return
+        if self.frame_rate is None:
+            self._index.stride = layout.frame_size
+            self._index.count = size // layout.frame_size
+        else:
+            self._index_y4m(len(head))
+
+    def _index_y4m(self, header_size: int) -> None:
+        """Locate the Y4M frames, assuming equal markers when the first
+        and last frame agree with that."""
+        data = self._map
+        frame_size = self.layout.frame_size
+        end = data.find(b"\n", header_size)
+        if end < 0 or data[header_size:header_size + 5] != Y4M_FRAME:
+            return
+        stride = end + 1 - header_size + frame_size
+        count = (len(data) - header_size) // stride
+        last = header_size + (count - 1) * stride
+        if count and data[last:last + 5] == Y4M_FRAME:
+            self._index = FrameIndex(first=end + 1, stride=stride,
+                                     count=count)
+            return
+        # Markers with parameters of varying length: scan all of them
+        offsets = []
+        marker = header_size
+        while data[marker:marker + 5] == Y4M_FRAME:
+            end = data.find(b"\n", marker)
+            if end < 0 or end + 1 + frame_size > len(data):
+                break
+            offsets.append(end + 1)
+            marker = end + 1 + frame_size
+        self._index = FrameIndex(offsets=offsets, count=len(offsets))
+
+    def __len__(self) -> int:
+        return self._index.count
+
+    def __enter__(self) -> "FrameReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file; views still referenced keep it mapped."""
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # released when the last view is freed
+            self._map = None
+
+    def frame_offset(self, index: int) -> int:
+        """Byte offset of a frame's samples in the file."""
+        return self._index.offset(index)
+
+    def frame_bytes(self, index: int) -> memoryview:
+        """Samples of one frame, without copying."""
+        offset = self.frame_offset(index)
+        return memoryview(self._map)[offset:offset + self.layout.frame_size]
+
+    def frame_array(self, start: int, count: int):
+        """(count, samples) NumPy view of consecutive frames.
+
+        Frames with Y4M markers of varying length are copied.
+        """
+        layout = self.layout
+        dtype = np.uint8 if layout.bytes_per_sample == 1 else np.dtype("<u2")
+        samples = layout.frame_size // layout.bytes_per_sample
+        self.frame_offset(start + count - 1)  # range check
+        if self._index.offsets is not None:
+            return np.stack([np.frombuffer(self.frame_bytes(i), dtype=dtype)
+                             for i in range(start, start + count)])
+        return np.ndarray((count, samples), dtype=dtype, buffer=self._map,
+                          offset=self.frame_offset(start),
+                          strides=(self._index.stride,
+                                   layout.bytes_per_sample))
+
+    def batch_planes(self, start: int, count: int) -> tuple:
+        """Y, U and V of consecutive frames as (count, height, width)
+        NumPy views."""
+        layout = self.layout
+        frames = self.frame_array(start, count)
+        (width, height), (c_width, c_height) = (
+            layout.plane_dimensions[0], layout.chroma_dimensions)
+        luma = width * height
+        chroma = c_width * c_height
+        y = frames[:, :luma].reshape(count, height, width)
+        if layout.num_planes == 2:
+            uv = frames[:, luma:luma + 2 * chroma].reshape(
+                count, c_height, 2 * c_width)
+            return y, uv[:, :, 0::2], uv[:, :, 1::2]
+        u = frames[:, luma:luma + chroma].reshape(count, c_height, c_width)
+        v = frames[:, luma + chroma:luma + 2 * chroma].reshape(
+            count, c_height, c_width)
+        return y, u, v
+
+    def planes(self, index: int) -> tuple:
+        """Y, U and V of one frame as (height, width) NumPy views."""
+        return tuple(plane[0] for plane in self.batch_planes(index, 1))
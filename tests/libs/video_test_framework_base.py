@@ -19,32 +19,42 @@ limitations under the License.
 
 import fnmatch
 import json
-import os
 import shutil
-import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from tests.libs.video_test_config_base import (
-    BaseTestConfig,
     SkipFilter,
     SkipRule,
     TestResult,
     VideoTestStatus,
-    create_error_result,
     is_test_skipped,
     load_skip_list,
 )
 
+from tests.libs.video_test_capabilities import (
+    CapabilityCache, DeviceCapabilities, default_cache_path)
 from tests.libs.video_test_platform_utils import PlatformUtils
-from tests.libs.video_test_driver_detect import (
-    parse_driver_from_output, parse_system_info_from_output, SystemInfo,
-    get_os_info
-)
+from tests.libs.video_test_driver_detect import SystemInfo, get_os_info
+from tests.libs.video_test_framework_benchmark import BenchmarkMixin
+from tests.libs.video_test_framework_devices import DeviceSupportMixin
+from tests.libs.video_test_framework_process import CommandExecutionMixin
+from tests.libs.video_test_framework_results import ResultStoreMixin
 from tests.libs.video_test_result_reporter import (
-    get_status_display, print_codec_breakdown, print_detailed_results,
-    print_final_summary, print_command_output)
+    count_memory_leaks, count_perf_regressions, get_status_display,
+    print_codec_breakdown, print_detailed_results, print_final_summary, print_command_output,
+    print_phase_totals, print_resource_usage, print_throughput,
+    print_timeouts)
+from tests.libs.video_test_timeout import TimeoutDecision
+from tests.libs.video_test_trace import (
+    CATEGORY_SUITE,
+    CATEGORY_TEST,
+    TraceRecorder,
+)
+from tests.libs.video_test_tuning import DEFAULT_PROFILE_DIR
+from tests.libs.video_test_run_journal import RunJournal, restore_result
 from tests.libs.video_test_utils import DEFAULT_TEST_TIMEOUT
 
 # Exit codes from sysexits.h
@@ -62,16 +72,9 @@ WIN_ASSERT_ABORT_SIGNED = -1073741819  # Assert/abort (signed int32)
 WIN_COMMON_CRASH_CODES = (-1, 1, 3, 22)    # Common crash return codes
 
 
-def _has_validation_messages(output: str) -> bool:
-    """Return True if the output contains Vulkan validation layer messages."""
-    if not output:
-        return False
-    return ("VUID-" in output) or ("Validation Error" in output) or \
-           ("Validation Warning" in output)
-
-
 # pylint: disable=too-many-public-methods,too-many-instance-attributes
-class VulkanVideoTestFrameworkBase:
+class VulkanVideoTestFrameworkBase(DeviceSupportMixin, ResultStoreMixin,
+                                   CommandExecutionMixin, BenchmarkMixin):
     """Base class for Vulkan Video test frameworks providing common
     functionality"""
 
@@ -108,15 +111,34 @@ class VulkanVideoTestFrameworkBase:
             'extended': options.get('extended', False),
             'codec_filter': options.get('codec_filter'),
             'test_pattern': options.get('test_pattern'),
+            'resume': options.get('resume', False),
+            'history_db': options.get('history_db'),
+            'detect_regressions': options.get('detect_regressions', False),
+            'recheck_unsupported': options.get('recheck_unsupported', False),
+            'memory_sample_interval': options.get('memory_sample_interval',
+                                                  0),
+            'adaptive_timeouts': options.get('adaptive_timeouts', False),
+            'capability_cache': (options.get('capability_cache')
+                                 or default_cache_path()),
         }
 
         self.resources_dir.mkdir(exist_ok=True)
         self.work_dir_path.mkdir(parents=True, exist_ok=True)
         self.results_dir.mkdir(exist_ok=True)
 
+        # Shared with the other framework when run by the orchestrator
+        self.tracer: TraceRecorder = options.get('tracer') or TraceRecorder()
         self.results: List[TestResult] = []
+        # Driver and system info of the first detected device, used for
+        # headers and reports; per-device state is kept in _devices
         self._detected_driver: Optional[str] = None
         self._system_info: Optional[SystemInfo] = None
+        self._devices: Dict[int, Tuple[Optional[str], SystemInfo]] = {}
+        self._devices_lock = threading.Lock()
+        self._capabilities: Optional[DeviceCapabilities] = None
+        self._probed_devices: List[DeviceCapabilities] = []
+        self._capability_cache: Optional[CapabilityCache] = None
+        self._adaptive_timeouts: Dict[str, Optional[TimeoutDecision]] = {}
         self._test_pattern_active = False
         self._skipped_samples: Dict[str, Optional[SkipRule]] = {}
 
@@ -140,6 +162,36 @@ class VulkanVideoTestFrameworkBase:
         """Per-test timeout in seconds."""
         return int(self._options['timeout'])
 
+    @property
+    def resume(self) -> bool:
+        """Whether to resume an interrupted run from its journal."""
+        return bool(self._options['resume'])
+
+    @property
+    def history_db(self) -> Optional[str]:
+        """Path of the SQLite run history database (None if disabled)."""
+        return self._options['history_db']
+
+    @property
+    def detect_regressions(self) -> bool:
+        """Whether to compare durations with the run history."""
+        return bool(self._options['detect_regressions'])
+
+    @property
+    def recheck_unsupported(self) -> bool:
+        """Whether to launch tests known to be unsupported anyway."""
+        return bool(self._options['recheck_unsupported'])
+
+    @property
+    def adaptive_timeouts(self) -> bool:
+        """Whether to derive test timeouts from the run history."""
+        return bool(self._options['adaptive_timeouts'])
+
+    @property
+    def memory_sample_interval(self) -> int:
+        """Memory sampling interval in milliseconds (0 if disabled)."""
+        return int(self._options['memory_sample_interval'] or 0)
+
     @property
     def skip_filter(self) -> SkipFilter:
         """Skip filter mode (ENABLED, SKIPPED, or ALL)."""
@@ -187,25 +239,6 @@ class VulkanVideoTestFrameworkBase:
             self._system_info = SystemInfo(os_name=get_os_info())
         return self._system_info
 
-    def _detect_driver_from_output(
-            self, stdout: str, stderr: str = "") -> None:
-        """Detect and cache driver and system info from test output
-        (first call only)."""
-        if self._detected_driver is not None:
-            return
-
-        driver = parse_driver_from_output(stdout, stderr)
-        if driver:
-            self._detected_driver = driver
-            if self.verbose:
-                print(f"✓ Detected driver: {driver}")
-
-        # Also capture full system info
-        if self._system_info is None or self._system_info.gpu_name == "":
-            self._system_info = parse_system_info_from_output(stdout, stderr)
-            if self.verbose and self._system_info.gpu_name:
-                print(f"✓ Detected GPU: {self._system_info.gpu_name}")
-
     def _validate_executable(self) -> bool:
         """Validate that the test executable exists in filesystem or PATH."""
         if not self.executable_path:
@@ -240,6 +273,9 @@ class VulkanVideoTestFrameworkBase:
 
     def cleanup_results(self, test_type: str = "test") -> None:
         """Clean up output artifacts if keep_files is False and no failures."""
+        # The whole run finished, so there is nothing left to resume
+        RunJournal(self._run_journal_path(test_type), "", "").remove()
+
         has_failures = any(
             r.status in [VideoTestStatus.ERROR, VideoTestStatus.CRASH]
             for r in self.results
@@ -267,8 +303,14 @@ class VulkanVideoTestFrameworkBase:
                   f"in: {self.results_dir}")
             return
 
+        history_path = (Path(self.history_db).resolve()
+                        if self.history_db else None)
         try:
             for item in self.results_dir.iterdir():
+                # Keep the stores that outlive a run
+                if (item.resolve() == history_path
+                        or item.name == DEFAULT_PROFILE_DIR):
+                    continue
                 if item.is_file() and not item.name.endswith('_results.json'):
                     item.unlink()
                 elif item.is_dir():
@@ -391,9 +433,12 @@ class VulkanVideoTestFrameworkBase:
 
         print("-" * 70)
 
-        # Print system info header
+        # Print system info header, one per device when tests ran on
+        # several GPUs
         print()
-        print(f"### {self.system_info.get_header()}")
+        devices = self.detected_devices
+        for info in (devices if len(devices) > 1 else [self.system_info]):
+            print(f"### {info.get_header()}")
         print()
 
         # Skipped tests are now included in results, so just use len(results)
@@ -404,9 +449,20 @@ class VulkanVideoTestFrameworkBase:
         print(f"Not Supported: {not_supported:3}")
         if skipped_hw > 0:
             print(f"Skipped:       {skipped_hw:3} (in skip list)")
+        regressed = count_perf_regressions(results)
+        if regressed > 0:
+            print(f"Perf Regress.: {regressed:3} (slower than history)")
+        leaks = count_memory_leaks(results)
+        if leaks > 0:
+            print(f"Memory Leaks:  {leaks:3} (growth across loops)")
         effective_total = len(results) - not_supported - skipped_hw
         if effective_total > 0:
             print(f"Success Rate: {passed/effective_total*100:.1f}%")
+        print()
+        print_timeouts(results)
+        print_phase_totals(results)
+        print_resource_usage(results)
+        print_throughput(results)
 
         return print_final_summary(
             (passed, not_supported, crashed, failed), test_type
@@ -418,83 +474,6 @@ class VulkanVideoTestFrameworkBase:
             return self.results_dir
         return None
 
-    def result_to_dict(self, result: TestResult, test_type: str) -> dict:
-        """Convert a TestResult to a dictionary for JSON export."""
-        test_name = (result.config.display_name
-                     if hasattr(result.config, 'display_name')
-                     else result.config.name)
-        result_dict = {
-            "name": test_name,
-            "codec": result.config.codec.value,
-            "test_type": test_type,
-            "description": result.config.description,
-            "status": result.status.value,
-            "success": result.success,
-            "returncode": result.returncode,
-            "execution_time_ms": round(
-                result.execution_time * 1000, 2
-            ),
-            "warning_found": result.warning_found,
-            "error_message": result.error_message,
-            "command_line": result.command_line
-        }
-
-        if hasattr(result.config, 'full_path'):
-            result_dict["input_file"] = str(result.config.full_path)
-        elif hasattr(result.config, 'full_yuv_path'):
-            result_dict["input_file"] = str(result.config.full_yuv_path)
-
-        if hasattr(result.config, 'profile') and result.config.profile:
-            result_dict["profile"] = result.config.profile
-
-        return result_dict
-
-    def export_results_json(self, output_file: str, test_type: str) -> bool:
-        """Export test results to JSON file. Returns True on success."""
-        try:
-            results_data = [
-                self.result_to_dict(result, test_type)
-                for result in self.results
-            ]
-            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-
-            sys_info = self.system_info
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "system_info": {
-                        "gpu_name": sys_info.gpu_name,
-                        "driver_name": sys_info.driver_name,
-                        "driver_version": sys_info.driver_version,
-                        "os_name": sys_info.os_name,
-                    },
-                    "summary": {
-                        "total_tests": len(self.results),
-                        "passed": sum(
-                            1 for r in self.results
-                            if r.status == VideoTestStatus.SUCCESS
-                        ),
-                        "not_supported": sum(
-                            1 for r in self.results
-                            if r.status == VideoTestStatus.NOT_SUPPORTED
-                        ),
-                        "crashed": sum(
-                            1 for r in self.results
-                            if r.status == VideoTestStatus.CRASH
-                        ),
-                        "failed": sum(
-                            1 for r in self.results
-                            if r.status == VideoTestStatus.ERROR
-                        )
-                    },
-                    "results": results_data
-                }, f, indent=2)
-
-            return True
-
-        except (OSError, IOError) as e:
-            print(f"✗ Failed to export {test_type} results: {e}")
-            return False
-
     @property
     def test_dir(self) -> Path:
         """Directory containing this test module."""
@@ -538,147 +517,6 @@ class VulkanVideoTestFrameworkBase:
         if result.warning_found and self.verbose:
             print(f"  ⚠️  Warning detected in {config.name}")
 
-    def execute_test_command(
-        self,
-        cmd: list,
-        config: BaseTestConfig,
-        timeout: int = DEFAULT_TEST_TIMEOUT,
-        cwd: Optional[Path] = None,
-    ) -> TestResult:
-        """Execute a test command and return result."""
-        command_line = ' '.join(cmd)
-
-        if self.verbose:
-            print(f"    Command: {command_line}")
-
-        try:
-            subprocess_kwargs = PlatformUtils.get_subprocess_kwargs()
-            cfg_timeout = getattr(config, 'timeout', None)
-            if cfg_timeout is not None:
-                try:
-                    subprocess_kwargs['timeout'] = int(cfg_timeout)
-                except (TypeError, ValueError):
-                    subprocess_kwargs['timeout'] = (
-                        int(self.timeout) if self.timeout else int(timeout)
-                    )
-            else:
-                subprocess_kwargs['timeout'] = (
-                    int(self.timeout) if self.timeout else int(timeout)
-                )
-            if cwd is not None:
-                subprocess_kwargs['cwd'] = str(cwd)
-            if self.validate:
-                env = os.environ.copy()
-                env['VK_INSTANCE_LAYERS'] = 'VK_LAYER_KHRONOS_validation'
-                subprocess_kwargs['env'] = env
-
-            result = subprocess.run(cmd, check=False, **subprocess_kwargs)
-            self._detect_driver_from_output(result.stdout, result.stderr)
-
-            return TestResult(
-                config=config,
-                returncode=result.returncode,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                execution_time=0,
-                status=self.determine_test_status(
-                    result.returncode, result.stderr),
-                command_line=command_line
-            )
-
-        except subprocess.TimeoutExpired:
-            return create_error_result(
-                config, "Test timed out", command_line)
-        except (OSError, subprocess.SubprocessError) as e:
-            return create_error_result(config, str(e), command_line)
-
-    def build_decoder_command(  # pylint: disable=too-many-arguments
-        self,
-        decoder_path: Path,
-        input_file: Path,
-        *,
-        output_file: Path = None,
-        extra_decoder_args: list = None,
-        no_display: bool = True,
-    ) -> list:
-        """Build decoder command with standard options."""
-        cmd = [
-            str(decoder_path),
-            "-i", str(input_file),
-            "--verbose",
-        ]
-        has_filter_arg = (extra_decoder_args
-                          and "--enablePostProcessFilter"
-                          in extra_decoder_args)
-        if not has_filter_arg:
-            cmd.extend(["--enablePostProcessFilter", "0"])
-
-        if output_file:
-            cmd.extend(["-o", str(output_file)])
-        if no_display:
-            cmd.append("--noPresent")
-        if self.device_id is not None:
-            cmd.extend(["--deviceID", str(self.device_id)])
-        cmd.append("--noDeviceFallback")
-        if extra_decoder_args:
-            cmd.extend(extra_decoder_args)
-
-        return cmd
-
-    def run_decoder_validation(
-        self,
-        decoder_path: Path,
-        input_file: Path,
-        extra_decoder_args: list = None,
-        config: BaseTestConfig = None,
-    ) -> tuple:
-        """Validate encoded file with decoder. Returns (success, output)."""
-        if not decoder_path or not decoder_path.exists():
-            print("  ⚠️  Decoder path not valid for validation")
-            return False, "Decoder path not valid"
-
-        print(f"  🔍 Validating with decoder: {input_file.name}")
-
-        cmd = self.build_decoder_command(
-            decoder_path=decoder_path,
-            input_file=input_file,
-            output_file=None,
-            extra_decoder_args=extra_decoder_args,
-            no_display=True,
-        )
-
-        if self.verbose:
-            print(f"    Decoder command: {' '.join(cmd)}")
-
-        run_cwd = self._default_run_cwd()
-        result = self.execute_test_command(
-            cmd, config, timeout=self.timeout, cwd=run_cwd
-        )
-
-        if self.verbose:
-            if result.stdout:
-                print("    Decoder stdout:")
-                print(result.stdout)
-            if result.stderr:
-                print("    Decoder stderr:")
-                print(result.stderr)
-
-        if result.status == VideoTestStatus.SUCCESS:
-            print("  ✓ Decoder validation passed")
-            return True, None
-
-        print("  ✗ Decoder validation failed")
-        output_lines = [
-            f"status: {result.status.name}, exit code: {result.returncode}"]
-        if result.stdout:
-            for line in result.stdout.strip().split('\n')[-10:]:
-                output_lines.append(line)
-        if result.stderr:
-            for line in result.stderr.strip().split('\n')[-10:]:
-                output_lines.append(line)
-
-        return False, '\n'.join(output_lines)
-
     # pylint: disable=too-many-arguments,too-many-positional-arguments
     # pylint: disable=too-many-locals
     def filter_test_suite(
@@ -765,9 +603,21 @@ class VulkanVideoTestFrameworkBase:
         if test_configs is None:
             test_configs = self.create_test_suite()
 
+        with self.tracer.span(f"{test_type} suite", CATEGORY_SUITE,
+                              tests=len(test_configs)):
+            return self._run_test_suite_traced(test_configs, test_type)
+
+    def _run_test_suite_traced(self, test_configs: list,
+                               test_type: str) -> List[TestResult]:
+        """Body of run_test_suite_base, run inside the suite span."""
         self._print_suite_start()
-        if not self._check_and_prepare_resources(test_configs):
-            return []
+        with self.tracer.span("check_resources", CATEGORY_SUITE):
+            if not self._check_and_prepare_resources(test_configs):
+                return []
+        with self.tracer.span("capability_probe", CATEGORY_SUITE):
+            self._probe_capabilities()
+
+        journal, completed = self._open_run_journal(test_configs, test_type)
 
         print()
         results: List[TestResult] = []
@@ -775,71 +625,131 @@ class VulkanVideoTestFrameworkBase:
 
         for i, config in enumerate(test_configs, 1):
             test_name = getattr(config, 'display_name', config.name)
+            progress = f"[{i}/{total}]"
 
-            # Check if this test is in the universal skip list
             if config.name in self._skipped_samples:
-                skip_rule = self._skipped_samples[config.name]
-                reason = skip_rule.reason if skip_rule else "In skip list"
-                print(f"[{i}/{total}] Skipping: {test_name} ({reason})")
-                skipped_result = TestResult(
-                    config=config,
-                    returncode=0,
-                    execution_time=0,
-                    status=VideoTestStatus.SKIPPED,
-                    stdout="",
-                    stderr="",
-                    error_message=f"Skipped: {reason}",
-                )
-                results.append(skipped_result)
-                self.results.append(skipped_result)
-                print()
-                continue
+                # Test in the universal skip list
+                result = self._skipped_result(config, progress)
+            elif test_name in completed:
+                # Reload results of tests finished by an interrupted run
+                result = restore_result(config, completed[test_name])
+                label, symbol = get_status_display(result.status)
+                print(f"{progress} Resumed: {test_name} - {symbol} {label} "
+                      f"({result.execution_time:.2f}s, from journal)")
+            else:
+                result = self._run_suite_test(config, test_type, progress)
+                journal.record(test_name,
+                               self.result_to_dict(result, test_type))
+            results.append(result)
+            self.results.append(result)
+            print()
 
-            print(f"[{i}/{total}] Running: {test_name}")
+        if self._capability_cache:
+            self._capability_cache.save()
+        self._detect_regressions(results, test_type)
+        self._record_run_history(results, test_type, journal)
+        return results
 
-            try:
+    def _skipped_result(self, config, progress: str) -> TestResult:
+        """Result of a test in the universal skip list."""
+        test_name = getattr(config, 'display_name', config.name)
+        skip_rule = self._skipped_samples[config.name]
+        reason = skip_rule.reason if skip_rule else "In skip list"
+        print(f"{progress} Skipping: {test_name} ({reason})")
+        return TestResult(
+            config=config,
+            returncode=0,
+            execution_time=0,
+            status=VideoTestStatus.SKIPPED,
+            stdout="",
+            stderr="",
+            error_message=f"Skipped: {reason}",
+        )
+
+    def _run_suite_test(self, config, test_type: str,
+                        progress: str) -> TestResult:
+        """Run one test of a suite, unless the device certainly cannot
+        run it."""
+        test_name = getattr(config, 'display_name', config.name)
+        unsupported_reason = self._known_unsupported_reason(config, test_type)
+        if unsupported_reason:
+            print(f"{progress} Not supported: {test_name} "
+                  f"({unsupported_reason})")
+            result = TestResult(
+                config=config,
+                returncode=EX_UNAVAILABLE,
+                execution_time=0,
+                status=VideoTestStatus.NOT_SUPPORTED,
+                stdout="",
+                stderr="",
+                error_message=f"Not supported: {unsupported_reason}",
+            )
+            result.meta["capability_skip"] = True
+            return result
+
+        print(f"{progress} Running: {test_name}")
+        self._prepare_adaptive_timeout(config, test_type)
+
+        try:
+            with self.tracer.span(test_name, CATEGORY_TEST) as span_args:
+                trace_mark = self.tracer.mark()
                 start_time = time.time()
                 result = self.run_single_test(config)
                 result.execution_time = time.time() - start_time
+                span_args["status"] = result.status.value
+            result.phases = self._phase_breakdown(
+                trace_mark, result.execution_time)
+        except (KeyError, ValueError, AttributeError, TypeError) as err:
+            print(f"⚠️  ERROR: {err}")
+            return TestResult(
+                config=config,
+                returncode=-1,
+                execution_time=0,
+                status=VideoTestStatus.ERROR,
+                stdout="",
+                stderr="",
+                error_message=str(err),
+            )
 
-                skip_rule = is_test_skipped(
-                    config.name, "vvs", self._skip_rules,
-                    current_driver=self.current_driver, test_type=test_type
-                )
+        self._apply_skip_rules(result, test_type)
+        self._print_single_result(result)
+        self._learn_support(config, test_type, result)
+        return result
 
-                if self._should_mask_as_skipped(skip_rule, result):
-                    driver_info = (f"driver '{self.current_driver}'"
-                                   if self._detected_driver
-                                   else f"drivers {skip_rule.drivers}")
-                    print(f"  ⚠️  Test in skip list for {driver_info} - "
-                          f"marking as SKIPPED")
-                    result.status = VideoTestStatus.SKIPPED
-                    result.error_message = (
-                        f"Skipped: in skip list for {driver_info}. "
-                        f"Reason: {skip_rule.reason or 'N/A'}"
-                    )
-
-                results.append(result)
-                self.results.append(result)
-                self._print_single_result(result)
-
-            except (KeyError, ValueError, AttributeError, TypeError) as err:
-                error_result = TestResult(
-                    config=config,
-                    returncode=-1,
-                    execution_time=0,
-                    status=VideoTestStatus.ERROR,
-                    stdout="",
-                    stderr="",
-                    error_message=str(err),
-                )
-                results.append(error_result)
-                self.results.append(error_result)
-                print(f"⚠️  ERROR: {err}")
+    def _apply_skip_rules(self, result: TestResult, test_type: str) -> None:
+        """Mark a failed test as skipped if the skip list covers it.
 
-            print()
+        Skip rules are matched against the driver of the device this test
+        ran on, not the first device seen.
+        """
+        test_driver = self.driver_for_result(result)
+        skip_rule = is_test_skipped(
+            result.config.name, "vvs", self._skip_rules,
+            current_driver=test_driver, test_type=test_type
+        )
 
-        return results
+        if self._should_mask_as_skipped(skip_rule, result):
+            driver_info = (f"driver '{test_driver}'"
+                           if test_driver != "all"
+                           else f"drivers {skip_rule.drivers}")
+            print(f"  ⚠️  Test in skip list for {driver_info} - "
+                  f"marking as SKIPPED")
+            result.status = VideoTestStatus.SKIPPED
+            result.error_message = (
+                f"Skipped: in skip list for {driver_info}. "
+                f"Reason: {skip_rule.reason or 'N/A'}"
+            )
+
+    def _phase_breakdown(self, trace_mark: int,
+                         execution_time: float) -> Dict[str, float]:
+        """Phase durations of the test that just ran.
+
+        Time not covered by a traced phase (command building, output
+        parsing, result validation) is reported as "harness".
+        """
+        phases = self.tracer.phase_totals(trace_mark)
+        phases["harness"] = max(0.0, execution_time - sum(phases.values()))
+        return phases
 
     def run_single_test(self, config):
         """Run a single test - to be implemented by subclasses"""
@@ -847,6 +757,17 @@ class VulkanVideoTestFrameworkBase:
             "Subclasses must implement run_single_test method"
         )
 
+    def build_test_command(  # pylint: disable=unused-argument
+            self, config) -> Optional[list]:
+        """Build the command run_single_test() runs for a test, for
+        benchmarking. Frameworks without benchmark support keep this
+        default, which cannot run any test.
+
+        Returns:
+            Command list, or None if the test cannot be run
+        """
+        return None
+
     def _print_suite_start(self) -> None:
         """Print header information for the test run."""
         print("=" * 70)
@@ -894,9 +815,7 @@ class VulkanVideoTestFrameworkBase:
         if result.status in (VideoTestStatus.CRASH, VideoTestStatus.ERROR):
             print(f"   Command: {result.command_line}")
             print_command_output(result)
-        elif self.validate and (
-                _has_validation_messages(result.stdout) or
-                _has_validation_messages(result.stderr)):
+        elif self.validate and result.meta.get("validation_messages"):
             print("   ⚠️  Vulkan validation layer reported messages:")
             print_command_output(result)
         elif self.verbose and (result.stdout or result.stderr):
@@ -0,0 +1,135 @@
+"""
+Video Test Framework Benchmark
+Warm-up and measured repetitions of the test commands of a suite, mixed
+into the framework base class.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import subprocess
+import time
+from typing import List, Optional
+
+from tests.libs.video_test_benchmark import (
+    DEFAULT_REPEATS,
+    DEFAULT_WARMUP,
+    BenchmarkResult,
+    BenchmarkStats,
+)
+from tests.libs.video_test_config_base import TestResult, VideoTestStatus
+from tests.libs.video_test_process import run_process
+from tests.libs.video_test_trace import CATEGORY_SUITE, CATEGORY_TEST
+
+
+class BenchmarkMixin:
+    """Benchmark mode of a test framework."""
+
+    def run_benchmark_suite(self, test_configs: list, test_type: str, *,
+                            warmup: int = DEFAULT_WARMUP,
+                            repeats: int = DEFAULT_REPEATS
+                            ) -> List[BenchmarkResult]:
+        """Benchmark the test commands of a suite.
+
+        Tests run one after another in a fixed (name) order; the warm-up
+        and measured repetitions of a test run back to back. Only the
+        wall-clock time of the test process is measured.
+        """
+        if test_configs is None:
+            test_configs = self.create_test_suite()
+        configs = sorted(
+            (c for c in test_configs if c.name not in self._skipped_samples),
+            key=lambda c: getattr(c, 'display_name', c.name))
+
+        with self.tracer.span(f"{test_type} benchmark", CATEGORY_SUITE,
+                              tests=len(configs)):
+            self._print_suite_start()
+            with self.tracer.span("check_resources", CATEGORY_SUITE):
+                if not self._check_and_prepare_resources(configs):
+                    return []
+            print()
+            results = []
+            for i, config in enumerate(configs, 1):
+                name = getattr(config, 'display_name', config.name)
+                print(f"[{i}/{len(configs)}] Benchmarking: {name} "
+                      f"({warmup} warm-up + {repeats} runs)")
+                with self.tracer.span(name, CATEGORY_TEST):
+                    result = self.benchmark_test(config, test_type,
+                                                 warmup, repeats)
+                results.append(result)
+                if result.stats:
+                    stats = result.stats
+                    print(f"  median {stats.median_ms:.1f} ms, "
+                          f"MAD {stats.mad_ms:.1f} ms, CI "
+                          f"[{stats.ci_low_ms:.1f}, {stats.ci_high_ms:.1f}]")
+                else:
+                    symbol = "○" if result.not_supported else "✗"
+                    print(f"  {symbol} {result.error}")
+            return results
+
+    def benchmark_test(self, config, test_type: str, warmup: int,
+                       repeats: int) -> BenchmarkResult:
+        """Run the warm-up and measured repetitions of one test."""
+        name = getattr(config, 'display_name', config.name)
+        result = BenchmarkResult(name=name, test_type=test_type,
+                                 codec=config.codec.value)
+        cmd = self.build_test_command(config)
+        if cmd is None:
+            result.error = "Test command could not be built"
+            return result
+        result.command_line = ' '.join(cmd)
+        samples_ms = self._time_runs(config, cmd, result, warmup, repeats)
+        if samples_ms is not None:
+            result.stats = BenchmarkStats.from_samples(samples_ms)
+        return result
+
+    def _time_runs(self, config, cmd: list, result: BenchmarkResult,
+                   warmup: int, repeats: int) -> Optional[List[float]]:
+        """Wall-clock times of the measured runs of a test command.
+
+        Returns None, with the error stored in the result, as soon as a
+        run fails.
+        """
+        kwargs = self._process_kwargs(
+            self._resolve_timeout(config, self.timeout).seconds,
+            self._default_run_cwd())
+
+        samples_ms = []
+        for run in range(warmup + repeats):
+            start = time.perf_counter()
+            try:
+                process = run_process(cmd, **kwargs)
+            except (OSError, subprocess.SubprocessError) as e:
+                result.error = str(e) or "Test timed out"
+                return None
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            status = self.determine_test_status(process.returncode)
+            if status != VideoTestStatus.SUCCESS:
+                result.not_supported = (
+                    status == VideoTestStatus.NOT_SUPPORTED)
+                result.error = (f"{status.value} "
+                                f"(return code {process.returncode})")
+                return None
+            if run == 0:
+                # Detect the device once, outside of the measurements
+                self.analyze_result(TestResult(
+                    config=config, returncode=0, execution_time=0,
+                    status=status, stdout=process.stdout,
+                    stderr=process.stderr), [])
+            if run >= warmup:
+                samples_ms.append(elapsed_ms)
+        return samples_ms
+
+
+__all__ = ['BenchmarkMixin']
@@ -17,9 +17,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import subprocess
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from tests.libs.video_test_fetch_sample import FetchableResource
 from tests.libs.video_test_config_base import (
@@ -33,6 +35,29 @@ from tests.libs.video_test_config_base import (
 from tests.libs.video_test_framework_base import (
     VulkanVideoTestFrameworkBase,
 )
+from tests.libs.video_test_output_analyzer import (
+    FrameProgressAnalyzer,
+    analyze_output,
+)
+from tests.libs.video_test_process import ProcessResult, run_process
+from tests.libs.video_test_scaling import (
+    DEFAULT_INSTANCES,
+    DEFAULT_QUEUE_MODES,
+    ScalingPoint,
+    apply_efficiency,
+    measure_point,
+    queue_mode_args,
+)
+from tests.libs.video_test_throughput import compute_decode_throughput
+from tests.libs.video_test_trace import CATEGORY_TEST
+from tests.libs.video_test_tuning import (
+    SEARCH_GRID,
+    SEARCH_HALVING,
+    TuningCandidate,
+    expand_space,
+    grid_search,
+    successive_halving,
+)
 from tests.libs.video_test_utils import (
     calculate_file_hash,
 )
@@ -122,6 +147,8 @@ class VulkanVideoDecodeTestFramework(VulkanVideoTestFrameworkBase):
                              if self.executable_path else None)
         self.display = options.get('display', False)
         self.verify_md5 = options.get('verify_md5',  True)
+        # Decoder arguments of a tuning profile, before each sample's own
+        self.tuning_args = list(options.get('tuning_args') or [])
 
         # Load decode samples from JSON file
         test_suite = options.get('test_suite') or 'decode_samples.json'
@@ -146,7 +173,8 @@ class VulkanVideoDecodeTestFramework(VulkanVideoTestFrameworkBase):
                             else self.decode_samples)
         return check_sample_resources(samples_to_check,
                                       "decoder resource",
-                                      auto_download)
+                                      auto_download,
+                                      tracer=self.tracer)
 
     def _run_decoder_test(self, config: DecodeTestSample) -> TestResult:
         """Run decoder test for specified codec"""
@@ -178,20 +206,30 @@ class VulkanVideoDecodeTestFramework(VulkanVideoTestFrameworkBase):
             decoder_path=self.decoder_path,
             input_file=input_file,
             output_file=output_file,
-            extra_decoder_args=config.extra_args,
+            extra_decoder_args=self._decoder_args(config),
             no_display=not self.display,
         )
 
         # Use base class to execute (handles subprocess details)
         run_cwd = self._default_run_cwd()
+        progress = FrameProgressAnalyzer()
+        start_time = time.perf_counter()
         result = self.execute_test_command(
-            cmd, config, timeout=self.timeout, cwd=run_cwd
+            cmd, config, timeout=self.timeout, cwd=run_cwd,
+            analyzers=[progress],
         )
+        if result.status == VideoTestStatus.SUCCESS:
+            throughput = compute_decode_throughput(
+                progress.progress, progress.crc_frames, progress.resolution,
+                time.perf_counter() - start_time)
+            if throughput:
+                result.meta["throughput"] = throughput.to_dict()
 
         # Verify MD5 if enabled and test succeeded
         if (should_verify_md5 and output_file and output_file.exists() and
                 result.status == VideoTestStatus.SUCCESS):
-            actual_md5 = calculate_file_hash(output_file, 'md5')
+            with self.tracer.span("md5"):
+                actual_md5 = calculate_file_hash(output_file, 'md5')
             if actual_md5:
                 if actual_md5.lower() == config.expected_output_md5.lower():
                     print(f"✓ MD5 verification passed: {actual_md5}")
@@ -212,10 +250,179 @@ class VulkanVideoDecodeTestFramework(VulkanVideoTestFrameworkBase):
             and result.status == VideoTestStatus.SUCCESS
             and not self.keep_files
         ):
-            output_file.unlink()
+            with self.tracer.span("cleanup"):
+                output_file.unlink()
 
         return result
 
+    def build_test_command(self, config: DecodeTestSample) -> Optional[list]:
+        """Build the decoder command of a test for benchmarking.
+
+        No output file is written, so only decoding is measured.
+        """
+        if not self.decoder_path or not config.full_path.exists():
+            return None
+        return self.build_decoder_command(
+            decoder_path=self.decoder_path,
+            input_file=config.full_path,
+            extra_decoder_args=self._decoder_args(config),
+            no_display=not self.display,
+        )
+
+    def _decoder_args(self, config: DecodeTestSample) -> list:
+        """Extra decoder arguments of a test: the tuning profile's, then
+        the sample's (which take precedence)"""
+        return self.tuning_args + list(config.extra_args or [])
+
+    def run_tuning(self, test_configs: List[DecodeTestSample],
+                   space: Dict[str, list], search: str = SEARCH_HALVING,
+                   repeats: int = 1
+                   ) -> Tuple[Optional[TuningCandidate],
+                              List[TuningCandidate]]:
+        """Search the decoder options for the fastest configuration over
+        the given samples.
+
+        Returns:
+            Tuple of (best candidate or None, all candidates)
+        """
+        configs = sorted(
+            (c for c in test_configs if c.name not in self._skipped_samples),
+            key=lambda c: c.display_name)
+        candidates = expand_space(space)
+        self._print_suite_start()
+        if not configs or not self._check_and_prepare_resources(configs):
+            return None, candidates
+        print(f"Tuning {len(candidates)} decoder configurations over "
+              f"{len(configs)} samples ({search} search)")
+
+        def measure(candidate: TuningCandidate, runs: int) -> None:
+            if candidate.error:
+                return
+            with self.tracer.span(" ".join(candidate.args) or "defaults",
+                                  CATEGORY_TEST, runs=runs):
+                for config in configs:
+                    error = self._measure_candidate(candidate, config, runs)
+                    if error:
+                        candidate.error = f"{config.display_name}: {error}"
+                        break
+            status = (f"✗ {candidate.error}" if candidate.error else
+                      f"{candidate.fps:8.1f} fps, "
+                      f"{candidate.cpu_ms_per_frame:6.2f} ms CPU/frame")
+            print(f"  {' '.join(candidate.args):60} {status}")
+
+        if search == SEARCH_GRID:
+            best = grid_search(candidates, measure, repeats)
+        else:
+            best = successive_halving(candidates, measure, repeats)
+        return best, candidates
+
+    def _measure_candidate(self, candidate: TuningCandidate,
+                           config: DecodeTestSample, runs: int) -> str:
+        """Decode a sample `runs` times with a candidate's options and
+        add the measurements to it.
+
+        Returns:
+            Error message, or "" on success
+        """
+        cmd = self.build_decoder_command(
+            decoder_path=self.decoder_path,
+            input_file=config.full_path,
+            extra_decoder_args=candidate.args + list(config.extra_args or []),
+            no_display=not self.display,
+        )
+        kwargs = self._process_kwargs(
+            self._resolve_timeout(config, self.timeout).seconds,
+            self._default_run_cwd())
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            try:
+                process = run_process(cmd, **kwargs)
+            except (OSError, subprocess.SubprocessError) as e:
+                return str(e) or "timed out"
+            if process.returncode != 0:
+                return f"return code {process.returncode}"
+            self._detect_device(config, [process])
+            progress = FrameProgressAnalyzer()
+            analyze_output(process.stdout, process.stderr, [progress])
+            throughput = compute_decode_throughput(
+                progress.progress, progress.crc_frames, progress.resolution,
+                time.perf_counter() - start_time)
+            if throughput is None:
+                return "no frames reported"
+            candidate.frames += throughput.frames
+            candidate.seconds += throughput.seconds
+            if process.usage:
+                candidate.cpu_seconds += process.usage.cpu_time
+            candidate.runs += 1
+        return ""
+
+    def run_scaling_benchmark(
+        self, test_configs: List[DecodeTestSample],
+        instance_counts: Sequence[int] = DEFAULT_INSTANCES,
+        queue_modes: Sequence[str] = DEFAULT_QUEUE_MODES,
+    ) -> List[ScalingPoint]:
+        """Decode each sample with increasing numbers of concurrent
+        decoder instances, for each queue selection mode.
+
+        One instance is always measured first, as the reference for the
+        efficiency of the other points.
+        """
+        configs = sorted(
+            (c for c in test_configs if c.name not in self._skipped_samples),
+            key=lambda c: c.display_name)
+        self._print_suite_start()
+        if not self._check_and_prepare_resources(configs):
+            return []
+        counts = sorted(set(instance_counts) | {1})
+
+        points = []
+        for config in configs:
+            cmd = self.build_test_command(config)
+            if cmd is None:
+                continue
+            kwargs = self._process_kwargs(
+                self._resolve_timeout(config, self.timeout).seconds,
+                self._default_run_cwd())
+            for mode in queue_modes:
+                for count in counts:
+                    point = self._measure_scaling_point(
+                        config, cmd, mode, count, kwargs)
+                    points.append(point)
+                    if point.errors:
+                        # More instances will not succeed either
+                        print(f"  ✗ {point.errors[0]}")
+                        break
+        apply_efficiency(points)
+        return points
+
+    def _measure_scaling_point(  # pylint: disable=too-many-arguments
+            self, config: DecodeTestSample, cmd: list, mode: str,
+            count: int, kwargs: dict) -> ScalingPoint:
+        """Run count concurrent decoder instances of a sample with a
+        queue selection mode."""
+        print(f"Scaling: {config.display_name} [{mode}] x{count}")
+        point = ScalingPoint(sample=config.display_name, mode=mode,
+                             instances=count)
+        queues = self.system_info.decode_queues
+        cmds = [cmd + queue_mode_args(mode, i, queues)
+                for i in range(count)]
+        with self.tracer.span(f"{config.display_name} {mode} x{count}",
+                              CATEGORY_TEST):
+            outcomes = measure_point(point, cmds, **kwargs)
+        self._detect_device(config, outcomes)
+        return point
+
+    def _detect_device(self, config: DecodeTestSample,
+                       outcomes: list) -> None:
+        """Detect the device from the first successful instance."""
+        for outcome in outcomes:
+            if isinstance(outcome, ProcessResult) and outcome.returncode == 0:
+                self.analyze_result(TestResult(
+                    config=config, returncode=0, execution_time=0,
+                    status=VideoTestStatus.SUCCESS, stdout=outcome.stdout,
+                    stderr=outcome.stderr), [])
+                return
+
     def create_test_suite(self) -> List[DecodeTestSample]:
         """Create test suite from samples with optional filtering"""
         # Use base class filtering method with skip list
@@ -0,0 +1,220 @@
+"""
+Video Test Framework Devices
+Device detection from test output, the capability probe and the cache of
+tests a device does not support, mixed into the framework base class.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from typing import List, Optional, Tuple
+
+from tests.libs.video_test_config_base import TestResult, VideoTestStatus
+from tests.libs.video_test_capabilities import (
+    CapabilityCache, DeviceCapabilities, probe_devices, select_device,
+    unsupported_test_key)
+from tests.libs.video_test_driver_detect import (
+    SystemInfo,
+    get_os_info,
+    parse_device_id_option,
+)
+from tests.libs.video_test_output_analyzer import (
+    DeviceInfoAnalyzer, OutputAnalyzer, ValidationMessageAnalyzer,
+    analyze_output)
+
+
+class DeviceSupportMixin:
+    """Device detection and capability support of a test framework.
+
+    Uses the device and capability state set up by
+    VulkanVideoTestFrameworkBase.__init__."""
+
+    def analyze_result(self, result: TestResult,
+                       analyzers: List[OutputAnalyzer]) -> None:
+        """Run the output analyzers over the captured output in a single
+        pass and store their findings in the result."""
+        device_analyzer = DeviceInfoAnalyzer()
+        analyzers = list(analyzers) + [device_analyzer]
+        if self.validate:
+            analyzers.append(ValidationMessageAnalyzer())
+
+        analyze_output(result.stdout, result.stderr, analyzers)
+        for analyzer in analyzers:
+            analyzer.apply(result)
+        self._apply_device_info(result, device_analyzer)
+
+    def _apply_device_info(self, result: TestResult,
+                           analyzer: DeviceInfoAnalyzer) -> None:
+        """Record the device a test ran on in its result, and cache the
+        driver and system info of each device (first detection only)."""
+        info = analyzer.system_info
+        if info is None:
+            return
+        if info.device_id is not None:
+            result.meta["device_id"] = info.device_id
+        if analyzer.driver:
+            result.meta["driver"] = analyzer.driver
+        self._register_device(analyzer.driver, info)
+
+    def _register_device(self, driver: Optional[str],
+                         info: SystemInfo) -> None:
+        """Cache the driver and system info of a device."""
+        with self._devices_lock:
+            if info.device_id is not None:
+                self._devices.setdefault(info.device_id, (driver, info))
+
+            if self._detected_driver is None and driver:
+                self._detected_driver = driver
+                if self.verbose:
+                    print(f"✓ Detected driver: {driver}")
+
+            if self._system_info is None or self._system_info.gpu_name == "":
+                self._system_info = info
+                if self.verbose and info.gpu_name:
+                    print(f"✓ Detected GPU: {info.gpu_name}")
+
+    def _device(self, device_id: Optional[int] = None
+                ) -> Tuple[Optional[str], Optional[SystemInfo]]:
+        """Driver and system info of a detected device.
+
+        Falls back to the device requested with --deviceID, then to the
+        first detected device, for an unknown or missing device ID.
+        """
+        requested = parse_device_id_option(self.device_id)
+        with self._devices_lock:
+            for key in (device_id, requested):
+                if key in self._devices:
+                    return self._devices[key]
+        return self._detected_driver, self._system_info
+
+    def driver_for_result(self, result: TestResult) -> str:
+        """
+        Get the driver of the device a test ran on.
+
+        Falls back to the device requested with --deviceID, then to the
+        first detected driver, for tests that printed no device line.
+        Returns "all" if no driver is known.
+        """
+        driver = (result.meta.get("driver")
+                  or self._device(result.meta.get("device_id"))[0])
+        return driver or self.current_driver
+
+    def system_info_for_result(self, result: TestResult) -> SystemInfo:
+        """Get the system info of the device a test ran on, with the same
+        fallbacks as driver_for_result()."""
+        info = self._device(result.meta.get("device_id"))[1]
+        return info or self.system_info
+
+    @property
+    def detected_devices(self) -> List[SystemInfo]:
+        """System info of every device tests ran on, in detection order."""
+        with self._devices_lock:
+            return [info for _, info in self._devices.values()]
+
+    def _probe_capabilities(self) -> None:
+        """Detect the devices and their video codec operations before the
+        first test, and load what earlier runs learned about them."""
+        self._capability_cache = CapabilityCache(
+            self._options['capability_cache'])
+        devices = probe_devices()
+        if devices is None:
+            if self.verbose:
+                print("ℹ️  vulkaninfo not available - device capabilities "
+                      "will be detected from the first test")
+            return
+
+        self._probed_devices = devices
+        capabilities = select_device(devices, self.device_id)
+        if capabilities is None:
+            # Without --deviceID the executables choose the device
+            if self.verbose:
+                print("ℹ️  Device capabilities apply once the first test "
+                      "reports its device")
+            return
+
+        self._use_capabilities(capabilities)
+        self._register_device(capabilities.driver, SystemInfo(
+            gpu_name=capabilities.gpu_name,
+            driver_name=capabilities.driver_name,
+            driver_version=capabilities.driver_version,
+            os_name=get_os_info(),
+            device_id=capabilities.device_id or None,
+        ))
+
+    def _use_capabilities(self, capabilities: DeviceCapabilities) -> None:
+        """Pre-classify the following tests with the codec operations of
+        the device under test."""
+        self._capabilities = capabilities
+        self._capability_cache.set_capabilities(capabilities)
+        operations = ", ".join(capabilities.codec_operations) or "none"
+        print(f"✓ Probed device: {capabilities.gpu_name} "
+              f"({capabilities.driver}) - video operations: {operations}")
+
+    def _bind_reported_device(self, result: TestResult) -> None:
+        """Apply the probed capabilities of the device a test reports,
+        when no device was selected before the first test."""
+        device_id = result.meta.get("device_id")
+        if self._capabilities is not None or device_id is None:
+            return
+        capabilities = next((d for d in self._probed_devices
+                             if d.device_id == device_id), None)
+        if capabilities:
+            self._use_capabilities(capabilities)
+
+    def _capability_cache_key(self) -> Optional[str]:
+        """Cache key of the device under test, once it is known."""
+        if self._capabilities:
+            return self._capabilities.cache_key
+        if self._system_info and self._system_info.gpu_name:
+            return (f"{self._system_info.gpu_name}|"
+                    f"{self._system_info.driver_version}")
+        return None
+
+    def _known_unsupported_reason(self, config,
+                                  test_type: str) -> Optional[str]:
+        """Return why a test cannot run on this device, or None if it
+        must be launched to find out."""
+        if self.recheck_unsupported or self._capability_cache is None:
+            return None
+        cache_key = self._capability_cache_key()
+        if cache_key is None:
+            return None
+
+        capabilities = (self._capabilities or
+                        self._capability_cache.get_capabilities(cache_key))
+        codec = config.codec.value
+        if (capabilities and capabilities.codec_operations and
+                not capabilities.supports(test_type, codec)):
+            return f"device has no {codec} {test_type} support"
+        if self._capability_cache.is_known_unsupported(
+                cache_key, unsupported_test_key(config, test_type)):
+            return "reported not supported on this GPU and driver before"
+        return None
+
+    def _learn_support(self, config, test_type: str,
+                       result: TestResult) -> None:
+        """Remember tests that the device reported as unsupported."""
+        self._bind_reported_device(result)
+        cache_key = self._capability_cache_key()
+        if self._capability_cache is None or cache_key is None:
+            return
+        if result.status == VideoTestStatus.NOT_SUPPORTED:
+            self._capability_cache.set_unsupported(
+                cache_key, unsupported_test_key(config, test_type), True)
+        elif result.status == VideoTestStatus.SUCCESS:
+            self._capability_cache.set_unsupported(
+                cache_key, unsupported_test_key(config, test_type), False)
+
+
+__all__ = ['DeviceSupportMixin']
@@ -17,11 +17,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import dataclasses
+import hashlib
+import subprocess
+import time
 from dataclasses import dataclass
-import re
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Sequence
 
+from tests.libs.video_test_benchmark import BenchmarkResult
 from tests.libs.video_test_config_base import (
     BaseTestConfig,
     CodecType,
@@ -34,9 +38,45 @@ from tests.libs.video_test_config_base import (
 from tests.libs.video_test_framework_base import (
     VulkanVideoTestFrameworkBase,
 )
+from tests.libs.video_test_convert import (
+    converted_path,
+    ensure_converted,
+    source_identity,
+)
 from tests.libs.video_test_fetch_sample import (
     FetchableResource,
 )
+from tests.libs.video_test_frames import (
+    DEFAULT_FRAME_RATE,
+    INPUT_LAYOUT_OPTIONS,
+    PIXEL_FORMATS,
+    FrameLayout,
+    encoder_input_args,
+    layout_for_format,
+    layout_from_args,
+    read_y4m_header,
+)
+from tests.libs.video_test_output_analyzer import (
+    EncodedFramesAnalyzer,
+    WarningAnalyzer,
+)
+from tests.libs.video_test_process import run_process
+from tests.libs.video_test_quality import (
+    check_quality,
+    compute_psnr,
+    compute_quality,
+)
+from tests.libs.video_test_rd import RDCurve, RDPoint, rd_point_args
+from tests.libs.video_test_structure import (
+    StructureExpectation,
+    check_stream_structure,
+)
+from tests.libs.video_test_synthetic import (
+    SyntheticSpec,
+    ensure_source,
+    source_path,
+)
+from tests.libs.video_test_trace import CATEGORY_SETUP, CATEGORY_TEST
 
 
 @dataclass
@@ -49,6 +89,13 @@ class EncodeTestSample(BaseTestConfig):
     height: int = 0
     qpmap: str = ""
     qpmap_filepath: str = ""
+    # Minimum average luma PSNR (dB) and SSIM checked with --encode-quality
+    min_psnr: Optional[float] = None
+    min_ssim: Optional[float] = None
+    # Generated source ("source": "synthetic") instead of a downloaded one
+    synthetic: Optional[SyntheticSpec] = None
+    # Pixel format the source is converted to for the encoder (e.g. p010)
+    input_format: str = ""
 
     def __post_init__(self):
         if bool(self.qpmap) != bool(self.qpmap_filepath):
@@ -57,10 +104,30 @@ class EncodeTestSample(BaseTestConfig):
                 f"or both omitted (got qpmap={self.qpmap!r}, "
                 f"filepath={self.qpmap_filepath!r})"
             )
+        if self.input_format:
+            if self.input_format not in PIXEL_FORMATS:
+                raise ValueError(
+                    f"{self.name}: unknown input_format "
+                    f"{self.input_format!r}; choose from "
+                    f"{', '.join(PIXEL_FORMATS)}")
+            options = set(INPUT_LAYOUT_OPTIONS) & set(self.extra_args or [])
+            if options:
+                raise ValueError(
+                    f"{self.name}: input_format sets "
+                    f"{', '.join(sorted(options))}")
 
     @classmethod
     def from_dict(cls, data: dict) -> 'EncodeTestSample':
         """Create an EncodeTestSample from a dictionary"""
+        source = data.get("source", "file")
+        if source not in ("file", "synthetic"):
+            raise ValueError(f"unknown source {source!r}")
+        synthetic = None
+        if source == "synthetic":
+            # Generated sources have no download
+            data = {"source_url": "", "source_checksum": "",
+                    "source_filepath": "", **data}
+            synthetic = SyntheticSpec.from_dict(data.get("synthetic", {}))
         return cls(
             **cls._parse_base_fields(data),
             profile=data.get("profile"),
@@ -69,6 +136,10 @@ class EncodeTestSample(BaseTestConfig):
             height=data.get("height", 0),
             qpmap=data.get("qpmap", ""),
             qpmap_filepath=data.get("qpmap_filepath", ""),
+            min_psnr=data.get("min_psnr"),
+            min_ssim=data.get("min_ssim"),
+            synthetic=synthetic,
+            input_format=data.get("input_format", ""),
         )
 
     @property
@@ -79,9 +150,47 @@ class EncodeTestSample(BaseTestConfig):
     @property
     def full_yuv_path(self) -> Path:
         """Get the full path to the YUV file"""
+        if self.synthetic:
+            return source_path(self.synthetic, self.file_layout,
+                               self.source_format == "y4m")
         resources_dir = Path(__file__).parent.parent / "resources"
         return resources_dir / self.source_filepath
 
+    @property
+    def file_layout(self) -> FrameLayout:
+        """Frame layout of a raw source file, from the encoder input
+        options"""
+        return layout_from_args(self.width, self.height, self.extra_args)
+
+    @property
+    def source_layout(self) -> FrameLayout:
+        """Frame layout of the raw encoder input"""
+        if self.input_format:
+            return layout_for_format(self.input_format, self.width,
+                                     self.height)
+        return self.file_layout
+
+    @property
+    def input_is_y4m(self) -> bool:
+        """Whether the encoder reads a Y4M file"""
+        return self.source_format == "y4m" and not self.input_format
+
+    @property
+    def encoder_input_path(self) -> Path:
+        """File read by the encoder: the source, or its conversion to
+        input_format"""
+        if not self.input_format:
+            return self.full_yuv_path
+        return converted_path(self.source_key, self.file_layout,
+                              self.source_layout)
+
+    @property
+    def source_key(self) -> str:
+        """Identity of the source file in the conversion cache"""
+        if self.synthetic:
+            return self.full_yuv_path.name  # holds the parameter hash
+        return source_identity(self.full_yuv_path, self.source_checksum)
+
     @property
     def full_qpmap_path(self) -> Optional[Path]:
         """Get the full path to the QP map file, or None if not set"""
@@ -132,6 +241,13 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
             'validate': validate_with_decoder,
             'path': Path(decoder_path_str) if decoder_path_str else None,
             'args': decoder_args,
+            # None, "psnr" or "ssim": compare the decoded output with the
+            # source during validation
+            'quality': options.get('quality_metrics'),
+            # Check the stream structure before decoding it
+            'structure': options.get('structure_check', False),
+            # Fraction of tests validated with the decoder
+            'sample_rate': options.get('decoder_sample_rate', 1.0),
         }
 
         # Load encode test samples from JSON file
@@ -167,6 +283,21 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
         """Additional arguments for decoder validation"""
         return self._decoder_config['args']
 
+    @property
+    def structure_check(self) -> bool:
+        """Whether to check the structure of encoder output"""
+        return self._decoder_config['structure']
+
+    @property
+    def decoder_sample_rate(self) -> float:
+        """Fraction of tests validated with the decoder"""
+        return self._decoder_config['sample_rate']
+
+    @property
+    def quality_metrics(self) -> Optional[str]:
+        """Quality metrics computed from the validation decode"""
+        return self._decoder_config['quality']
+
     def _load_encode_samples(
             self, json_file: str = "encode_samples.json"
     ) -> List[EncodeTestSample]:
@@ -227,19 +358,73 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
         # Use provided test configs or all samples
         samples_to_check = (test_configs if test_configs is not None
                             else self.encode_samples)
+        if not self._generate_synthetic_sources(
+                [s for s in samples_to_check if s.synthetic]):
+            return False
         adapted_samples = [YUVSampleAdapter(sample)
-                           for sample in samples_to_check]
-        return check_sample_resources(adapted_samples,
+                           for sample in samples_to_check
+                           if not sample.synthetic]
+        if not check_sample_resources(adapted_samples,
                                       "encoder YUV resource",
-                                      auto_download)
-
-    def _run_encoder_test(self, config: EncodeTestSample) -> TestResult:
-        """Run encoder test for specified codec and profile"""
-        if not self.encoder_path:
-            return create_error_result(config, "Encoder path not specified")
+                                      auto_download,
+                                      tracer=self.tracer):
+            return False
+        return self._convert_sources(
+            [s for s in samples_to_check if s.input_format])
+
+    def _generate_synthetic_sources(
+            self, samples: List[EncodeTestSample]) -> bool:
+        """Generate the synthetic sources missing from the cache"""
+        for sample in samples:
+            path = sample.full_yuv_path
+            if path.exists():
+                continue
+            print(f"🧪 Generating synthetic source {path.name}")
+            try:
+                with self.tracer.span("generate", CATEGORY_SETUP,
+                                      file=path.name):
+                    ensure_source(sample.synthetic, sample.file_layout,
+                                  sample.source_format == "y4m")
+            except (OSError, ValueError) as e:
+                print(f"✗ {sample.name}: cannot generate synthetic "
+                      f"source: {e}")
+                return False
+        return True
+
+    def _convert_sources(self, samples: List[EncodeTestSample]) -> bool:
+        """Convert sources to the input formats missing from the cache"""
+        for sample in samples:
+            path = sample.encoder_input_path
+            if path.exists():
+                continue
+            print(f"🔄 Converting {sample.full_yuv_path.name} to "
+                  f"{sample.input_format}")
+            try:
+                with self.tracer.span("convert", CATEGORY_SETUP,
+                                      file=path.name):
+                    ensure_converted(sample.full_yuv_path,
+                                     sample.file_layout,
+                                     sample.source_layout,
+                                     sample.source_key)
+            except (OSError, ValueError) as e:
+                print(f"✗ {sample.name}: cannot convert source to "
+                      f"{sample.input_format}: {e}")
+                return False
+        return True
+
+    def _output_file(self, config: EncodeTestSample) -> Path:
+        """Encoded output file of a test in the results folder"""
+        return self.results_dir / (
+            f"test_output_{config.name}."
+            f"{self._get_output_extension(config.codec)}"
+        )
 
-        # Use the YUV file specified in the test configuration
-        yuv_file = config.full_yuv_path
+    def build_encoder_command(self, config: EncodeTestSample,
+                              output_file: Path) -> list:
+        """Build encoder command for a test configuration"""
+        # Use the YUV file specified in the test configuration, or its
+        # conversion to the sample's input format
+        yuv_file = config.encoder_input_path
 
         # Base command
         cmd = [
@@ -249,11 +434,14 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
         ]
 
         # Only add dimensions for raw YUV (Y4M has dimensions in header)
-        if config.source_format != "y4m":
+        if not config.input_is_y4m:
             width, height = str(config.width), str(config.height)
             cmd.extend(["--inputWidth", width])
             cmd.extend(["--inputHeight", height])
-            cmd.extend(["--inputNumPlanes", "3"])
+            if config.input_format:
+                cmd.extend(encoder_input_args(config.source_layout))
+            else:
+                cmd.extend(["--inputNumPlanes", "3"])
 
         cmd.append("--verbose")
 
@@ -278,30 +466,48 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
             cmd.extend(["--qpMap", config.qpmap,
                         "--qpMapFileName", str(qpmap_path)])
 
-        # Output file to results folder
-        output_file = self.results_dir / (
-            f"test_output_{config.name}."
-            f"{self._get_output_extension(config.codec)}"
-        )
         cmd.extend(["-o", str(output_file)])
+        return cmd
+
+    def _run_encoder_test(self, config: EncodeTestSample) -> TestResult:
+        """Run encoder test for specified codec and profile"""
+        if not self.encoder_path:
+            return create_error_result(config, "Encoder path not specified")
+
+        # Output file to results folder
+        output_file = self._output_file(config)
+        cmd = self.build_encoder_command(config, output_file)
 
         # Use base class to execute (handles subprocess details)
         run_cwd = self._default_run_cwd()
+        frames = EncodedFramesAnalyzer()
+        start_time = time.perf_counter()
         result = self.execute_test_command(
-            cmd, config, timeout=self.timeout, cwd=run_cwd
-        )
-
-        # Analyze output
-        result.warning_found = self._analyze_encoder_output(
-            result.stderr, config
+            cmd, config, timeout=self.timeout, cwd=run_cwd,
+            analyzers=[WarningAnalyzer(), frames],
         )
+        if result.status == VideoTestStatus.SUCCESS and output_file.exists():
+            result.meta["encode_stats"] = self._encode_stats(
+                frames.frames, time.perf_counter() - start_time,
+                output_file.stat().st_size)
+
+        # Check the stream structure first: it is cheap and spares the
+        # decoder run when the stream is already wrong
+        if (self.structure_check and output_file.exists() and
+                result.status == VideoTestStatus.SUCCESS):
+            self._check_structure(result, output_file)
 
         # Validate encoded output with decoder if enabled
+        decoded_file = (self.results_dir /
+                        f"test_output_{config.name}_decoded.yuv"
+                        if self.quality_metrics else None)
         if (self.validate_with_decoder and
                 output_file.exists() and
-                result.status == VideoTestStatus.SUCCESS):
+                result.status == VideoTestStatus.SUCCESS and
+                (decoded_file or self._decoder_sampled(config))):
             validation_success, validation_output = (
-                self._validate_with_decoder(output_file, config)
+                self._validate_with_decoder(output_file, config,
+                                            decoded_file)
             )
             if not validation_success:
                 # Decoder validation failed - mark encoder test as error
@@ -309,43 +515,111 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
                 result.error_message = "Decoder validation failed"
                 # Store validation output for display after test result
                 result.meta["decoder_validation_output"] = validation_output
+            elif decoded_file:
+                self._check_quality(result, decoded_file)
+
+        if (decoded_file and decoded_file.exists() and
+                result.status == VideoTestStatus.SUCCESS and
+                not self.keep_files):
+            decoded_file.unlink()
 
         # Clean up output file only if test succeeded and keep_files is False
         if (output_file.exists() and
                 result.status == VideoTestStatus.SUCCESS and
                 not self.keep_files):
-            output_file.unlink()
+            with self.tracer.span("cleanup"):
+                output_file.unlink()
 
         return result
 
-    def _analyze_encoder_output(self, stderr: str,
-                                _config: EncodeTestSample) -> bool:
-        """Analyze encoder output for general warnings/errors"""
-        # Look for any warning messages (general approach)
-        warning_patterns = [
-            r"warning\s*:",
-            r"warn\s*:",
-            r"caution\s*:",
-            r"deprecated",
-            r"not\s+supported",
-            r"disabling",
-            r"fallback"
-        ]
-
-        for pattern in warning_patterns:
-            if re.search(pattern, stderr, re.IGNORECASE):
-                return True
+    @staticmethod
+    def _encode_stats(frames: int, seconds: float, output_bytes: int) -> dict:
+        """Encode rate and output size of a test"""
+        return {
+            "frames": frames,
+            "seconds": round(seconds, 4),
+            "fps": round(frames / seconds, 2) if seconds > 0 else 0.0,
+            "output_bytes": output_bytes,
+            "bytes_per_frame": (round(output_bytes / frames, 1)
+                                if frames else 0.0),
+        }
 
-        return False
+    def _source_layout(self, config: EncodeTestSample) -> tuple:
+        """Frame layout and frame rate of a sample's source"""
+        if config.input_is_y4m:
+            return read_y4m_header(config.full_yuv_path)
+        return config.source_layout, DEFAULT_FRAME_RATE
+
+    def _check_quality(self, result: TestResult, decoded_file: Path) -> None:
+        """Compare the decoded output of a test with its source and fail
+        the test when it is below the sample's minimum quality"""
+        config = result.config
+        try:
+            layout, _ = self._source_layout(config)
+            with self.tracer.span("quality"):
+                quality = compute_quality(
+                    config.encoder_input_path, decoded_file, layout,
+                    ssim=(self.quality_metrics == "ssim"
+                          or config.min_ssim is not None))
+        except (OSError, ValueError) as e:
+            result.status = VideoTestStatus.ERROR
+            result.error_message = f"Quality check failed: {e}"
+            return
+        if quality is None:
+            result.status = VideoTestStatus.ERROR
+            result.error_message = "Quality check failed: no decoded frames"
+            return
+        result.meta["quality"] = quality.to_dict()
+        ssim = (f", SSIM {quality.ssim:.4f}"
+                if quality.ssim is not None else "")
+        print(f"  📐 Y-PSNR {quality.psnr.y:.2f} dB "
+              f"(min frame {quality.min_psnr_y:.2f}), "
+              f"YUV-PSNR {quality.psnr.yuv:.2f} dB{ssim}")
+        failure = check_quality(quality, config.min_psnr, config.min_ssim)
+        if failure:
+            result.status = VideoTestStatus.ERROR
+            result.error_message = f"Quality below threshold: {failure}"
+
+    def _check_structure(self, result: TestResult,
+                         encoded_file: Path) -> None:
+        """Check the encoded stream against the structure its encoder
+        options ask for and fail the test when it differs"""
+        config = result.config
+        try:
+            expected = StructureExpectation.from_args(config.extra_args)
+            with self.tracer.span("structure"):
+                report = check_stream_structure(
+                    encoded_file, config.codec.value, expected)
+        except (OSError, ValueError) as e:
+            result.status = VideoTestStatus.ERROR
+            result.error_message = f"Structure check failed: {e}"
+            return
+        result.meta["structure"] = report.to_dict()
+        if not report.passed:
+            result.status = VideoTestStatus.ERROR
+            result.error_message = (
+                f"Structure check failed: {'; '.join(report.failures)}")
+
+    def _decoder_sampled(self, config: EncodeTestSample) -> bool:
+        """Whether a test is in the sample validated with the decoder;
+        the choice depends only on the test name, so it is stable across
+        runs"""
+        rate = self.decoder_sample_rate
+        if rate >= 1.0:
+            return True
+        digest = hashlib.sha256(config.name.encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < rate
 
     def _validate_with_decoder(
-        self, encoded_file: Path, config: EncodeTestSample
+        self, encoded_file: Path, config: EncodeTestSample,
+        decoded_file: Optional[Path] = None,
     ) -> tuple:
         """Validate encoded output by attempting to decode it
 
         Args:
             encoded_file: Path to encoded video file
             config: Encoder test configuration
+            decoded_file: Where to write the decoded frames, if needed
 
         Returns:
             Tuple of (success: bool, validation_output: str or None)
@@ -356,6 +630,7 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
             input_file=encoded_file,
             extra_decoder_args=self.decoder_args,
             config=config,
+            output_file=decoded_file,
         )
 
     def _get_output_extension(self, codec: CodecType) -> str:
@@ -367,6 +642,125 @@ class VulkanVideoEncodeTestFramework(VulkanVideoTestFrameworkBase):
         }
         return extensions.get(codec, "bin")
 
+    def build_test_command(self, config: EncodeTestSample) -> Optional[list]:
+        """Build the encoder command of a test for benchmarking"""
+        if not self.encoder_path:
+            return None
+        return self.build_encoder_command(config, self._output_file(config))
+
+    def benchmark_test(self, config: EncodeTestSample, test_type: str,
+                       warmup: int, repeats: int) -> BenchmarkResult:
+        """Benchmark a test and remove its encoded output"""
+        result = super().benchmark_test(config, test_type, warmup, repeats)
+        output_file = self._output_file(config)
+        if output_file.exists() and not self.keep_files:
+            output_file.unlink()
+        return result
+
+    def run_rd_benchmark(self, test_configs: List[EncodeTestSample],
+                         mode: str, values: Sequence[int]
+                         ) -> List[RDCurve]:
+        """Encode each sample at every QP or bitrate and measure the
+        bitrate and PSNR of the decoded output."""
+        configs = sorted(
+            (c for c in test_configs if c.name not in self._skipped_samples),
+            key=lambda c: c.display_name)
+        self._print_suite_start()
+        if not configs or not self._check_and_prepare_resources(configs):
+            return []
+        if not self.decoder_path:
+            print("✗ FATAL: The RD benchmark decodes the encoded output and "
+                  "needs the validation decoder")
+            return []
+
+        curves = []
+        for config in configs:
+            curve = RDCurve(name=config.display_name,
+                            codec=config.codec.value, mode=mode)
+            print(f"{config.display_name}")
+            with self.tracer.span(config.display_name, CATEGORY_TEST,
+                                  mode=mode):
+                for value in values:
+                    point, status = self._measure_rd_point(config, mode,
+                                                           value)
+                    curve.points.append(point)
+                    if status == VideoTestStatus.NOT_SUPPORTED:
+                        curve.not_supported = True
+                        curve.error = point.error
+                        break
+                    if point.error:
+                        curve.error = f"{mode} {value}: {point.error}"
+                        print(f"  {mode} {value:6} ✗ {point.error}")
+                        continue
+                    print(f"  {mode} {value:6} {point.bitrate_kbps:10.1f} "
+                          f"kbit/s  Y-PSNR {point.psnr.y:6.2f} dB")
+            curves.append(curve)
+        return curves
+
+    def _measure_rd_point(self, config: EncodeTestSample, mode: str,
+                          value: int) -> tuple:
+        """Encode a sample at one RD point and decode the output.
+
+        Returns:
+            Tuple of (RDPoint, status of the encoder)
+        """
+        point = RDPoint(value=value)
+        stem = f"rd_{config.name}_{mode}{value}"
+        files = (self.results_dir /
+                 f"{stem}.{self._get_output_extension(config.codec)}",
+                 self.results_dir / f"{stem}.yuv")
+        rd_config = dataclasses.replace(
+            config, extra_args=(list(config.extra_args or [])
+                                + rd_point_args(mode, value)))
+        kwargs = self._process_kwargs(
+            self._resolve_timeout(config, self.timeout).seconds,
+            self._default_run_cwd())
+        status = VideoTestStatus.ERROR
+        try:
+            process = run_process(
+                self.build_encoder_command(rd_config, files[0]), **kwargs)
+            status = self.determine_test_status(process.returncode)
+            if status != VideoTestStatus.SUCCESS:
+                point.error = (f"encoder {status.value} "
+                               f"(return code {process.returncode})")
+                return point, status
+            self._decode_rd_point(config, point, files, kwargs)
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            point.error = str(e) or "timed out"
+        finally:
+            if not self.keep_files:
+                for path in files:
+                    if path.exists():
+                        path.unlink()
+        return point, status
+
+    def _decode_rd_point(self, config: EncodeTestSample, point: RDPoint,
+                         files: tuple, kwargs: dict) -> None:
+        """Decode the output of an RD point and measure its bitrate and
+        PSNR against the source.
+
+        Args:
+            files: Tuple of (encoded, decoded) paths
+        """
+        encoded, decoded = files
+        process = run_process(self.build_decoder_command(
+            decoder_path=self.decoder_path, input_file=encoded,
+            output_file=decoded, extra_decoder_args=self.decoder_args),
+            **kwargs)
+        if process.returncode != 0:
+            point.error = f"decoder return code {process.returncode}"
+            return
+        layout, frame_rate = self._source_layout(config)
+        with self.tracer.span("psnr"):
+            point.psnr = compute_psnr(
+                config.encoder_input_path, decoded, layout)
+        if point.psnr is None:
+            point.error = "no decoded frames"
+            return
+        point.output_bytes = encoded.stat().st_size
+        point.bitrate_kbps = (point.output_bytes * 8 * frame_rate
+                              / point.psnr.frames / 1000)
+
     def create_test_suite(self) -> List[EncodeTestSample]:
         """Create test suite from samples with optional filtering"""
         # Use base class filtering method with skip list
@@ -0,0 +1,309 @@
+"""
+Video Test Framework Process
+Execution of test and decoder commands with static, per-sample and
+adaptive timeouts, process group kills and memory sampling, mixed into the
+framework base class.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import sqlite3
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+from tests.libs.video_test_config_base import (
+    BaseTestConfig, TestResult, VideoTestStatus, create_error_result)
+from tests.libs.video_test_memory import (
+    PROCFS_AVAILABLE,
+    MemorySampler,
+    detect_memory_growth,
+    loop_iterations,
+)
+from tests.libs.video_test_output_analyzer import OutputAnalyzer
+from tests.libs.video_test_platform_utils import PlatformUtils
+from tests.libs.video_test_process import ProcessKill, run_process
+from tests.libs.video_test_run_history import RunHistory
+from tests.libs.video_test_timeout import (
+    POLICY_SAMPLE,
+    POLICY_STATIC,
+    TimeoutDecision,
+    find_adaptive_timeout,
+)
+from tests.libs.video_test_utils import DEFAULT_TEST_TIMEOUT
+
+
+class CommandExecutionMixin:
+    """Execution of the test commands of a test framework."""
+
+    def execute_test_command(
+        self,
+        cmd: list,
+        config: BaseTestConfig,
+        timeout: int = DEFAULT_TEST_TIMEOUT,
+        cwd: Optional[Path] = None,
+        analyzers: Optional[List[OutputAnalyzer]] = None,
+    ) -> TestResult:
+        """Execute a test command and return result.
+
+        The captured output is scanned once by the driver detection and
+        validation message analyzers plus any extra analyzers given.
+        """
+        command_line = ' '.join(cmd)
+        decision = self._resolve_timeout(config, timeout)
+
+        if self.verbose:
+            print(f"    Command: {command_line}")
+            if decision.policy != POLICY_STATIC:
+                print(f"    Timeout: {decision.seconds:.1f}s "
+                      f"({decision.describe()})")
+
+        try:
+            subprocess_kwargs = self._process_kwargs(decision.seconds, cwd)
+            with self.tracer.span("execute", executable=Path(cmd[0]).name):
+                sampler = self._create_memory_sampler()
+                result = run_process(cmd, monitor=sampler,
+                                     **subprocess_kwargs)
+
+            test_result = TestResult(
+                config=config,
+                returncode=result.returncode,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                execution_time=0,
+                status=self.determine_test_status(
+                    result.returncode, result.stderr),
+                command_line=command_line
+            )
+            test_result.usage = result.usage
+            test_result.meta["timeout"] = decision.to_dict()
+            if result.kill:
+                self._record_kill(test_result, result.kill)
+            if sampler:
+                self._apply_memory_samples(test_result, sampler)
+            with self.tracer.span("analyze_output"):
+                self.analyze_result(test_result, analyzers or [])
+            return test_result
+
+        except subprocess.TimeoutExpired as e:
+            test_result = create_error_result(
+                config,
+                f"Test timed out after {decision.seconds:.1f}s "
+                f"({decision.describe()})",
+                command_line)
+            test_result.meta["timeout"] = {**decision.to_dict(),
+                                           "timed_out": True}
+            # Output printed before the kill helps to see where it hung
+            test_result.stdout = e.output or ""
+            test_result.stderr = e.stderr or ""
+            kill = getattr(e, 'kill', None)
+            if kill:
+                self._record_kill(test_result, kill)
+            return test_result
+        except (OSError, subprocess.SubprocessError) as e:
+            return create_error_result(config, str(e), command_line)
+
+    def _process_kwargs(self, timeout: float,
+                        cwd: Optional[Path] = None) -> dict:
+        """Keyword arguments of run_process() for a test executable."""
+        subprocess_kwargs = PlatformUtils.get_subprocess_kwargs()
+        # run_process() always captures text output
+        subprocess_kwargs.pop('capture_output', None)
+        subprocess_kwargs.pop('text', None)
+        subprocess_kwargs['timeout'] = timeout
+        if cwd is not None:
+            subprocess_kwargs['cwd'] = str(cwd)
+        if self.validate:
+            env = os.environ.copy()
+            env['VK_INSTANCE_LAYERS'] = 'VK_LAYER_KHRONOS_validation'
+            subprocess_kwargs['env'] = env
+        return subprocess_kwargs
+
+    def _record_kill(self, result: TestResult, kill: ProcessKill) -> None:
+        """Store the termination of a test's process group in its result
+        and warn when the watchdog could not confirm it is gone."""
+        result.meta["kill"] = kill.to_dict()
+        signals = "+".join(kill.signals) or "none"
+        if kill.reason == "orphans":
+            print(f"  ⚠️  Test left processes running in its process "
+                  f"group - terminated ({signals})")
+        elif self.verbose:
+            print(f"    Terminated process group ({signals})")
+        if not kill.group_cleared:
+            print("  ⚠️  Watchdog: processes of this test survived SIGKILL "
+                  "(stuck in the driver?) - following tests may be affected")
+
+    def _create_memory_sampler(self) -> Optional[MemorySampler]:
+        """Create a sampler for the next test process, if enabled."""
+        if not self.memory_sample_interval or not PROCFS_AVAILABLE:
+            return None
+        return MemorySampler(self.memory_sample_interval / 1000.0)
+
+    def _apply_memory_samples(self, result: TestResult,
+                              sampler: MemorySampler) -> None:
+        """Store the memory series of a test and check it for growth
+        across --loop iterations."""
+        iterations = loop_iterations(result.config.extra_args)
+        leak = detect_memory_growth(sampler.samples, iterations)
+        result.meta["memory"] = {
+            "interval_ms": self.memory_sample_interval,
+            "peak_kb": sampler.peak_kb(),
+            "iterations": iterations,
+            "series": sampler.series(),
+            "leak": leak,
+        }
+        if leak:
+            print(f"  🧠 Possible memory leak: RSS grew "
+                  f"{leak['growth_kb'] / 1024:.1f} MB over "
+                  f"{iterations} loop iterations")
+
+    def _resolve_timeout(self, config: BaseTestConfig,
+                         default: int) -> TimeoutDecision:
+        """Choose the timeout of a test: the per-sample timeout, else the
+        adaptive timeout from the run history, else the static default."""
+        cfg_timeout = getattr(config, 'timeout', None)
+        if cfg_timeout is not None:
+            try:
+                return TimeoutDecision(int(cfg_timeout), POLICY_SAMPLE)
+            except (TypeError, ValueError):
+                pass
+        adaptive = self._adaptive_timeouts.get(
+            getattr(config, 'display_name', config.name))
+        if adaptive:
+            return adaptive
+        return TimeoutDecision(
+            int(self.timeout) if self.timeout else int(default),
+            POLICY_STATIC)
+
+    def _prepare_adaptive_timeout(self, config: BaseTestConfig,
+                                  test_type: str) -> None:
+        """Derive the adaptive timeout of a test from the run history
+        before it runs."""
+        if not self.adaptive_timeouts or not self.history_db:
+            return
+        test_name = getattr(config, 'display_name', config.name)
+        if test_name in self._adaptive_timeouts:
+            return
+        binary_name = (Path(self.executable_path).name
+                       if self.executable_path else "")
+        # Until a test reveals the device, any GPU and driver match
+        driver, info = self._device()
+        gpu_name = info.gpu_name if info else ""
+        try:
+            with RunHistory(self.history_db) as history:
+                self._adaptive_timeouts[test_name] = find_adaptive_timeout(
+                    history, test_name, test_type=test_type,
+                    driver=driver,
+                    gpu_name=gpu_name or None,
+                    binary_name=binary_name)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Could not read run history: {e}")
+            self._adaptive_timeouts[test_name] = None
+
+    def build_decoder_command(  # pylint: disable=too-many-arguments
+        self,
+        decoder_path: Path,
+        input_file: Path,
+        *,
+        output_file: Path = None,
+        extra_decoder_args: list = None,
+        no_display: bool = True,
+    ) -> list:
+        """Build decoder command with standard options."""
+        cmd = [
+            str(decoder_path),
+            "-i", str(input_file),
+            "--verbose",
+        ]
+        has_filter_arg = (extra_decoder_args
+                          and "--enablePostProcessFilter"
+                          in extra_decoder_args)
+        if not has_filter_arg:
+            cmd.extend(["--enablePostProcessFilter", "0"])
+
+        if output_file:
+            cmd.extend(["-o", str(output_file)])
+        if no_display:
+            cmd.append("--noPresent")
+        if self.device_id is not None:
+            cmd.extend(["--deviceID", str(self.device_id)])
+        cmd.append("--noDeviceFallback")
+        if extra_decoder_args:
+            cmd.extend(extra_decoder_args)
+
+        return cmd
+
+    def run_decoder_validation(
+        self,
+        decoder_path: Path,
+        input_file: Path,
+        extra_decoder_args: list = None,
+        config: BaseTestConfig = None,
+        output_file: Path = None,
+    ) -> tuple:
+        """Validate encoded file with decoder. Returns (success, output).
+
+        The decoded frames are written to output_file if given.
+        """
+        if not decoder_path or not decoder_path.exists():
+            print("  ⚠️  Decoder path not valid for validation")
+            return False, "Decoder path not valid"
+
+        print(f"  🔍 Validating with decoder: {input_file.name}")
+
+        cmd = self.build_decoder_command(
+            decoder_path=decoder_path,
+            input_file=input_file,
+            output_file=output_file,
+            extra_decoder_args=extra_decoder_args,
+            no_display=True,
+        )
+
+        if self.verbose:
+            print(f"    Decoder command: {' '.join(cmd)}")
+
+        run_cwd = self._default_run_cwd()
+        with self.tracer.span("decoder_validation"):
+            result = self.execute_test_command(
+                cmd, config, timeout=self.timeout, cwd=run_cwd
+            )
+
+        if self.verbose:
+            if result.stdout:
+                print("    Decoder stdout:")
+                print(result.stdout)
+            if result.stderr:
+                print("    Decoder stderr:")
+                print(result.stderr)
+
+        if result.status == VideoTestStatus.SUCCESS:
+            print("  ✓ Decoder validation passed")
+            return True, None
+
+        print("  ✗ Decoder validation failed")
+        output_lines = [
+            f"status: {result.status.name}, exit code: {result.returncode}"]
+        if result.stdout:
+            for line in result.stdout.strip().split('\n')[-10:]:
+                output_lines.append(line)
+        if result.stderr:
+            for line in result.stderr.strip().split('\n')[-10:]:
+                output_lines.append(line)
+
+        return False, '\n'.join(output_lines)
+
+
+__all__ = ['CommandExecutionMixin']
@@ -0,0 +1,233 @@
+"""
+Video Test Framework Results
+JSON export of test results, the run journal and the run history with its
+duration regression check, mixed into the framework base class.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.libs.video_test_config_base import (
+    EXPORTED_META, TestResult, VideoTestStatus)
+from tests.libs.video_test_regression import find_duration_regression
+from tests.libs.video_test_result_reporter import (
+    count_memory_leaks, count_perf_regressions, summarize_resource_usage,
+    summarize_throughput)
+from tests.libs.video_test_run_history import RunHistory
+from tests.libs.video_test_run_journal import (
+    RunJournal, compute_binary_hash, compute_suite_fingerprint)
+from tests.libs.video_test_trace import CATEGORY_SUITE
+
+
+class ResultStoreMixin:
+    """Export and persistence of the results of a test framework."""
+
+    def result_to_dict(self, result: TestResult, test_type: str) -> dict:
+        """Convert a TestResult to a dictionary for JSON export."""
+        test_name = (result.config.display_name
+                     if hasattr(result.config, 'display_name')
+                     else result.config.name)
+        result_dict = {
+            "name": test_name,
+            "codec": result.config.codec.value,
+            "test_type": test_type,
+            "description": result.config.description,
+            "status": result.status.value,
+            "success": result.success,
+            "returncode": result.returncode,
+            "execution_time_ms": round(
+                result.execution_time * 1000, 2
+            ),
+            "warning_found": result.warning_found,
+            "error_message": result.error_message,
+            "command_line": result.command_line
+        }
+
+        if result.phases:
+            result_dict["phases_ms"] = {
+                phase: round(seconds * 1000, 2)
+                for phase, seconds in result.phases.items()
+            }
+
+        if hasattr(result.config, 'full_path'):
+            result_dict["input_file"] = str(result.config.full_path)
+        elif hasattr(result.config, 'full_yuv_path'):
+            result_dict["input_file"] = str(result.config.full_yuv_path)
+
+        if hasattr(result.config, 'profile') and result.config.profile:
+            result_dict["profile"] = result.config.profile
+
+        if result.usage:
+            result_dict["rusage"] = result.usage.to_dict()
+        for key in EXPORTED_META:
+            if result.meta.get(key):
+                result_dict[key] = result.meta[key]
+
+        if "device_id" in result.meta:
+            result_dict["device_id"] = f"0x{result.meta['device_id']:04x}"
+        if result.meta.get("driver"):
+            result_dict["driver"] = result.meta["driver"]
+
+        perf_check = result.meta.get("perf_check")
+        if perf_check:
+            result_dict["perf_status"] = (
+                "regression" if perf_check["regressed"] else "ok")
+            result_dict["perf_check"] = perf_check
+
+        return result_dict
+
+    def export_results_json(self, output_file: str, test_type: str) -> bool:
+        """Export test results to JSON file. Returns True on success."""
+        try:
+            results_data = [
+                self.result_to_dict(result, test_type)
+                for result in self.results
+            ]
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "system_info": self.system_info.to_dict(),
+                    "summary": {
+                        "total_tests": len(self.results),
+                        "passed": sum(
+                            1 for r in self.results
+                            if r.status == VideoTestStatus.SUCCESS
+                        ),
+                        "not_supported": sum(
+                            1 for r in self.results
+                            if r.status == VideoTestStatus.NOT_SUPPORTED
+                        ),
+                        "crashed": sum(
+                            1 for r in self.results
+                            if r.status == VideoTestStatus.CRASH
+                        ),
+                        "failed": sum(
+                            1 for r in self.results
+                            if r.status == VideoTestStatus.ERROR
+                        ),
+                        "perf_regressions": count_perf_regressions(
+                            self.results),
+                        "memory_leaks": count_memory_leaks(self.results),
+                    },
+                    "resource_usage": summarize_resource_usage(self.results),
+                    "throughput": summarize_throughput(self.results),
+                    "results": results_data
+                }, f, indent=2)
+
+            return True
+
+        except (OSError, IOError) as e:
+            print(f"✗ Failed to export {test_type} results: {e}")
+            return False
+
+    def _detect_regressions(self, results: List[TestResult],
+                            test_type: str) -> None:
+        """Flag passing tests that are significantly slower than their
+        history on the same GPU, driver and executable."""
+        if not self.detect_regressions or not self.history_db:
+            return
+        binary_name = (Path(self.executable_path).name
+                       if self.executable_path else "")
+        try:
+            with RunHistory(self.history_db) as history:
+                for result in results:
+                    if result.status != VideoTestStatus.SUCCESS:
+                        continue
+                    test_name = getattr(result.config, 'display_name',
+                                        result.config.name)
+                    check = find_duration_regression(
+                        history, test_name, result.execution_time * 1000,
+                        test_type=test_type,
+                        driver=self.driver_for_result(result),
+                        gpu_name=self.system_info_for_result(result).gpu_name,
+                        binary_name=binary_name,
+                    )
+                    if check is None:
+                        continue
+                    result.meta["perf_check"] = check.to_dict()
+                    if check.regressed:
+                        print(f"⏱️  Performance regression: {test_name} took "
+                              f"{check.current_ms:.0f} ms, median of last "
+                              f"{check.samples} runs is "
+                              f"{check.baseline_ms:.0f} ms "
+                              f"(x{check.ratio:.2f})")
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Could not read run history: {e}")
+
+    def _record_run_history(self, results: List[TestResult], test_type: str,
+                            journal: RunJournal) -> None:
+        """Append the results of this suite to the run history database."""
+        if not self.history_db or not results:
+            return
+        binary_name = (Path(self.executable_path).name
+                       if self.executable_path else "")
+        # One run per device, so each result is keyed by its own device
+        devices: Dict[Optional[int], List[TestResult]] = {}
+        for result in results:
+            devices.setdefault(result.meta.get("device_id"), []).append(result)
+        try:
+            with self.tracer.span("run_history", CATEGORY_SUITE), \
+                    RunHistory(self.history_db) as history:
+                for device_results in devices.values():
+                    history.record_run(
+                        test_type,
+                        self.system_info_for_result(device_results[0]),
+                        [self.result_to_dict(r, test_type)
+                         for r in device_results],
+                        driver=self.driver_for_result(device_results[0]),
+                        binary_name=binary_name,
+                        binary_hash=journal.binary_hash,
+                        suite_fingerprint=journal.suite_fingerprint,
+                    )
+            print(f"🗄️  Recorded {len(results)} {test_type} result(s) in "
+                  f"run history: {self.history_db}")
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Could not update run history: {e}")
+
+    def _run_journal_path(self, test_type: str) -> Path:
+        """Path of the run journal for the given test type."""
+        return self.results_dir / f"{test_type}_run_journal.jsonl"
+
+    def _open_run_journal(self, test_configs: list,
+                          test_type: str) -> tuple:
+        """Open the run journal for this suite.
+
+        Returns:
+            Tuple of (RunJournal, dict of completed test name to result
+            dictionary). The dict is only populated with --resume.
+        """
+        journal = RunJournal(
+            self._run_journal_path(test_type),
+            suite_fingerprint=compute_suite_fingerprint(test_configs),
+            binary_hash=compute_binary_hash(self.executable_path),
+        )
+        completed = journal.start(resume=self.resume)
+        if self.resume:
+            if completed:
+                print(f"↻ Resuming interrupted {test_type} run: "
+                      f"{len(completed)} of {len(test_configs)} test(s) "
+                      f"already completed")
+            else:
+                print(f"↻ No resumable {test_type} run found - "
+                      f"starting from the first test")
+        return journal, completed
+
+
+__all__ = ['ResultStoreMixin']
@@ -0,0 +1,174 @@
+"""
+Video Test Memory Sampling
+Polls /proc/<pid>/status and /proc/<pid>/stat of a running test executable
+at a fixed interval, and flags memory that keeps growing from one --loop
+iteration to the next as a possible leak.
+
+Sampling is only available on Linux (procfs).
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+PROCFS_AVAILABLE = os.path.isfile("/proc/self/status")
+
+# Series stored per test are downsampled to at most this many points
+MAX_SERIES_POINTS = 120
+# Growth between the first and last loop iteration needed to report a
+# leak: at least LEAK_MIN_GROWTH_KB and LEAK_MIN_GROWTH_RATIO of the first
+LEAK_MIN_GROWTH_KB = 2048
+LEAK_MIN_GROWTH_RATIO = 0.02
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class MemorySample:
+    """One reading of a process' memory and CPU time."""
+    time: float  # seconds since the sampler started
+    rss_kb: int
+    hwm_kb: int
+    cpu_time: float  # user plus system seconds
+
+
+def read_proc_sample(pid: int) -> Optional[MemorySample]:
+    """Read VmRSS/VmHWM and the CPU time of a process from procfs.
+
+    Returns:
+        MemorySample with time 0, or None if the process is gone
+    """
+    rss_kb = hwm_kb = 0
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii",
+                  errors="replace") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    hwm_kb = int(line.split()[1])
+        with open(f"/proc/{pid}/stat", encoding="ascii",
+                  errors="replace") as f:
+            # The command name may contain spaces; fields follow the ')'
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError, ValueError):
+        return None
+    if not rss_kb:
+        return None  # zombie: the address space is already released
+    cpu_time = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    return MemorySample(0.0, rss_kb, hwm_kb, cpu_time)
+
+
+class MemorySampler:
+    """Collects MemorySamples of one process while it runs.
+
+    Used as the monitor of run_process(): start() is called with the pid
+    right after launch and sample() every `interval` seconds.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: List[MemorySample] = []
+        self._pid = 0
+        self._start = 0.0
+
+    def start(self, pid: int) -> None:
+        """Begin sampling a process."""
+        self._pid = pid
+        self._start = time.monotonic()
+        self.sample()
+
+    def sample(self) -> None:
+        """Take one sample (ignored once the process has exited)."""
+        sample = read_proc_sample(self._pid)
+        if sample is not None:
+            sample.time = time.monotonic() - self._start
+            self.samples.append(sample)
+
+    def series(self, max_points: int = MAX_SERIES_POINTS) -> Dict[str, list]:
+        """Compact time series for export, downsampled to max_points."""
+        samples = self.samples
+        if len(samples) > max_points:
+            step = len(samples) / max_points
+            samples = [samples[int(i * step)] for i in range(max_points)]
+            samples[-1] = self.samples[-1]
+        return {
+            "t": [round(s.time, 3) for s in samples],
+            "rss_kb": [s.rss_kb for s in samples],
+            "cpu_s": [round(s.cpu_time, 2) for s in samples],
+        }
+
+    def peak_kb(self) -> int:
+        """Highest VmHWM seen (VmRSS if the kernel reports no HWM)."""
+        return max((max(s.hwm_kb, s.rss_kb) for s in self.samples),
+                   default=0)
+
+
+def loop_iterations(extra_args: Optional[Sequence[str]]) -> int:
+    """Number of playback loops requested with --loop (1 without it)."""
+    args = list(extra_args or [])
+    if "--loop" in args:
+        index = args.index("--loop")
+        try:
+            return max(1, int(args[index + 1]))
+        except (IndexError, ValueError):
+            return 1
+    return 1
+
+
+def detect_memory_growth(samples: Sequence[MemorySample],
+                         iterations: int) -> Optional[dict]:
+    """Check whether memory grows monotonically across loop iterations.
+
+    The run is split into `iterations` equal time windows (the loops of a
+    --loop run take about the same time) and the peak RSS of each window
+    is compared. Memory that rises from every window to the next by more
+    than the noise threshold is reported as a possible leak.
+
+    Args:
+        samples: Samples of one run, in time order
+        iterations: Number of --loop iterations
+
+    Returns:
+        Dictionary with the peak RSS per iteration and the growth, or None
+        if memory does not grow (or there are too few samples)
+    """
+    if iterations < 2 or len(samples) < 2 * iterations:
+        return None
+    duration = samples[-1].time - samples[0].time
+    if duration <= 0:
+        return None
+
+    peaks = [0] * iterations
+    for sample in samples:
+        window = min(int((sample.time - samples[0].time) / duration
+                         * iterations), iterations - 1)
+        peaks[window] = max(peaks[window], sample.rss_kb)
+    if 0 in peaks:
+        return None
+
+    growth_kb = peaks[-1] - peaks[0]
+    monotonic = all(b > a for a, b in zip(peaks, peaks[1:]))
+    if (not monotonic or growth_kb < LEAK_MIN_GROWTH_KB
+            or growth_kb < peaks[0] * LEAK_MIN_GROWTH_RATIO):
+        return None
+    return {
+        "iteration_peak_kb": peaks,
+        "growth_kb": growth_kb,
+        "growth_per_iteration_kb": growth_kb // (iterations - 1),
+    }
@@ -0,0 +1,140 @@
+"""
+Video Test Benchmark Mode
+The --benchmark mode of the test runner: its options, their validation and
+the driver that benchmarks the encoder and decoder test commands, compares
+them with a baseline file and saves a new one.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+from typing import List
+
+from tests.libs.video_test_benchmark import (
+    DEFAULT_REPEATS,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WARMUP,
+    BenchmarkResult,
+    compare_with_baseline,
+    load_baseline,
+    write_baseline,
+)
+from tests.libs.video_test_result_reporter import print_benchmark_results
+
+
+def add_benchmark_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the --benchmark mode"""
+    group = parser.add_argument_group("benchmark options")
+    group.add_argument(
+        "--benchmark", action="store_true",
+        help="Benchmark the test commands instead of running the tests: "
+             "each test runs warm-up and measured repetitions in a fixed "
+             "order and its median time is reported")
+    group.add_argument(
+        "--benchmark-warmup", type=int, default=DEFAULT_WARMUP, metavar="N",
+        help=f"Unmeasured runs before each benchmark "
+             f"(default: {DEFAULT_WARMUP})")
+    group.add_argument(
+        "--benchmark-repeats", type=int, default=DEFAULT_REPEATS,
+        metavar="N",
+        help=f"Measured runs of each benchmark (default: {DEFAULT_REPEATS})")
+    group.add_argument(
+        "--benchmark-baseline", metavar="FILE",
+        help="Compare benchmarks with this baseline file and fail when one "
+             "is slower than --benchmark-threshold")
+    group.add_argument(
+        "--save-benchmark-baseline", metavar="FILE",
+        help="Write the benchmark results as a baseline file")
+    group.add_argument(
+        "--benchmark-threshold", type=float,
+        default=DEFAULT_THRESHOLD * 100, metavar="PCT",
+        help=f"Slowdown of the median, in percent, that fails the baseline "
+             f"comparison (default: {DEFAULT_THRESHOLD * 100:g})")
+
+
+def validate_benchmark_arguments(args: argparse.Namespace,
+                                 parser: argparse.ArgumentParser) -> None:
+    """Reject invalid or conflicting --benchmark options"""
+    if args.benchmark_repeats < 1:
+        parser.error("--benchmark-repeats must be at least 1")
+    if args.benchmark_warmup < 0:
+        parser.error("--benchmark-warmup must not be negative")
+    if ((args.benchmark_baseline or args.save_benchmark_baseline)
+            and not args.benchmark):
+        parser.error("--benchmark-baseline and --save-benchmark-baseline "
+                     "require --benchmark")
+
+
+def run_benchmarks(framework, test_type_filter=None, *,
+                   warmup: int = DEFAULT_WARMUP,
+                   repeats: int = DEFAULT_REPEATS) -> List[BenchmarkResult]:
+    """Benchmark the encoder and decoder test commands"""
+    encode_tests, decode_tests = framework.create_test_suite(test_type_filter)
+    results = []
+    for sub_framework, configs, test_type, label in (
+            (framework.encode_framework, encode_tests, "encode", "ENCODER"),
+            (framework.decode_framework, decode_tests, "decode", "DECODER")):
+        if not configs:
+            continue
+        print("\n" + "=" * 50)
+        print(f"BENCHMARKING {label} TESTS")
+        print("=" * 50)
+        results.extend(sub_framework.run_benchmark_suite(
+            configs, test_type, warmup=warmup, repeats=repeats))
+    return results
+
+
+def run_benchmark_mode(args: argparse.Namespace, framework) -> bool:
+    """Run benchmarks, compare them with the baseline and save it"""
+    baseline = {}
+    if args.benchmark_baseline:
+        try:
+            baseline = load_baseline(args.benchmark_baseline)
+        except (OSError, ValueError) as e:
+            print(f"✗ Failed to load benchmark baseline: {e}")
+            return False
+
+    results = run_benchmarks(
+        framework,
+        args.test_type_filter,
+        warmup=args.benchmark_warmup,
+        repeats=args.benchmark_repeats,
+    )
+    if not results:
+        print("No benchmarks were run!")
+        return False
+
+    for result in results:
+        if result.key in baseline:
+            result.comparison = compare_with_baseline(
+                result, baseline[result.key],
+                args.benchmark_threshold / 100.0)
+    print_benchmark_results(results)
+
+    if args.save_benchmark_baseline:
+        frameworks = [f for f in (framework.decode_framework,
+                                  framework.encode_framework) if f]
+        write_baseline(args.save_benchmark_baseline, results,
+                       frameworks[0].system_info)
+        print(f"✓ Benchmark baseline saved to "
+              f"{args.save_benchmark_baseline}")
+
+    failed = sum(1 for r in results if r.failed)
+    regressed = sum(1 for r in results if r.regressed)
+    if failed:
+        print(f"✗ {failed} benchmark(s) failed")
+    if regressed:
+        print(f"✗ {regressed} benchmark(s) slower than the baseline")
+    return not failed and not regressed
@@ -0,0 +1,140 @@
+"""
+Video Test RD Mode
+The --rd-benchmark mode of the test runner: its options, their validation
+and the driver that measures the rate-distortion curve of each encode
+sample, compares it with an anchor file and saves a new one.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+from typing import List
+
+from tests.libs.video_test_rd import (
+    DEFAULT_BD_RATE_THRESHOLD,
+    DEFAULT_QPS,
+    RD_MODE_BITRATE,
+    RD_MODE_QP,
+    RDCurve,
+    compare_with_anchor,
+    load_anchor,
+    write_anchor,
+)
+from tests.libs.video_test_result_reporter import print_rd_results
+from tests.libs.video_test_utils import parse_int_list, write_json_atomic
+
+
+def add_rd_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the --rd-benchmark mode"""
+    group = parser.add_argument_group("rate-distortion benchmark options")
+    group.add_argument(
+        "--rd-benchmark", action="store_true",
+        help="Encode each selected sample at several QPs (or bitrates), "
+             "measure bitrate and PSNR of the decoded output and report "
+             "BD-rate and BD-PSNR against --rd-anchor")
+    group.add_argument(
+        "--rd-qps", metavar="QP[,QP...]",
+        default=",".join(str(qp) for qp in DEFAULT_QPS),
+        help="Constant QPs of the RD benchmark (default: "
+             f"{','.join(str(qp) for qp in DEFAULT_QPS)})")
+    group.add_argument(
+        "--rd-bitrates", metavar="KBPS[,KBPS...]",
+        help="Measure the RD curve at these CBR bitrates in kbit/s "
+             "instead of constant QPs")
+    group.add_argument(
+        "--rd-anchor", metavar="FILE",
+        help="Compare RD curves with this anchor file and fail when the "
+             "BD-rate is worse than --rd-threshold")
+    group.add_argument(
+        "--save-rd-anchor", metavar="FILE",
+        help="Write the RD curves as an anchor file")
+    group.add_argument(
+        "--rd-threshold", type=float,
+        default=DEFAULT_BD_RATE_THRESHOLD * 100, metavar="PCT",
+        help=f"BD-rate increase, in percent, that fails the anchor "
+             f"comparison (default: {DEFAULT_BD_RATE_THRESHOLD * 100:g})")
+
+
+def validate_rd_arguments(args: argparse.Namespace,
+                          parser: argparse.ArgumentParser) -> None:
+    """Parse the QP or bitrate list and reject conflicting --rd-benchmark
+    options"""
+    args.rd_mode = RD_MODE_BITRATE if args.rd_bitrates else RD_MODE_QP
+    try:
+        args.rd_values = parse_int_list(args.rd_bitrates or args.rd_qps)
+    except ValueError:
+        parser.error("--rd-qps and --rd-bitrates must be lists of positive "
+                     "integers, e.g. 22,27,32,37")
+    if args.rd_benchmark and args.decoder_only:
+        parser.error("--rd-benchmark cannot be combined with "
+                     "--decoder-only")
+    if (args.rd_anchor or args.save_rd_anchor) and not args.rd_benchmark:
+        parser.error("--rd-anchor and --save-rd-anchor require "
+                     "--rd-benchmark")
+
+
+def run_rd_benchmark(framework, mode: str,
+                     values: List[int]) -> List[RDCurve]:
+    """Measure the rate-distortion curve of each encode sample"""
+    if not framework.encode_framework:
+        print("✗ FATAL: The RD benchmark needs an encoder")
+        return []
+    encode_tests = framework.encode_framework.create_test_suite()
+    print("\n" + "=" * 50)
+    print("ENCODER RATE-DISTORTION BENCHMARK")
+    print("=" * 50)
+    return framework.encode_framework.run_rd_benchmark(
+        encode_tests, mode, values)
+
+
+def run_rd_mode(args: argparse.Namespace, framework) -> bool:
+    """Run the RD benchmark, compare it with the anchor and save it"""
+    anchor = {}
+    if args.rd_anchor:
+        try:
+            anchor = load_anchor(args.rd_anchor, args.rd_mode)
+        except (OSError, ValueError) as e:
+            print(f"✗ Failed to load RD anchor: {e}")
+            return False
+
+    curves = run_rd_benchmark(framework, args.rd_mode, args.rd_values)
+    if not curves:
+        print("No RD benchmarks were run!")
+        return False
+
+    for curve in curves:
+        if curve.name in anchor:
+            curve.comparison = compare_with_anchor(
+                curve, anchor[curve.name], args.rd_threshold / 100.0)
+    print_rd_results(curves)
+
+    info = framework.encode_framework.system_info
+    if args.save_rd_anchor:
+        write_anchor(args.save_rd_anchor, curves, args.rd_mode, info)
+        print(f"✓ RD anchor saved to {args.save_rd_anchor}")
+    if args.export_json:
+        write_json_atomic(args.export_json, {
+            "system_info": info.to_dict(),
+            "rd": [curve.to_dict() for curve in curves],
+        })
+        print(f"✓ RD results exported to {args.export_json}")
+
+    failed = sum(1 for c in curves if c.failed)
+    regressed = sum(1 for c in curves if c.regressed)
+    if failed:
+        print(f"✗ {failed} RD curve(s) failed")
+    if regressed:
+        print(f"✗ {regressed} RD curve(s) worse than the anchor")
+    return not failed and not regressed
@@ -0,0 +1,111 @@
+"""
+Video Test Scaling Mode
+The --scaling-benchmark mode of the test runner: its options, their
+validation and the driver that decodes each sample with increasing
+numbers of concurrent decoder instances and exports the scaling curves.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+from typing import List
+
+from tests.libs.video_test_result_reporter import print_scaling_results
+from tests.libs.video_test_scaling import (
+    DEFAULT_INSTANCES,
+    DEFAULT_QUEUE_MODES,
+    QUEUE_MODES,
+    ScalingPoint,
+)
+from tests.libs.video_test_utils import parse_int_list, write_json_atomic
+
+
+def add_scaling_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the --scaling-benchmark mode"""
+    group = parser.add_argument_group("scaling benchmark options")
+    group.add_argument(
+        "--scaling-benchmark", action="store_true",
+        help="Decode each selected sample with increasing numbers of "
+             "concurrent decoder instances and report aggregate fps, "
+             "per-instance fps and scaling efficiency")
+    group.add_argument(
+        "--scaling-instances", metavar="N[,N...]",
+        default=",".join(str(n) for n in DEFAULT_INSTANCES),
+        help="Instance counts of the scaling benchmark (default: "
+             f"{','.join(str(n) for n in DEFAULT_INSTANCES)})")
+    group.add_argument(
+        "--scaling-queue-modes", metavar="MODE[,MODE...]",
+        default=",".join(DEFAULT_QUEUE_MODES),
+        help=f"Queue selection modes of the scaling benchmark, from "
+             f"{', '.join(QUEUE_MODES)} "
+             f"(default: {','.join(DEFAULT_QUEUE_MODES)})")
+
+
+def validate_scaling_arguments(args: argparse.Namespace,
+                               parser: argparse.ArgumentParser) -> None:
+    """Parse the instance counts and queue modes and reject conflicting
+    --scaling-benchmark options"""
+    try:
+        args.scaling_instances = parse_int_list(args.scaling_instances)
+    except ValueError:
+        parser.error("--scaling-instances must be a list of positive "
+                     "integers, e.g. 1,2,4,8")
+    args.scaling_queue_modes = [
+        mode.strip() for mode in args.scaling_queue_modes.split(",")
+        if mode.strip()]
+    unknown = set(args.scaling_queue_modes) - set(QUEUE_MODES)
+    if unknown or not args.scaling_queue_modes:
+        parser.error(f"--scaling-queue-modes must be from "
+                     f"{', '.join(QUEUE_MODES)}")
+    if args.scaling_benchmark and args.encoder_only:
+        parser.error("--scaling-benchmark runs decoder instances and "
+                     "cannot be combined with --encoder-only")
+
+
+def run_scaling_benchmark(framework, instance_counts: List[int],
+                          queue_modes: List[str]) -> List[ScalingPoint]:
+    """Measure how decode throughput scales with concurrent decoder
+    instances"""
+    if not framework.decode_framework:
+        print("✗ FATAL: The scaling benchmark needs a decoder")
+        return []
+    decode_tests = framework.decode_framework.create_test_suite()
+    print("\n" + "=" * 50)
+    print("DECODER CONCURRENCY SCALING")
+    print("=" * 50)
+    return framework.decode_framework.run_scaling_benchmark(
+        decode_tests, instance_counts, queue_modes)
+
+
+def run_scaling_mode(args: argparse.Namespace, framework) -> bool:
+    """Run the concurrency scaling benchmark and export its curves"""
+    points = run_scaling_benchmark(framework, args.scaling_instances,
+                                   args.scaling_queue_modes)
+    if not points:
+        print("No scaling benchmarks were run!")
+        return False
+    print_scaling_results(points)
+
+    if args.export_json:
+        info = framework.decode_framework.system_info
+        write_json_atomic(args.export_json, {
+            "system_info": {**info.to_dict(),
+                            "decode_queues": info.decode_queues},
+            "scaling": [point.to_dict() for point in points],
+        })
+        print(f"✓ Scaling results exported to {args.export_json}")
+
+    # Failures at high instance counts are results, not errors
+    return any(not point.errors for point in points)
@@ -0,0 +1,113 @@
+"""
+Video Test Sweep Mode
+The --encode-sweep mode of the test runner: its options, their validation
+and the driver that encodes the samples with every combination of an
+encoder option matrix and exports the speed/size/quality Pareto front.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+from typing import List
+
+from tests.libs.video_test_result_reporter import print_sweep_results
+from tests.libs.video_test_sweep import (
+    SPEED_SIZE_AND_QUALITY,
+    SweepPoint,
+    SweepSpec,
+    collect_points,
+    expand_sweep,
+    load_sweep,
+    pareto_front,
+)
+from tests.libs.video_test_utils import write_json_atomic
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the --encode-sweep mode"""
+    group = parser.add_argument_group("encoder sweep options")
+    group.add_argument(
+        "--encode-sweep", metavar="FILE",
+        help="Encode the selected samples with every combination of the "
+             "encoder options in this JSON matrix and report the "
+             "speed/size/quality Pareto front of each sample. Implies "
+             "--encode-quality psnr unless --no-validate-with-decoder "
+             "is given")
+
+
+def validate_sweep_arguments(args: argparse.Namespace,
+                             parser: argparse.ArgumentParser) -> None:
+    """Load the sweep matrix, measure the PSNR of the configurations
+    unless the output is not decoded, and reject conflicting
+    --encode-sweep options"""
+    if args.encode_sweep:
+        try:
+            args.encode_sweep = load_sweep(args.encode_sweep)
+        except (OSError, ValueError) as e:
+            parser.error(f"--encode-sweep: {e}")
+        if args.decoder_only:
+            parser.error("--encode-sweep cannot be combined with "
+                         "--decoder-only")
+        if not args.encode_quality and not args.no_validate_with_decoder:
+            args.encode_quality = "psnr"
+        if args.encode_quality and args.decoder_sample_rate < 1.0:
+            parser.error("--encode-sweep measures the quality of every "
+                         "configuration and cannot be combined with "
+                         "--decoder-sample-rate")
+
+
+def run_encode_sweep(framework, spec: SweepSpec,
+                     quality: bool = False) -> List[SweepPoint]:
+    """Encode the samples with every combination of the sweep options
+    and mark the Pareto front of each sample, with the luma PSNR as an
+    objective if quality is measured"""
+    if not framework.encode_framework:
+        print("✗ FATAL: The encoder sweep needs an encoder")
+        return []
+    configs, origins = expand_sweep(
+        framework.encode_framework.create_test_suite(), spec)
+    if not configs:
+        print("✗ No encode samples match the sweep")
+        return []
+    print("\n" + "=" * 50)
+    print(f"ENCODER SWEEP ({len(spec.combinations())} configurations "
+          f"x {len(configs) // len(spec.combinations())} samples)")
+    print("=" * 50)
+    results = framework.encode_framework.run_test_suite(configs)
+    framework.all_results.extend(results)
+    points = collect_points(results, origins, quality)
+    pareto_front(points, SPEED_SIZE_AND_QUALITY if quality else None)
+    return points
+
+
+def run_sweep_mode(args: argparse.Namespace, framework) -> bool:
+    """Run the encoder sweep and export its points"""
+    points = run_encode_sweep(framework, args.encode_sweep,
+                              bool(args.encode_quality))
+    if not points:
+        print("No sweep configurations were run!")
+        return False
+    print_sweep_results(points)
+
+    if args.export_json:
+        write_json_atomic(args.export_json, {
+            "system_info": framework.encode_framework.system_info.to_dict(),
+            "matrix": args.encode_sweep.matrix,
+            "sweep": [point.to_dict() for point in points],
+        })
+        print(f"✓ Sweep results exported to {args.export_json}")
+
+    # Combinations the encoder rejects are results, not errors
+    return any(point.measured for point in points)
@@ -0,0 +1,132 @@
+"""
+Video Test Tuning Mode
+The --tune-decoder mode of the test runner: its options, their validation
+and the driver that searches the decoder options for the fastest
+configuration and writes it as a tuning profile. Also validates
+--decoder-tuning-profile, which applies a profile to a normal test run.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from tests.libs.video_test_result_reporter import print_tuning_results
+from tests.libs.video_test_tuning import (
+    DEFAULT_PROFILE_DIR,
+    DEFAULT_SPACE,
+    SEARCH_HALVING,
+    SEARCH_METHODS,
+    TuningCandidate,
+    load_profile_args,
+    load_space,
+    profile_path,
+    write_profile,
+)
+
+
+def add_tuning_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the --tune-decoder mode"""
+    group = parser.add_argument_group("decoder tuning options")
+    group.add_argument(
+        "--tune-decoder", action="store_true",
+        help="Search the decoder's pipeline options for the fastest "
+             "configuration over the selected decode samples and write it "
+             "as a tuning profile")
+    group.add_argument(
+        "--tune-search", choices=SEARCH_METHODS, default=SEARCH_HALVING,
+        help=f"Search method of --tune-decoder (default: {SEARCH_HALVING})")
+    group.add_argument(
+        "--tune-space", metavar="FILE",
+        help="JSON file mapping decoder options to candidate values "
+             "(default: built-in pipeline-depth and queue options)")
+    group.add_argument(
+        "--tune-repeats", type=int, default=1, metavar="N",
+        help="Runs per sample of each configuration (first round of the "
+             "halving search; default: 1)")
+    group.add_argument(
+        "--tune-profile", metavar="FILE",
+        help=f"Tuning profile written by --tune-decoder (default: "
+             f"results/{DEFAULT_PROFILE_DIR}/decoder_<driver>_<gpu>.json)")
+    group.add_argument(
+        "--decoder-tuning-profile", metavar="FILE",
+        help="Run decode tests with the best configuration of a tuning "
+             "profile (sample arguments take precedence)")
+
+
+def validate_tuning_arguments(args: argparse.Namespace,
+                              parser: argparse.ArgumentParser) -> None:
+    """Load the tuning profile and search space and reject conflicting
+    --tune-decoder options"""
+    args.tuning_args = None
+    if args.decoder_tuning_profile:
+        try:
+            args.tuning_args = load_profile_args(args.decoder_tuning_profile)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"--decoder-tuning-profile: {e}")
+    if args.tune_space:
+        try:
+            args.tune_space = load_space(args.tune_space)
+        except (OSError, ValueError) as e:
+            parser.error(f"--tune-space: {e}")
+    else:
+        args.tune_space = DEFAULT_SPACE
+    if args.tune_repeats < 1:
+        parser.error("--tune-repeats must be at least 1")
+    if args.tune_decoder and args.encoder_only:
+        parser.error("--tune-decoder cannot be combined with "
+                     "--encoder-only")
+
+
+def run_decoder_tuning(
+    framework,
+    space: dict,
+    search: str,
+    repeats: int,
+) -> Tuple[Optional[TuningCandidate], List[TuningCandidate]]:
+    """Search the decoder options for the fastest configuration"""
+    if not framework.decode_framework:
+        print("✗ FATAL: Decoder tuning needs a decoder")
+        return None, []
+    decode_tests = framework.decode_framework.create_test_suite()
+    print("\n" + "=" * 50)
+    print("DECODER TUNING")
+    print("=" * 50)
+    return framework.decode_framework.run_tuning(
+        decode_tests, space, search, repeats)
+
+
+def run_tuning_mode(args: argparse.Namespace, framework) -> bool:
+    """Run the decoder tuning search and write the profile"""
+    best, candidates = run_decoder_tuning(
+        framework, args.tune_space, args.tune_search, args.tune_repeats)
+    print_tuning_results(best, candidates)
+    if best is None:
+        print("✗ No decoder configuration completed")
+        return False
+
+    decoder = framework.decode_framework
+    path = (Path(args.tune_profile) if args.tune_profile else
+            profile_path(framework.results_dir / DEFAULT_PROFILE_DIR,
+                         decoder.current_driver, decoder.system_info))
+    write_profile(path, best, candidates,
+                  driver=decoder.current_driver,
+                  system_info=decoder.system_info,
+                  samples=[c.display_name
+                           for c in decoder.create_test_suite()],
+                  search=args.tune_search)
+    print(f"✓ Tuning profile written to {path}")
+    return True
@@ -0,0 +1,203 @@
+"""
+Video Test Output Analyzers
+Pluggable analyzers run over the output captured from a test executable.
+
+Each analyzer owns one precompiled pattern (or literal marker) and stops
+at its first hit. Each stream is read once, line by line: every line goes
+to the analyzers that still need an answer, case-insensitive analyzers
+share one lowercased copy of it, and the pass ends once all analyzers are
+done. This replaces the separate full-text regex scans previously done
+for driver detection, system info, validation messages and encoder
+warnings.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from tests.libs.video_test_config_base import TestResult
+from tests.libs.video_test_driver_detect import (
+    SystemInfo,
+    find_device_line,
+    parse_device_line,
+)
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+
+class OutputAnalyzer:
+    """Base class of output analyzers.
+
+    Subclasses implement scan(), which receives the output one line at a
+    time and sets self.done once the analyzer has its answer, and apply(),
+    which stores the findings in a TestResult.
+    """
+    STREAMS: Tuple[str, ...] = (STDOUT, STDERR)
+    # Analyzers with IGNORE_CASE receive the lines lowercased
+    IGNORE_CASE = False
+
+    def __init__(self):
+        self.done = False
+
+    def scan(self, line: str) -> None:
+        """Scan one line of output, without its line ending."""
+        raise NotImplementedError
+
+    def apply(self, result: TestResult) -> None:
+        """Store the findings in the test result."""
+
+
+class PatternAnalyzer(OutputAnalyzer):
+    """Analyzer that is done at the first match of PATTERN."""
+    PATTERN: re.Pattern = re.compile(r'(?!)')
+
+    def __init__(self):
+        super().__init__()
+        self.found = False
+
+    def scan(self, line: str) -> None:
+        if self.PATTERN.search(line):
+            self.found = True
+            self.done = True
+
+
+class DeviceInfoAnalyzer(OutputAnalyzer):
+    """Extracts the driver and system information from the device
+    selection line."""
+
+    def __init__(self):
+        super().__init__()
+        self.driver: Optional[str] = None
+        self.system_info: Optional[SystemInfo] = None
+
+    def scan(self, line: str) -> None:
+        if find_device_line(line) is not None:
+            self.driver, self.system_info = parse_device_line(line)
+            self.done = True
+
+
+class ValidationMessageAnalyzer(PatternAnalyzer):
+    """Detects messages of the Vulkan validation layers."""
+    PATTERN = re.compile(r'VUID-|Validation (?:Error|Warning)')
+
+    def apply(self, result: TestResult) -> None:
+        result.meta["validation_messages"] = self.found
+
+
+class WarningAnalyzer(PatternAnalyzer):
+    """Detects general warnings in the encoder's standard error."""
+    PATTERN = re.compile(r'warn(?:ing)?\s*:|caution\s*:|deprecated'
+                         r'|not\s+supported|disabling|fallback')
+    STREAMS = (STDERR,)
+    IGNORE_CASE = True
+
+    def apply(self, result: TestResult) -> None:
+        result.warning_found = self.found
+
+
+class FrameProgressAnalyzer(OutputAnalyzer):
+    """Collects the decoder's frame progress lines, per-frame CRC lines
+    and the decoded resolution (see video_test_throughput)."""
+    STREAMS = (STDOUT,)
+    PROGRESS_PATTERN = re.compile(
+        r'\s*Frame (\d+), FPS: ([-+0-9.eE]+|inf|nan)')
+    CRC_PATTERN = re.compile(r'CRC Frame\[')
+    DISPLAY_AREA_PATTERN = re.compile(
+        r'Display area\s*:\s*\[(\d+), (\d+), (\d+), (\d+)\]')
+    CODED_SIZE_PATTERN = re.compile(r'Coded size\s*:\s*\[(\d+), (\d+)\]')
+
+    def __init__(self):
+        super().__init__()
+        self.progress: List[Tuple[int, float]] = []
+        self.crc_frames = 0
+        self.resolution: Optional[Tuple[int, int]] = None
+        self._display_area = False
+
+    def scan(self, line: str) -> None:
+        # Never done: every progress and CRC line is needed
+        progress = self.PROGRESS_PATTERN.match(line)
+        if progress:
+            self.progress.append((int(progress[1]), float(progress[2])))
+        elif self.CRC_PATTERN.match(line):
+            self.crc_frames += 1
+        elif not self._display_area:
+            self._scan_resolution(line)
+
+    def _scan_resolution(self, line: str) -> None:
+        """Take the resolution from the display area, or from the coded
+        size until a display area is printed."""
+        area = self.DISPLAY_AREA_PATTERN.search(line)
+        if area:
+            left, top, right, bottom = map(int, area.groups())
+            self.resolution = (right - left, bottom - top)
+            self._display_area = True
+            return
+        coded = self.CODED_SIZE_PATTERN.search(line)
+        if coded and self.resolution is None:
+            self.resolution = (int(coded[1]), int(coded[2]))
+
+
+class EncodedFramesAnalyzer(OutputAnalyzer):
+    """Reads the number of frames the encoder processed from its
+    "Total number of frames processed by <stage>: N" lines."""
+    STREAMS = (STDOUT,)
+    PATTERN = re.compile(r'Total number of frames processed by '
+                         r'AssembleBitstreamData: (\d+)')
+
+    def __init__(self):
+        super().__init__()
+        self.frames = 0
+
+    def scan(self, line: str) -> None:
+        # Every stage prints its count for each batch of frames; the
+        # batches of the last stage add up to the frames written
+        match = self.PATTERN.search(line)
+        if match:
+            self.frames += int(match[1])
+
+
+def scan_output(text: str, analyzers: Sequence[OutputAnalyzer]) -> None:
+    """Feed one stream, line by line, to the analyzers that still need an
+    answer, stopping once all of them are done.
+
+    Args:
+        text: Captured output of one stream
+        analyzers: Analyzers interested in this stream
+    """
+    active = [analyzer for analyzer in analyzers if not analyzer.done]
+    if not text or not active:
+        return
+    for line in text.splitlines():
+        lowered = None
+        for analyzer in active:
+            if analyzer.IGNORE_CASE:
+                if lowered is None:
+                    lowered = line.lower()
+                analyzer.scan(lowered)
+            else:
+                analyzer.scan(line)
+        if any(analyzer.done for analyzer in active):
+            active = [analyzer for analyzer in active if not analyzer.done]
+            if not active:
+                return
+
+
+def analyze_output(stdout: str, stderr: str,
+                   analyzers: List[OutputAnalyzer]) -> None:
+    """Run the analyzers over the captured stdout and stderr."""
+    for stream, text in ((STDOUT, stdout), (STDERR, stderr)):
+        scan_output(text, [a for a in analyzers if stream in a.STREAMS])
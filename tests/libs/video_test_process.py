@@ -0,0 +1,295 @@
+"""
+Video Test Process Execution
+Runs a test executable, captures its output and reaps it with os.wait4()
+so the resource usage of the child (CPU time, peak RSS and context
+switches) is available per test, not only summed over all children.
+
+Each test runs in its own session and process group. On timeout the whole
+group receives SIGTERM and, if it does not exit, SIGKILL; helpers left
+running by a test that exited are terminated the same way. A watchdog then
+waits until no process of the group is left, so a decoder stuck in the
+driver cannot hold the GPU while the next test runs.
+
+On platforms without os.wait4() (Windows) the process is run with
+subprocess.run() and no resource usage is reported.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+HAS_WAIT4 = hasattr(os, "wait4")
+
+# Seconds a process group gets to exit after SIGTERM before SIGKILL
+TERMINATE_GRACE = 2.0
+# Seconds the watchdog waits for the group to disappear after SIGKILL
+WATCHDOG_TIMEOUT = 30.0
+# Seconds to wait for the output pipes after a kill
+PIPE_DRAIN_TIMEOUT = 5.0
+
+
+@dataclass
+class ProcessUsage:
+    """Resource usage of one reaped child process."""
+    user_time: float = 0.0  # seconds
+    system_time: float = 0.0  # seconds
+    max_rss_kb: int = 0
+    voluntary_ctx_switches: int = 0
+    involuntary_ctx_switches: int = 0
+
+    @property
+    def cpu_time(self) -> float:
+        """User plus system CPU time in seconds."""
+        return self.user_time + self.system_time
+
+    @classmethod
+    def from_rusage(cls, rusage) -> "ProcessUsage":
+        """Build from a resource.struct_rusage."""
+        max_rss = rusage.ru_maxrss
+        if sys.platform == "darwin":
+            max_rss //= 1024  # bytes on macOS, kilobytes elsewhere
+        return cls(
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss_kb=max_rss,
+            voluntary_ctx_switches=rusage.ru_nvcsw,
+            involuntary_ctx_switches=rusage.ru_nivcsw,
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        data = asdict(self)
+        data["user_time"] = round(self.user_time, 4)
+        data["system_time"] = round(self.system_time, 4)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProcessUsage":
+        """Deserialize from to_dict() output."""
+        names = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+@dataclass
+class ProcessKill:
+    """Record of a process group the harness had to terminate."""
+    reason: str  # "timeout", or "orphans" for helpers left by the test
+    signals: List[str] = field(default_factory=list)
+    # Whether the watchdog saw every process of the group exit
+    group_cleared: bool = True
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        return asdict(self)
+
+
+class ProcessTimeout(subprocess.TimeoutExpired):
+    """TimeoutExpired carrying the record of the process group kill."""
+
+    def __init__(self, cmd, timeout, output, stderr, kill: ProcessKill):
+        super().__init__(cmd, timeout, output, stderr)
+        self.kill = kill
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of run_process()."""
+    returncode: int
+    stdout: str
+    stderr: str
+    usage: Optional[ProcessUsage] = None
+    kill: Optional[ProcessKill] = None
+
+
+def _read_stream(stream, chunks: List[str]) -> None:
+    """Read a pipe to EOF (run in a thread)."""
+    with stream:
+        chunks.append(stream.read())
+
+
+def _group_alive(pgid: int) -> bool:
+    """Whether any process of the process group is still running.
+
+    Zombies (exited, waiting for their parent or init to reap them) do not
+    count; they hold no GPU resources.
+    """
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    if not os.path.isdir("/proc/self"):
+        return True
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", encoding="ascii",
+                      errors="replace") as f:
+                # Fields after the command name: state, ppid, pgrp, ...
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            return True
+    return False
+
+
+def _wait_group_gone(pgid: int, waiter: threading.Thread,
+                     timeout: float) -> bool:
+    """Wait until the leader is reaped and the group is empty."""
+    deadline = time.monotonic() + timeout
+    while True:
+        waiter.join(max(0.0, min(0.05, deadline - time.monotonic())))
+        if not waiter.is_alive() and not _group_alive(pgid):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+
+
+def terminate_group(pgid: int, waiter: threading.Thread,
+                    reason: str) -> ProcessKill:
+    """Terminate a process group: SIGTERM, then SIGKILL if it survives
+    TERMINATE_GRACE, then watch it for up to WATCHDOG_TIMEOUT.
+
+    Args:
+        pgid: Process group ID (the pid of the test executable)
+        waiter: Thread reaping the group leader
+        reason: Why the group is terminated, recorded in the result
+    """
+    kill = ProcessKill(reason=reason)
+    for sig, grace in ((signal.SIGTERM, TERMINATE_GRACE),
+                       (signal.SIGKILL, WATCHDOG_TIMEOUT)):
+        try:
+            os.killpg(pgid, sig)
+        except ProcessLookupError:
+            break
+        kill.signals.append(signal.Signals(sig).name)
+        if _wait_group_gone(pgid, waiter, grace):
+            break
+    kill.group_cleared = _wait_group_gone(pgid, waiter, 0)
+    return kill
+
+
+def _wait_for(waiter: threading.Thread, timeout: Optional[float],
+              monitor, pid: int) -> None:
+    """Wait for the waiter thread, polling the monitor meanwhile."""
+    if monitor is None:
+        waiter.join(timeout)
+        return
+    deadline = None if timeout is None else time.monotonic() + timeout
+    monitor.start(pid)
+    while waiter.is_alive():
+        wait = monitor.interval
+        if deadline is not None:
+            wait = min(wait, deadline - time.monotonic())
+            if wait <= 0:
+                return
+        waiter.join(wait)
+        if waiter.is_alive():
+            monitor.sample()
+
+
+def run_process(cmd: List[str], timeout: Optional[float] = None,
+                monitor=None, **popen_kwargs) -> ProcessResult:
+    """Run a command to completion, capturing its text output.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process is killed
+        monitor: Optional sampler polled while the process runs; it needs
+                 an `interval` attribute (seconds) and start(pid) and
+                 sample() methods (see MemorySampler)
+        **popen_kwargs: Extra subprocess.Popen arguments (cwd, env, ...)
+
+    Returns:
+        ProcessResult with the resource usage of the child when available
+
+    Raises:
+        subprocess.TimeoutExpired: The process was killed after timeout
+        OSError: The process could not be started
+    """
+    if not HAS_WAIT4:
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                timeout=timeout, check=False, **popen_kwargs)
+        return ProcessResult(result.returncode, result.stdout, result.stderr)
+
+    # A new session makes the test the leader of its own process group
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, text=True,
+                          errors="replace", start_new_session=True,
+                          **popen_kwargs) as proc:
+        return _collect(proc, cmd, timeout, monitor)
+
+
+def _start_readers(proc: subprocess.Popen, stdout: List[str],
+                   stderr: List[str]) -> List[threading.Thread]:
+    """Start threads appending the process output to the lists."""
+    readers = [threading.Thread(target=_read_stream, args=args, daemon=True)
+               for args in ((proc.stdout, stdout), (proc.stderr, stderr))]
+    for reader in readers:
+        reader.start()
+    return readers
+
+
+def _collect(proc: subprocess.Popen, cmd: List[str],
+             timeout: Optional[float], monitor) -> ProcessResult:
+    """Read the output of a started process, reap it with its resource
+    usage and terminate its group on timeout or when helpers outlive it.
+    """
+    stdout: List[str] = []
+    stderr: List[str] = []
+    readers = _start_readers(proc, stdout, stderr)
+
+    # The child is reaped here rather than by Popen so its rusage is kept
+    reaped = {}
+    waiter = threading.Thread(
+        target=lambda: reaped.update(zip(
+            ("pid", "status", "rusage"), os.wait4(proc.pid, 0))),
+        daemon=True)
+    waiter.start()
+    _wait_for(waiter, timeout, monitor, proc.pid)
+    timed_out = waiter.is_alive()
+    kill = None
+    if timed_out:
+        # Popen.kill() would poll and race with the waiter thread
+        kill = terminate_group(proc.pid, waiter, "timeout")
+    elif _group_alive(proc.pid):
+        kill = terminate_group(proc.pid, waiter, "orphans")
+    for reader, stream in zip(readers, ("stdout", "stderr")):
+        reader.join(PIPE_DRAIN_TIMEOUT if kill else None)
+        if reader.is_alive():
+            # Closing a pipe that a reader is blocked on blocks as well;
+            # leave it to the daemon thread instead of Popen's exit
+            setattr(proc, stream, None)
+
+    # A process stuck in the kernel may survive SIGKILL and stay unreaped
+    proc.returncode = (os.waitstatus_to_exitcode(reaped["status"])
+                       if "status" in reaped else -signal.SIGKILL)
+    output, errors = "".join(stdout), "".join(stderr)
+    if timed_out:
+        raise ProcessTimeout(cmd, timeout, output, errors, kill)
+    return ProcessResult(proc.returncode, output, errors,
+                         ProcessUsage.from_rusage(reaped["rusage"])
+                         if "rusage" in reaped else None, kill)
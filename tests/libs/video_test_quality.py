@@ -0,0 +1,329 @@
+"""
+Video Test Quality Metrics
+Computes the PSNR, and optionally the SSIM, of a decoded stream against
+its source. Frames are read through memory-mapped FrameReaders
+(video_test_frames).
+
+PSNR is computed per frame and plane, capped at MAX_PSNR for identical
+planes, and averaged over the frames. The combined YUV value weights the
+planes 6:1:1 as in the JVET common test conditions. SSIM is computed on
+the luma plane over 8x8 windows (Wang et al., uniform weighting) and
+averaged over the windows of each frame.
+
+With NumPy installed, frames are compared in batches of plane views into
+the maps, the working arrays of a batch taking at most QUALITY_BATCH_BYTES,
+so memory use does not grow with the length of the stream. Without NumPy,
+PSNR is computed in plain Python and SSIM is not available.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+import math
+import sys
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from tests.libs.video_test_frames import FrameLayout, FrameReader
+
+HAS_NUMPY = np is not None
+
+MAX_PSNR = 100.0
+# Working memory of one batch of frames on the NumPy path
+QUALITY_BATCH_BYTES = 64 * 1024 * 1024
+SSIM_WINDOW = 8
+
+
+def _samples(data: bytes, bytes_per_sample: int) -> Sequence[int]:
+    """Sample values of a plane."""
+    if bytes_per_sample == 1:
+        return data
+    samples = array("H")
+    samples.frombytes(data)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def _sse(reference: Sequence[int], distorted: Sequence[int]) -> int:
+    """Sum of squared differences of two sample sequences."""
+    return sum((a - b) ** 2 for a, b in zip(reference, distorted))
+
+
+def plane_sse(reference: bytes, distorted: bytes,
+              bytes_per_sample: int = 1) -> int:
+    """Sum of squared differences of two planes."""
+    return _sse(_samples(reference, bytes_per_sample),
+                _samples(distorted, bytes_per_sample))
+
+
+def psnr_from_sse(sse: float, samples: int, peak: int) -> float:
+    """PSNR in dB of a squared error over a number of samples."""
+    if sse <= 0:
+        return MAX_PSNR
+    return min(MAX_PSNR, 10 * math.log10(peak * peak * samples / sse))
+
+
+@dataclass
+class PsnrResult:
+    """Average PSNR of the frames of a decoded stream."""
+    frames: int
+    y: float
+    u: float
+    v: float
+
+    @property
+    def yuv(self) -> float:
+        """Combined PSNR, planes weighted 6:1:1."""
+        return (6 * self.y + self.u + self.v) / 8
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        return {"frames": self.frames, "y": round(self.y, 4),
+                "u": round(self.u, 4), "v": round(self.v, 4),
+                "yuv": round(self.yuv, 4)}
+
+
+@dataclass
+class QualityResult:
+    """Per-frame quality of a decoded stream."""
+    # (Y, U, V) PSNR of each frame
+    psnr_frames: List[Tuple[float, float, float]] = field(
+        default_factory=list)
+    # Luma SSIM of each frame, if computed
+    ssim_frames: Optional[List[float]] = None
+
+    @property
+    def frames(self) -> int:
+        """Number of compared frames."""
+        return len(self.psnr_frames)
+
+    @property
+    def psnr(self) -> PsnrResult:
+        """PSNR of each plane averaged over the frames."""
+        return PsnrResult(self.frames, *(
+            sum(plane) / self.frames for plane in zip(*self.psnr_frames)))
+
+    @property
+    def min_psnr_y(self) -> float:
+        """Luma PSNR of the worst frame."""
+        return min(y for y, _, _ in self.psnr_frames)
+
+    @property
+    def ssim(self) -> Optional[float]:
+        """Luma SSIM averaged over the frames."""
+        if not self.ssim_frames:
+            return None
+        return sum(self.ssim_frames) / len(self.ssim_frames)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export, with the per-frame values."""
+        data = {
+            "frames": self.frames,
+            "psnr": {**self.psnr.to_dict(),
+                     "min_y": round(self.min_psnr_y, 4)},
+            "per_frame_psnr": [[round(v, 3) for v in frame]
+                               for frame in self.psnr_frames],
+        }
+        if self.ssim_frames:
+            data["ssim"] = {"mean": round(self.ssim, 5),
+                            "min": round(min(self.ssim_frames), 5)}
+            data["per_frame_ssim"] = [round(v, 5) for v in self.ssim_frames]
+        return data
+
+
+def check_quality(quality: QualityResult, min_psnr: Optional[float],
+                  min_ssim: Optional[float]) -> str:
+    """Check the average luma PSNR and SSIM against minimum values.
+
+    Returns:
+        Description of the first value below its minimum, or ""
+    """
+    if min_psnr is not None and quality.psnr.y < min_psnr:
+        return (f"Y-PSNR {quality.psnr.y:.2f} dB below minimum "
+                f"{min_psnr:g} dB")
+    if min_ssim is not None:
+        if quality.ssim is None:
+            return "SSIM not computed"
+        if quality.ssim < min_ssim:
+            return f"SSIM {quality.ssim:.4f} below minimum {min_ssim:g}"
+    return ""
+
+
+def _frame_planes(frame: memoryview, layout: FrameLayout) -> list:
+    """Y, U and V sample sequences of one frame in plain Python."""
+    samples = _samples(frame, layout.bytes_per_sample)
+    luma = layout.width * layout.height
+    c_width, c_height = layout.chroma_dimensions
+    chroma = c_width * c_height
+    if layout.num_planes == 2:
+        uv = samples[luma:luma + 2 * chroma]
+        planes = [samples[:luma], uv[0::2], uv[1::2]]
+    else:
+        planes = [samples[:luma], samples[luma:luma + chroma],
+                  samples[luma + chroma:luma + 2 * chroma]]
+    if layout.sample_shift:
+        planes = [[v >> layout.sample_shift for v in p] for p in planes]
+    return planes
+
+
+def _frame_psnr(ref_frame: memoryview, dist_frame: memoryview,
+                ref_layout: FrameLayout, dist_layout: FrameLayout
+                ) -> Tuple[float, float, float]:
+    """(Y, U, V) PSNR of one frame in plain Python."""
+    return tuple(
+        psnr_from_sse(_sse(ref, dist), width * height, ref_layout.peak)
+        for ref, dist, (width, height) in zip(
+            _frame_planes(ref_frame, ref_layout),
+            _frame_planes(dist_frame, dist_layout),
+            ref_layout.plane_dimensions))
+
+
+def _aligned(planes: tuple, layout: FrameLayout) -> tuple:
+    """Planes with the file's sample shift undone."""
+    if not layout.sample_shift:
+        return planes
+    return tuple(p >> layout.sample_shift for p in planes)
+
+
+def _window_sums(values):
+    """Sums over all SSIM windows of (n, height, width) arrays."""
+    k = SSIM_WINDOW
+    sums = np.zeros((values.shape[0], values.shape[1] + 1,
+                     values.shape[2] + 1))
+    sums[:, 1:, 1:] = values.cumsum(axis=1).cumsum(axis=2)
+    return (sums[:, k:, k:] - sums[:, :-k, k:]
+            - sums[:, k:, :-k] + sums[:, :-k, :-k])
+
+
+def _batch_ssim(ref, dist, peak: int):
+    """Mean SSIM of each frame of (n, height, width) luma arrays."""
+    if min(ref.shape[1:]) < SSIM_WINDOW:
+        raise ValueError("frame smaller than the SSIM window")
+    x = ref.astype(np.float64)
+    y = dist.astype(np.float64)
+    area = SSIM_WINDOW * SSIM_WINDOW
+    mu_x = _window_sums(x) / area
+    mu_y = _window_sums(y) / area
+    var_x = _window_sums(x * x) / area - mu_x * mu_x
+    var_y = _window_sums(y * y) / area - mu_y * mu_y
+    cov = _window_sums(x * y) / area - mu_x * mu_y
+    c1 = (0.01 * peak) ** 2
+    c2 = (0.03 * peak) ** 2
+    ssim_map = (((2 * mu_x * mu_y + c1) * (2 * cov + c2))
+                / ((mu_x * mu_x + mu_y * mu_y + c1) * (var_x + var_y + c2)))
+    return ssim_map.mean(axis=(1, 2))
+
+
+def _batch_quality(ref_planes: tuple, dist_planes: tuple,
+                   layout: FrameLayout, ssim: bool, result: QualityResult
+                   ) -> None:
+    """Add the quality of a batch of frames to a result (NumPy)."""
+    per_plane = []
+    for ref, dist, (width, height) in zip(ref_planes, dist_planes,
+                                          layout.plane_dimensions):
+        diff = ref.astype(np.int64) - dist
+        sse = np.einsum("nij,nij->n", diff, diff)
+        per_plane.append([psnr_from_sse(float(v), width * height,
+                                        layout.peak) for v in sse])
+    result.psnr_frames.extend(zip(*per_plane))
+    if ssim:
+        result.ssim_frames.extend(
+            float(v) for v in _batch_ssim(ref_planes[0], dist_planes[0],
+                                          layout.peak))
+
+
+def _reader_quality(ref_reader: FrameReader, dist_reader: FrameReader,
+                    frames: int, ssim: bool, result: QualityResult) -> None:
+    """Add the quality of the first frames of two readers to a result, in
+    batches that bound the NumPy working memory."""
+    ref_layout = ref_reader.layout
+    # The int64 difference of each plane and, for SSIM, the float64
+    # window sums of the luma plane
+    samples = ref_layout.frame_size // ref_layout.bytes_per_sample
+    width, height = ref_layout.plane_dimensions[0]
+    frame_bytes = 8 * samples + (64 * width * height if ssim else 0)
+    batch = max(1, QUALITY_BATCH_BYTES // frame_bytes)
+    for start in range(0, frames, batch):
+        count = min(batch, frames - start)
+        _batch_quality(
+            _aligned(ref_reader.batch_planes(start, count), ref_layout),
+            _aligned(dist_reader.batch_planes(start, count),
+                     dist_reader.layout),
+            ref_layout, ssim, result)
+
+
+def compute_quality(reference: Path, distorted: Path, layout: FrameLayout,
+                    *, distorted_layout: Optional[FrameLayout] = None,
+                    ssim: bool = False) -> Optional[QualityResult]:
+    """Per-frame quality of a decoded stream against its source, over the
+    frames both files have.
+
+    Args:
+        reference: Source file, raw YUV in `layout` or Y4M
+        distorted: Decoded file, raw YUV or Y4M
+        layout: Layout of a raw source
+        distorted_layout: Layout of a raw decoded file (default: the
+            source layout as 3 planes with LSB-aligned samples, which is
+            what the decoder writes)
+        ssim: Also compute the luma SSIM
+
+    Raises:
+        ValueError: SSIM was requested without NumPy, or the frames are
+        smaller than the SSIM window
+
+    Returns:
+        QualityResult, or None if either file has no complete frame
+    """
+    if ssim and not HAS_NUMPY:
+        raise ValueError("SSIM needs NumPy")
+    if distorted_layout is None:
+        distorted_layout = dataclasses.replace(layout, num_planes=3,
+                                               sample_shift=0)
+    result = QualityResult(ssim_frames=[] if ssim else None)
+    with FrameReader(reference, layout) as ref_reader, \
+            FrameReader(distorted, distorted_layout) as dist_reader:
+        ref_layout = ref_reader.layout
+        frames = min(len(ref_reader), len(dist_reader))
+        if not HAS_NUMPY:
+            for index in range(frames):
+                result.psnr_frames.append(_frame_psnr(
+                    ref_reader.frame_bytes(index),
+                    dist_reader.frame_bytes(index),
+                    ref_layout, dist_reader.layout))
+            return result if result.frames else None
+        _reader_quality(ref_reader, dist_reader, frames, ssim, result)
+    return result if result.frames else None
+
+
+def compute_psnr(reference: Path, distorted: Path, layout: FrameLayout, *,
+                 distorted_layout: Optional[FrameLayout] = None
+                 ) -> Optional[PsnrResult]:
+    """PSNR of a decoded stream against its source, over the frames both
+    files have.
+
+    Returns:
+        PsnrResult, or None if either file has no complete frame
+    """
+    quality = compute_quality(reference, distorted, layout,
+                              distorted_layout=distorted_layout)
+    return quality.psnr if quality else None
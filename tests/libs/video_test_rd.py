@@ -0,0 +1,239 @@
+"""
+Video Test Rate-Distortion Benchmark
+Encodes each source at several QPs or target bitrates, decodes the output
+with the validation decoder and measures bitrate and PSNR against the
+source. The resulting rate-distortion curve is compared with a stored
+anchor curve using the Bjontegaard metrics (VCEG-M33):
+
+- BD-rate: average bitrate difference at equal PSNR, in percent. Positive
+  values mean the encoder needs more bits than the anchor.
+- BD-PSNR: average PSNR difference at equal bitrate, in dB.
+
+Both fit a cubic polynomial through the points of each curve (log
+bitrate against luma PSNR) and integrate the difference over the range
+the curves share, so at least four points are needed.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tests.libs.video_test_benchmark import outcome_to_dict
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_quality import PsnrResult
+from tests.libs.video_test_utils import write_json_atomic
+
+ANCHOR_VERSION = 1
+
+RD_MODE_QP = "qp"
+RD_MODE_BITRATE = "bitrate"
+
+DEFAULT_QPS = (22, 27, 32, 37)
+MIN_BD_POINTS = 4
+# An RD curve fails the anchor gate when its BD-rate is more than this
+# fraction above the anchor
+DEFAULT_BD_RATE_THRESHOLD = 0.05
+
+
+def rd_point_args(mode: str, value: int) -> List[str]:
+    """Encoder arguments of one RD point: a constant QP for all frame types
+    with rate control disabled, or a CBR target in kbit/s."""
+    if mode == RD_MODE_QP:
+        return ["--rateControlMode", "disabled", "--qpI", str(value),
+                "--qpP", str(value), "--qpB", str(value)]
+    return ["--rateControlMode", "cbr",
+            "--averageBitrate", str(value * 1000)]
+
+
+@dataclass
+class RDPoint:
+    """Bitrate and PSNR of one encode."""
+    value: int  # QP or target kbit/s
+    output_bytes: int = 0
+    bitrate_kbps: float = 0.0
+    psnr: Optional[PsnrResult] = None
+    error: str = ""
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export and anchor files."""
+        data: Dict[str, object] = {"value": self.value}
+        if self.psnr:
+            data.update({"output_bytes": self.output_bytes,
+                         "bitrate_kbps": round(self.bitrate_kbps, 3),
+                         "psnr": self.psnr.to_dict()})
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+@dataclass
+class RDCurve:
+    """RD points of one encode sample."""
+    name: str
+    codec: str
+    mode: str
+    points: List[RDPoint] = field(default_factory=list)
+    error: str = ""
+    # The encoder reported NOT_SUPPORTED; not counted as a failure
+    not_supported: bool = False
+    comparison: Optional[dict] = None
+
+    @property
+    def rd_data(self) -> List[Tuple[float, float]]:
+        """(bitrate in kbit/s, luma PSNR) of the measured points."""
+        return [(p.bitrate_kbps, p.psnr.y) for p in self.points
+                if p.psnr and p.bitrate_kbps > 0]
+
+    @property
+    def failed(self) -> bool:
+        """Whether the curve could not be measured."""
+        return bool(self.error) and not self.not_supported
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the anchor comparison failed."""
+        return bool(self.comparison and self.comparison["regressed"])
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export and anchor files."""
+        data = {
+            "name": self.name,
+            "codec": self.codec,
+            "mode": self.mode,
+            "points": [p.to_dict() for p in self.points],
+        }
+        data.update(outcome_to_dict(self, "anchor"))
+        return data
+
+
+def _polyfit3(xs: Sequence[float], ys: Sequence[float]) -> List[float]:
+    """Least-squares cubic through the points; coefficients lowest order
+    first. Solves the normal equations by Gaussian elimination."""
+    size = 4
+    matrix = [[sum(x ** (i + j) for x in xs) for j in range(size)]
+              + [sum(y * x ** i for x, y in zip(xs, ys))]
+              for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size),
+                    key=lambda r, c=col: abs(matrix[r][c]))
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        if matrix[col][col] == 0:
+            raise ValueError("degenerate RD curve")
+        for row in range(size):
+            if row != col:
+                factor = matrix[row][col] / matrix[col][col]
+                matrix[row] = [a - factor * b
+                               for a, b in zip(matrix[row], matrix[col])]
+    return [matrix[i][size] / matrix[i][i] for i in range(size)]
+
+
+def _integral(coeffs: List[float], low: float, high: float) -> float:
+    """Integral of a polynomial between two bounds."""
+    return sum(c * (high ** (i + 1) - low ** (i + 1)) / (i + 1)
+               for i, c in enumerate(coeffs))
+
+
+def _bd_average(anchor: List[Tuple[float, float]],
+                test: List[Tuple[float, float]]) -> Optional[float]:
+    """Average difference test - anchor of y(x) over the shared x range,
+    with x and y given as point pairs."""
+    if min(len(anchor), len(test)) < MIN_BD_POINTS:
+        return None
+    low = max(min(x for x, _ in anchor), min(x for x, _ in test))
+    high = min(max(x for x, _ in anchor), max(x for x, _ in test))
+    if high <= low:
+        return None
+    # Centre x so the normal equations stay well conditioned
+    centre = (low + high) / 2
+    areas = []
+    for curve in (anchor, test):
+        try:
+            coeffs = _polyfit3([x - centre for x, _ in curve],
+                               [y for _, y in curve])
+        except ValueError:
+            return None
+        areas.append(_integral(coeffs, low - centre, high - centre))
+    return (areas[1] - areas[0]) / (high - low)
+
+
+def bd_rate(anchor: List[Tuple[float, float]],
+            test: List[Tuple[float, float]]) -> Optional[float]:
+    """BD-rate in percent of (bitrate, PSNR) points against the anchor."""
+    average = _bd_average([(psnr, math.log(rate)) for rate, psnr in anchor],
+                          [(psnr, math.log(rate)) for rate, psnr in test])
+    return None if average is None else (math.exp(average) - 1) * 100
+
+
+def bd_psnr(anchor: List[Tuple[float, float]],
+            test: List[Tuple[float, float]]) -> Optional[float]:
+    """BD-PSNR in dB of (bitrate, PSNR) points against the anchor."""
+    return _bd_average([(math.log(rate), psnr) for rate, psnr in anchor],
+                       [(math.log(rate), psnr) for rate, psnr in test])
+
+
+def compare_with_anchor(curve: RDCurve, anchor: dict,
+                        threshold: float = DEFAULT_BD_RATE_THRESHOLD
+                        ) -> Optional[dict]:
+    """Compare an RD curve with its anchor entry.
+
+    Returns:
+        Comparison dictionary, or None if the curves do not overlap or
+        either has fewer than MIN_BD_POINTS points
+    """
+    anchor_data = [(p["bitrate_kbps"], p["psnr"]["y"])
+                   for p in anchor.get("points", [])
+                   if p.get("psnr") and p.get("bitrate_kbps", 0) > 0]
+    rate = bd_rate(anchor_data, curve.rd_data)
+    psnr = bd_psnr(anchor_data, curve.rd_data)
+    if rate is None or psnr is None:
+        return None
+    return {
+        "bd_rate_pct": round(rate, 3),
+        "bd_psnr_db": round(psnr, 4),
+        "threshold": threshold,
+        "regressed": rate > threshold * 100,
+    }
+
+
+def load_anchor(path: str, mode: str) -> Dict[str, dict]:
+    """Load the curves of an anchor file, keyed by RDCurve.name.
+
+    Raises:
+        OSError, ValueError: The file cannot be read, is not an anchor or
+        was measured in another mode
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != ANCHOR_VERSION:
+        raise ValueError(f"unsupported RD anchor version in {path}")
+    if data.get("mode") != mode:
+        raise ValueError(f"{path} holds {data.get('mode')} curves, "
+                         f"not {mode} curves")
+    return data.get("curves", {})
+
+
+def write_anchor(path: str, curves: List[RDCurve], mode: str,
+                 system_info: SystemInfo) -> None:
+    """Write RD curves as an anchor file (atomic replace)."""
+    data = {
+        "version": ANCHOR_VERSION,
+        "mode": mode,
+        "system_info": system_info.to_dict(),
+        "curves": {c.name: c.to_dict() for c in curves if c.rd_data},
+    }
+    write_json_atomic(path, data)
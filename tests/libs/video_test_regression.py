@@ -0,0 +1,125 @@
+"""
+Video Test Performance Regression Detection
+Compares test durations with their recent run history using robust
+statistics (median and median absolute deviation).
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import statistics
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from tests.libs.video_test_run_history import RunHistory
+
+# Number of previous successful runs used as the baseline
+HISTORY_WINDOW = 20
+# Minimum number of previous runs before a test can be judged
+MIN_HISTORY_SAMPLES = 5
+# Scale factor making the MAD a consistent estimator of the std deviation
+MAD_SCALE = 1.4826
+# A regression must exceed all three thresholds
+DEFAULT_Z_THRESHOLD = 4.0      # robust z-score
+DEFAULT_MIN_RATIO = 1.25       # at least 25% slower than the median
+DEFAULT_MIN_DELTA_MS = 100.0   # and at least 100 ms slower (noise floor)
+
+
+@dataclass
+class DurationCheck:  # pylint: disable=too-many-instance-attributes
+    """Outcome of comparing a duration with its history."""
+    current_ms: float
+    baseline_ms: float
+    mad_ms: float
+    robust_z: float
+    ratio: float
+    samples: int
+    regressed: bool
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable dictionary with rounded values."""
+        data = asdict(self)
+        for key in ("current_ms", "baseline_ms", "mad_ms", "robust_z",
+                    "ratio"):
+            data[key] = round(data[key], 3)
+        return data
+
+
+def median_and_mad(samples: List[float]) -> tuple:
+    """Return the median and the median absolute deviation of samples."""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(s - median) for s in samples)
+    return median, mad
+
+
+def check_duration(current_ms: float, history_ms: List[float], *,
+                   z_threshold: float = DEFAULT_Z_THRESHOLD,
+                   min_ratio: float = DEFAULT_MIN_RATIO,
+                   min_delta_ms: float = DEFAULT_MIN_DELTA_MS
+                   ) -> Optional[DurationCheck]:
+    """Check whether a duration is a significant slowdown.
+
+    The robust z-score uses the MAD of the history. A MAD of zero (perfectly
+    stable history) is floored to 1% of the median so that a constant
+    history does not flag every tiny deviation.
+
+    Args:
+        current_ms: Duration of the current run
+        history_ms: Durations of previous successful runs
+        z_threshold: Minimum robust z-score
+        min_ratio: Minimum ratio of current duration to the median
+        min_delta_ms: Minimum absolute slowdown in milliseconds
+
+    Returns:
+        DurationCheck, or None when there is not enough history
+    """
+    if len(history_ms) < MIN_HISTORY_SAMPLES:
+        return None
+
+    median, mad = median_and_mad(history_ms)
+    sigma = max(mad * MAD_SCALE, median * 0.01, 1e-6)
+    robust_z = (current_ms - median) / sigma
+    ratio = current_ms / median if median > 0 else float("inf")
+    regressed = (robust_z >= z_threshold
+                 and ratio >= min_ratio
+                 and current_ms - median >= min_delta_ms)
+    return DurationCheck(
+        current_ms=current_ms,
+        baseline_ms=median,
+        mad_ms=mad,
+        robust_z=robust_z,
+        ratio=ratio,
+        samples=len(history_ms),
+        regressed=regressed,
+    )
+
+
+# pylint: disable=too-many-arguments
+def find_duration_regression(history: RunHistory, name: str,
+                             current_ms: float, *, test_type: str,
+                             driver: str, gpu_name: str,
+                             binary_name: str) -> Optional[DurationCheck]:
+    """Compare a test duration with its history on the same system.
+
+    Only previous successful runs of the same test on the same GPU, driver
+    and executable (by file name, so rebuilds share a lineage) are used.
+
+    Returns:
+        DurationCheck, or None when there is not enough history
+    """
+    rows = history.test_history(
+        name, test_type=test_type, driver=driver, gpu_name=gpu_name,
+        binary_name=binary_name, status="success", limit=HISTORY_WINDOW)
+    return check_duration(current_ms,
+                          [row["execution_time_ms"] for row in rows])
@@ -17,8 +17,17 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import List
+from typing import Dict, List, Optional
+from tests.libs.video_test_benchmark import BenchmarkResult
 from tests.libs.video_test_config_base import TestResult, VideoTestStatus
+from tests.libs.video_test_rd import RDCurve
+from tests.libs.video_test_scaling import ScalingPoint
+from tests.libs.video_test_sweep import SweepPoint
+from tests.libs.video_test_tuning import (
+    TuningCandidate,
+    option_args,
+    rank,
+)
 
 
 def get_status_display(status: VideoTestStatus) -> tuple:
@@ -87,12 +96,353 @@ def print_detailed_results(results: List[TestResult]) -> None:
         test_name = (config.display_name
                      if hasattr(config, 'display_name')
                      else config.name)
+        perf_check = result.meta.get("perf_check")
+        perf_str = (f" ⏱️  REGRESSION x{perf_check['ratio']:.2f}"
+                    if perf_check and perf_check["regressed"] else "")
+        leak = (result.meta.get("memory") or {}).get("leak")
+        if leak:
+            perf_str += f" 🧠 LEAK? +{leak['growth_kb'] / 1024:.1f}MB"
         print(
             f"{status_symbol} {config.codec.value:4} {test_name:35} - "
-            f"{status:5} ({result.execution_time:.2f}s)"
+            f"{status:5} ({result.execution_time:.2f}s){perf_str}"
         )
 
 
+def count_perf_regressions(results: List[TestResult]) -> int:
+    """Count results flagged as performance regressions
+
+    Args:
+        results: List of TestResult objects
+
+    Returns:
+        Number of results whose duration regressed against history
+    """
+    return sum(1 for r in results
+               if r.meta.get("perf_check", {}).get("regressed"))
+
+
+def print_phase_totals(results: List[TestResult]) -> None:
+    """Print the time spent in each test phase over all results
+
+    Args:
+        results: List of TestResult objects
+    """
+    totals = {}
+    for result in results:
+        for phase, seconds in result.phases.items():
+            totals[phase] = totals.get(phase, 0.0) + seconds
+    total_time = sum(totals.values())
+    if total_time <= 0:
+        return
+
+    print("Time by phase:")
+    for phase, seconds in sorted(totals.items(), key=lambda kv: -kv[1]):
+        print(f"  {phase:20} {seconds:8.2f}s "
+              f"({seconds / total_time * 100:5.1f}%)")
+
+
+def print_timeouts(results: List[TestResult]) -> None:
+    """Print the tests that were killed on timeout and the timeout policy
+    that applied to each
+
+    Args:
+        results: List of TestResult objects
+    """
+    timed_out = [r for r in results
+                 if (r.meta.get("timeout") or {}).get("timed_out")]
+    if not timed_out:
+        return
+
+    print("Timed out:")
+    for result in timed_out:
+        timeout = result.meta["timeout"]
+        test_name = getattr(result.config, 'display_name', result.config.name)
+        kill = result.meta.get("kill")
+        kill_str = ""
+        if kill:
+            kill_str = f", {'+'.join(kill['signals']) or 'exited'}"
+            if not kill["group_cleared"]:
+                kill_str += ", STILL RUNNING"
+        print(f"  {test_name:35} after {timeout['seconds']:7.1f}s "
+              f"({timeout['policy']} policy{kill_str})")
+    print()
+
+
+def count_memory_leaks(results: List[TestResult]) -> int:
+    """Count results whose memory grew across --loop iterations
+
+    Args:
+        results: List of TestResult objects
+
+    Returns:
+        Number of results flagged as possible memory leaks
+    """
+    return sum(1 for r in results
+               if (r.meta.get("memory") or {}).get("leak"))
+
+
+def summarize_resource_usage(results: List[TestResult]) -> Dict[str, dict]:
+    """Sum the resource usage of the test processes per codec
+
+    Args:
+        results: List of TestResult objects
+
+    Returns:
+        Dictionary mapping codec names to usage totals; CPU times and
+        context switches are summed, max_rss_kb is the peak of any test
+    """
+    summary: Dict[str, dict] = {}
+    for result in results:
+        usage = result.usage
+        if usage is None:
+            continue
+        totals = summary.setdefault(result.config.codec.value, {
+            "tests": 0, "user_time": 0.0, "system_time": 0.0,
+            "max_rss_kb": 0, "voluntary_ctx_switches": 0,
+            "involuntary_ctx_switches": 0,
+        })
+        totals["tests"] += 1
+        totals["user_time"] += usage.user_time
+        totals["system_time"] += usage.system_time
+        totals["max_rss_kb"] = max(totals["max_rss_kb"], usage.max_rss_kb)
+        totals["voluntary_ctx_switches"] += usage.voluntary_ctx_switches
+        totals["involuntary_ctx_switches"] += usage.involuntary_ctx_switches
+    for totals in summary.values():
+        totals["user_time"] = round(totals["user_time"], 4)
+        totals["system_time"] = round(totals["system_time"], 4)
+    return summary
+
+
+def print_resource_usage(results: List[TestResult]) -> None:
+    """Print CPU time, peak memory and context switches per codec
+
+    Args:
+        results: List of TestResult objects
+    """
+    summary = summarize_resource_usage(results)
+    if not summary:
+        return
+
+    print("Resource usage by codec:")
+    for codec, totals in summary.items():
+        print(f"  {codec.upper():8} {totals['tests']:3} tests, "
+              f"CPU {totals['user_time']:7.2f}s user "
+              f"{totals['system_time']:6.2f}s sys, "
+              f"peak RSS {totals['max_rss_kb'] / 1024:7.1f} MB, "
+              f"ctx sw {totals['voluntary_ctx_switches']}/"
+              f"{totals['involuntary_ctx_switches']} (vol/invol)")
+
+
+def summarize_throughput(results: List[TestResult]) -> Dict[str, dict]:
+    """Aggregate the decode throughput of the tests per codec
+
+    Args:
+        results: List of TestResult objects
+
+    Returns:
+        Dictionary mapping codec names to totals: frames and decode
+        seconds are summed, fps and mpixels_per_s are the aggregate rates
+        and frame_ms_p95 is the worst per-test 95th percentile
+    """
+    summary: Dict[str, dict] = {}
+    for result in results:
+        throughput = result.meta.get("throughput")
+        if not throughput:
+            continue
+        totals = summary.setdefault(result.config.codec.value, {
+            "tests": 0, "frames": 0, "seconds": 0.0, "frame_ms_p95": None,
+            "_pixels": 0, "_pixel_seconds": 0.0,
+        })
+        totals["tests"] += 1
+        totals["frames"] += throughput["frames"]
+        totals["seconds"] += throughput["seconds"]
+        if throughput.get("width"):
+            # Only tests with a known resolution count for the pixel rate
+            totals["_pixels"] += (throughput["width"] * throughput["height"]
+                                  * throughput["frames"])
+            totals["_pixel_seconds"] += throughput["seconds"]
+        p95 = (throughput.get("frame_ms") or {}).get("p95")
+        if p95 is not None:
+            totals["frame_ms_p95"] = max(totals["frame_ms_p95"] or 0.0, p95)
+    for totals in summary.values():
+        seconds = totals["seconds"]
+        pixels = totals.pop("_pixels")
+        pixel_seconds = totals.pop("_pixel_seconds")
+        totals["fps"] = (round(totals["frames"] / seconds, 2)
+                         if seconds else 0.0)
+        totals["mpixels_per_s"] = (round(pixels / pixel_seconds / 1e6, 2)
+                                   if pixel_seconds else 0.0)
+        totals["seconds"] = round(seconds, 4)
+    return summary
+
+
+def print_throughput(results: List[TestResult]) -> None:
+    """Print the decode rate per codec
+
+    Args:
+        results: List of TestResult objects
+    """
+    summary = summarize_throughput(results)
+    if not summary:
+        return
+
+    print("Decode throughput by codec:")
+    for codec, totals in summary.items():
+        line = (f"  {codec.upper():8} {totals['tests']:3} tests, "
+                f"{totals['frames']:6} frames, {totals['fps']:8.1f} fps")
+        if totals["mpixels_per_s"]:
+            line += f", {totals['mpixels_per_s']:8.1f} Mpix/s"
+        if totals["frame_ms_p95"] is not None:
+            line += f", p95 frame {totals['frame_ms_p95']:.2f} ms"
+        print(line)
+
+
+def print_benchmark_results(results: List[BenchmarkResult]) -> None:
+    """Print the median, MAD and confidence interval of each benchmark and
+    its ratio to the baseline
+
+    Args:
+        results: List of BenchmarkResult objects
+    """
+    print("=" * 70)
+    print("BENCHMARK RESULTS")
+    print("=" * 70)
+    for result in results:
+        name = f"{result.test_type}:{result.name}"
+        if result.stats is None:
+            symbol = "○" if result.not_supported else "✗"
+            print(f"  {name:40} {symbol} {result.error}")
+            continue
+        stats = result.stats
+        line = (f"  {name:40} {stats.median_ms:9.1f} ms "
+                f"± {stats.mad_ms:6.1f} "
+                f"[{stats.ci_low_ms:.1f}, {stats.ci_high_ms:.1f}]")
+        if result.comparison:
+            ratio = result.comparison["ratio"]
+            line += f"  x{ratio:.3f} vs baseline"
+            if result.regressed:
+                line += " ⚠️ REGRESSION"
+        print(line)
+    print()
+
+
+def print_scaling_results(points: List[ScalingPoint]) -> None:
+    """Print the scaling curve of each sample and queue mode
+
+    Args:
+        points: List of ScalingPoint objects, grouped by sample and mode
+    """
+    print("=" * 70)
+    print("CONCURRENCY SCALING")
+    print("=" * 70)
+    current = None
+    for point in points:
+        if (point.sample, point.mode) != current:
+            current = (point.sample, point.mode)
+            print(f"{point.sample} [{point.mode}]")
+            print(f"  {'N':>3} {'aggregate fps':>14} {'fps/instance':>13} "
+                  f"{'efficiency':>11}")
+        if point.errors:
+            print(f"  {point.instances:3} ✗ {point.errors[0]}")
+            continue
+        efficiency = (f"{point.efficiency * 100:10.1f}%"
+                      if point.efficiency is not None else f"{'-':>11}")
+        print(f"  {point.instances:3} {point.aggregate_fps:14.1f} "
+              f"{point.mean_instance_fps:13.1f} {efficiency}")
+    print()
+
+
+def print_tuning_results(best: Optional[TuningCandidate],
+                         candidates: List[TuningCandidate]) -> None:
+    """Print the measured decoder configurations, fastest first, and the
+    best one
+
+    Args:
+        best: Best candidate, or None if none completed
+        candidates: All candidates of the search
+    """
+    print("=" * 70)
+    print("DECODER TUNING RESULTS")
+    print("=" * 70)
+    for candidate in rank(candidates)[:10]:
+        marker = "★" if candidate is best else " "
+        print(f"{marker} {' '.join(candidate.args) or '(defaults)':55} "
+              f"{candidate.fps:8.1f} fps "
+              f"{candidate.cpu_ms_per_frame:6.2f} ms CPU/frame "
+              f"({candidate.runs} runs)")
+    failed = [c for c in candidates if c.error]
+    if failed:
+        print(f"  {len(failed)} configuration(s) failed, e.g. "
+              f"{' '.join(failed[0].args)}: {failed[0].error}")
+    print()
+
+
+def print_rd_results(curves: List[RDCurve]) -> None:
+    """Print the RD points of each sample and its anchor comparison
+
+    Args:
+        curves: List of RDCurve objects
+    """
+    print("=" * 70)
+    print("RATE-DISTORTION RESULTS")
+    print("=" * 70)
+    for curve in curves:
+        if curve.not_supported:
+            print(f"○ {curve.name}: not supported")
+            continue
+        comparison = curve.comparison
+        if comparison:
+            symbol = "✗" if comparison["regressed"] else "✓"
+            verdict = (f"BD-rate {comparison['bd_rate_pct']:+.2f}%, "
+                       f"BD-PSNR {comparison['bd_psnr_db']:+.3f} dB")
+        else:
+            symbol = "✗" if curve.failed else "•"
+            verdict = "no anchor comparison"
+        print(f"{symbol} {curve.name}: {verdict}")
+        for point in curve.points:
+            if point.psnr:
+                print(f"    {curve.mode} {point.value:6} "
+                      f"{point.bitrate_kbps:10.1f} kbit/s  "
+                      f"Y {point.psnr.y:6.2f}  YUV {point.psnr.yuv:6.2f} dB")
+            else:
+                print(f"    {curve.mode} {point.value:6} ✗ {point.error}")
+    print()
+
+
+def print_sweep_results(points: List[SweepPoint]) -> None:
+    """Print the configurations of each swept sample, fastest first, with
+    the members of the Pareto front marked
+
+    Args:
+        points: List of SweepPoint objects
+    """
+    quality = any(p.psnr_y is not None for p in points)
+    print("=" * 70)
+    print(f"ENCODER SWEEP (★ = speed/size{'/quality' if quality else ''} "
+          f"Pareto front)")
+    print("=" * 70)
+    for sample in dict.fromkeys(p.sample for p in points):
+        group = [p for p in points if p.sample == sample]
+        print(f"{sample} [{group[0].codec}]")
+        print(f"    {'fps':>8} {'bytes/frame':>12}"
+              f"{' Y-PSNR' if quality else ''}  options")
+        for point in sorted((p for p in group if p.measured),
+                            key=lambda p: -p.fps):
+            marker = "★" if point.on_front else " "
+            psnr = f" {point.psnr_y:6.2f}" if quality else ""
+            print(f"  {marker} {point.fps:8.1f} {point.bytes_per_frame:12.0f}"
+                  f"{psnr}  {' '.join(option_args(point.params))}")
+        unsupported = sum(1 for p in group if p.not_supported)
+        failed = [p for p in group if p.error]
+        if unsupported:
+            print(f"    {unsupported} configuration(s) not supported")
+        if failed:
+            print(f"    {len(failed)} configuration(s) failed, e.g. "
+                  f"{' '.join(option_args(failed[0].params))}: "
+                  f"{failed[0].error}")
+    print()
+
+
 def print_final_summary(counts: tuple, test_type: str = "") -> bool:
     """Print final summary and return success status
 
@@ -0,0 +1,211 @@
+"""
+Video Test Run History
+Optional SQLite store keeping per-test status, duration and system
+information for every run, used for trend queries and regression checks.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.libs.video_test_driver_detect import SystemInfo
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at        TEXT NOT NULL,
+    test_type         TEXT NOT NULL,
+    gpu_name          TEXT NOT NULL DEFAULT '',
+    driver            TEXT NOT NULL DEFAULT '',
+    driver_name       TEXT NOT NULL DEFAULT '',
+    driver_version    TEXT NOT NULL DEFAULT '',
+    os_name           TEXT NOT NULL DEFAULT '',
+    binary_name       TEXT NOT NULL DEFAULT '',
+    binary_hash       TEXT NOT NULL DEFAULT '',
+    suite_fingerprint TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS test_results (
+    result_id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id            INTEGER NOT NULL REFERENCES runs(run_id),
+    recorded_at       TEXT NOT NULL,
+    name              TEXT NOT NULL,
+    codec             TEXT NOT NULL DEFAULT '',
+    test_type         TEXT NOT NULL,
+    status            TEXT NOT NULL,
+    execution_time_ms REAL NOT NULL DEFAULT 0,
+    returncode        INTEGER,
+    driver            TEXT NOT NULL DEFAULT '',
+    gpu_name          TEXT NOT NULL DEFAULT '',
+    driver_version    TEXT NOT NULL DEFAULT '',
+    binary_name       TEXT NOT NULL DEFAULT '',
+    binary_hash       TEXT NOT NULL DEFAULT '',
+    suite_fingerprint TEXT NOT NULL DEFAULT '',
+    details           TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE INDEX IF NOT EXISTS idx_test_results_test
+    ON test_results (name, test_type, result_id);
+CREATE INDEX IF NOT EXISTS idx_test_results_driver
+    ON test_results (driver, gpu_name, name);
+CREATE INDEX IF NOT EXISTS idx_test_results_run
+    ON test_results (run_id);
+"""
+
+# Fields of result_to_dict() stored in dedicated columns
+_COLUMN_FIELDS = ("name", "codec", "test_type", "status", "execution_time_ms",
+                  "returncode")
+
+
+class RunHistory:
+    """SQLite database of test run history.
+
+    Usable as a context manager; the connection is closed on exit.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def __enter__(self) -> 'RunHistory':
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    # pylint: disable=too-many-arguments
+    def record_run(self, test_type: str, system_info: SystemInfo,
+                   result_dicts: List[dict], *, driver: str = "",
+                   binary_name: str = "", binary_hash: str = "",
+                   suite_fingerprint: str = "") -> int:
+        """Record a completed run and all of its test results.
+
+        Args:
+            test_type: Type of the run ("decode" or "encode")
+            system_info: Detected GPU, driver and OS information
+            result_dicts: Results as produced by result_to_dict()
+            driver: Normalized driver name used for skip rules
+            binary_name: File name of the test executable
+            binary_hash: SHA256 of the test executable
+            suite_fingerprint: Fingerprint of the selected test suite
+
+        Returns:
+            The run_id of the new run
+        """
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at, test_type, gpu_name, driver, "
+                "driver_name, driver_version, os_name, binary_name, "
+                "binary_hash, suite_fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, test_type, system_info.gpu_name, driver,
+                 system_info.driver_name, system_info.driver_version,
+                 system_info.os_name, binary_name, binary_hash,
+                 suite_fingerprint))
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO test_results (run_id, recorded_at, name, codec, "
+                "test_type, status, execution_time_ms, returncode, driver, "
+                "gpu_name, driver_version, binary_name, binary_hash, "
+                "suite_fingerprint, details) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, now, r.get("name", ""), r.get("codec", ""),
+                  test_type, r.get("status", ""),
+                  r.get("execution_time_ms", 0), r.get("returncode"),
+                  driver, system_info.gpu_name, system_info.driver_version,
+                  binary_name, binary_hash, suite_fingerprint,
+                  json.dumps({k: v for k, v in r.items()
+                              if k not in _COLUMN_FIELDS}))
+                 for r in result_dicts])
+        return run_id
+
+    def recent_runs(self, limit: int = 20) -> List[Dict]:
+        """Return the most recent runs with their status counts."""
+        rows = self._conn.execute(
+            "SELECT r.*, COUNT(t.result_id) AS total, "
+            "SUM(t.status = 'success') AS passed, "
+            "SUM(t.status IN ('error', 'crash')) AS failed "
+            "FROM runs r LEFT JOIN test_results t ON t.run_id = r.run_id "
+            "GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+    # pylint: disable=too-many-arguments
+    def test_history(self, name: str, *, test_type: Optional[str] = None,
+                     driver: Optional[str] = None,
+                     gpu_name: Optional[str] = None,
+                     binary_name: Optional[str] = None,
+                     status: Optional[str] = None,
+                     limit: int = 50) -> List[Dict]:
+        """Return the most recent results of a test, newest first.
+
+        Args:
+            name: Test display name (e.g. "decode_h264_clip_a")
+            test_type: Optional test type filter
+            driver: Optional normalized driver filter
+            gpu_name: Optional GPU name filter
+            binary_name: Optional executable file name filter
+            status: Optional status filter (e.g. "success")
+            limit: Maximum number of rows
+        """
+        query = "SELECT * FROM test_results WHERE name = ?"
+        params: list = [name]
+        for column, value in (("test_type", test_type), ("driver", driver),
+                              ("gpu_name", gpu_name),
+                              ("binary_name", binary_name),
+                              ("status", status)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        query += " ORDER BY result_id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._conn.execute(query, params)]
+
+    def driver_summary(self, driver: str,
+                       gpu_name: Optional[str] = None) -> List[Dict]:
+        """Return per-test statistics for all runs on a driver.
+
+        Args:
+            driver: Normalized driver name
+            gpu_name: Optional GPU name filter
+        """
+        query = ("SELECT name, test_type, COUNT(*) AS runs, "
+                 "SUM(status = 'success') AS passed, "
+                 "SUM(status IN ('error', 'crash')) AS failed, "
+                 "AVG(execution_time_ms) AS avg_ms, "
+                 "MIN(execution_time_ms) AS min_ms, "
+                 "MAX(execution_time_ms) AS max_ms "
+                 "FROM test_results WHERE driver = ?")
+        params: list = [driver]
+        if gpu_name is not None:
+            query += " AND gpu_name = ?"
+            params.append(gpu_name)
+        query += " GROUP BY name, test_type ORDER BY name"
+        return [dict(row) for row in self._conn.execute(query, params)]
@@ -0,0 +1,217 @@
+"""
+Video Test Run Journal
+Checkpoint journal recording completed tests so that an interrupted run can
+be resumed with --resume.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from tests.libs.video_test_config_base import (
+    EXPORTED_META,
+    BaseTestConfig,
+    TestResult,
+    VideoTestStatus,
+)
+from tests.libs.video_test_process import ProcessUsage
+from tests.libs.video_test_utils import calculate_file_hash
+
+JOURNAL_VERSION = 1
+
+
+def compute_suite_fingerprint(test_configs: list) -> str:
+    """Compute a fingerprint identifying the tests selected for a run.
+
+    The fingerprint covers every field that changes the command line of a
+    test, so a journal written for a different selection, sample catalogue
+    or argument set is never resumed.
+
+    Args:
+        test_configs: Ordered list of test configurations
+
+    Returns:
+        SHA256 hex digest
+    """
+    hasher = hashlib.sha256()
+    for config in test_configs:
+        entry = {
+            "name": getattr(config, 'display_name', config.name),
+            "codec": config.codec.value,
+            "extra_args": config.extra_args or [],
+            "source_checksum": config.source_checksum,
+            "profile": getattr(config, 'profile', None),
+        }
+        hasher.update(json.dumps(entry, sort_keys=True).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def compute_binary_hash(executable_path: Optional[str]) -> str:
+    """Return the SHA256 of the test executable (empty if unavailable)."""
+    if not executable_path:
+        return ""
+    path = Path(executable_path)
+    if not path.is_file():
+        return ""
+    return calculate_file_hash(path, 'sha256')
+
+
+def restore_result(config: BaseTestConfig, entry: dict) -> TestResult:
+    """Rebuild a TestResult from a journal entry written by result_to_dict.
+
+    Args:
+        config: Test configuration the entry belongs to
+        entry: Dictionary produced by result_to_dict()
+
+    Returns:
+        TestResult flagged as resumed in its meta mapping
+    """
+    result = TestResult(
+        config=config,
+        returncode=entry.get("returncode", 0),
+        execution_time=entry.get("execution_time_ms", 0) / 1000.0,
+        status=VideoTestStatus(entry.get("status", "error")),
+        warning_found=entry.get("warning_found", False),
+        error_message=entry.get("error_message", ""),
+        command_line=entry.get("command_line", ""),
+    )
+    result.phases = {phase: ms / 1000.0
+                     for phase, ms in entry.get("phases_ms", {}).items()}
+    for key in EXPORTED_META:
+        if key in entry:
+            result.meta[key] = entry[key]
+    if "rusage" in entry:
+        result.usage = ProcessUsage.from_dict(entry["rusage"])
+    if "device_id" in entry:
+        result.meta["device_id"] = int(entry["device_id"], 16)
+    if entry.get("driver"):
+        result.meta["driver"] = entry["driver"]
+    result.meta["resumed"] = True
+    return result
+
+
+class RunJournal:
+    """Append-only JSON lines journal of completed tests.
+
+    The first line is a header holding the suite fingerprint and binary
+    hash; each following line holds one completed test. Lines are flushed
+    and synced as they are written so that a killed run loses at most the
+    test that was executing.
+    """
+
+    def __init__(self, journal_path: Path, suite_fingerprint: str,
+                 binary_hash: str):
+        self.path = Path(journal_path)
+        self.suite_fingerprint = suite_fingerprint
+        self.binary_hash = binary_hash
+
+    def _matches(self, header: dict) -> bool:
+        """Check whether a journal header belongs to the current run."""
+        return (header.get("type") == "header"
+                and header.get("version") == JOURNAL_VERSION
+                and header.get("suite_fingerprint") == self.suite_fingerprint
+                and header.get("binary_hash") == self.binary_hash)
+
+    def load(self) -> Dict[str, dict]:
+        """Load completed tests from an existing journal.
+
+        Returns:
+            Mapping of test name to result dictionary. Empty if there is no
+            journal or it was written for a different suite or binary.
+        """
+        if not self.path.exists():
+            return {}
+
+        completed: Dict[str, dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            print(f"⚠️  Could not read run journal {self.path}: {e}")
+            return {}
+
+        if not lines:
+            return {}
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return {}
+        if not self._matches(header):
+            print("⚠️  Run journal belongs to a different test suite or "
+                  "binary - ignoring it")
+            return {}
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Partially written line from an interrupted run
+                continue
+            if entry.get("type") == "result" and "name" in entry:
+                completed[entry["name"]] = entry.get("result", {})
+        return completed
+
+    def start(self, resume: bool = False) -> Dict[str, dict]:
+        """Start journaling, optionally resuming an interrupted run.
+
+        Args:
+            resume: Reuse completed tests from a matching journal
+
+        Returns:
+            Mapping of already completed test names to result dictionaries
+        """
+        completed = self.load() if resume else {}
+        if not completed:
+            self.reset()
+        return completed
+
+    def reset(self) -> None:
+        """Truncate the journal and write a fresh header."""
+        header = {
+            "type": "header",
+            "version": JOURNAL_VERSION,
+            "suite_fingerprint": self.suite_fingerprint,
+            "binary_hash": self.binary_hash,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not create run journal: {e}")
+
+    def record(self, test_name: str, result_dict: dict) -> None:
+        """Append a completed test to the journal."""
+        entry = {"type": "result", "name": test_name, "result": result_dict}
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"⚠️  Could not update run journal: {e}")
+
+    def remove(self) -> None:
+        """Delete the journal once the run has completed."""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"⚠️  Could not remove run journal: {e}")
@@ -0,0 +1,183 @@
+"""
+Video Test Concurrency Scaling
+Runs N decoder instances on the same stream at once and measures how the
+aggregate decode rate scales with N and with the decoder's queue
+selection flags, to size the number of concurrent decode sessions a GPU
+can sustain.
+
+The aggregate rate of a point is the frames decoded by all instances over
+the wall time from the common start to the last exit, so instances that
+wait for a busy queue lower it. The per-instance rate is taken from each
+instance's own progress output (see video_test_throughput). The
+efficiency of a point is its aggregate rate divided by N times the
+aggregate rate of a single instance with the same flags: 1.0 is linear
+scaling.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from tests.libs.video_test_output_analyzer import (
+    FrameProgressAnalyzer,
+    analyze_output,
+)
+from tests.libs.video_test_process import ProcessResult, run_process
+from tests.libs.video_test_throughput import compute_decode_throughput
+
+QUEUE_MODE_DEFAULT = "default"            # decoder's own queue choice
+QUEUE_MODE_LOAD_BALANCE = "load-balance"  # --enableHwLoadBalancing
+QUEUE_MODE_QUEUE_ID = "queue-id"          # instance i on queue i % queues
+QUEUE_MODE_COMPUTE = "compute"            # --selectVideoWithComputeQueue
+QUEUE_MODES = (QUEUE_MODE_DEFAULT, QUEUE_MODE_LOAD_BALANCE,
+               QUEUE_MODE_QUEUE_ID, QUEUE_MODE_COMPUTE)
+
+DEFAULT_INSTANCES = (1, 2, 4, 8)
+DEFAULT_QUEUE_MODES = (QUEUE_MODE_DEFAULT, QUEUE_MODE_LOAD_BALANCE)
+
+
+def queue_mode_args(mode: str, instance: int,
+                    decode_queues: Optional[int]) -> List[str]:
+    """Decoder arguments selecting the queue of one instance.
+
+    Args:
+        mode: One of QUEUE_MODES
+        instance: Index of the instance (0-based)
+        decode_queues: Number of decode queues of the device, if known
+    """
+    if mode == QUEUE_MODE_LOAD_BALANCE:
+        return ["--enableHwLoadBalancing"]
+    if mode == QUEUE_MODE_QUEUE_ID:
+        queue = instance % decode_queues if decode_queues else instance
+        return ["--queueid", str(queue)]
+    if mode == QUEUE_MODE_COMPUTE:
+        return ["--selectVideoWithComputeQueue"]
+    return []
+
+
+@dataclass
+class ScalingPoint:  # pylint: disable=too-many-instance-attributes
+    """Outcome of running a number of instances at once."""
+    sample: str
+    mode: str
+    instances: int
+    wall_seconds: float = 0.0
+    instance_fps: List[float] = field(default_factory=list)
+    frames: int = 0
+    errors: List[str] = field(default_factory=list)
+    # Set by apply_efficiency() from the single-instance point
+    efficiency: Optional[float] = None
+
+    @property
+    def aggregate_fps(self) -> float:
+        """Frames per second of all instances together (wall time)."""
+        return (self.frames / self.wall_seconds
+                if self.wall_seconds > 0 else 0.0)
+
+    @property
+    def mean_instance_fps(self) -> float:
+        """Average decode rate of one instance as reported by it."""
+        return (sum(self.instance_fps) / len(self.instance_fps)
+                if self.instance_fps else 0.0)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        data = {
+            "sample": self.sample,
+            "mode": self.mode,
+            "instances": self.instances,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "frames": self.frames,
+            "aggregate_fps": round(self.aggregate_fps, 2),
+            "instance_fps": [round(fps, 2) for fps in self.instance_fps],
+        }
+        if self.efficiency is not None:
+            data["efficiency"] = round(self.efficiency, 4)
+        if self.errors:
+            data["errors"] = self.errors
+        return data
+
+
+def run_concurrently(cmds: List[List[str]], **run_kwargs
+                     ) -> List[object]:
+    """Start the commands at the same time and wait for all of them.
+
+    Returns:
+        ProcessResult or the raised exception of each command, in order
+    """
+    outcomes: List[object] = [None] * len(cmds)
+    barrier = threading.Barrier(len(cmds))
+
+    def _run(index: int) -> None:
+        barrier.wait()
+        try:
+            outcomes[index] = run_process(cmds[index], **run_kwargs)
+        except (OSError, subprocess.SubprocessError) as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=_run, args=(i,), daemon=True)
+               for i in range(len(cmds))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def measure_point(point: ScalingPoint, cmds: List[List[str]],
+                  **run_kwargs) -> List[object]:
+    """Run the instances of a point and record their rates.
+
+    Returns:
+        The outcomes of run_concurrently()
+    """
+    start = time.perf_counter()
+    outcomes = run_concurrently(cmds, **run_kwargs)
+    point.wall_seconds = time.perf_counter() - start
+    for index, outcome in enumerate(outcomes):
+        if not isinstance(outcome, ProcessResult):
+            point.errors.append(f"instance {index}: {outcome}")
+            continue
+        if outcome.returncode != 0:
+            point.errors.append(
+                f"instance {index}: return code {outcome.returncode}")
+            continue
+        progress = FrameProgressAnalyzer()
+        analyze_output(outcome.stdout, outcome.stderr, [progress])
+        throughput = compute_decode_throughput(
+            progress.progress, progress.crc_frames, progress.resolution,
+            point.wall_seconds)
+        if throughput is None:
+            point.errors.append(f"instance {index}: no frames reported")
+            continue
+        point.frames += throughput.frames
+        point.instance_fps.append(throughput.fps)
+    return outcomes
+
+
+def apply_efficiency(points: List[ScalingPoint]) -> None:
+    """Set the efficiency of each point relative to one instance of the
+    same sample and queue mode."""
+    single: Dict[tuple, float] = {
+        (p.sample, p.mode): p.aggregate_fps
+        for p in points if p.instances == 1 and p.aggregate_fps > 0}
+    for point in points:
+        base = single.get((point.sample, point.mode))
+        if base and not point.errors:
+            point.efficiency = point.aggregate_fps / (point.instances * base)
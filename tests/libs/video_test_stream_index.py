@@ -0,0 +1,582 @@
+"""
+Video Test Stream Index
+Metadata of the catalogue's streams: resolution, frame count, bit depth,
+chroma format and profile, read once per sample and cached by checksum,
+so that tests can be selected by the resources they need and their cost
+estimated before they run.
+
+Decode samples are parsed with video_test_bitstream: the first H.264 or
+H.265 SPS, AV1 sequence header or VP9 key frame header gives the format,
+and the stream walk gives the frame count. AV1 sizes are the sequence
+header's maximum frame size. Encode samples are described by their raw or
+Y4M source. The index is a JSON file written under a temporary name and
+renamed; entries of older index versions are dropped.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from tests.libs.video_test_bitstream import (
+    IVF_FRAME_HEADER,
+    OBU_SEQUENCE_HEADER,
+    BitReader,
+    Buffer,
+    StreamInfo,
+    StreamUnit,
+    map_file,
+    parse_buffer,
+    unescape,
+)
+from tests.libs.video_test_frames import FrameReader
+from tests.libs.video_test_memory import loop_iterations
+from tests.libs.video_test_utils import load_json_entries, save_json_entries
+
+# Part of the index: bump when the parsed metadata changes
+INDEX_VERSION = 2
+INDEX_PATH = Path(__file__).parent.parent / "resources" / "stream_index.json"
+
+CHROMA_FORMATS = {0: "400", 1: "420", 2: "422", 3: "444"}
+# Chroma format of (subsampling_x, subsampling_y)
+CHROMA_SUBSAMPLINGS = {(1, 1): "420", (1, 0): "422", (0, 0): "444",
+                       (0, 1): "440"}
+H264_PROFILES = {66: "baseline", 77: "main", 88: "extended", 100: "high",
+                 110: "high10", 122: "high422", 244: "high444"}
+# profile_idc values with chroma format and bit depth in the SPS
+H264_HIGH_PROFILES = {100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139,
+                      134, 135}
+H265_PROFILES = {1: "main", 2: "main10", 3: "mainstill", 4: "range",
+                 9: "scc"}
+AV1_PROFILES = {0: "main", 1: "high", 2: "professional"}
+VP9_SYNC_CODE = 0x498342
+VP9_CS_RGB = 7
+
+H264_SPS = 7
+H265_SPS = 33
+
+
+@dataclass(frozen=True)
+class StreamMetadata:
+    """Format and length of a stream or raw source."""
+    codec: str
+    width: int = 0
+    height: int = 0
+    frames: int = 0
+    bit_depth: int = 8
+    chroma: str = "420"
+    profile: str = ""
+
+    @property
+    def pixels(self) -> int:
+        """Luma samples per frame."""
+        return self.width * self.height
+
+    def to_dict(self) -> dict:
+        """Entry of the index file."""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StreamMetadata":
+        """Metadata of an index entry; unknown fields are ignored."""
+        names = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def _skip_scaling_list(bits: BitReader, size: int) -> None:
+    """Skip an H.264 scaling_list()."""
+    last = next_scale = 8
+    for _ in range(size):
+        if next_scale:
+            next_scale = (last + bits.se() + 256) % 256
+        last = next_scale or last
+
+
+def h264_sps_metadata(rbsp: bytes) -> dict:
+    """Profile, chroma format, bit depth and cropped size of an H.264
+    SPS (7.3.2.1.1)."""
+    bits = BitReader(rbsp)
+    profile_idc = bits.u(8)
+    bits.u(16)  # constraint flags, level_idc
+    bits.ue()  # seq_parameter_set_id
+    chroma, bit_depth = 1, 8
+    if profile_idc in H264_HIGH_PROFILES:
+        chroma = bits.ue()
+        if chroma == 3:
+            bits.u(1)  # separate_colour_plane_flag
+        bit_depth = bits.ue() + 8
+        bits.ue()  # bit_depth_chroma_minus8
+        bits.u(1)  # qpprime_y_zero_transform_bypass_flag
+        if bits.u(1):  # seq_scaling_matrix_present_flag
+            for index in range(8 if chroma != 3 else 12):
+                if bits.u(1):
+                    _skip_scaling_list(bits, 16 if index < 6 else 64)
+    bits.ue()  # log2_max_frame_num_minus4
+    poc_type = bits.ue()
+    if poc_type == 0:
+        bits.ue()  # log2_max_pic_order_cnt_lsb_minus4
+    elif poc_type == 1:
+        bits.u(1)  # delta_pic_order_always_zero_flag
+        bits.se()
+        bits.se()
+        for _ in range(bits.ue()):
+            bits.se()
+    bits.ue()  # max_num_ref_frames
+    bits.u(1)  # gaps_in_frame_num_value_allowed_flag
+    width_mbs = bits.ue() + 1
+    height_units = bits.ue() + 1
+    frame_mbs_only = bits.u(1)
+    if not frame_mbs_only:
+        bits.u(1)  # mb_adaptive_frame_field_flag
+    bits.u(1)  # direct_8x8_inference_flag
+    crop = [bits.ue() for _ in range(4)] if bits.u(1) else [0] * 4
+    sub_width, sub_height = {1: (2, 2), 2: (2, 1)}.get(chroma, (1, 1))
+    crop_y = sub_height * (2 - frame_mbs_only)
+    return {
+        "width": width_mbs * 16 - sub_width * (crop[0] + crop[1]),
+        "height": ((2 - frame_mbs_only) * height_units * 16
+                   - crop_y * (crop[2] + crop[3])),
+        "bit_depth": bit_depth,
+        "chroma": CHROMA_FORMATS.get(chroma, "420"),
+        "profile": H264_PROFILES.get(profile_idc, str(profile_idc)),
+    }
+
+
+def _h265_profile_tier_level(bits: BitReader,
+                             max_sub_layers_minus1: int) -> int:
+    """Read profile_tier_level(1, max_sub_layers_minus1) (7.3.3) and
+    return general_profile_idc."""
+    bits.u(3)  # general_profile_space, general_tier_flag
+    profile_idc = bits.u(5)
+    bits.u(32)  # general_profile_compatibility_flag[32]
+    bits.u(48)  # source and constraint flags
+    bits.u(8)  # general_level_idc
+    present = [(bits.u(1), bits.u(1)) for _ in range(max_sub_layers_minus1)]
+    if max_sub_layers_minus1:
+        bits.u(2 * (8 - max_sub_layers_minus1))  # reserved_zero_2bits
+    for profile_present, level_present in present:
+        bits.u(88 * profile_present + 8 * level_present)
+    return profile_idc
+
+
+def h265_sps_metadata(rbsp: bytes) -> dict:
+    """Profile, chroma format, bit depth and conformance window size of
+    an H.265 SPS (7.3.2.2)."""
+    bits = BitReader(rbsp)
+    bits.u(4)  # sps_video_parameter_set_id
+    max_sub_layers_minus1 = bits.u(3)
+    bits.u(1)  # sps_temporal_id_nesting_flag
+    profile_idc = _h265_profile_tier_level(bits, max_sub_layers_minus1)
+    bits.ue()  # sps_seq_parameter_set_id
+    chroma = bits.ue()
+    if chroma == 3:
+        bits.u(1)  # separate_colour_plane_flag
+    width, height = bits.ue(), bits.ue()
+    if bits.u(1):  # conformance_window_flag
+        left, right, top, bottom = (bits.ue() for _ in range(4))
+        sub_width, sub_height = {1: (2, 2), 2: (2, 1)}.get(chroma, (1, 1))
+        width -= sub_width * (left + right)
+        height -= sub_height * (top + bottom)
+    return {
+        "width": width,
+        "height": height,
+        "bit_depth": bits.ue() + 8,
+        "chroma": CHROMA_FORMATS.get(chroma, "420"),
+        "profile": H265_PROFILES.get(profile_idc, str(profile_idc)),
+    }
+
+
+def _uvlc(bits: BitReader) -> int:
+    """AV1 uvlc() value (4.10.3)."""
+    zeros = 0
+    while not bits.u(1):
+        zeros += 1
+        if zeros >= 32:
+            return (1 << 32) - 1
+    return bits.u(zeros) + (1 << zeros) - 1
+
+
+# pylint: disable=too-many-locals,too-many-branches,too-many-statements
+def av1_sequence_metadata(payload: bytes) -> dict:
+    """Profile, maximum frame size, bit depth and chroma format of an AV1
+    sequence header OBU payload (5.5)."""
+    bits = BitReader(payload)
+    seq_profile = bits.u(3)
+    bits.u(1)  # still_picture
+    reduced = bits.u(1)
+    if reduced:
+        bits.u(5)  # seq_level_idx[0]
+    else:
+        decoder_model_info = False
+        buffer_delay_length = 0
+        if bits.u(1):  # timing_info_present_flag
+            bits.u(64)  # num_units_in_display_tick, time_scale
+            if bits.u(1):  # equal_picture_interval
+                _uvlc(bits)
+            decoder_model_info = bool(bits.u(1))
+            if decoder_model_info:
+                buffer_delay_length = bits.u(5) + 1
+                bits.u(32 + 5 + 5)
+        initial_display_delay = bits.u(1)
+        for _ in range(bits.u(5) + 1):  # operating points
+            bits.u(12)  # operating_point_idc
+            if bits.u(5) > 7:  # seq_level_idx
+                bits.u(1)  # seq_tier
+            if decoder_model_info and bits.u(1):
+                bits.u(2 * buffer_delay_length + 1)
+            if initial_display_delay and bits.u(1):
+                bits.u(4)
+    width_bits, height_bits = bits.u(4) + 1, bits.u(4) + 1
+    width, height = bits.u(width_bits) + 1, bits.u(height_bits) + 1
+    if not reduced and bits.u(1):  # frame_id_numbers_present_flag
+        bits.u(7)
+    bits.u(3)  # use_128x128_superblock, filter_intra, intra_edge
+    if not reduced:
+        bits.u(4)  # interintra, masked compound, warped motion, dual filter
+        order_hint = bits.u(1)
+        if order_hint:
+            bits.u(2)  # enable_jnt_comp, enable_ref_frame_mvs
+        force_screen_content = 2 if bits.u(1) else bits.u(1)
+        if force_screen_content and not bits.u(1):
+            bits.u(1)  # seq_force_integer_mv
+        if order_hint:
+            bits.u(3)  # order_hint_bits_minus_1
+    bits.u(3)  # enable_superres, enable_cdef, enable_restoration
+    # color_config()
+    bit_depth = 10 if bits.u(1) else 8
+    if seq_profile == 2 and bit_depth == 10 and bits.u(1):
+        bit_depth = 12
+    mono_chrome = bits.u(1) if seq_profile != 1 else 0
+    primaries = transfer = matrix = None
+    if bits.u(1):  # color_description_present_flag
+        primaries, transfer, matrix = bits.u(8), bits.u(8), bits.u(8)
+    if mono_chrome:
+        chroma = "400"
+    elif (primaries, transfer, matrix) == (1, 13, 0):
+        chroma = "444"  # sRGB
+    else:
+        bits.u(1)  # color_range
+        if seq_profile == 0:
+            chroma = "420"
+        elif seq_profile == 1:
+            chroma = "444"
+        elif bit_depth == 12:
+            sub_x = bits.u(1)
+            sub_y = bits.u(1) if sub_x else 0
+            chroma = CHROMA_SUBSAMPLINGS[(sub_x, sub_y)]
+        else:
+            chroma = "422"
+    return {
+        "width": width,
+        "height": height,
+        "bit_depth": bit_depth,
+        "chroma": chroma,
+        "profile": AV1_PROFILES.get(seq_profile, str(seq_profile)),
+    }
+
+
+def vp9_key_frame_metadata(payload: bytes) -> dict:
+    """Profile, size, bit depth and chroma format of a VP9 key frame's
+    uncompressed header.
+
+    Raises:
+        ValueError: Not a key frame
+    """
+    bits = BitReader(payload)
+    if bits.u(2) != 2:
+        raise ValueError("invalid VP9 frame marker")
+    profile = bits.u(1) | (bits.u(1) << 1)
+    if profile == 3:
+        bits.u(1)  # reserved_zero
+    if bits.u(1) or bits.u(1):  # show_existing_frame, frame_type
+        raise ValueError("first VP9 frame is not a key frame")
+    bits.u(2)  # show_frame, error_resilient_mode
+    if bits.u(24) != VP9_SYNC_CODE:
+        raise ValueError("invalid VP9 sync code")
+    bit_depth = 8
+    if profile >= 2:
+        bit_depth = 12 if bits.u(1) else 10
+    chroma = "420"
+    if bits.u(3) != VP9_CS_RGB:
+        bits.u(1)  # color_range
+        if profile in (1, 3):
+            chroma = CHROMA_SUBSAMPLINGS[(bits.u(1), bits.u(1))]
+            bits.u(1)  # reserved_zero
+    elif profile in (1, 3):
+        chroma = "444"
+        bits.u(1)  # reserved_zero
+    return {
+        "width": bits.u(16) + 1,
+        "height": bits.u(16) + 1,
+        "bit_depth": bit_depth,
+        "chroma": chroma,
+        "profile": str(profile),
+    }
+
+
+def _first_unit(info: StreamInfo, unit_type: int) -> Optional[StreamUnit]:
+    """First NAL unit or OBU of a type."""
+    for frame in info.frames:
+        for unit in frame.units:
+            if unit.type == unit_type:
+                return unit
+    return None
+
+
+def _unit_bytes(data: Buffer, unit: StreamUnit, skip: int,
+                limit: int = 256) -> bytes:
+    """Up to `limit` bytes of a unit after its first `skip` bytes."""
+    start = unit.offset + skip
+    return bytes(data[start:min(start + limit, unit.offset + unit.size)])
+
+
+def _header_metadata(data: Buffer, info: StreamInfo) -> dict:
+    """Format fields from the stream's first sequence-level header.
+
+    Raises:
+        ValueError: No header found, or a malformed one
+    """
+    if info.codec in ("h264", "h265"):
+        h265 = info.codec == "h265"
+        sps = _first_unit(info, H265_SPS if h265 else H264_SPS)
+        if sps is None:
+            raise ValueError("no SPS found")
+        rbsp = unescape(_unit_bytes(data, sps, 2 if h265 else 1), 256)
+        return h265_sps_metadata(rbsp) if h265 else h264_sps_metadata(rbsp)
+    if info.codec == "av1":
+        header = _first_unit(info, OBU_SEQUENCE_HEADER)
+        if header is None:
+            raise ValueError("no AV1 sequence header found")
+        obu = _unit_bytes(data, header, 0)
+        skip = 2 if obu[0] & 0x04 else 1
+        if obu[0] & 0x02:  # obu_has_size_field
+            while obu[skip] & 0x80:
+                skip += 1
+            skip += 1
+        return av1_sequence_metadata(obu[skip:])
+    if info.codec == "vp9" and info.frames:
+        start = info.frames[0].offset + IVF_FRAME_HEADER.size
+        return vp9_key_frame_metadata(bytes(data[start:start + 32]))
+    raise ValueError(f"no metadata parser for codec {info.codec!r}")
+
+
+def read_stream_metadata(path: Path,
+                         codec: Optional[str] = None) -> StreamMetadata:
+    """Metadata of a coded stream.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or parsed
+    """
+    with map_file(path) as data:
+        info = parse_buffer(data, path, codec)
+        fields = {"width": info.width, "height": info.height}
+        fields.update(_header_metadata(data, info))
+    return StreamMetadata(codec=info.codec, frames=info.frame_count,
+                          **fields)
+
+
+def source_file_metadata(sample) -> StreamMetadata:
+    """Format and frames of an encode sample's source file, as codec
+    "y4m" or "yuv"; a raw file is read in the sample's file layout.
+
+    Raises:
+        OSError, ValueError: The source cannot be read
+    """
+    with FrameReader(sample.full_yuv_path, sample.file_layout) as reader:
+        layout, frames = reader.layout, len(reader)
+        y4m = reader.frame_rate is not None
+    return StreamMetadata(codec="y4m" if y4m else "yuv", width=layout.width,
+                          height=layout.height, frames=frames,
+                          bit_depth=layout.bit_depth, chroma=layout.chroma)
+
+
+def source_metadata(sample, file_metadata: Optional[StreamMetadata] = None
+                    ) -> StreamMetadata:
+    """Metadata of an encode sample's input: the layout the encoder reads
+    and the frames of the source file, or of its synthetic spec.
+
+    Args:
+        file_metadata: source_file_metadata() of the sample, read if not
+            given
+
+    Raises:
+        OSError, ValueError: The source cannot be read
+    """
+    profile = sample.profile or ""
+    if sample.synthetic is not None:
+        frames = sample.synthetic.frames
+    else:
+        file_metadata = file_metadata or source_file_metadata(sample)
+        if sample.input_is_y4m:
+            return dataclasses.replace(file_metadata,
+                                       codec=sample.codec.value,
+                                       profile=profile)
+        frames = file_metadata.frames
+    layout = sample.source_layout
+    return StreamMetadata(codec=sample.codec.value, width=layout.width,
+                          height=layout.height, frames=frames,
+                          bit_depth=layout.bit_depth, chroma=layout.chroma,
+                          profile=profile)
+
+
+def _option(args: Optional[Sequence[str]],
+            option: str) -> Optional[int]:
+    """Integer value of an option, or None."""
+    args = list(args or [])
+    if option in args and args.index(option) + 1 < len(args):
+        try:
+            return int(args[args.index(option) + 1])
+        except ValueError:
+            return None
+    return None
+
+
+def processed_frames(metadata: StreamMetadata,
+                     extra_args: Optional[Sequence[str]],
+                     test_type: str) -> int:
+    """Frames a test processes: the stream's, limited by --maxFrameCount
+    (decode) or --numFrames (encode)."""
+    option = "--numFrames" if test_type == "encode" else "--maxFrameCount"
+    limit = _option(extra_args, option)
+    if limit and limit > 0:
+        return min(metadata.frames, limit)
+    return metadata.frames
+
+
+def estimate_cost(metadata: StreamMetadata,
+                  extra_args: Optional[Sequence[str]],
+                  test_type: str) -> float:
+    """Relative cost of a test: millions of luma samples processed,
+    including --loop iterations of decode tests."""
+    frames = processed_frames(metadata, extra_args, test_type)
+    if test_type == "decode":
+        frames *= loop_iterations(extra_args)
+    return metadata.pixels * frames / 1e6
+
+
+def parse_resolution(text: str) -> Tuple[int, int]:
+    """Width and height of a "WIDTHxHEIGHT" string.
+
+    Raises:
+        ValueError: Malformed or not positive
+    """
+    width, sep, height = text.lower().partition("x")
+    if not sep or not width.isdigit() or not height.isdigit() \
+            or not int(width) or not int(height):
+        raise ValueError(f"invalid resolution {text!r}; expected e.g. "
+                         f"1920x1080")
+    return int(width), int(height)
+
+
+@dataclass(frozen=True)
+class MetadataFilter:
+    """Resource limits a test must fit; None is not checked."""
+    max_width: Optional[int] = None
+    max_height: Optional[int] = None
+    max_frames: Optional[int] = None
+    bit_depth: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether any limit is set."""
+        return any(v is not None for v in dataclasses.astuple(self))
+
+    def reject_reason(self, metadata: Optional[StreamMetadata],
+                      frames: int) -> str:
+        """Why a test with this metadata and frame count is filtered
+        out, or "" if it fits."""
+        if metadata is None:
+            return "stream metadata unknown"
+        if self.max_width is not None and (
+                metadata.width > self.max_width
+                or metadata.height > self.max_height):
+            return (f"{metadata.width}x{metadata.height} above "
+                    f"{self.max_width}x{self.max_height}")
+        if self.max_frames is not None and frames > self.max_frames:
+            return f"{frames} frames above {self.max_frames}"
+        if self.bit_depth is not None and \
+                metadata.bit_depth != self.bit_depth:
+            return f"{metadata.bit_depth}-bit, not {self.bit_depth}-bit"
+        return ""
+
+
+class StreamIndex:
+    """On-disk index of stream metadata keyed by sample checksum."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict] = load_json_entries(
+            self.path, INDEX_VERSION, "streams")
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[StreamMetadata]:
+        """Indexed metadata of a stream."""
+        data = self._entries.get(key)
+        return StreamMetadata.from_dict(data) if data else None
+
+    def lookup(self, key: str, path: Path,
+               codec: Optional[str] = None) -> Optional[StreamMetadata]:
+        """Metadata of a coded stream, parsed and indexed on first use;
+        None if the file is missing or cannot be parsed."""
+        return self._cached(key, lambda: read_stream_metadata(path, codec))
+
+    def lookup_source(self, sample) -> Optional[StreamMetadata]:
+        """Metadata of an encode sample's input, from the source file
+        metadata read and indexed on first use; None if the source is
+        missing or cannot be read.
+
+        Samples sharing a source file share its entry, and the codec,
+        profile and encoder input layout of each are applied per call.
+        """
+        if sample.synthetic is not None:
+            return source_metadata(sample)
+        try:
+            key = sample.source_key
+        except OSError:
+            return None
+        if sample.source_format != "y4m":
+            # The frames of a raw file depend on the layout it is read in
+            key = f"{key}:{sample.file_layout.frame_size}"
+        file_metadata = self._cached(
+            key, lambda: source_file_metadata(sample))
+        if file_metadata is None:
+            return None
+        return source_metadata(sample, file_metadata)
+
+    def _cached(self, key: str,
+                read: Callable[[], StreamMetadata]
+                ) -> Optional[StreamMetadata]:
+        """Indexed metadata of a key, else the result of `read`."""
+        metadata = self.get(key)
+        if metadata is None:
+            try:
+                metadata = read()
+            except (OSError, ValueError):
+                return None
+            self._entries[key] = metadata.to_dict()
+            self._dirty = True
+        return metadata
+
+    def save(self) -> None:
+        """Write the index if it changed."""
+        if self._dirty:
+            self._dirty = not save_json_entries(
+                self.path, INDEX_VERSION, "streams",
+                dict(sorted(self._entries.items())), "stream index")
@@ -0,0 +1,385 @@
+"""
+Video Test Stream Structure
+Checks the structure of an encoder's output against its options without
+decoding it: frame count, key frame (IDR) positions, intra and B frame
+placement, slices per picture and temporal layers. It is the cheap first
+tier of encoder validation; the decoder runs only when it passes.
+
+Streams are walked with video_test_bitstream. Picture types come from
+the first slice header of each H.264/H.265 picture and from the frame
+headers of each AV1 temporal unit. Only options given to the encoder are
+checked, since device defaults are not known here:
+
+- --numFrames: frames
+- --idrPeriod: key frames at multiples of the period, in decode order
+- --gopFrameCount: intra frames at the start of each GOP of each IDR
+  period
+- --consecutiveBFrameCount: no longer runs of B pictures (H.264/H.265)
+- --slices: slices of every picture (H.264/H.265)
+- --temporalLayerCount: temporal ids below the layer count
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from tests.libs.video_test_bitstream import (
+    AV1_INTRA_ONLY_FRAME,
+    AV1_KEY_FRAME,
+    H264_VCL_TYPES,
+    H265_VCL_TYPES,
+    Av1State,
+    BitReader,
+    Buffer,
+    StreamFrame,
+    StreamUnit,
+    map_file,
+    parse_buffer,
+    unescape,
+)
+
+PICTURE_I = "I"
+PICTURE_P = "P"
+PICTURE_B = "B"
+
+H264_PREFIX_NAL = 14
+H265_PPS = 34
+# H.264 slice_type % 5: P, B, I, SP, SI
+H264_SLICE_TYPES = (PICTURE_P, PICTURE_B, PICTURE_I, PICTURE_P, PICTURE_I)
+# H.265 slice_type: B, P, I
+H265_SLICE_TYPES = (PICTURE_B, PICTURE_P, PICTURE_I)
+
+
+@dataclass(frozen=True)
+# pylint: disable=too-many-instance-attributes
+class StructureExpectation:
+    """Structure an encoder was asked for; None is not checked."""
+    frames: Optional[int] = None
+    idr_period: Optional[int] = None
+    gop_frame_count: Optional[int] = None
+    b_frames: Optional[int] = None
+    slices: Optional[int] = None
+    temporal_layers: Optional[int] = None
+    # Intra refresh changes slice counts and picture types
+    intra_refresh: bool = False
+    # --lastFrameType can make the last picture intra
+    last_frame_type: bool = False
+
+    @classmethod
+    def from_args(cls, args: Optional[Sequence[str]]
+                  ) -> "StructureExpectation":
+        """Expectation from encoder arguments.
+
+        Raises:
+            ValueError: An option value is not an integer
+        """
+        args = list(args or [])
+
+        def value(option: str) -> Optional[int]:
+            if option not in args or args.index(option) + 1 >= len(args):
+                return None
+            return int(args[args.index(option) + 1])
+
+        return cls(
+            frames=value("--numFrames"),
+            idr_period=value("--idrPeriod"),
+            gop_frame_count=value("--gopFrameCount"),
+            b_frames=value("--consecutiveBFrameCount"),
+            slices=value("--slices"),
+            temporal_layers=value("--temporalLayerCount"),
+            intra_refresh="--intraRefreshMode" in args,
+            last_frame_type="--lastFrameType" in args)
+
+
+@dataclass
+class PictureInfo:
+    """Structure of one frame of a stream."""
+    key: bool
+    type: str = ""  # PICTURE_I, PICTURE_P, PICTURE_B or "" if unknown
+    slices: int = 0  # H.264/H.265 only
+    temporal_id: int = 0
+
+
+@dataclass
+class StructureReport:
+    """Pictures of a stream and the checks they failed."""
+    codec: str
+    pictures: List[PictureInfo] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        """Whether every check passed."""
+        return not self.failures
+
+    @property
+    def key_frames(self) -> List[int]:
+        """Indices of the key frames."""
+        return [i for i, p in enumerate(self.pictures) if p.key]
+
+    def to_dict(self) -> dict:
+        """Summary for JSON export."""
+        types = Counter(p.type for p in self.pictures if p.type)
+        data: Dict = {
+            "frames": len(self.pictures),
+            "key_frames": self.key_frames,
+            "picture_types": dict(sorted(types.items())),
+            "max_temporal_id": max((p.temporal_id for p in self.pictures),
+                                   default=0),
+        }
+        if self.failures:
+            data["failures"] = list(self.failures)
+        return data
+
+
+def _rbsp(data: Buffer, unit: StreamUnit, header: int,
+          limit: int = 32) -> bytes:
+    """First bytes of a NAL unit's RBSP after its header."""
+    start = unit.offset + header
+    return unescape(data[start:min(start + limit,
+                                   unit.offset + unit.size)])
+
+
+def _h264_picture(data: Buffer, frame: StreamFrame) -> PictureInfo:
+    """Type, slices and temporal id of an H.264 access unit."""
+    slices = [u for u in frame.units if u.type in H264_VCL_TYPES]
+    picture = PictureInfo(key=frame.key, slices=len(slices))
+    if slices:
+        bits = BitReader(_rbsp(data, slices[0], 1))
+        bits.ue()  # first_mb_in_slice
+        picture.type = H264_SLICE_TYPES[bits.ue() % 5]
+    for unit in frame.units:
+        # SVC prefix NAL unit: svc_extension_flag, then temporal_id in
+        # the top bits of the third extension byte
+        if (unit.type == H264_PREFIX_NAL and unit.size >= 4
+                and data[unit.offset + 1] & 0x80):
+            picture.temporal_id = data[unit.offset + 3] >> 5
+            break
+    return picture
+
+
+def _h265_picture(data: Buffer, frame: StreamFrame,
+                  extra_bits: Dict[int, int]) -> PictureInfo:
+    """Type, slices and temporal id of an H.265 access unit;
+    `extra_bits` maps PPS ids to num_extra_slice_header_bits."""
+    picture = PictureInfo(key=frame.key)
+    for unit in frame.units:
+        if unit.type == H265_PPS:
+            bits = BitReader(_rbsp(data, unit, 2))
+            pps_id = bits.ue()
+            bits.ue()  # pps_seq_parameter_set_id
+            # dependent_slice_segments_enabled_flag, output_flag_present_flag
+            bits.u(2)
+            extra_bits[pps_id] = bits.u(3)
+        elif unit.type in H265_VCL_TYPES and unit.layer_id == 0:
+            picture.slices += 1
+            if picture.slices > 1:
+                continue
+            picture.temporal_id = unit.temporal_id
+            bits = BitReader(_rbsp(data, unit, 2))
+            if not bits.u(1):  # first_slice_segment_in_pic_flag
+                continue
+            if 16 <= unit.type <= 23:
+                bits.u(1)  # no_output_of_prior_pics_flag
+            pps_id = bits.ue()
+            bits.u(extra_bits.get(pps_id, 0))  # slice_reserved_flag
+            picture.type = H265_SLICE_TYPES[min(bits.ue(), 2)]
+    return picture
+
+
+def _av1_picture(data: Buffer, frame: StreamFrame,
+                 state: Av1State) -> PictureInfo:
+    """Type and temporal id of an AV1 temporal unit; B frames are not
+    told apart from P frames."""
+    types = state.frame_types(data, frame.units)
+    picture = PictureInfo(key=frame.key, temporal_id=max(
+        (u.temporal_id for u in frame.units), default=0))
+    coded = [t for t in types if t is not None]
+    if any(t in (AV1_KEY_FRAME, AV1_INTRA_ONLY_FRAME) for t in coded):
+        picture.type = PICTURE_I
+    elif coded:
+        picture.type = PICTURE_P
+    return picture
+
+
+def read_pictures(path: Path, codec: Optional[str] = None) -> StructureReport:
+    """Pictures of an encoded stream.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or parsed
+    """
+    with map_file(path) as data:
+        info = parse_buffer(data, path, codec)
+        report = StructureReport(info.codec)
+        extra_bits: Dict[int, int] = {}
+        av1 = Av1State()
+        for frame in info.frames:
+            if info.codec == "h264":
+                picture = _h264_picture(data, frame)
+            elif info.codec == "h265":
+                picture = _h265_picture(data, frame, extra_bits)
+            elif info.codec == "av1":
+                picture = _av1_picture(data, frame, av1)
+            else:
+                picture = PictureInfo(key=frame.key)
+            report.pictures.append(picture)
+    return report
+
+
+def _expected_key_frames(frames: int, idr_period: int) -> List[int]:
+    """Key frame indices of an IDR period (0: the first frame only)."""
+    return list(range(0, frames, idr_period)) if idr_period > 0 else [0]
+
+
+def _expected_intra_frames(key_frames: List[int], frames: int,
+                           gop_frame_count: int) -> int:
+    """Number of intra pictures: one per GOP of every IDR period."""
+    bounds = key_frames + [frames]
+    return sum(-(-(end - start) // gop_frame_count)
+               for start, end in zip(bounds, bounds[1:]))
+
+
+def _longest_run(pictures: List[PictureInfo], picture_type: str) -> int:
+    """Longest run of consecutive pictures of a type."""
+    longest = run = 0
+    for picture in pictures:
+        run = run + 1 if picture.type == picture_type else 0
+        longest = max(longest, run)
+    return longest
+
+
+def _check_first_key(report: StructureReport,
+                     _expected: StructureExpectation) -> Optional[str]:
+    """The stream starts with a key frame."""
+    if not report.pictures[0].key:
+        return "first frame is not a key frame"
+    return None
+
+
+def _check_key_frames(report: StructureReport,
+                      expected: StructureExpectation) -> Optional[str]:
+    """Key frames follow --idrPeriod."""
+    if expected.idr_period is None:
+        return None
+    keys = _expected_key_frames(len(report.pictures), expected.idr_period)
+    if report.key_frames != keys:
+        return (f"key frames at {report.key_frames[:8]}, expected "
+                f"{keys[:8]} (--idrPeriod {expected.idr_period})")
+    return None
+
+
+def _check_intra_frames(report: StructureReport,
+                        expected: StructureExpectation) -> Optional[str]:
+    """Each GOP of --gopFrameCount starts with an intra picture, when the
+    type of every picture is known."""
+    pictures = report.pictures
+    if (not expected.gop_frame_count or expected.gop_frame_count <= 0
+            or expected.intra_refresh or expected.last_frame_type
+            or not all(p.type for p in pictures if not p.key)):
+        return None
+    intra = sum(1 for p in pictures if p.type == PICTURE_I)
+    wanted = _expected_intra_frames(report.key_frames, len(pictures),
+                                    expected.gop_frame_count)
+    if intra != wanted:
+        return (f"{intra} intra frames, expected {wanted} "
+                f"(--gopFrameCount {expected.gop_frame_count})")
+    return None
+
+
+def _check_b_frames(report: StructureReport,
+                    expected: StructureExpectation) -> Optional[str]:
+    """No more consecutive B frames than --consecutiveBFrameCount."""
+    if expected.b_frames is None or report.codec == "av1":
+        return None
+    run = _longest_run(report.pictures, PICTURE_B)
+    if run > expected.b_frames:
+        return (f"{run} consecutive B frames, expected at most "
+                f"{expected.b_frames}")
+    return None
+
+
+def _check_slices(report: StructureReport,
+                  expected: StructureExpectation) -> Optional[str]:
+    """Every H.264/H.265 picture has the configured number of slices."""
+    if (not expected.slices or report.codec not in ("h264", "h265")
+            or expected.intra_refresh):
+        return None
+    pictures = report.pictures
+    wrong = [i for i, p in enumerate(pictures)
+             if p.slices != expected.slices]
+    if wrong:
+        return (f"frame {wrong[0]} has {pictures[wrong[0]].slices} "
+                f"slices, expected {expected.slices}")
+    return None
+
+
+def _check_temporal_layers(report: StructureReport,
+                           expected: StructureExpectation) -> Optional[str]:
+    """Temporal ids stay below the number of temporal layers."""
+    if not expected.temporal_layers:
+        return None
+    highest = max(p.temporal_id for p in report.pictures)
+    if highest >= expected.temporal_layers:
+        return (f"temporal id {highest}, expected fewer than "
+                f"{expected.temporal_layers} layers")
+    return None
+
+
+# Checks of a stream with at least one frame, in reporting order
+STRUCTURE_CHECKS = (
+    _check_first_key,
+    _check_key_frames,
+    _check_intra_frames,
+    _check_b_frames,
+    _check_slices,
+    _check_temporal_layers,
+)
+
+
+def check_structure(report: StructureReport,
+                    expected: StructureExpectation) -> List[str]:
+    """Compare the pictures of a stream with the expected structure.
+
+    Returns:
+        Description of each failed check (empty when all pass)
+    """
+    count = len(report.pictures)
+    failures = []
+    if expected.frames is not None and count != expected.frames:
+        failures.append(f"{count} frames, expected {expected.frames}")
+    if not count:
+        return failures or ["no frames"]
+    for check in STRUCTURE_CHECKS:
+        failure = check(report, expected)
+        if failure:
+            failures.append(failure)
+    return failures
+
+
+def check_stream_structure(path: Path, codec: Optional[str],
+                           expected: StructureExpectation
+                           ) -> StructureReport:
+    """Read a stream and check its structure; the failures are in the
+    report.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or parsed
+    """
+    report = read_pictures(path, codec)
+    report.failures = check_structure(report, expected)
+    return report
@@ -0,0 +1,243 @@
+"""
+Video Test Encoder Sweep
+Expands a declared matrix of encoder options (quality level, tuning mode,
+rate control, GOP structure, ...) into encode test samples and finds the
+speed/size Pareto front of the measured configurations.
+
+A sweep file names the encoder options and their values, and optionally
+the encode samples to sweep (default: the selected encode suite):
+
+    {
+      "samples": ["h264_default"],
+      "matrix": {
+        "qualityLevel": [0, 2, 4],
+        "tuningMode": ["default", "hq", "lowlatency"],
+        "consecutiveBFrameCount": [0, 2]
+      }
+    }
+
+Each combination becomes a copy of the sample with the options appended
+to its arguments. A configuration is on the front of its sample when no
+other configuration of that sample encodes both faster and to a smaller
+output. When the encode quality is measured, the luma PSNR of the decoded
+output is a third objective, so that a configuration that is slower or
+larger but of higher quality stays on the front.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+import itertools
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from tests.libs.video_test_config_base import TestResult, VideoTestStatus
+from tests.libs.video_test_tuning import option_args
+
+# Objective of the Pareto front: value of a point and whether larger is
+# better
+Objective = Tuple[Callable[["SweepPoint"], float], bool]
+
+
+@dataclass
+class SweepSpec:
+    """Parsed sweep file."""
+    matrix: Dict[str, list]
+    samples: List[str] = field(default_factory=list)
+
+    def combinations(self) -> List[Dict[str, object]]:
+        """All option combinations, in a stable order."""
+        names = list(self.matrix)
+        return [dict(zip(names, values)) for values in
+                itertools.product(*(self.matrix[n] for n in names))]
+
+
+def load_sweep(path: str) -> SweepSpec:
+    """Load a sweep file.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or is invalid
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    matrix = data.get("matrix") if isinstance(data, dict) else None
+    if not isinstance(matrix, dict) or not matrix:
+        raise ValueError(f"{path}: expected a 'matrix' of option lists")
+    for name, values in matrix.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"{path}: '{name}' needs a list of values")
+    samples = data.get("samples", [])
+    if not isinstance(samples, list):
+        raise ValueError(f"{path}: 'samples' must be a list of names")
+    return SweepSpec(matrix=matrix, samples=samples)
+
+
+def expand_sweep(base_configs: list, spec: SweepSpec
+                 ) -> Tuple[list, Dict[str, Tuple[str, dict]]]:
+    """Copy each base sample once per option combination.
+
+    Returns:
+        Tuple of (expanded configs, map of expanded name to the base
+        sample name and its options)
+    """
+    if spec.samples:
+        base_configs = [c for c in base_configs if c.name in spec.samples]
+    configs = []
+    origins = {}
+    for base in base_configs:
+        for index, params in enumerate(spec.combinations()):
+            name = f"{base.name}_sweep{index:03d}"
+            configs.append(dataclasses.replace(
+                base, name=name,
+                extra_args=list(base.extra_args or []) + option_args(params),
+                description=f"{base.description} "
+                            f"[{' '.join(option_args(params))}]".strip()))
+            origins[name] = (base.name, params)
+    return configs, origins
+
+
+@dataclass
+class SweepPoint:  # pylint: disable=too-many-instance-attributes
+    """Measured outcome of one configuration of a sweep."""
+    sample: str
+    codec: str
+    params: Dict[str, object]
+    frames: int = 0
+    seconds: float = 0.0
+    output_bytes: int = 0
+    # Average luma PSNR of the decoded output, if measured
+    psnr_y: Optional[float] = None
+    error: str = ""
+    not_supported: bool = False
+    on_front: bool = False
+
+    @property
+    def fps(self) -> float:
+        """Frames encoded per second (wall time of the encoder)."""
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        """Average size of an encoded frame."""
+        return self.output_bytes / self.frames if self.frames else 0.0
+
+    @property
+    def measured(self) -> bool:
+        """Whether the configuration encoded frames."""
+        return not self.error and not self.not_supported and self.frames > 0
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        data = {
+            "sample": self.sample,
+            "codec": self.codec,
+            "params": self.params,
+            "args": option_args(self.params),
+        }
+        if self.measured:
+            data.update({
+                "frames": self.frames,
+                "seconds": round(self.seconds, 4),
+                "fps": round(self.fps, 2),
+                "output_bytes": self.output_bytes,
+                "bytes_per_frame": round(self.bytes_per_frame, 1),
+                "pareto": self.on_front,
+            })
+            if self.psnr_y is not None:
+                data["psnr_y"] = round(self.psnr_y, 4)
+        if self.not_supported:
+            data["not_supported"] = True
+        elif self.error:
+            data["error"] = self.error
+        return data
+
+
+def collect_points(results: List[TestResult],
+                   origins: Dict[str, Tuple[str, dict]],
+                   quality: bool = False) -> List[SweepPoint]:
+    """Sweep points of the results of the expanded configs.
+
+    With quality, the luma PSNR of each result is required, and results
+    without it are errors.
+    """
+    points = []
+    for result in results:
+        if result.config.name not in origins:
+            continue
+        sample, params = origins[result.config.name]
+        point = SweepPoint(sample=sample, codec=result.config.codec.value,
+                           params=params)
+        stats = result.meta.get("encode_stats")
+        psnr = result.meta.get("quality", {}).get("psnr")
+        if result.status == VideoTestStatus.NOT_SUPPORTED:
+            point.not_supported = True
+        elif result.status != VideoTestStatus.SUCCESS:
+            point.error = result.error_message or result.status.value
+        elif not stats or not stats["frames"]:
+            point.error = "no frame count in encoder output"
+        elif quality and not psnr:
+            point.error = "no quality measurement of the decoded output"
+        else:
+            point.psnr_y = psnr["y"] if psnr else None
+            point.frames = stats["frames"]
+            point.seconds = stats["seconds"]
+            point.output_bytes = stats["output_bytes"]
+        points.append(point)
+    return points
+
+
+SPEED_AND_SIZE: Sequence[Objective] = (
+    (lambda p: p.fps, True),
+    (lambda p: p.bytes_per_frame, False),
+)
+
+SPEED_SIZE_AND_QUALITY: Sequence[Objective] = (
+    *SPEED_AND_SIZE,
+    (lambda p: p.psnr_y, True),
+)
+
+
+def _dominates(a: SweepPoint, b: SweepPoint,
+               objectives: Sequence[Objective]) -> bool:
+    """Whether a is at least as good as b everywhere and better once."""
+    better = False
+    for value, maximize in objectives:
+        va, vb = (value(a), value(b)) if maximize else (-value(a), -value(b))
+        if va < vb:
+            return False
+        better = better or va > vb
+    return better
+
+
+def pareto_front(points: List[SweepPoint],
+                 objectives: Optional[Sequence[Objective]] = None
+                 ) -> List[SweepPoint]:
+    """Mark the non-dominated points of each sample.
+
+    Returns:
+        The points on the front, fastest first within each sample
+    """
+    objectives = objectives or SPEED_AND_SIZE
+    front = []
+    samples = dict.fromkeys(p.sample for p in points)
+    for sample in samples:
+        group = [p for p in points if p.sample == sample and p.measured]
+        for point in group:
+            point.on_front = not any(_dominates(other, point, objectives)
+                                     for other in group)
+        front.extend(sorted((p for p in group if p.on_front),
+                            key=lambda p: -p.fps))
+    return front
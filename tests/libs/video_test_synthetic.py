@@ -0,0 +1,222 @@
+"""
+Video Test Synthetic Sources
+Generates deterministic raw YUV or Y4M sources for encode tests, so that
+encoder coverage at any resolution does not need downloaded sources.
+
+Patterns:
+
+- gradient: luma and chroma gradients panning slowly across the frame
+- moving: a checkerboard moving diagonally over the gradient
+- noise: uniform noise around mid-grey, new for every frame
+- scene_cuts: switches between the other patterns, with a new seed and
+  colour offset, every scene_length frames
+
+Frames are computed with NumPy, one at a time, and depend only on the
+spec and the frame index. Generated files are cached by a hash of the
+spec, the layout and the generator version; a file is written under a
+temporary name and renamed when complete.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from tests.libs.video_test_frames import (
+    DEFAULT_FRAME_RATE,
+    FrameLayout,
+    pack_planes,
+)
+
+# Part of the cache key: bump when the generated frames change
+GENERATOR_VERSION = 1
+
+PATTERN_GRADIENT = "gradient"
+PATTERN_MOVING = "moving"
+PATTERN_NOISE = "noise"
+PATTERN_SCENE_CUTS = "scene_cuts"
+PATTERNS = (PATTERN_GRADIENT, PATTERN_MOVING, PATTERN_NOISE,
+            PATTERN_SCENE_CUTS)
+
+SYNTHETIC_DIR = Path(__file__).parent.parent / "resources" / "synthetic"
+CHECKER_SIZE = 16
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Parameters of a synthetic source other than its layout."""
+    pattern: str = PATTERN_MOVING
+    frames: int = 30
+    seed: int = 0
+    scene_length: int = 30
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SyntheticSpec":
+        """Parse the "synthetic" object of an encode sample.
+
+        Raises:
+            ValueError: Unknown pattern or field, a field of the wrong
+            type or an invalid count
+        """
+        fields = {f.name: f for f in dataclasses.fields(cls)}
+        unknown = set(data) - set(fields)
+        if unknown:
+            raise ValueError(f"unknown synthetic fields: "
+                             f"{', '.join(sorted(unknown))}")
+        for name, value in data.items():
+            expected = type(fields[name].default)
+            if isinstance(value, bool) or not isinstance(value, expected):
+                raise ValueError(f"synthetic {name} must be of type "
+                                 f"{expected.__name__}")
+        spec = cls(**data)
+        if spec.pattern not in PATTERNS:
+            raise ValueError(f"unknown synthetic pattern {spec.pattern}; "
+                             f"choose from {', '.join(PATTERNS)}")
+        if spec.frames < 1 or spec.scene_length < 1:
+            raise ValueError("synthetic frames and scene_length must be "
+                             "positive")
+        return spec
+
+
+def cache_key(spec: SyntheticSpec, layout: FrameLayout, y4m: bool) -> str:
+    """Hash of everything that determines the generated file."""
+    params = {"version": GENERATOR_VERSION, "y4m": y4m,
+              "spec": dataclasses.asdict(spec),
+              "layout": dataclasses.asdict(layout)}
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()
+                          ).hexdigest()[:16]
+
+
+def source_path(spec: SyntheticSpec, layout: FrameLayout, y4m: bool = False,
+                cache_dir: Path = SYNTHETIC_DIR) -> Path:
+    """Cache file of a synthetic source."""
+    name = (f"{spec.pattern}_{layout.width}x{layout.height}_"
+            f"{layout.chroma}p{layout.bit_depth}_{spec.frames}_"
+            f"{cache_key(spec, layout, y4m)}")
+    return Path(cache_dir) / (name + (".y4m" if y4m else ".yuv"))
+
+
+def _gradient(width: int, height: int, index: int, phase: float):
+    """Diagonal gradient in [0, 1] panning one sample per frame."""
+    x = (np.arange(width) + index) / width
+    y = np.arange(height)[:, None] / height
+    return ((x + y + phase) / 2) % 1.0
+
+
+def _checker(width: int, height: int, index: int, size: int):
+    """Checkerboard of 0/1 squares moving (2, 1) samples per frame."""
+    x = (np.arange(width) - 2 * index) // size
+    y = (np.arange(height)[:, None] - index) // size
+    return ((x + y) % 2).astype(np.float64)
+
+
+def _plane(spec: SyntheticSpec, plane: int, size: Tuple[int, int],
+           index: int, scale: int):
+    """One component in [0, 1] of a basic pattern; size is the (width,
+    height) of the plane and scale its subsampling."""
+    width, height = size
+    if spec.pattern == PATTERN_NOISE:
+        rng = np.random.default_rng([spec.seed, index, plane])
+        return 0.5 + (rng.random((height, width)) - 0.5) * 0.6
+    phase = (spec.seed * 0.37 + plane * 0.25) % 1.0
+    values = _gradient(width, height, index, phase)
+    if plane == 0:
+        values = 0.15 + 0.7 * values
+    else:
+        values = 0.35 + 0.3 * values
+    if spec.pattern == PATTERN_MOVING and plane == 0:
+        checker = _checker(width, height, index,
+                           max(1, CHECKER_SIZE // scale))
+        values = 0.6 * values + 0.4 * checker
+    return values
+
+
+def generate_frame(spec: SyntheticSpec, layout: FrameLayout,
+                   index: int) -> List:
+    """Y, U and V sample values of one frame as arrays at the layout's
+    bit depth."""
+    if spec.pattern == PATTERN_SCENE_CUTS:
+        scene = index // spec.scene_length
+        basic = (PATTERN_GRADIENT, PATTERN_MOVING, PATTERN_NOISE)
+        spec = dataclasses.replace(spec, pattern=basic[scene % len(basic)],
+                                   seed=spec.seed * 1000 + scene)
+    planes = []
+    for plane, size in enumerate(layout.plane_dimensions):
+        scale = 1 if plane == 0 else layout.width // size[0]
+        values = _plane(spec, plane, size, index, scale)
+        planes.append(np.clip(np.rint(values * layout.peak), 0, layout.peak)
+                      .astype(np.uint16))
+    return planes
+
+
+def y4m_header(layout: FrameLayout, frame_rate: float) -> bytes:
+    """Y4M stream header of a planar layout."""
+    rate = Fraction(frame_rate).limit_denominator(1001)
+    colour = layout.chroma
+    if layout.bit_depth > 8:
+        colour += f"p{layout.bit_depth}"
+    return (f"YUV4MPEG2 W{layout.width} H{layout.height} "
+            f"F{rate.numerator}:{rate.denominator} Ip A1:1 C{colour}\n"
+            ).encode("ascii")
+
+
+def write_source(path: Path, spec: SyntheticSpec, layout: FrameLayout,
+                 y4m: bool = False) -> None:
+    """Generate a source file (atomic replace); Y4M files get the default
+    frame rate.
+
+    Raises:
+        OSError: The file cannot be written
+        ValueError: NumPy is missing or the layout cannot be stored
+    """
+    if np is None:
+        raise ValueError("synthetic sources need NumPy")
+    if y4m and (layout.num_planes != 3 or layout.sample_shift):
+        raise ValueError("Y4M sources must be planar and LSB-aligned")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        if y4m:
+            f.write(y4m_header(layout, DEFAULT_FRAME_RATE))
+        for index in range(spec.frames):
+            if y4m:
+                f.write(b"FRAME\n")
+            f.write(pack_planes(generate_frame(spec, layout, index), layout))
+    os.replace(tmp_path, path)
+
+
+def ensure_source(spec: SyntheticSpec, layout: FrameLayout, y4m: bool = False,
+                  cache_dir: Path = SYNTHETIC_DIR) -> Path:
+    """Cache file of a synthetic source, generated if missing.
+
+    Raises:
+        OSError, ValueError: See write_source()
+    """
+    path = source_path(spec, layout, y4m, cache_dir)
+    if not path.exists():
+        write_source(path, spec, layout, y4m)
+    return path
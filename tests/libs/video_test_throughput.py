@@ -0,0 +1,133 @@
+"""
+Video Test Decode Throughput
+Derives the decode rate of a test from the decoder's output: the frame
+count, frames per second, pixel rate and the distribution of the time per
+frame.
+
+With --verbose the decoder prints a progress line ("Frame N, FPS: X")
+about once a second and once more at the end of the stream. Each line gives
+the frames decoded since the previous one and their rate, so the decode
+time excludes process start-up and the time per frame is known per
+interval. Without progress lines, the number of "CRC Frame[N]" lines of
+--crcperframe and the wall time of the test process are used instead.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+TIMING_DECODER = "decoder"  # intervals reported by the progress lines
+TIMING_WALL = "wall"        # wall time of the test process
+
+
+def weighted_percentile(values: Sequence[Tuple[float, int]],
+                        pct: float) -> float:
+    """Nearest-rank percentile of values given as (value, count) pairs."""
+    ordered = sorted(values)
+    total = sum(count for _, count in ordered)
+    rank = max(1, -(-total * pct // 100))  # ceil without float error
+    seen = 0
+    for value, count in ordered:
+        seen += count
+        if seen >= rank:
+            return value
+    return ordered[-1][0]
+
+
+@dataclass
+class DecodeThroughput:  # pylint: disable=too-many-instance-attributes
+    """Decode rate of one test."""
+    frames: int
+    seconds: float
+    timing: str  # TIMING_DECODER or TIMING_WALL
+    width: int = 0
+    height: int = 0
+    # Time per frame in milliseconds; per progress interval, so only
+    # available with decoder timing
+    frame_ms_p50: Optional[float] = None
+    frame_ms_p95: Optional[float] = None
+    frame_ms_max: Optional[float] = None
+
+    @property
+    def fps(self) -> float:
+        """Frames decoded per second."""
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def pixel_rate(self) -> float:
+        """Pixels decoded per second (0 if the resolution is unknown)."""
+        return self.width * self.height * self.fps
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON export."""
+        data = {
+            "frames": self.frames,
+            "seconds": round(self.seconds, 4),
+            "timing": self.timing,
+            "fps": round(self.fps, 2),
+        }
+        if self.width and self.height:
+            data["width"] = self.width
+            data["height"] = self.height
+            data["mpixels_per_s"] = round(self.pixel_rate / 1e6, 2)
+        if self.frame_ms_p50 is not None:
+            data["frame_ms"] = {
+                "p50": round(self.frame_ms_p50, 3),
+                "p95": round(self.frame_ms_p95, 3),
+                "max": round(self.frame_ms_max, 3),
+            }
+        return data
+
+
+def compute_decode_throughput(progress: List[Tuple[int, float]],
+                              crc_frames: int,
+                              resolution: Optional[Tuple[int, int]],
+                              wall_seconds: float
+                              ) -> Optional[DecodeThroughput]:
+    """Compute the decode rate of a test.
+
+    Args:
+        progress: (cumulative frame count, fps) of each progress line
+        crc_frames: Number of per-frame CRC lines
+        resolution: Decoded (width, height), if known
+        wall_seconds: Wall time of the test process
+
+    Returns:
+        DecodeThroughput, or None if the output reports no frames
+    """
+    width, height = resolution or (0, 0)
+    intervals = []  # (ms per frame, frames)
+    previous = 0
+    for frame, fps in progress:
+        frames = frame - previous
+        previous = max(previous, frame)
+        if frames > 0 and fps > 0:
+            intervals.append((1000.0 / fps, frames))
+
+    if intervals:
+        return DecodeThroughput(
+            frames=previous,
+            seconds=sum(ms * n for ms, n in intervals) / 1000.0,
+            timing=TIMING_DECODER, width=width, height=height,
+            frame_ms_p50=weighted_percentile(intervals, 50),
+            frame_ms_p95=weighted_percentile(intervals, 95),
+            frame_ms_max=max(ms for ms, _ in intervals))
+
+    frames = max(previous, crc_frames)
+    if frames <= 0 or wall_seconds <= 0:
+        return None
+    return DecodeThroughput(frames=frames, seconds=wall_seconds,
+                            timing=TIMING_WALL, width=width, height=height)
@@ -0,0 +1,127 @@
+"""
+Video Test Timeout Policies
+Chooses the timeout of each test: a per-sample "timeout" from the test
+suite, an adaptive timeout derived from the test's run history, or the
+static --timeout default.
+
+The adaptive timeout is a high percentile of the recorded durations times a
+safety factor, clamped to a floor and a ceiling, so a hung 0.2 s test is
+killed after seconds instead of minutes while long tests get more time than
+the static default.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from tests.libs.video_test_regression import (
+    HISTORY_WINDOW,
+    MIN_HISTORY_SAMPLES,
+)
+from tests.libs.video_test_run_history import RunHistory
+
+POLICY_STATIC = "static"      # --timeout (or the built-in default)
+POLICY_SAMPLE = "sample"      # "timeout" of the test suite entry
+POLICY_ADAPTIVE = "adaptive"  # derived from the run history
+
+ADAPTIVE_PERCENTILE = 95
+ADAPTIVE_FACTOR = 3.0
+ADAPTIVE_FLOOR = 10.0     # seconds; covers start-up jitter of short tests
+ADAPTIVE_CEILING = 900.0  # seconds
+
+
+@dataclass
+class TimeoutDecision:
+    """Timeout applied to a test and the policy that chose it."""
+    seconds: float
+    policy: str
+    # Adaptive policy only: percentile of the history and number of runs
+    basis_ms: Optional[float] = None
+    samples: int = 0
+
+    def describe(self) -> str:
+        """Human readable description of the policy."""
+        if self.policy == POLICY_ADAPTIVE:
+            return (f"adaptive timeout: {ADAPTIVE_FACTOR:g} x "
+                    f"p{ADAPTIVE_PERCENTILE} of {self.samples} runs "
+                    f"({self.basis_ms / 1000:.2f}s)")
+        if self.policy == POLICY_SAMPLE:
+            return "per-sample timeout"
+        return "static timeout"
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable dictionary."""
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 2)
+        if self.basis_ms is not None:
+            data["basis_ms"] = round(self.basis_ms, 2)
+        return data
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentile of samples with linear interpolation between ranks."""
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def adaptive_timeout(history_ms: List[float], *,
+                     pct: float = ADAPTIVE_PERCENTILE,
+                     factor: float = ADAPTIVE_FACTOR,
+                     floor: float = ADAPTIVE_FLOOR,
+                     ceiling: float = ADAPTIVE_CEILING
+                     ) -> Optional[TimeoutDecision]:
+    """Derive a timeout from previous durations.
+
+    Args:
+        history_ms: Durations of previous successful runs
+        pct: Percentile of the history used as the expected duration
+        factor: Safety factor applied to the percentile
+        floor: Minimum timeout in seconds
+        ceiling: Maximum timeout in seconds
+
+    Returns:
+        TimeoutDecision, or None when there is not enough history
+    """
+    if len(history_ms) < MIN_HISTORY_SAMPLES:
+        return None
+    basis_ms = percentile(history_ms, pct)
+    seconds = min(max(basis_ms / 1000.0 * factor, floor), ceiling)
+    return TimeoutDecision(seconds=seconds, policy=POLICY_ADAPTIVE,
+                           basis_ms=basis_ms, samples=len(history_ms))
+
+
+# pylint: disable=too-many-arguments
+def find_adaptive_timeout(history: RunHistory, name: str, *,
+                          test_type: str, driver: Optional[str],
+                          gpu_name: Optional[str],
+                          binary_name: str) -> Optional[TimeoutDecision]:
+    """Derive the timeout of a test from its history on the same system.
+
+    Uses the same runs as the regression check: previous successful runs
+    of the test on the same GPU, driver and executable. A driver or GPU of
+    None (not detected yet) matches runs on any.
+
+    Returns:
+        TimeoutDecision, or None when there is not enough history
+    """
+    rows = history.test_history(
+        name, test_type=test_type, driver=driver, gpu_name=gpu_name,
+        binary_name=binary_name, status="success", limit=HISTORY_WINDOW)
+    return adaptive_timeout([row["execution_time_ms"] for row in rows])
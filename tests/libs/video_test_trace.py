@@ -0,0 +1,191 @@
+"""
+Video Test Timeline Tracing
+Records timed spans of the test harness (resource checks, test execution,
+decoder validation, hashing, cleanup) and exports them in the Chrome
+trace-event format, which can be opened with https://ui.perfetto.dev or
+chrome://tracing.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Span categories
+CATEGORY_SUITE = "suite"    # Whole test suites and suite-level steps
+CATEGORY_TEST = "test"      # One span per executed test
+CATEGORY_PHASE = "phase"    # Steps inside a test (run, validation, MD5...)
+CATEGORY_SETUP = "setup"    # Resource hashing and downloads
+
+
+@dataclass
+class TraceSpan:
+    """A completed span on a worker track."""
+    name: str
+    category: str
+    start: float          # Seconds since the recorder was created
+    duration: float       # Seconds
+    track: int            # Worker track number (1 = first thread seen)
+    args: Dict = field(default_factory=dict)
+
+
+class TraceRecorder:
+    """Thread-safe recorder of harness spans.
+
+    Every thread that records a span gets its own track, so tests run by
+    concurrent workers appear as parallel tracks in the trace viewer.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: List[TraceSpan] = []
+        self._tracks: Dict[int, int] = {}
+        self._track_names: Dict[int, str] = {}
+
+    def _current_track(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            if ident not in self._tracks:
+                track = len(self._tracks) + 1
+                self._tracks[ident] = track
+                self._track_names[track] = (
+                    "main" if threading.current_thread()
+                    is threading.main_thread()
+                    else threading.current_thread().name)
+            return self._tracks[ident]
+
+    def now(self) -> float:
+        """Seconds elapsed since the recorder was created."""
+        return time.perf_counter() - self._origin
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = CATEGORY_PHASE,
+             **args) -> Iterator[Dict]:
+        """Record a span around a block of code.
+
+        Yields the span's argument dictionary, which may be updated inside
+        the block (e.g. with the test status).
+        """
+        track = self._current_track()
+        start = self.now()
+        try:
+            yield args
+        finally:
+            self.add_span(TraceSpan(name=name, category=category,
+                                    start=start, duration=self.now() - start,
+                                    track=track, args=args))
+
+    def add_span(self, span: TraceSpan) -> None:
+        """Add a completed span."""
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[TraceSpan]:
+        """Copy of all spans recorded so far."""
+        with self._lock:
+            return list(self._spans)
+
+    def mark(self) -> int:
+        """Return a position usable with spans_since()."""
+        with self._lock:
+            return len(self._spans)
+
+    def spans_since(self, mark: int) -> List[TraceSpan]:
+        """Return the spans completed after mark() was called."""
+        with self._lock:
+            return self._spans[mark:]
+
+    def phase_totals(self, mark: int) -> Dict[str, float]:
+        """Sum the phases recorded on the calling thread since mark.
+
+        Only top-level phase spans are counted; a phase nested in another
+        one (e.g. the decoder run inside decoder_validation) is part of its
+        parent's time.
+
+        Returns:
+            Mapping of phase name to seconds, in order of first occurrence
+        """
+        track = self._current_track()
+        phases = sorted((s for s in self.spans_since(mark)
+                         if s.track == track
+                         and s.category == CATEGORY_PHASE),
+                        key=lambda s: (s.start, -s.duration))
+        totals: Dict[str, float] = {}
+        covered_until = float("-inf")
+        for span in phases:
+            if span.start < covered_until:
+                continue
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+            covered_until = span.start + span.duration
+        return totals
+
+    def to_chrome_trace(self) -> Dict:
+        """Return the recorded spans as a Chrome trace-event document."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            track_names = dict(self._track_names)
+
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": "vvs_test_runner"}}]
+        for track, track_name in sorted(track_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid,
+                           "tid": track, "args": {"name": track_name}})
+        for span in sorted(spans, key=lambda s: (s.track, s.start)):
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": span.track,
+                "args": span.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, output_file: str) -> bool:
+        """Write the Chrome trace JSON file.
+
+        Returns:
+            True if the file was written
+        """
+        try:
+            path = Path(output_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, default=str)
+            print(f"🕒 Trace written to: {output_file} "
+                  f"(open with https://ui.perfetto.dev)")
+            return True
+        except OSError as e:
+            print(f"✗ Failed to write trace: {e}")
+            return False
+
+
+def trace_span(tracer: Optional[TraceRecorder], name: str,
+               category: str = CATEGORY_PHASE, **args):
+    """Return tracer.span(...), or a no-op context when tracer is None."""
+    if tracer is None:
+        return contextlib.nullcontext(args)
+    return tracer.span(name, category, **args)
@@ -0,0 +1,206 @@
+"""
+Video Test Decoder Tuning
+Searches the decoder's pipeline-depth and queue options for the
+configuration with the highest decode rate on this GPU and driver, and
+stores it as a JSON profile.
+
+Each candidate configuration decodes the chosen samples; its score is the
+decode rate over all of them (frames over decoder-reported decode time),
+with the CPU time per frame as tie-breaker. The search is either a full
+grid or successive halving: every candidate gets a short measurement, the
+faster half survives and is measured again with twice the repetitions,
+until one candidate is left.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import itertools
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_utils import write_json_atomic
+
+PROFILE_VERSION = 1
+
+SEARCH_GRID = "grid"
+SEARCH_HALVING = "halving"
+SEARCH_METHODS = (SEARCH_GRID, SEARCH_HALVING)
+
+# Decoder options searched and their default candidate values. Boolean
+# options are flags passed only when True.
+DEFAULT_SPACE: Dict[str, list] = {
+    "decodeImagesInFlight": [2, 4, 8, 12],
+    "queueSize": [1, 3, 5, 8],
+    "enableHwLoadBalancing": [False, True],
+    # 0 is what the harness passes by default; 1 and 2 change the output
+    "enablePostProcessFilter": [0],
+}
+
+# Under the results directory of the test runner
+DEFAULT_PROFILE_DIR = "tuning_profiles"
+
+
+def option_args(params: Dict[str, object]) -> List[str]:
+    """Command line arguments of option values: booleans are flags passed
+    only when True, other values follow their option."""
+    args = []
+    for name, value in params.items():
+        if isinstance(value, bool):
+            if value:
+                args.append(f"--{name}")
+        else:
+            args.extend([f"--{name}", str(value)])
+    return args
+
+
+@dataclass
+class TuningCandidate:
+    """One decoder configuration and its accumulated measurements."""
+    params: Dict[str, object]
+    frames: int = 0
+    seconds: float = 0.0  # decode time reported by the decoder
+    cpu_seconds: float = 0.0
+    runs: int = 0
+    error: str = ""
+
+    @property
+    def args(self) -> List[str]:
+        """Decoder arguments of this configuration."""
+        return option_args(self.params)
+
+    @property
+    def fps(self) -> float:
+        """Decode rate over all measured runs."""
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def cpu_ms_per_frame(self) -> float:
+        """CPU time of the decoder process per decoded frame."""
+        return self.cpu_seconds * 1000 / self.frames if self.frames else 0.0
+
+    def to_dict(self) -> dict:
+        """Serialize for the profile file."""
+        data = {
+            "params": self.params,
+            "args": self.args,
+            "runs": self.runs,
+            "fps": round(self.fps, 2),
+            "cpu_ms_per_frame": round(self.cpu_ms_per_frame, 3),
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+def load_space(path: str) -> Dict[str, list]:
+    """Load a search space file: option name to list of candidate values.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or is invalid
+    """
+    with open(path, encoding="utf-8") as f:
+        space = json.load(f)
+    if not isinstance(space, dict) or not space:
+        raise ValueError(f"{path}: expected an object of option lists")
+    for name, values in space.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"{path}: '{name}' needs a list of values")
+    return space
+
+
+def expand_space(space: Dict[str, list]) -> List[TuningCandidate]:
+    """All combinations of the option values, in a stable order."""
+    names = list(space)
+    return [TuningCandidate(params=dict(zip(names, values)))
+            for values in itertools.product(*(space[n] for n in names))]
+
+
+def rank(candidates: List[TuningCandidate]) -> List[TuningCandidate]:
+    """Candidates without errors, fastest first (less CPU on ties)."""
+    return sorted((c for c in candidates if not c.error and c.frames),
+                  key=lambda c: (-round(c.fps, 1), c.cpu_ms_per_frame))
+
+
+Measure = Callable[[TuningCandidate, int], None]
+
+
+def grid_search(candidates: List[TuningCandidate], measure: Measure,
+                repeats: int) -> Optional[TuningCandidate]:
+    """Measure every candidate `repeats` times and return the best."""
+    for candidate in candidates:
+        measure(candidate, repeats)
+    ranked = rank(candidates)
+    return ranked[0] if ranked else None
+
+
+def successive_halving(candidates: List[TuningCandidate], measure: Measure,
+                       repeats: int) -> Optional[TuningCandidate]:
+    """Measure the survivors with doubling repetitions, halving them after
+    each round, and return the last one."""
+    survivors = list(candidates)
+    while True:
+        for candidate in survivors:
+            measure(candidate, repeats)
+        ranked = rank(survivors)
+        if len(ranked) <= 1:
+            return ranked[0] if ranked else None
+        survivors = ranked[:(len(ranked) + 1) // 2]
+        if len(survivors) == 1:
+            return survivors[0]
+        repeats *= 2
+
+
+def profile_path(directory: Path, driver: Optional[str],
+                 system_info: SystemInfo) -> Path:
+    """Default profile file of a GPU and driver."""
+    slug = re.sub(r'[^a-z0-9]+', '_',
+                  f"{driver or 'unknown'} {system_info.gpu_name or 'gpu'}"
+                  .lower()).strip('_')
+    return Path(directory) / f"decoder_{slug}.json"
+
+
+# pylint: disable=too-many-arguments
+def write_profile(path: Path, best: TuningCandidate,
+                  candidates: List[TuningCandidate], *,
+                  driver: Optional[str], system_info: SystemInfo,
+                  samples: List[str], search: str) -> None:
+    """Write the tuning profile (atomic replace)."""
+    data = {
+        "version": PROFILE_VERSION,
+        "driver": driver,
+        "system_info": system_info.to_dict(),
+        "search": search,
+        "samples": samples,
+        "best": best.to_dict(),
+        "candidates": [c.to_dict() for c in candidates if c.runs],
+    }
+    write_json_atomic(path, data)
+
+
+def load_profile_args(path: str) -> List[str]:
+    """Decoder arguments of the best configuration of a profile.
+
+    Raises:
+        OSError, ValueError: The file cannot be read or is not a profile
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != PROFILE_VERSION:
+        raise ValueError(f"unsupported tuning profile in {path}")
+    return list(data["best"]["args"])
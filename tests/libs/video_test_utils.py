@@ -20,6 +20,7 @@ limitations under the License.
 
 import hashlib
 import json
+import os
 from pathlib import Path
 
 # Constants
@@ -100,6 +101,58 @@ def verify_file_checksum(file_path: Path, expected_checksum: str) -> bool:
         return False
 
 
+def parse_int_list(value: str) -> list:
+    """Parse a comma separated list of positive integers
+
+    Raises:
+        ValueError: The list is empty or has a non-positive item
+    """
+    numbers = [int(item) for item in value.split(",") if item.strip()]
+    if not numbers or min(numbers) < 1:
+        raise ValueError(value)
+    return numbers
+
+
+def write_json_atomic(path, data) -> None:
+    """Write data as indented JSON, replacing path atomically so that
+    readers never see a partial file"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, target)
+
+
+def load_json_entries(path, version: int, key: str) -> dict:
+    """Entries stored under key in a JSON file of a format version;
+    empty if the file is missing, unreadable or of another version"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == version:
+            return data.get(key, {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def save_json_entries(path, version: int, key: str, entries: dict,
+                      description: str) -> bool:
+    """Write entries under key in a JSON file of a format version; a
+    failure is reported as a warning
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        write_json_atomic(path, {"version": version, key: entries})
+        return True
+    except OSError as e:
+        print(f"⚠️  Could not save {description}: {e}")
+        return False
+
+
 def safe_main_wrapper(main_func):
     """Decorator to wrap main function with standard exception handling
 
@@ -0,0 +1,66 @@
+"""
+Builders of hand-made coded streams for the unit tests.
+
+Bit strings of Exp-Golomb and fixed-width fields, NAL units with start
+codes and emulation prevention, AV1 OBUs and IVF files, shared by the
+bitstream, structure and stream index tests.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import struct
+
+
+def ue(value: int) -> str:
+    """Exp-Golomb code of a value as a bit string"""
+    code = bin(value + 1)[2:]
+    return "0" * (len(code) - 1) + code
+
+
+def u(value: int, bits: int) -> str:
+    """Fixed-width field as a bit string"""
+    return format(value, f"0{bits}b")
+
+
+def payload(bits: str) -> bytes:
+    """Bytes of a bit string with a stop bit"""
+    bits += "1"
+    bits += "0" * (-len(bits) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def nal(header: bytes, bits: str) -> bytes:
+    """NAL unit with a 4-byte start code and emulation prevention,
+    followed by non-zero bytes"""
+    escaped = bytearray()
+    for byte in payload(bits):
+        if escaped[-2:] == b"\x00\x00" and byte <= 3:
+            escaped.append(3)
+        escaped.append(byte)
+    return b"\x00\x00\x00\x01" + header + bytes(escaped) + b"\x55" * 4
+
+
+def obu(obu_type: int, data: bytes) -> bytes:
+    """OBU with a size field"""
+    return bytes([(obu_type << 3) | 0x02, len(data)]) + data
+
+
+def ivf(fourcc: bytes, frames) -> bytes:
+    """IVF file of 64x32 frames"""
+    data = b"DKIF" + struct.pack("<HH4sHHIIII", 0, 32, fourcc, 64, 32, 30, 1,
+                                 len(frames), 0)
+    for index, frame in enumerate(frames):
+        data += struct.pack("<IQ", len(frame), index) + frame
+    return data
@@ -0,0 +1,115 @@
+"""
+Unit tests for benchmark statistics.
+
+Tests the confidence interval of the median, the benchmark summary and
+the comparison with a baseline file.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_benchmark import (
+    BenchmarkResult,
+    BenchmarkStats,
+    compare_with_baseline,
+    load_baseline,
+    median_ci,
+    write_baseline,
+)
+from tests.libs.video_test_driver_detect import SystemInfo
+
+
+def _result(samples, name="decode_h264_a") -> BenchmarkResult:
+    """Benchmark result with the given samples"""
+    return BenchmarkResult(name=name, test_type="decode", codec="h264",
+                           stats=BenchmarkStats.from_samples(samples))
+
+
+class TestBenchmarkStats:
+    """Tests for median_ci() and BenchmarkStats"""
+
+    def test_small_sample_uses_range(self):
+        """Test that five samples give the full range at 95%"""
+        assert median_ci([5.0, 1.0, 3.0, 2.0, 4.0]) == (1.0, 5.0)
+
+    def test_interval_narrows_with_samples(self):
+        """Test the order statistics used for larger samples"""
+        samples = [float(i) for i in range(1, 21)]
+        # P(Binomial(20, 0.5) <= 5) = 0.0207 <= 0.025 < P(... <= 6)
+        assert median_ci(samples) == (6.0, 15.0)
+
+    def test_summary(self):
+        """Test the median, MAD and extremes"""
+        stats = BenchmarkStats.from_samples([100.0, 102.0, 98.0, 101.0,
+                                             140.0])
+        assert stats.median_ms == 101.0
+        assert stats.mad_ms == 1.0
+        assert stats.min_ms == 98.0
+        assert stats.max_ms == 140.0
+        assert stats.mean_ms == pytest.approx(108.2)
+
+
+class TestBaselineComparison:
+    """Tests for compare_with_baseline() and baseline files"""
+
+    def test_slower_beyond_threshold_regresses(self):
+        """Test that a consistently slower benchmark regresses"""
+        result = _result([120.0, 121.0, 119.0, 122.0, 120.0])
+        comparison = compare_with_baseline(result, {"median_ms": 100.0},
+                                           threshold=0.10)
+        assert comparison["regressed"]
+        assert comparison["ratio"] == pytest.approx(1.2)
+
+    def test_within_threshold_passes(self):
+        """Test that a small slowdown does not regress"""
+        result = _result([105.0, 106.0, 104.0, 105.0, 107.0])
+        assert not compare_with_baseline(result, {"median_ms": 100.0},
+                                         threshold=0.10)["regressed"]
+
+    def test_noisy_interval_overlapping_baseline_passes(self):
+        """Test that a slow median with a wide interval does not regress"""
+        result = _result([95.0, 130.0, 125.0, 128.0, 99.0])
+        comparison = compare_with_baseline(result, {"median_ms": 100.0})
+        assert comparison["ratio"] > 1.1
+        assert not comparison["regressed"]
+
+    def test_failed_benchmark_not_compared(self):
+        """Test that a benchmark without statistics is not compared"""
+        result = BenchmarkResult(name="a", test_type="decode", codec="h264",
+                                 error="crash (return code -11)")
+        assert compare_with_baseline(result, {"median_ms": 100.0}) is None
+        assert result.failed
+
+    def test_baseline_round_trip(self, tmp_path):
+        """Test that written baselines load keyed by test type and name"""
+        path = tmp_path / "baseline.json"
+        unsupported = BenchmarkResult(name="b", test_type="decode",
+                                      codec="av1", error="not_supported",
+                                      not_supported=True)
+        write_baseline(str(path), [_result([10.0, 11.0, 12.0]), unsupported],
+                       SystemInfo(gpu_name="RTX 3080", driver_name="NVIDIA"))
+
+        baseline = load_baseline(str(path))
+        assert list(baseline) == ["decode:decode_h264_a"]
+        assert baseline["decode:decode_h264_a"]["median_ms"] == 11.0
+        assert not unsupported.failed
+
+    def test_unknown_version_rejected(self, tmp_path):
+        """Test that a file of another format is rejected"""
+        path = tmp_path / "baseline.json"
+        path.write_text('{"version": 99}', encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_baseline(str(path))
@@ -0,0 +1,181 @@
+"""
+Unit tests for bitstream parsing.
+
+Tests access unit grouping of H.264/H.265 Annex-B streams, IVF frames of
+AV1 and VP9, AV1 OBU streams, codec detection and the bit readers, on
+small hand-made streams.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_bitstream import (
+    CONTAINER_ANNEXB,
+    CONTAINER_IVF,
+    CONTAINER_OBU,
+    OBU_FRAME,
+    OBU_SEQUENCE_HEADER,
+    OBU_TEMPORAL_DELIMITER,
+    BitReader,
+    detect_codec,
+    iter_nal_units,
+    parse_stream,
+    read_leb128,
+    unescape,
+    unit_payload,
+)
+from tests.unit_tests.stream_builders import ivf, obu
+
+
+def _h264(nal_type: int, first: bool = True, size: int = 6) -> bytes:
+    """H.264 NAL unit with a 4-byte start code; slices start with
+    first_mb_in_slice 0 or 1"""
+    payload = bytes([0x80 if first else 0x40]) + b"\x11" * size
+    return b"\x00\x00\x00\x01" + bytes([0x60 | nal_type]) + payload
+
+
+def _h265(nal_type: int, first: bool = True, layer: int = 0) -> bytes:
+    """H.265 NAL unit with a 3-byte start code"""
+    header = bytes([nal_type << 1, (layer << 3) | 1])
+    payload = bytes([0x80 if first else 0]) + b"\x22" * 4
+    return b"\x00\x00\x01" + header + payload
+
+
+SEQUENCE_HEADER = obu(OBU_SEQUENCE_HEADER, b"\x00\x00\x00")
+AV1_KEY = obu(OBU_FRAME, b"\x10\x00")  # show_existing 0, KEY_FRAME
+AV1_INTER = obu(OBU_FRAME, b"\x30\x00")  # show_existing 0, INTER_FRAME
+TD = obu(OBU_TEMPORAL_DELIMITER, b"")
+
+
+class TestAnnexB:
+    """Tests for H.264 and H.265 access units"""
+
+    def test_h264_access_units(self, tmp_path):
+        """Test that parameter sets start a picture and slices join it"""
+        first = _h264(7) + _h264(8) + _h264(5) + _h264(5, first=False)
+        second = _h264(9) + _h264(1) + _h264(1, first=False)
+        third = _h264(1) + _h264(12)  # filler data belongs to the picture
+        path = tmp_path / "a.h264"
+        path.write_bytes(first + second + third + b"\x00\x00")
+        info = parse_stream(path)
+        assert (info.container, info.codec) == (CONTAINER_ANNEXB, "h264")
+        assert info.frame_count == 3
+        assert info.key_frames == [0]
+        assert info.frame_sizes == [len(first), len(second), len(third) + 2]
+        assert info.unit_type_counts() == {7: 1, 8: 1, 5: 2, 9: 1, 1: 3,
+                                           12: 1}
+
+    def test_h265_access_units(self, tmp_path):
+        """Test IRAP pictures, slice segments and enhancement layers"""
+        stream = (_h265(32) + _h265(33) + _h265(34) + _h265(19)
+                  + _h265(19, first=False) + _h265(1, layer=1)
+                  + _h265(39) + _h265(1) + _h265(21) + _h265(1))
+        path = tmp_path / "a.bin"
+        path.write_bytes(stream)
+        info = parse_stream(path)
+        assert info.codec == "h265"
+        assert info.frame_count == 4
+        assert info.key_frames == [0, 2]
+        assert [len(f.units) for f in info.frames] == [6, 2, 1, 1]
+        assert sum(info.frame_sizes) == len(stream)
+
+    def test_unit_offsets(self):
+        """Test that units exclude start codes and trailing zeros"""
+        data = b"\x00\x00\x01\x67\x42\x00\x00\x00\x00\x01\x68\xce"
+        units = list(iter_nal_units(data, "h264"))
+        assert [(u.offset, u.size, u.type) for u in units] == [
+            (3, 2, 7), (10, 2, 8)]
+        assert bytes(unit_payload(data, units[1])) == b"\x68\xce"
+
+
+class TestAv1Vp9:
+    """Tests for IVF files and OBU streams"""
+
+    def test_ivf_av1(self, tmp_path):
+        """Test frames and key frames of an AV1 IVF file"""
+        frames = [TD + SEQUENCE_HEADER + AV1_KEY, TD + AV1_INTER,
+                  TD + AV1_INTER, TD + SEQUENCE_HEADER + AV1_KEY]
+        path = tmp_path / "a.ivf"
+        path.write_bytes(ivf(b"AV01", frames) + b"\x01\x02")
+        info = parse_stream(path)
+        assert (info.container, info.codec) == (CONTAINER_IVF, "av1")
+        assert (info.width, info.height) == (64, 32)
+        assert info.key_frames == [0, 3]
+        assert info.frame_sizes == [12 + len(f) for f in frames]
+        assert info.trailing_bytes == 2
+        assert info.to_dict()["unit_types"] == {"1": 2, "2": 4, "6": 4}
+
+    def test_ivf_vp9(self, tmp_path):
+        """Test VP9 key frames from the uncompressed header"""
+        # frame_marker 2, profile 0, show_existing 0, frame_type 0 / 1
+        path = tmp_path / "a.ivf"
+        path.write_bytes(ivf(b"VP90", [b"\x82\x49", b"\x86\x00",
+                                       b"\x88\x00"]))
+        info = parse_stream(path)
+        assert info.codec == "vp9"
+        # The third frame shows an existing frame
+        assert info.key_frames == [0]
+
+    def test_obu_stream(self, tmp_path):
+        """Test temporal units of a low-overhead OBU stream"""
+        stream = TD + SEQUENCE_HEADER + AV1_KEY + TD + AV1_INTER
+        path = tmp_path / "a.obu"
+        path.write_bytes(stream)
+        info = parse_stream(path)
+        assert info.container == CONTAINER_OBU
+        assert info.key_frames == [0]
+        assert info.frame_sizes == [len(TD + SEQUENCE_HEADER + AV1_KEY),
+                                    len(TD + AV1_INTER)]
+
+    def test_malformed_obu(self, tmp_path):
+        """Test that truncated OBUs and the forbidden bit are errors"""
+        path = tmp_path / "a.obu"
+        for data in (TD + b"\x32\x05\x00", b"\x80\x00"):
+            path.write_bytes(data)
+            with pytest.raises(ValueError):
+                parse_stream(path)
+
+
+class TestHelpers:
+    """Tests for detection and bit readers"""
+
+    def test_detect_codec(self, tmp_path):
+        """Test detection from content and extension"""
+        path = tmp_path / "stream.bin"
+        assert detect_codec(path, _h264(7)) == (CONTAINER_ANNEXB, "h264")
+        assert detect_codec(path, _h265(32)) == (CONTAINER_ANNEXB, "h265")
+        assert detect_codec(path, TD) == (CONTAINER_OBU, "av1")
+        assert detect_codec(tmp_path / "a.hevc", _h264(7))[1] == "h265"
+        path.write_bytes(b"")
+        assert parse_stream(path).frame_count == 0
+
+    def test_bit_reader(self):
+        """Test fixed-width fields and Exp-Golomb codes"""
+        # 101 | 1 | 010 | 011 | 00100 | 00101
+        bits = BitReader(bytes([0b10110100, 0b11001000, 0b01010000]))
+        assert bits.u(3) == 5
+        assert [bits.ue(), bits.ue(), bits.ue()] == [0, 1, 2]
+        assert [bits.se(), bits.se()] == [2, -2]
+        with pytest.raises(ValueError):
+            bits.u(8)
+
+    def test_unescape_and_leb128(self):
+        """Test emulation prevention removal and LEB128 values"""
+        assert unescape(b"\x00\x00\x03\x01\x00\x00\x03") == \
+            b"\x00\x00\x01\x00\x00"
+        assert read_leb128(b"\xe5\x8e\x26", 0) == (624485, 3)
+        with pytest.raises(ValueError):
+            read_leb128(b"\x80", 0)
@@ -0,0 +1,166 @@
+"""
+Unit tests for the device capability probe.
+
+Tests vulkaninfo parsing, device selection and the capability cache.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from tests.libs.video_test_capabilities import (
+    CapabilityCache,
+    DeviceCapabilities,
+    parse_vulkaninfo_output,
+    select_device,
+    unsupported_test_key,
+)
+from tests.libs.video_test_config_base import BaseTestConfig, CodecType
+
+VULKANINFO_OUTPUT = """\
+Device Properties and Extensions:
+=================================
+GPU0:
+VkPhysicalDeviceProperties:
+---------------------------
+\tvendorID          = 0x8086
+\tdeviceID          = 0x56a0
+\tdeviceName        = Intel(R) Arc(tm) A770 Graphics (DG2)
+VkPhysicalDeviceDriverProperties:
+---------------------------------
+\tdriverID           = DRIVER_ID_INTEL_OPEN_SOURCE_MESA
+\tdriverName         = Intel open-source Mesa driver
+\tdriverInfo         = Mesa 24.0.5
+VkQueueFamilyProperties:
+========================
+\t\tVkQueueFamilyVideoPropertiesKHR:
+\t\t\tvideoCodecOperations: count = 2
+\t\t\t\tVIDEO_CODEC_OPERATION_DECODE_H264_BIT_KHR
+\t\t\t\tVIDEO_CODEC_OPERATION_DECODE_H265_BIT_KHR
+\t\tVkQueueFamilyVideoPropertiesKHR:
+\t\t\tvideoCodecOperations: count = 1
+\t\t\t\tVIDEO_CODEC_OPERATION_ENCODE_H264_BIT_KHR
+
+GPU1:
+VkPhysicalDeviceProperties:
+---------------------------
+\tvendorID          = 0x10de
+\tdeviceID          = 0x2206
+\tdeviceName        = NVIDIA GeForce RTX 3080
+VkPhysicalDeviceDriverProperties:
+---------------------------------
+\tdriverID           = DRIVER_ID_NVIDIA_PROPRIETARY
+\tdriverName         = NVIDIA
+\tdriverInfo         = 550.120
+VkQueueFamilyProperties:
+========================
+\t\tVkQueueFamilyVideoPropertiesKHR:
+\t\t\tvideoCodecOperations: count = 1
+\t\t\t\tVIDEO_CODEC_OPERATION_DECODE_AV1_BIT_KHR
+"""
+
+
+class TestParseVulkaninfo:
+    """Tests for parse_vulkaninfo_output()"""
+
+    def test_devices_parsed(self):
+        """Test that each GPU section becomes one device"""
+        devices = parse_vulkaninfo_output(VULKANINFO_OUTPUT)
+        assert len(devices) == 2
+        intel, nvidia = devices[0], devices[1]
+
+        assert intel.gpu_name == "Intel(R) Arc(tm) A770 Graphics (DG2)"
+        assert intel.driver == "anv"
+        assert intel.driver_version == "Mesa 24.0.5"
+        assert intel.codec_operations == [
+            "decode_h264", "decode_h265", "encode_h264"]
+
+        assert nvidia.driver == "nvidia"
+        assert nvidia.device_id == 0x2206
+        assert nvidia.supports("decode", "av1")
+        assert not nvidia.supports("decode", "h264")
+
+    def test_no_video_support(self):
+        """Test that output without video queues has no operations"""
+        output = ("GPU0:\n\tvendorID = 0x1002\n\tdeviceID = 0x73bf\n"
+                  "\tdeviceName = AMD Radeon\n"
+                  "\tdriverID = DRIVER_ID_MESA_RADV\n")
+        devices = parse_vulkaninfo_output(output)
+        assert len(devices) == 1
+        device = devices[0]
+        assert device.driver == "radv"
+        assert device.codec_operations == []
+
+
+class TestSelectDevice:
+    """Tests for select_device()"""
+
+    def test_select_by_device_id(self):
+        """Test selection with --deviceID in hex"""
+        devices = parse_vulkaninfo_output(VULKANINFO_OUTPUT)
+        device = select_device(devices, device_id="0x2206")
+        assert device.gpu_name == "NVIDIA GeForce RTX 3080"
+
+    def test_unknown_device_id(self):
+        """Test that an unknown device ID selects nothing"""
+        devices = parse_vulkaninfo_output(VULKANINFO_OUTPUT)
+        assert select_device(devices, device_id="1234") is None
+
+    def test_no_device_id(self):
+        """Test that nothing is selected before a test reports its
+        device"""
+        devices = parse_vulkaninfo_output(VULKANINFO_OUTPUT)
+        assert select_device(devices) is None
+
+
+class TestCapabilityCache:
+    """Tests for CapabilityCache"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that capabilities and unsupported tests persist"""
+        path = tmp_path / "capabilities.json"
+        capabilities = DeviceCapabilities(
+            gpu_name="RTX 3080", driver_version="550.120", driver="nvidia",
+            codec_operations=["decode_h264"])
+        cache = CapabilityCache(path)
+        cache.set_capabilities(capabilities)
+        cache.set_unsupported(capabilities.cache_key, "decode:a:1", True)
+        cache.save()
+
+        reloaded = CapabilityCache(path)
+        assert reloaded.get_capabilities("RTX 3080|550.120") == capabilities
+        assert reloaded.is_known_unsupported("RTX 3080|550.120",
+                                             "decode:a:1")
+        assert not reloaded.is_known_unsupported("RTX 3080|555.42",
+                                                 "decode:a:1")
+
+    def test_success_clears_unsupported(self, tmp_path):
+        """Test that a test can be removed from the unsupported set"""
+        cache = CapabilityCache(tmp_path / "capabilities.json")
+        cache.set_unsupported("gpu|1", "decode:a:1", True)
+        cache.set_unsupported("gpu|1", "decode:a:1", False)
+        assert not cache.is_known_unsupported("gpu|1", "decode:a:1")
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        """Test that an unreadable cache starts empty"""
+        path = tmp_path / "capabilities.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert CapabilityCache(path).get_capabilities("gpu|1") is None
+
+    def test_test_key_depends_on_arguments(self):
+        """Test that changed arguments produce a different key"""
+        plain = BaseTestConfig(name="a", codec=CodecType.H265)
+        tuned = BaseTestConfig(name="a", codec=CodecType.H265,
+                               extra_args=["--queueSize", "4"])
+        assert (unsupported_test_key(plain, "decode") !=
+                unsupported_test_key(tuned, "decode"))
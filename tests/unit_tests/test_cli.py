@@ -206,6 +206,117 @@ class TestOutputOptions:
         assert "--keep-files" in result.stdout
 
 
+class TestRunStateOptions:
+    """Tests for options that persist state across runs"""
+
+    def test_resume_option_accepted(self):
+        """Test that --resume option is valid"""
+        result = run_codec("--help")
+        assert "--resume" in result.stdout
+
+    def test_history_db_option_accepted(self):
+        """Test that --history-db option is valid"""
+        result = run_codec("--help")
+        assert "--history-db" in result.stdout
+
+    def test_recheck_unsupported_option_accepted(self):
+        """Test that --recheck-unsupported option is valid"""
+        result = run_codec("--help")
+        assert "--recheck-unsupported" in result.stdout
+
+    def test_trace_file_option_accepted(self):
+        """Test that --trace-file option is valid"""
+        result = run_codec("--help")
+        assert "--trace-file" in result.stdout
+
+    def test_detect_regressions_requires_history_db(self):
+        """Test that --detect-regressions without --history-db fails"""
+        result = run_codec("--detect-regressions")
+        assert result.returncode != 0
+        assert "--history-db" in result.stderr
+
+    def test_adaptive_timeouts_requires_history_db(self):
+        """Test that --adaptive-timeouts without --history-db fails"""
+        result = run_codec("--adaptive-timeouts")
+        assert result.returncode != 0
+        assert "--history-db" in result.stderr
+
+    def test_memory_sample_interval_option_accepted(self):
+        """Test that --memory-sample-interval option is valid"""
+        result = run_codec("--help")
+        assert "--memory-sample-interval" in result.stdout
+
+    def test_benchmark_baseline_requires_benchmark(self):
+        """Test that --benchmark-baseline without --benchmark fails"""
+        result = run_codec("--benchmark-baseline", "baseline.json")
+        assert result.returncode != 0
+        assert "--benchmark" in result.stderr
+
+    def test_scaling_instances_must_be_positive(self):
+        """Test that invalid --scaling-instances lists are rejected"""
+        result = run_codec("--scaling-benchmark", "--scaling-instances",
+                           "1,0")
+        assert result.returncode != 0
+        assert "--scaling-instances" in result.stderr
+
+    def test_scaling_queue_mode_must_be_known(self):
+        """Test that unknown queue modes are rejected"""
+        result = run_codec("--scaling-benchmark", "--scaling-queue-modes",
+                           "default,fastest")
+        assert result.returncode != 0
+        assert "--scaling-queue-modes" in result.stderr
+
+    def test_encode_quality_requires_validation(self):
+        """Test that --encode-quality needs the validation decode"""
+        result = run_codec("--encode-quality", "psnr",
+                           "--no-validate-with-decoder")
+        assert result.returncode != 0
+        assert "--encode-quality" in result.stderr
+
+    def test_decoder_sample_rate_requires_structure_check(self):
+        """Test that sampled decoder validation needs the structure
+        check"""
+        result = run_codec("--decoder-sample-rate", "0.5")
+        assert result.returncode != 0
+        assert "--structure-check" in result.stderr
+
+    def test_rd_anchor_requires_rd_benchmark(self):
+        """Test that --rd-anchor without --rd-benchmark fails"""
+        result = run_codec("--rd-anchor", "anchor.json")
+        assert result.returncode != 0
+        assert "--rd-benchmark" in result.stderr
+
+    def test_encode_sweep_conflicts_with_decoder_only(self, tmp_path):
+        """Test that --encode-sweep is rejected with --decoder-only"""
+        sweep = tmp_path / "sweep.json"
+        sweep.write_text('{"matrix": {"qualityLevel": [0, 1]}}')
+        result = run_codec("--encode-sweep", str(sweep), "--decoder-only")
+        assert result.returncode != 0
+        assert "--encode-sweep" in result.stderr
+
+    def test_encode_sweep_measures_quality_of_all_outputs(self, tmp_path):
+        """Test that the implied --encode-quality rejects sampled decoder
+        validation"""
+        sweep = tmp_path / "sweep.json"
+        sweep.write_text('{"matrix": {"qualityLevel": [0, 1]}}')
+        result = run_codec("--encode-sweep", str(sweep), "--structure-check",
+                           "--decoder-sample-rate", "0.5")
+        assert result.returncode != 0
+        assert "--decoder-sample-rate" in result.stderr
+
+    def test_tune_repeats_must_be_positive(self):
+        """Test that --tune-repeats 0 is rejected"""
+        result = run_codec("--tune-decoder", "--tune-repeats", "0")
+        assert result.returncode != 0
+        assert "--tune-repeats" in result.stderr
+
+    def test_benchmark_repeats_must_be_positive(self):
+        """Test that --benchmark-repeats 0 is rejected"""
+        result = run_codec("--benchmark", "--benchmark-repeats", "0")
+        assert result.returncode != 0
+        assert "--benchmark-repeats" in result.stderr
+
+
 class TestFrameworkTypeOptions:
     """Tests for encoder/decoder-only options"""
 
@@ -0,0 +1,162 @@
+"""
+Unit tests for input format conversion.
+
+Tests encoder input options of each format, encode samples declaring an
+input format, cache paths, and the converted samples of chroma and bit
+depth changes.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import random
+
+import pytest
+
+from tests.libs.video_test_convert import (
+    CONVERT_DIR,
+    convert_source,
+    converted_path,
+    ensure_converted,
+)
+from tests.libs.video_test_frames import (
+    PIXEL_FORMATS,
+    FrameLayout,
+    FrameReader,
+    encoder_input_args,
+    layout_for_format,
+    layout_from_args,
+)
+from tests.libs.video_test_framework_encode import EncodeTestSample
+
+I420 = FrameLayout(width=6, height=4)  # 24 + 6 + 6 bytes per frame
+
+
+def _sample(**fields) -> EncodeTestSample:
+    """Encode sample of a 6x4 source"""
+    data = {"name": "a", "codec": "h264", "width": 6, "height": 4,
+            "source_url": "", "source_checksum": "sha",
+            "source_filepath": "video/yuv/a.yuv"}
+    return EncodeTestSample.from_dict({**data, **fields})
+
+
+class TestInputFormats:
+    """Tests for declared input formats"""
+
+    @pytest.mark.parametrize("pixel_format", PIXEL_FORMATS)
+    def test_encoder_args(self, pixel_format):
+        """Test that encoder options give back the format's layout"""
+        layout = layout_for_format(pixel_format, 64, 32)
+        assert layout_from_args(64, 32, encoder_input_args(layout)) == layout
+
+    def test_sample_input_format(self):
+        """Test the encoder input of a sample with an input format"""
+        sample = _sample(input_format="p010")
+        assert sample.file_layout == I420
+        assert sample.source_layout == layout_for_format("p010", 6, 4)
+        assert sample.encoder_input_path.parent == CONVERT_DIR
+        assert _sample().encoder_input_path == _sample().full_yuv_path
+
+    def test_invalid_input_format(self):
+        """Test that unknown formats and conflicting options fail"""
+        with pytest.raises(ValueError):
+            _sample(input_format="yuyv")
+        with pytest.raises(ValueError):
+            _sample(input_format="nv12", extra_args=["--inputNumPlanes", "2"])
+
+    def test_cache_path(self):
+        """Test that the path changes with the source and both layouts"""
+        p010 = layout_for_format("p010", 6, 4)
+        paths = {converted_path("a", I420, p010),
+                 converted_path("b", I420, p010),
+                 converted_path("a", I420, layout_for_format("nv12", 6, 4)),
+                 converted_path("a", FrameLayout(6, 4, "444"), p010)}
+        assert len(paths) == 4
+
+
+class TestConversion:
+    """Tests for converted samples"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Two random I420 frames"""
+        rng = random.Random(3)
+        path = tmp_path / "src.yuv"
+        path.write_bytes(bytes(rng.randrange(256)
+                               for _ in range(2 * I420.frame_size)))
+        return path
+
+    @staticmethod
+    def _planes(path, layout, index=1):
+        """Sample values of a frame's planes as lists"""
+        with FrameReader(path, layout) as reader:
+            assert len(reader) == 2
+            return [(p >> layout.sample_shift).tolist()
+                    for p in reader.planes(index)]
+
+    def test_semi_planar(self, tmp_path, source):
+        """Test that NV12 holds the same samples"""
+        nv12 = layout_for_format("nv12", 6, 4)
+        convert_source(source, I420, tmp_path / "nv12.yuv", nv12)
+        assert (self._planes(tmp_path / "nv12.yuv", nv12)
+                == self._planes(source, I420))
+
+    def test_p010(self, tmp_path, source):
+        """Test that P010 raises the bit depth and MSB-aligns samples"""
+        p010 = layout_for_format("p010", 6, 4)
+        convert_source(source, I420, tmp_path / "p010.yuv", p010)
+        expected = [[[v << 2 for v in row] for row in plane]
+                    for plane in self._planes(source, I420)]
+        assert self._planes(tmp_path / "p010.yuv", p010) == expected
+
+    def test_chroma_round_trip(self, tmp_path, source):
+        """Test that 4:2:0 to 4:4:4 and back is lossless"""
+        i444 = layout_for_format("i444", 6, 4)
+        convert_source(source, I420, tmp_path / "444.yuv", i444)
+        assert self._planes(tmp_path / "444.yuv", i444)[1][0] == [
+            v for v in self._planes(source, I420)[1][0] for _ in (0, 1)]
+        convert_source(tmp_path / "444.yuv", i444, tmp_path / "420.yuv",
+                       I420)
+        assert (tmp_path / "420.yuv").read_bytes() == source.read_bytes()
+
+    def test_downsample_rounding(self, tmp_path):
+        """Test averaging of odd chroma sizes and bit depth rounding"""
+        layout = FrameLayout(3, 1, "444", 10)
+        path = tmp_path / "444.yuv"
+        # Black luma; U and V samples 1, 2 and 7 (16-bit little-endian)
+        path.write_bytes(bytes(6) + bytes([1, 0, 2, 0, 7, 0] * 2))
+        target = FrameLayout(3, 1, "422", 8)
+        convert_source(path, layout, tmp_path / "422.yuv", target)
+        # U and V: (1 + 2) / 2 rounds to 2, then 7 alone; 10 to 8 bits
+        # rounds 2 / 4 to 1 and 7 / 4 to 2
+        assert (tmp_path / "422.yuv").read_bytes() == bytes([0, 0, 0,
+                                                             1, 2, 1, 2])
+
+    def test_cached_once(self, tmp_path, source):
+        """Test that a converted file is reused"""
+        nv12 = layout_for_format("nv12", 6, 4)
+        path = ensure_converted(source, I420, nv12, "sha", tmp_path)
+        mtime = path.stat().st_mtime_ns
+        assert ensure_converted(source, I420, nv12, "sha", tmp_path) == path
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_size_mismatch(self, tmp_path, source):
+        """Test that a source of another size is rejected"""
+        with pytest.raises(ValueError):
+            convert_source(source, I420, tmp_path / "a.yuv",
+                           layout_for_format("nv12", 8, 4))
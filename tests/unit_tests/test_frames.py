@@ -0,0 +1,167 @@
+"""
+Unit tests for memory-mapped frame access.
+
+Tests frame layouts, encoder input options, Y4M headers and frame
+markers, and the NumPy plane views of planar and semi-planar formats.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import struct
+
+import pytest
+
+from tests.libs.video_test_frames import (
+    FrameLayout,
+    FrameReader,
+    layout_for_format,
+    layout_from_args,
+    read_y4m_header,
+)
+
+LAYOUT = FrameLayout(width=4, height=2)  # 8 + 2 + 2 bytes per frame
+
+
+def _frames(count: int, size: int = 12) -> bytes:
+    """Frames whose samples are all their frame index."""
+    return b"".join(bytes([i]) * size for i in range(count))
+
+
+class TestFrameLayout:
+    """Tests for frame layouts and Y4M headers"""
+
+    def test_plane_sizes(self):
+        """Test plane sizes of subsampled and high bit depth layouts"""
+        assert LAYOUT.plane_sizes == [8, 2, 2]
+        odd = FrameLayout(width=5, height=3, chroma="420", bit_depth=10)
+        assert odd.plane_sizes == [30, 12, 12]
+        assert odd.peak == 1023
+
+    def test_layout_from_args(self):
+        """Test that encoder input options set the layout"""
+        layout = layout_from_args(352, 288, ["--inputBpp", "10",
+                                             "--inputChromaSubsampling",
+                                             "444"])
+        assert layout == FrameLayout(352, 288, "444", 10)
+        assert layout_from_args(352, 288, None).chroma == "420"
+
+    def test_p010_args(self):
+        """Test that MSB-aligned 2-plane input matches the P010 format"""
+        layout = layout_from_args(64, 32, ["--inputBpp", "10",
+                                           "--inputNumPlanes", "2",
+                                           "--msbShift", "0"])
+        assert layout == layout_for_format("p010", 64, 32)
+        with pytest.raises(ValueError):
+            layout_for_format("yuyv", 64, 32)
+
+    def test_y4m_header(self, tmp_path):
+        """Test parsing of size, frame rate and colour space"""
+        path = tmp_path / "a.y4m"
+        path.write_bytes(b"YUV4MPEG2 W4 H2 F25:1 Ip A1:1 C420p10\n"
+                         b"FRAME\n" + bytes(24))
+        layout, frame_rate = read_y4m_header(path)
+        assert layout == FrameLayout(4, 2, "420", 10)
+        assert frame_rate == 25
+
+
+class TestFrameReader:
+    """Tests for random frame access"""
+
+    def test_raw_frames(self, tmp_path):
+        """Test frame count, offsets and a truncated last frame"""
+        path = tmp_path / "a.yuv"
+        path.write_bytes(_frames(3) + b"\0")
+        with FrameReader(path, LAYOUT) as reader:
+            assert len(reader) == 3
+            assert bytes(reader.frame_bytes(2)) == bytes([2]) * 12
+            with pytest.raises(IndexError):
+                reader.frame_bytes(3)
+
+    def test_raw_needs_layout(self, tmp_path):
+        """Test that a raw file without a layout is rejected"""
+        path = tmp_path / "a.yuv"
+        path.write_bytes(bytes(12))
+        with pytest.raises(ValueError):
+            FrameReader(path)
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file has no frames"""
+        path = tmp_path / "a.yuv"
+        path.write_bytes(b"")
+        with FrameReader(path, LAYOUT) as reader:
+            assert len(reader) == 0
+
+    def test_y4m_frames(self, tmp_path):
+        """Test that Y4M frames skip their markers"""
+        path = tmp_path / "a.y4m"
+        path.write_bytes(b"YUV4MPEG2 W4 H2 F30:1 C420jpeg\n" + b"".join(
+            b"FRAME\n" + bytes([i]) * 12 for i in range(3)))
+        with FrameReader(path) as reader:
+            assert reader.layout == LAYOUT
+            assert reader.frame_rate == 30
+            assert len(reader) == 3
+            assert bytes(reader.frame_bytes(1)) == bytes([1]) * 12
+
+    def test_y4m_frame_parameters(self, tmp_path):
+        """Test markers of varying length with frame parameters"""
+        path = tmp_path / "a.y4m"
+        path.write_bytes(b"YUV4MPEG2 W4 H2 C420jpeg\n"
+                         b"FRAME\n" + bytes([0]) * 12
+                         + b"FRAME Ixyz\n" + bytes([1]) * 12
+                         + b"FRAME\n" + bytes([2]) * 12)
+        with FrameReader(path) as reader:
+            assert len(reader) == 3
+            assert [bytes(reader.frame_bytes(i))[0] for i in range(3)] == [
+                0, 1, 2]
+
+
+class TestPlaneViews:
+    """Tests for the NumPy plane views"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_planar_views(self, tmp_path):
+        """Test that planes are views of the selected frames"""
+        path = tmp_path / "a.yuv"
+        path.write_bytes(bytes(range(12)) * 2)
+        with FrameReader(path, LAYOUT) as reader:
+            y, u, v = reader.planes(1)
+            assert y.shape == (2, 4) and u.shape == (1, 2)
+            assert y[1, 0] == 4 and u[0, 1] == 9 and v[0, 0] == 10
+            assert not y.flags.owndata
+
+    def test_semi_planar_views(self, tmp_path):
+        """Test that interleaved chroma is split into U and V views"""
+        path = tmp_path / "a.yuv"
+        samples = list(range(8)) + [100, 200, 101, 201]
+        path.write_bytes(struct.pack("<12H", *(s << 6 for s in samples)))
+        with FrameReader(path, layout_for_format("p010", 4, 2)) as reader:
+            y, u, v = reader.planes(0)
+            assert y[1, 3] >> reader.layout.sample_shift == 7
+            assert (u >> 6).tolist() == [[100, 101]]
+            assert (v >> 6).tolist() == [[200, 201]]
+
+    def test_y4m_batch(self, tmp_path):
+        """Test a batch of Y4M frames as one strided view"""
+        path = tmp_path / "a.y4m"
+        path.write_bytes(b"YUV4MPEG2 W4 H2 C420jpeg\n" + b"".join(
+            b"FRAME\n" + bytes([i]) * 12 for i in range(4)))
+        with FrameReader(path) as reader:
+            y, _, v = reader.batch_planes(1, 3)
+            assert y.shape == (3, 2, 4)
+            assert y[:, 0, 0].tolist() == [1, 2, 3]
+            assert v[2, 0, 0] == 3
@@ -0,0 +1,91 @@
+"""
+Unit tests for memory sampling.
+
+Tests procfs sampling of a running process and leak detection across
+--loop iterations.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+
+import pytest
+
+from tests.libs.video_test_memory import (
+    PROCFS_AVAILABLE,
+    MemorySample,
+    MemorySampler,
+    detect_memory_growth,
+    loop_iterations,
+)
+from tests.libs.video_test_process import HAS_WAIT4, run_process
+
+
+def _samples(rss_per_iteration, per_iteration=5):
+    """Samples of a run whose RSS is flat within each iteration"""
+    samples = []
+    for iteration, rss in enumerate(rss_per_iteration):
+        for i in range(per_iteration):
+            t = iteration + i / per_iteration
+            samples.append(MemorySample(t, rss, rss, t))
+    return samples
+
+
+class TestDetectMemoryGrowth:
+    """Tests for detect_memory_growth()"""
+
+    def test_growth_across_iterations(self):
+        """Test that RSS rising every loop is reported"""
+        leak = detect_memory_growth(
+            _samples([100_000, 110_000, 120_000]), 3)
+        assert leak["iteration_peak_kb"] == [100_000, 110_000, 120_000]
+        assert leak["growth_kb"] == 20_000
+        assert leak["growth_per_iteration_kb"] == 10_000
+
+    def test_stable_memory(self):
+        """Test that flat memory after the first loop is not a leak"""
+        assert detect_memory_growth(
+            _samples([100_000, 130_000, 130_000]), 3) is None
+
+    def test_noise_below_threshold(self):
+        """Test that small monotonic growth is ignored"""
+        assert detect_memory_growth(
+            _samples([100_000, 100_100, 100_200]), 3) is None
+
+    def test_single_iteration(self):
+        """Test that runs without --loop are never flagged"""
+        assert detect_memory_growth(_samples([100_000, 200_000]), 1) is None
+
+    def test_loop_iterations(self):
+        """Test parsing of the --loop argument"""
+        assert loop_iterations(["--loop", "3"]) == 3
+        assert loop_iterations(["--queueSize", "4"]) == 1
+        assert loop_iterations(None) == 1
+
+
+@pytest.mark.skipif(not (PROCFS_AVAILABLE and HAS_WAIT4),
+                    reason="procfs not available")
+def test_samples_running_process():
+    """Test that a running child is sampled at the interval"""
+    sampler = MemorySampler(0.02)
+    run_process([sys.executable, "-c",
+                 "import time; buf = bytearray(32 * 1024 * 1024); "
+                 "time.sleep(0.3)"], monitor=sampler)
+
+    assert len(sampler.samples) >= 5
+    assert sampler.peak_kb() >= 32 * 1024
+    series = sampler.series(max_points=4)
+    assert len(series["t"]) == 4
+    assert series["t"][-1] == round(sampler.samples[-1].time, 3)
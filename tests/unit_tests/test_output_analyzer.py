@@ -0,0 +1,229 @@
+"""
+Unit tests for the output analyzers.
+
+Tests device line parsing, per-device driver detection, validation message
+and warning detection.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from tests.libs import video_test_config_base as config_base
+from tests.libs.video_test_driver_detect import (
+    parse_device_id_option,
+    parse_driver_from_output,
+    parse_system_info_from_output,
+)
+from tests.libs.video_test_framework_base import VulkanVideoTestFrameworkBase
+from tests.libs.video_test_output_analyzer import (
+    DeviceInfoAnalyzer,
+    ValidationMessageAnalyzer,
+    WarningAnalyzer,
+    analyze_output,
+)
+
+DEVICE_LINE = (
+    "*** Selected Vulkan physical device with name: AMD Radeon RX 7900 XTX "
+    "(RADV NAVI31), vendor ID: 1002, device UUID: 00, and device ID: 744c, "
+    "driver ID: 3, driver name: radv, driver info: Mesa 24.1.0, "
+    "Num Decode Queues: 1, Num Encode Queues: 1 ***"
+)
+NVIDIA_DEVICE_LINE = (
+    "*** Selected Vulkan physical device with name: NVIDIA GeForce RTX 3080, "
+    "vendor ID: 10de, device UUID: 00, and device ID: 2206, driver ID: 4, "
+    "driver name: NVIDIA, driver info: 550.120, "
+    "Num Decode Queues: 16, Num Encode Queues: 3 ***"
+)
+
+
+def _result() -> config_base.TestResult:
+    """Create an empty successful result"""
+    return config_base.TestResult(
+        config=config_base.BaseTestConfig(
+            name="a", codec=config_base.CodecType.H264),
+        returncode=0, execution_time=0,
+        status=config_base.VideoTestStatus.SUCCESS)
+
+
+class TestDeviceInfo:
+    """Tests for device line parsing"""
+
+    def test_device_line_in_stdout(self):
+        """Test that driver and system info come from the device line"""
+        analyzer = DeviceInfoAnalyzer()
+        analyze_output(f"Decoding...\n{DEVICE_LINE}\nFrame 1\n", "",
+                       [analyzer])
+
+        assert analyzer.done
+        assert analyzer.driver == "radv"
+        info = analyzer.system_info
+        assert info.gpu_name == "AMD Radeon RX 7900 XTX (RADV NAVI31)"
+        assert info.driver_name == "radv"
+        assert info.driver_version == "Mesa 24.1.0"
+        assert info.device_id == 0x744c
+        assert info.decode_queues == 1
+        assert info.encode_queues == 1
+
+    def test_device_line_in_stderr(self):
+        """Test that stderr is scanned when stdout has no device line"""
+        analyzer = DeviceInfoAnalyzer()
+        analyze_output("no device here\n", DEVICE_LINE, [analyzer])
+        assert analyzer.driver == "radv"
+
+    def test_no_device_line(self):
+        """Test output without a device line"""
+        analyzer = DeviceInfoAnalyzer()
+        analyze_output("Frame 1\n", "error\n", [analyzer])
+        assert not analyzer.done
+        assert analyzer.driver is None
+
+    def test_parse_helpers_use_device_line(self):
+        """Test the standalone parse helpers"""
+        assert parse_driver_from_output("", DEVICE_LINE) == "radv"
+        assert parse_driver_from_output("Frame 1\n") is None
+        info = parse_system_info_from_output(DEVICE_LINE)
+        assert info.driver_version == "Mesa 24.1.0"
+
+    def test_device_id_option(self):
+        """Test parsing of --deviceID values"""
+        assert parse_device_id_option("0x2206") == 0x2206
+        assert parse_device_id_option("2206") == 0x2206
+        assert parse_device_id_option("0X73BF") == 0x73bf
+        assert parse_device_id_option(None) is None
+        assert parse_device_id_option("gpu") is None
+
+
+class TestMessageAnalyzers:
+    """Tests for validation message and warning detection"""
+
+    def test_validation_messages(self):
+        """Test detection of validation layer messages"""
+        analyzer = ValidationMessageAnalyzer()
+        result = _result()
+        analyze_output("ok\n", "Validation Error: [ VUID-vkCmdFoo-01 ]\n",
+                       [analyzer])
+        analyzer.apply(result)
+        assert result.meta["validation_messages"] is True
+
+    def test_warning_is_case_insensitive(self):
+        """Test that encoder warnings are matched ignoring case"""
+        analyzer = WarningAnalyzer()
+        result = _result()
+        analyze_output("", "B-frames NOT Supported, disabling them\n",
+                       [analyzer])
+        analyzer.apply(result)
+        assert result.warning_found
+
+    def test_warning_only_in_stderr(self):
+        """Test that encoder warnings are only looked for in stderr"""
+        analyzer = WarningAnalyzer()
+        analyze_output("Warning: in stdout\n", "all good\n", [analyzer])
+        assert not analyzer.found
+
+    def test_done_analyzers_skip_later_streams(self):
+        """Test that an analyzer stops after its first hit"""
+        analyzer = ValidationMessageAnalyzer()
+        analyze_output("VUID-1\n", "VUID-2\n", [analyzer])
+        assert analyzer.done
+
+    def test_pass_stops_when_all_done(self):
+        """Test that lines after the last answer are not scanned"""
+        class Recorder(ValidationMessageAnalyzer):
+            """Validation analyzer remembering the lines it was fed"""
+
+            def __init__(self):
+                super().__init__()
+                self.lines = []
+
+            def scan(self, line: str) -> None:
+                self.lines.append(line)
+                super().scan(line)
+
+        recorder = Recorder()
+        warnings = WarningAnalyzer()
+        analyze_output("", "Warning: slow\nVUID-1\nVUID-2\nend\n",
+                       [recorder, warnings])
+        assert warnings.found
+        assert recorder.lines == ["Warning: slow", "VUID-1"]
+
+
+class _Framework(VulkanVideoTestFrameworkBase):
+    """Minimal framework for per-device detection tests"""
+
+    def __init__(self, **options):
+        super().__init__(executable_path=None, **options)
+
+    def check_resources(self, _auto_download=True, _test_configs=None):
+        """Check resources - always available."""
+        return True
+
+    def create_test_suite(self):
+        """Create test suite - empty."""
+        return []
+
+    def run_single_test(self, _config):
+        """Run single test - not used."""
+
+
+class TestPerDeviceDetection:
+    """Tests for driver detection per device ID"""
+
+    def _run(self, framework, stdout):
+        result = _result()
+        result.stdout = stdout
+        framework.analyze_result(result, [])
+        return result
+
+    def test_each_result_gets_its_device_driver(self):
+        """Test that tests on different GPUs keep their own driver"""
+        framework = _Framework()
+        amd = self._run(framework, DEVICE_LINE)
+        nvidia = self._run(framework, NVIDIA_DEVICE_LINE)
+
+        assert framework.driver_for_result(amd) == "radv"
+        assert framework.driver_for_result(nvidia) == "nvidia"
+        assert nvidia.meta["device_id"] == 0x2206
+        # The first device stays the primary one for headers
+        assert framework.current_driver == "radv"
+        assert [d.gpu_name for d in framework.detected_devices] == [
+            "AMD Radeon RX 7900 XTX (RADV NAVI31)", "NVIDIA GeForce RTX 3080"]
+
+    def test_each_result_gets_its_device_info(self):
+        """Test the system info of the GPU each test ran on"""
+        framework = _Framework()
+        self._run(framework, DEVICE_LINE)
+        nvidia = self._run(framework, NVIDIA_DEVICE_LINE)
+        crashed = self._run(framework, "Segmentation fault\n")
+
+        info = framework.system_info_for_result(nvidia)
+        assert info.gpu_name == "NVIDIA GeForce RTX 3080"
+        assert info.driver_version == "550.120"
+        # Without a device line, the first device
+        info = framework.system_info_for_result(crashed)
+        assert info.gpu_name == "AMD Radeon RX 7900 XTX (RADV NAVI31)"
+
+    def test_no_device_line_uses_requested_device(self):
+        """Test the fallback for tests that crash before selecting a GPU"""
+        framework = _Framework(device_id="0x2206")
+        self._run(framework, DEVICE_LINE)
+        self._run(framework, NVIDIA_DEVICE_LINE)
+
+        crashed = self._run(framework, "Segmentation fault\n")
+        assert "driver" not in crashed.meta
+        assert framework.driver_for_result(crashed) == "nvidia"
+
+    def test_nothing_detected(self):
+        """Test that an unknown driver matches all skip rules"""
+        framework = _Framework()
+        assert framework.driver_for_result(self._run(framework, "")) == "all"
@@ -0,0 +1,164 @@
+"""
+Unit tests for test process execution.
+
+Tests run_process() output capture, timeouts, process group termination
+and per-process resource usage, and the per-codec resource usage summary.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.libs import video_test_config_base as config_base
+from tests.libs import video_test_process
+from tests.libs.video_test_process import (
+    HAS_WAIT4,
+    ProcessUsage,
+    run_process,
+)
+from tests.libs.video_test_result_reporter import summarize_resource_usage
+
+requires_wait4 = pytest.mark.skipif(not HAS_WAIT4,
+                                    reason="os.wait4() not available")
+
+
+def _python(code: str) -> list:
+    """Command running a Python snippet"""
+    return [sys.executable, "-c", code]
+
+
+class TestRunProcess:
+    """Tests for run_process()"""
+
+    def test_output_and_returncode(self):
+        """Test that both streams and the exit code are captured"""
+        result = run_process(_python(
+            "import sys; print('out'); print('err', file=sys.stderr); "
+            "sys.exit(3)"))
+        assert result.returncode == 3
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+
+    @requires_wait4
+    def test_usage_of_child(self):
+        """Test that the rusage of the child itself is reported"""
+        result = run_process(_python(
+            "buf = bytearray(64 * 1024 * 1024)\n"
+            "for i in range(0, len(buf), 4096): buf[i] = 1\n"))
+        usage = result.usage
+        assert usage.max_rss_kb >= 64 * 1024
+        assert usage.cpu_time > 0
+
+    @requires_wait4
+    def test_signal_returncode(self):
+        """Test that a signalled child reports a negative return code"""
+        result = run_process(_python(
+            "import os, signal; os.kill(os.getpid(), signal.SIGABRT)"))
+        assert result.returncode == -6
+
+    def test_timeout(self):
+        """Test that a hanging child is killed"""
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_process(_python("import time; time.sleep(30)"), timeout=0.5)
+
+
+def _alive(pid: int) -> bool:
+    """Whether a process exists and is not a zombie"""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+@requires_wait4
+@pytest.mark.skipif(not os.path.isdir("/proc/self"),
+                    reason="procfs not available")
+class TestProcessGroupTermination:
+    """Tests for process group termination and the watchdog"""
+
+    def test_timeout_kills_helpers(self, tmp_path):
+        """Test that a helper spawned by the test dies with it"""
+        pid_file = tmp_path / "helper.pid"
+        with pytest.raises(subprocess.TimeoutExpired) as error:
+            run_process(["sh", "-c",
+                         f"sleep 60 & echo $! > {pid_file}; sleep 60"],
+                        timeout=0.5)
+
+        kill = error.value.kill
+        assert kill.reason == "timeout"
+        assert kill.signals == ["SIGTERM"]
+        assert kill.group_cleared
+        assert not _alive(int(pid_file.read_text()))
+
+    def test_sigkill_after_grace(self, monkeypatch):
+        """Test escalation to SIGKILL when SIGTERM is ignored"""
+        monkeypatch.setattr(video_test_process, "TERMINATE_GRACE", 0.2)
+        with pytest.raises(subprocess.TimeoutExpired) as error:
+            run_process(_python(
+                "import signal, time\n"
+                "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+                "print('ready', flush=True)\n"
+                "time.sleep(30)\n"), timeout=0.5)
+        assert error.value.kill.signals == ["SIGTERM", "SIGKILL"]
+
+    def test_orphans_of_finished_test(self):
+        """Test that helpers left by a test that exited are terminated"""
+        result = run_process(["sh", "-c", "sleep 60 & echo done"])
+        assert result.returncode == 0
+        assert result.stdout == "done\n"
+        assert result.kill.reason == "orphans"
+        assert result.kill.group_cleared
+
+    def test_clean_exit_not_recorded(self):
+        """Test that a test without helpers records no kill"""
+        assert run_process(_python("pass")).kill is None
+
+
+class TestResourceUsageSummary:
+    """Tests for summarize_resource_usage()"""
+
+    def test_totals_per_codec(self):
+        """Test that CPU time is summed and RSS is the peak"""
+        results = []
+        for codec, rss in ((config_base.CodecType.H264, 100),
+                           (config_base.CodecType.H264, 300),
+                           (config_base.CodecType.AV1, 50)):
+            result = config_base.TestResult(
+                config=config_base.BaseTestConfig(name="a", codec=codec),
+                returncode=0, execution_time=1,
+                status=config_base.VideoTestStatus.SUCCESS)
+            result.usage = ProcessUsage(user_time=1.5, system_time=0.5,
+                                        max_rss_kb=rss,
+                                        voluntary_ctx_switches=10)
+            results.append(result)
+
+        summary = summarize_resource_usage(results)
+        assert summary["h264"]["tests"] == 2
+        assert summary["h264"]["user_time"] == 3.0
+        assert summary["h264"]["max_rss_kb"] == 300
+        assert summary["h264"]["voluntary_ctx_switches"] == 20
+        assert summary["av1"]["max_rss_kb"] == 50
+
+    def test_usage_round_trip(self):
+        """Test the JSON form of the usage"""
+        usage = ProcessUsage(user_time=1.23456, max_rss_kb=10)
+        restored = ProcessUsage.from_dict(usage.to_dict())
+        assert restored.max_rss_kb == 10
+        assert restored.user_time == pytest.approx(1.2346)
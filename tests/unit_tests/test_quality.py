@@ -0,0 +1,170 @@
+"""
+Unit tests for quality metrics.
+
+Tests PSNR against a raw or Y4M source, the NumPy batch path with SSIM
+and the minimum quality check.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import math
+import random
+import struct
+
+import pytest
+
+from tests.libs import video_test_quality
+from tests.libs.video_test_frames import layout_for_format
+from tests.libs.video_test_framework_encode import EncodeTestSample
+from tests.libs.video_test_quality import (
+    MAX_PSNR,
+    FrameLayout,
+    QualityResult,
+    check_quality,
+    compute_psnr,
+    compute_quality,
+)
+
+LAYOUT = FrameLayout(width=4, height=2)  # 8 + 2 + 2 bytes per frame
+
+
+class TestPsnr:
+    """Tests for compute_psnr()"""
+
+    def test_identical_and_noisy_frames(self, tmp_path):
+        """Test the PSNR of identical planes and a known error"""
+        source = tmp_path / "src.yuv"
+        decoded = tmp_path / "dec.yuv"
+        frame = bytes(range(12))
+        source.write_bytes(frame * 2)
+        # Second frame: every luma sample off by 2 (MSE 4)
+        noisy = bytes(b + 2 for b in frame[:8]) + frame[8:]
+        decoded.write_bytes(frame + noisy + b"\0")  # truncated third frame
+
+        psnr = compute_psnr(source, decoded, LAYOUT)
+        assert psnr.frames == 2
+        expected_y = (MAX_PSNR + 10 * math.log10(255 ** 2 / 4)) / 2
+        assert psnr.y == pytest.approx(expected_y)
+        assert psnr.u == MAX_PSNR
+        assert psnr.yuv == pytest.approx((6 * expected_y + 2 * MAX_PSNR) / 8)
+
+    def test_y4m_reference(self, tmp_path):
+        """Test comparing a Y4M source with raw decoded output"""
+        source = tmp_path / "src.y4m"
+        source.write_bytes(b"YUV4MPEG2 W4 H2 F30:1 C420jpeg\n"
+                           b"FRAME\n" + bytes(12))
+        decoded = tmp_path / "dec.yuv"
+        decoded.write_bytes(bytes(12))
+        psnr = compute_psnr(source, decoded, LAYOUT)
+        assert psnr.frames == 1
+        assert psnr.y == MAX_PSNR
+
+    def test_semi_planar_source(self, tmp_path):
+        """Test comparing a P010 source with planar decoded output"""
+        luma, u, v = list(range(100, 108)), [300, 301], [700, 701]
+        source = tmp_path / "src.yuv"
+        source.write_bytes(struct.pack(
+            "<12H", *(s << 6 for s in luma + [u[0], v[0], u[1], v[1]])))
+        decoded = tmp_path / "dec.yuv"
+        decoded.write_bytes(struct.pack("<12H", *(luma + u + v)))
+        layout = layout_for_format("p010", 4, 2)
+        psnr = compute_psnr(source, decoded, layout)
+        assert (psnr.y, psnr.u, psnr.v) == (MAX_PSNR,) * 3
+
+    def test_no_frames(self, tmp_path):
+        """Test that an empty decode gives no result"""
+        source = tmp_path / "src.yuv"
+        source.write_bytes(bytes(12))
+        decoded = tmp_path / "dec.yuv"
+        decoded.write_bytes(b"")
+        assert compute_psnr(source, decoded, LAYOUT) is None
+
+
+def _noisy_files(tmp_path, layout: FrameLayout, frames: int):
+    """Random source and a copy with small random errors"""
+    rnd = random.Random(7)
+    source = bytes(rnd.randrange(256) for _ in range(layout.frame_size
+                                                     * frames))
+    decoded = bytes(min(255, max(0, b + rnd.randrange(-5, 6)))
+                    for b in source)
+    (tmp_path / "src.yuv").write_bytes(source)
+    (tmp_path / "dec.yuv").write_bytes(decoded)
+    return tmp_path / "src.yuv", tmp_path / "dec.yuv"
+
+
+class TestQualityCheck:
+    """Tests for QualityResult and check_quality()"""
+
+    def test_thresholds(self):
+        """Test the minimum PSNR and SSIM of a sample"""
+        quality = QualityResult(psnr_frames=[(40.0, 45.0, 45.0),
+                                             (36.0, 44.0, 44.0)],
+                                ssim_frames=[0.97, 0.95])
+        assert quality.psnr.y == 38.0
+        assert quality.min_psnr_y == 36.0
+        assert check_quality(quality, 37.0, 0.95) == ""
+        assert "Y-PSNR" in check_quality(quality, 39.0, None)
+        assert "SSIM" in check_quality(quality, None, 0.99)
+        assert quality.to_dict()["ssim"]["min"] == 0.95
+
+    def test_ssim_threshold_without_ssim(self):
+        """Test that a required SSIM that was not computed fails"""
+        quality = QualityResult(psnr_frames=[(40.0, 40.0, 40.0)])
+        assert check_quality(quality, None, 0.9) == "SSIM not computed"
+
+    def test_sample_thresholds(self):
+        """Test that encode samples read their minimum quality"""
+        sample = EncodeTestSample.from_dict({
+            "name": "a", "codec": "h264", "width": 352, "height": 288,
+            "source_url": "", "source_checksum": "",
+            "source_filepath": "video/yuv/a.yuv",
+            "min_psnr": 35.5, "min_ssim": 0.9})
+        assert (sample.min_psnr, sample.min_ssim) == (35.5, 0.9)
+
+
+class TestNumpyQuality:
+    """Tests for the NumPy batch path"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_matches_python_psnr(self, tmp_path, monkeypatch):
+        """Test that batched PSNR equals the plain Python result"""
+        layout = FrameLayout(width=16, height=8)
+        source, decoded = _noisy_files(tmp_path, layout, 3)
+        batched = compute_quality(source, decoded, layout)
+
+        monkeypatch.setattr(video_test_quality, "HAS_NUMPY", False)
+        plain = compute_quality(source, decoded, layout)
+        assert batched.psnr_frames == pytest.approx(plain.psnr_frames)
+
+    def test_bounded_batches(self, tmp_path, monkeypatch):
+        """Test that one-frame batches give the same SSIM"""
+        layout = FrameLayout(width=16, height=16)
+        source, decoded = _noisy_files(tmp_path, layout, 3)
+        whole = compute_quality(source, decoded, layout, ssim=True)
+        monkeypatch.setattr(video_test_quality, "QUALITY_BATCH_BYTES", 1)
+        batched = compute_quality(source, decoded, layout, ssim=True)
+        assert batched.ssim_frames == pytest.approx(whole.ssim_frames)
+        assert 0.9 < whole.ssim < 1.0
+
+    def test_identical_ssim(self, tmp_path):
+        """Test that a perfect decode has SSIM 1"""
+        layout = FrameLayout(width=16, height=16)
+        source, _ = _noisy_files(tmp_path, layout, 2)
+        quality = compute_quality(source, source, layout, ssim=True)
+        assert quality.ssim == pytest.approx(1.0)
+        assert quality.psnr.y == MAX_PSNR
@@ -0,0 +1,106 @@
+"""
+Unit tests for the rate-distortion benchmark.
+
+Tests the Bjontegaard metrics, the anchor comparison gate and anchor
+files.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_quality import PsnrResult
+from tests.libs.video_test_rd import (
+    RD_MODE_BITRATE,
+    RD_MODE_QP,
+    RDCurve,
+    RDPoint,
+    bd_psnr,
+    bd_rate,
+    compare_with_anchor,
+    load_anchor,
+    rd_point_args,
+    write_anchor,
+)
+
+ANCHOR = [(500.0, 32.1), (900.0, 35.0), (1600.0, 37.6), (3000.0, 40.2)]
+
+
+def _curve(data, name="encode_h264_default") -> RDCurve:
+    """RD curve of (bitrate, luma PSNR) points"""
+    return RDCurve(name=name, codec="h264", mode=RD_MODE_QP, points=[
+        RDPoint(value=22 + 5 * i, output_bytes=1000, bitrate_kbps=rate,
+                psnr=PsnrResult(frames=10, y=psnr, u=psnr, v=psnr))
+        for i, (rate, psnr) in enumerate(data)])
+
+
+class TestBjontegaard:
+    """Tests for bd_rate() and bd_psnr()"""
+
+    def test_rate_scaled_curve(self):
+        """Test that 10% more bits at equal PSNR is a 10% BD-rate"""
+        test = [(rate * 1.1, psnr) for rate, psnr in ANCHOR]
+        assert bd_rate(ANCHOR, test) == pytest.approx(10.0)
+        assert bd_psnr(ANCHOR, test) < 0
+
+    def test_psnr_shifted_curve(self):
+        """Test that 0.5 dB more at equal bitrate is a 0.5 dB BD-PSNR"""
+        test = [(rate, psnr + 0.5) for rate, psnr in ANCHOR]
+        assert bd_psnr(ANCHOR, test) == pytest.approx(0.5)
+        assert bd_rate(ANCHOR, test) < 0
+
+    def test_needs_four_points(self):
+        """Test that short or disjoint curves give no result"""
+        assert bd_rate(ANCHOR[:3], ANCHOR[:3]) is None
+        disjoint = [(rate * 100, psnr + 20) for rate, psnr in ANCHOR]
+        assert bd_psnr(ANCHOR, disjoint) is None
+
+
+class TestAnchorComparison:
+    """Tests for compare_with_anchor() and anchor files"""
+
+    def test_threshold_gate(self):
+        """Test that only BD-rates above the threshold regress"""
+        anchor = _curve(ANCHOR).to_dict()
+        worse = _curve([(rate * 1.08, psnr) for rate, psnr in ANCHOR])
+        comparison = compare_with_anchor(worse, anchor, threshold=0.05)
+        assert comparison["bd_rate_pct"] == pytest.approx(8.0)
+        assert comparison["regressed"]
+        assert not compare_with_anchor(worse, anchor,
+                                       threshold=0.10)["regressed"]
+
+    def test_anchor_round_trip(self, tmp_path):
+        """Test that written anchors load back per curve and mode"""
+        path = tmp_path / "anchor.json"
+        failed = RDCurve(name="encode_av1_default", codec="av1",
+                         mode=RD_MODE_QP, error="crash")
+        write_anchor(str(path), [_curve(ANCHOR), failed], RD_MODE_QP,
+                     SystemInfo(gpu_name="GPU"))
+
+        anchor = load_anchor(str(path), RD_MODE_QP)
+        assert list(anchor) == ["encode_h264_default"]
+        comparison = compare_with_anchor(_curve(ANCHOR),
+                                         anchor["encode_h264_default"])
+        assert comparison["bd_rate_pct"] == pytest.approx(0.0, abs=1e-6)
+        with pytest.raises(ValueError):
+            load_anchor(str(path), RD_MODE_BITRATE)
+
+    def test_point_args(self):
+        """Test the encoder arguments of QP and bitrate points"""
+        assert rd_point_args(RD_MODE_QP, 27)[-6:] == [
+            "--qpI", "27", "--qpP", "27", "--qpB", "27"]
+        assert rd_point_args(RD_MODE_BITRATE, 1500)[-2:] == [
+            "--averageBitrate", "1500000"]
@@ -0,0 +1,114 @@
+"""
+Unit tests for performance regression detection.
+
+Tests the robust duration check and its use of the run history.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_regression import (
+    MIN_HISTORY_SAMPLES,
+    check_duration,
+    find_duration_regression,
+    median_and_mad,
+)
+from tests.libs.video_test_run_history import RunHistory
+
+NVIDIA = SystemInfo(gpu_name="RTX 3080", driver_name="NVIDIA",
+                    driver_version="550.120", os_name="Linux")
+STABLE_HISTORY = [1000.0, 1010.0, 990.0, 1005.0, 995.0, 1000.0]
+
+
+def _record(history: RunHistory, time_ms: float, status: str = "success",
+            binary_name: str = "vk-video-dec-test") -> None:
+    """Record a single decode_a result"""
+    history.record_run("decode", NVIDIA, [{
+        "name": "decode_a", "codec": "h264", "status": status,
+        "execution_time_ms": time_ms}],
+        driver="nvidia", binary_name=binary_name)
+
+
+class TestCheckDuration:
+    """Tests for check_duration()"""
+
+    def test_median_and_mad(self):
+        """Test the robust statistics"""
+        assert median_and_mad([1.0, 2.0, 3.0, 4.0, 100.0]) == (3.0, 1.0)
+
+    def test_not_enough_history(self):
+        """Test that short histories are not judged"""
+        history = STABLE_HISTORY[:MIN_HISTORY_SAMPLES - 1]
+        assert check_duration(5000.0, history) is None
+
+    def test_stable_duration_not_flagged(self):
+        """Test that a duration within the spread is not flagged"""
+        check = check_duration(1020.0, STABLE_HISTORY)
+        assert check is not None
+        assert not check.regressed
+        assert check.samples == len(STABLE_HISTORY)
+
+    def test_large_slowdown_flagged(self):
+        """Test that a clear slowdown is flagged"""
+        check = check_duration(2000.0, STABLE_HISTORY)
+        assert check.regressed
+        assert check.baseline_ms == 1000.0
+        assert check.ratio == 2.0
+
+    def test_outlier_in_history_ignored(self):
+        """Test that a single slow run does not hide a regression"""
+        check = check_duration(2000.0, STABLE_HISTORY + [9000.0])
+        assert check.regressed
+
+    def test_small_absolute_delta_not_flagged(self):
+        """Test that short tests need a minimum absolute slowdown"""
+        check = check_duration(20.0, [10.0] * 6)
+        assert check.ratio == 2.0
+        assert not check.regressed
+
+    def test_noisy_history_not_flagged(self):
+        """Test that a noisy test needs a larger slowdown"""
+        noisy = [1000.0, 1600.0, 700.0, 1400.0, 900.0, 1200.0]
+        assert not check_duration(1800.0, noisy).regressed
+
+
+class TestFindDurationRegression:
+    """Tests for find_duration_regression()"""
+
+    def test_uses_matching_history(self, tmp_path):
+        """Test that only successful runs of the same binary are used"""
+        with RunHistory(str(tmp_path / "history.db")) as history:
+            for time_ms in STABLE_HISTORY:
+                _record(history, time_ms)
+            _record(history, 50.0, status="crash")
+            for _ in range(10):
+                _record(history, 4000.0, binary_name="other-binary")
+
+            check = find_duration_regression(
+                history, "decode_a", 2500.0, test_type="decode",
+                driver="nvidia", gpu_name="RTX 3080",
+                binary_name="vk-video-dec-test")
+        assert check.samples == len(STABLE_HISTORY)
+        assert check.regressed
+
+    def test_other_gpu_has_no_history(self, tmp_path):
+        """Test that history from another GPU is not used"""
+        with RunHistory(str(tmp_path / "history.db")) as history:
+            for time_ms in STABLE_HISTORY:
+                _record(history, time_ms)
+            assert find_duration_regression(
+                history, "decode_a", 2500.0, test_type="decode",
+                driver="nvidia", gpu_name="RTX 4090",
+                binary_name="vk-video-dec-test") is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for the run history database.
+
+Tests RunHistory recording and queries.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+
+import pytest
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_run_history import RunHistory
+
+NVIDIA = SystemInfo(gpu_name="RTX 3080", driver_name="NVIDIA",
+                    driver_version="550.120", os_name="Linux")
+INTEL = SystemInfo(gpu_name="Arc A770", driver_name="Intel open-source Mesa",
+                   driver_version="Mesa 24.0", os_name="Linux")
+
+
+def _result(name: str, status: str = "success", time_ms: float = 100.0,
+            **extra) -> dict:
+    """Create a result dictionary as produced by result_to_dict()"""
+    return {"name": name, "codec": "h264", "test_type": "decode",
+            "status": status, "success": status == "success",
+            "returncode": 0 if status == "success" else 1,
+            "execution_time_ms": time_ms, **extra}
+
+
+@pytest.fixture(name="history")
+def fixture_history(tmp_path):
+    """Create a temporary run history database"""
+    with RunHistory(str(tmp_path / "history.db")) as db:
+        yield db
+
+
+class TestRunHistory:
+    """Tests for RunHistory"""
+
+    def test_record_and_query_test(self, history):
+        """Test that recorded results are returned newest first"""
+        history.record_run("decode", NVIDIA, [_result("decode_a", time_ms=80)],
+                           driver="nvidia", binary_hash="abc")
+        history.record_run("decode", NVIDIA, [_result("decode_a", time_ms=90)],
+                           driver="nvidia", binary_hash="def")
+
+        rows = history.test_history("decode_a")
+        assert [r["execution_time_ms"] for r in rows] == [90, 80]
+        assert rows[0]["binary_hash"] == "def"
+        assert rows[0]["gpu_name"] == "RTX 3080"
+
+    def test_filter_by_driver(self, history):
+        """Test that history can be filtered by driver"""
+        history.record_run("decode", NVIDIA, [_result("decode_a")],
+                           driver="nvidia")
+        history.record_run("decode", INTEL, [_result("decode_a")],
+                           driver="anv")
+
+        rows = history.test_history("decode_a", driver="anv")
+        assert len(rows) == 1
+        assert rows[0]["gpu_name"] == "Arc A770"
+
+    def test_extra_fields_kept_as_details(self, history):
+        """Test that fields without a column are stored as JSON details"""
+        history.record_run("decode", NVIDIA,
+                           [_result("decode_a", error_message="oops")],
+                           driver="nvidia")
+        details = json.loads(history.test_history("decode_a")[0]["details"])
+        assert details["error_message"] == "oops"
+
+    def test_recent_runs_counts(self, history):
+        """Test that recent runs report status counts"""
+        history.record_run("decode", NVIDIA, [
+            _result("decode_a"), _result("decode_b", status="crash"),
+            _result("decode_c", status="not_supported")], driver="nvidia")
+
+        runs = history.recent_runs()
+        assert len(runs) == 1
+        assert runs[0]["total"] == 3
+        assert runs[0]["passed"] == 1
+        assert runs[0]["failed"] == 1
+
+    def test_driver_summary(self, history):
+        """Test per-test aggregation for a driver"""
+        for time_ms in (100, 200, 300):
+            history.record_run("decode", NVIDIA,
+                               [_result("decode_a", time_ms=time_ms)],
+                               driver="nvidia")
+
+        summary = history.driver_summary("nvidia")
+        assert len(summary) == 1
+        assert summary[0]["runs"] == 3
+        assert summary[0]["avg_ms"] == 200
+        assert summary[0]["max_ms"] == 300
+
+    def test_reopen_keeps_data(self, tmp_path):
+        """Test that data persists across connections"""
+        db_path = str(tmp_path / "history.db")
+        with RunHistory(db_path) as history:
+            history.record_run("decode", NVIDIA, [_result("decode_a")])
+        with RunHistory(db_path) as history:
+            assert len(history.test_history("decode_a")) == 1
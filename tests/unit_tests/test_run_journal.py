@@ -0,0 +1,147 @@
+"""
+Unit tests for the run journal.
+
+Tests RunJournal checkpointing, fingerprinting and result restoration.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from tests.libs.video_test_config_base import (
+    EXPORTED_META,
+    BaseTestConfig,
+    CodecType,
+    VideoTestStatus,
+)
+from tests.libs.video_test_run_journal import (
+    RunJournal,
+    compute_suite_fingerprint,
+    restore_result,
+)
+
+
+def _make_config(name: str, extra_args=None) -> BaseTestConfig:
+    """Create a minimal test config"""
+    return BaseTestConfig(name=name, codec=CodecType.H264,
+                          extra_args=extra_args)
+
+
+class TestSuiteFingerprint:
+    """Tests for compute_suite_fingerprint()"""
+
+    def test_same_suite_same_fingerprint(self):
+        """Test that identical suites produce the same fingerprint"""
+        suite_a = [_make_config("a"), _make_config("b")]
+        suite_b = [_make_config("a"), _make_config("b")]
+        assert (compute_suite_fingerprint(suite_a) ==
+                compute_suite_fingerprint(suite_b))
+
+    def test_extra_args_change_fingerprint(self):
+        """Test that changed arguments produce a different fingerprint"""
+        suite_a = [_make_config("a")]
+        suite_b = [_make_config("a", ["--loop", "3"])]
+        assert (compute_suite_fingerprint(suite_a) !=
+                compute_suite_fingerprint(suite_b))
+
+    def test_selection_changes_fingerprint(self):
+        """Test that a different test selection changes the fingerprint"""
+        suite_a = [_make_config("a"), _make_config("b")]
+        suite_b = [_make_config("a")]
+        assert (compute_suite_fingerprint(suite_a) !=
+                compute_suite_fingerprint(suite_b))
+
+
+class TestRunJournal:
+    """Tests for RunJournal"""
+
+    def test_resume_returns_completed_tests(self, tmp_path):
+        """Test that recorded tests are returned on resume"""
+        path = tmp_path / "journal.jsonl"
+        journal = RunJournal(path, "fp", "bin")
+        assert not journal.start(resume=True)
+        journal.record("decode_a", {"status": "success"})
+
+        resumed = RunJournal(path, "fp", "bin").start(resume=True)
+        assert resumed == {"decode_a": {"status": "success"}}
+
+    def test_without_resume_journal_is_reset(self, tmp_path):
+        """Test that a normal run discards the previous journal"""
+        path = tmp_path / "journal.jsonl"
+        journal = RunJournal(path, "fp", "bin")
+        journal.start()
+        journal.record("decode_a", {"status": "success"})
+
+        assert not RunJournal(path, "fp", "bin").start(resume=False)
+        assert not RunJournal(path, "fp", "bin").load()
+
+    def test_mismatched_binary_is_ignored(self, tmp_path):
+        """Test that a journal for a different binary is not resumed"""
+        path = tmp_path / "journal.jsonl"
+        journal = RunJournal(path, "fp", "bin")
+        journal.start()
+        journal.record("decode_a", {"status": "success"})
+
+        assert not RunJournal(path, "fp", "other").start(resume=True)
+
+    def test_truncated_line_is_ignored(self, tmp_path):
+        """Test that a partially written entry does not break loading"""
+        path = tmp_path / "journal.jsonl"
+        journal = RunJournal(path, "fp", "bin")
+        journal.start()
+        journal.record("decode_a", {"status": "success"})
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "result", "name": "deco')
+
+        assert list(journal.load()) == ["decode_a"]
+
+    def test_remove(self, tmp_path):
+        """Test that remove deletes the journal file"""
+        path = tmp_path / "journal.jsonl"
+        journal = RunJournal(path, "fp", "bin")
+        journal.start()
+        journal.remove()
+        assert not path.exists()
+        journal.remove()  # Removing twice is harmless
+
+
+def test_restore_fields():
+    """Test that exported fields are restored into a TestResult"""
+    config = _make_config("a")
+    result = restore_result(config, {
+        "status": "crash",
+        "returncode": -11,
+        "execution_time_ms": 1500.0,
+        "warning_found": True,
+        "error_message": "boom",
+        "command_line": "dec -i a.h264",
+        "phases_ms": {"execute": 1400.0, "harness": 100.0},
+    })
+    assert result.config is config
+    assert result.status == VideoTestStatus.CRASH
+    assert result.returncode == -11
+    assert result.execution_time == 1.5
+    assert result.warning_found
+    assert result.error_message == "boom"
+    assert result.command_line == "dec -i a.h264"
+    assert result.phases == {"execute": 1.4, "harness": 0.1}
+    assert result.meta["resumed"] is True
+
+
+def test_restore_meta():
+    """Test that every exported meta entry is restored"""
+    entry = {key: {"value": index}
+             for index, key in enumerate(EXPORTED_META)}
+    result = restore_result(_make_config("a"), entry)
+    for key in EXPORTED_META:
+        assert result.meta[key] == entry[key]
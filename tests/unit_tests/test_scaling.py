@@ -0,0 +1,90 @@
+"""
+Unit tests for the concurrency scaling benchmark.
+
+Tests the queue selection arguments, concurrent measurement of instances
+and the scaling efficiency.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+
+import pytest
+
+from tests.libs.video_test_scaling import (
+    QUEUE_MODE_DEFAULT,
+    QUEUE_MODE_LOAD_BALANCE,
+    QUEUE_MODE_QUEUE_ID,
+    ScalingPoint,
+    apply_efficiency,
+    measure_point,
+    queue_mode_args,
+)
+
+FAKE_DECODER = [sys.executable, "-c",
+                "print('\\t\\tFrame 30, FPS: 60.0')"]
+
+
+class TestQueueModes:
+    """Tests for queue_mode_args()"""
+
+    def test_queue_id_round_robin(self):
+        """Test that instances are spread over the decode queues"""
+        assert [queue_mode_args(QUEUE_MODE_QUEUE_ID, i, 2)[1]
+                for i in range(4)] == ["0", "1", "0", "1"]
+
+    def test_flags(self):
+        """Test the flags of the other modes"""
+        assert not queue_mode_args(QUEUE_MODE_DEFAULT, 3, 16)
+        assert queue_mode_args(QUEUE_MODE_LOAD_BALANCE, 0, None) == [
+            "--enableHwLoadBalancing"]
+
+
+class TestScalingPoints:
+    """Tests for measure_point() and apply_efficiency()"""
+
+    def test_measure_concurrent_instances(self):
+        """Test that every instance's frames and rate are collected"""
+        point = ScalingPoint(sample="decode_a", mode=QUEUE_MODE_DEFAULT,
+                             instances=3)
+        measure_point(point, [FAKE_DECODER] * 3, timeout=30)
+        assert not point.errors
+        assert point.frames == 90
+        assert point.instance_fps == pytest.approx([60.0, 60.0, 60.0])
+        assert point.aggregate_fps == pytest.approx(90 / point.wall_seconds)
+
+    def test_failed_instance_recorded(self):
+        """Test that an instance exiting with an error is reported"""
+        point = ScalingPoint(sample="decode_a", mode=QUEUE_MODE_DEFAULT,
+                             instances=2)
+        measure_point(point, [FAKE_DECODER,
+                              [sys.executable, "-c", "exit(3)"]])
+        assert point.errors == ["instance 1: return code 3"]
+
+    def test_efficiency_relative_to_one_instance(self):
+        """Test efficiency per sample and mode"""
+        points = [
+            ScalingPoint("a", QUEUE_MODE_DEFAULT, 1, wall_seconds=1.0,
+                         frames=100),
+            ScalingPoint("a", QUEUE_MODE_DEFAULT, 4, wall_seconds=2.0,
+                         frames=400),
+            ScalingPoint("a", QUEUE_MODE_LOAD_BALANCE, 2, wall_seconds=1.0,
+                         frames=200),
+        ]
+        apply_efficiency(points)
+        assert points[0].efficiency == 1.0
+        assert points[1].efficiency == 0.5
+        # No single-instance reference for this mode
+        assert points[2].efficiency is None
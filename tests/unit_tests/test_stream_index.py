@@ -0,0 +1,226 @@
+"""
+Unit tests for the stream metadata index.
+
+Tests metadata read from hand-made H.264 and H.265 parameter sets, AV1
+sequence headers and VP9 key frames, encode source metadata, the on-disk
+index, test filters and cost estimates.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+
+import pytest
+
+from tests.libs.video_test_framework_encode import EncodeTestSample
+from tests.libs.video_test_stream_index import (
+    INDEX_VERSION,
+    MetadataFilter,
+    StreamIndex,
+    StreamMetadata,
+    estimate_cost,
+    parse_resolution,
+    read_stream_metadata,
+)
+from tests.unit_tests.stream_builders import ivf, nal, obu, payload, u, ue
+
+
+def _h264_stream() -> bytes:
+    """High 10 1920x1080 H.264 stream of 3 pictures"""
+    sps = (u(110, 8) + u(0, 8) + u(40, 8) + ue(0)
+           + ue(1) + ue(2) + ue(2) + "0" + "0"  # 4:2:0, 10-bit
+           + ue(0) + ue(0) + ue(0) + ue(1) + "0"
+           + ue(119) + ue(67) + "1" + "1"  # 1920x1088, frame_mbs_only
+           + "1" + ue(0) + ue(0) + ue(0) + ue(4)  # crop 8 lines
+           + "0")
+    data = nal(b"\x67", sps) + nal(b"\x68", "1")
+    data += nal(b"\x65", ue(0) + ue(7))
+    for _ in range(2):
+        data += nal(b"\x41", ue(0) + ue(5))
+    return data
+
+
+def _h265_stream() -> bytes:
+    """Main 10 1280x720 H.265 stream of 2 pictures"""
+    sps = ("0000" + "000" + "1"  # vps id, max_sub_layers_minus1, nesting
+           + "00" + "0" + u(2, 5) + "0" * 32 + "0" * 48 + u(93, 8)
+           + ue(0) + ue(1) + ue(1280) + ue(720) + "0"
+           + ue(2) + ue(2))
+    data = (nal(b"\x40\x01", "1") + nal(b"\x42\x01", sps)
+            + nal(b"\x44\x01", "1"))
+    data += nal(bytes([19 << 1, 1]), "1")
+    data += nal(bytes([1 << 1, 1]), "1")
+    return data
+
+
+def _av1_sequence_header() -> bytes:
+    """Main profile, 10-bit, 1920x1080 sequence header payload"""
+    bits = (u(0, 3) + "0" + "0"  # profile, still_picture, reduced
+            + "0" + "0"  # timing_info, initial_display_delay
+            + u(0, 5) + u(0, 12) + u(8, 5) + "0"  # one operating point
+            + u(10, 4) + u(10, 4) + u(1919, 11) + u(1079, 11)
+            + "0" + "000" + "0000"  # frame ids, tools
+            + "1" + "00"  # enable_order_hint
+            + "1" + "1"  # choose screen content, choose integer mv
+            + "110" + "000"  # order_hint_bits_minus_1, superres etc.
+            + "1" + "0" + "0" + "0")  # 10-bit, not mono, no desc, range
+    return payload(bits)
+
+
+class TestStreamMetadata:
+    """Tests for metadata read from coded streams"""
+
+    def test_h264(self, tmp_path):
+        """Test a High 10 SPS with cropping"""
+        path = tmp_path / "a.264"
+        path.write_bytes(_h264_stream())
+        assert read_stream_metadata(path) == StreamMetadata(
+            "h264", 1920, 1080, 3, 10, "420", "high10")
+
+    def test_h265(self, tmp_path):
+        """Test a Main 10 SPS"""
+        path = tmp_path / "a.265"
+        path.write_bytes(_h265_stream())
+        assert read_stream_metadata(path) == StreamMetadata(
+            "h265", 1280, 720, 2, 10, "420", "main10")
+
+    def test_av1(self, tmp_path):
+        """Test the maximum frame size and bit depth of an AV1 stream"""
+        td = obu(2, b"")
+        key = td + obu(1, _av1_sequence_header()) + obu(6, b"\x10\x00")
+        path = tmp_path / "a.ivf"
+        path.write_bytes(ivf(b"AV01", [key, td + obu(6, b"\x30\x00")]))
+        assert read_stream_metadata(path) == StreamMetadata(
+            "av1", 1920, 1080, 2, 10, "420", "main")
+
+    def test_vp9(self, tmp_path):
+        """Test a profile 2 key frame header"""
+        bits = ("10" + "0" + "1" + "0" + "0" + "1" + "0"
+                + u(0x498342, 24) + "0" + "001" + "0"
+                + u(351, 16) + u(287, 16))
+        path = tmp_path / "a.ivf"
+        path.write_bytes(ivf(b"VP90", [payload(bits), b"\x86\x00"]))
+        assert read_stream_metadata(path) == StreamMetadata(
+            "vp9", 352, 288, 2, 10, "420", "2")
+
+    def test_missing_header(self, tmp_path):
+        """Test that a stream without an SPS is an error"""
+        path = tmp_path / "a.264"
+        path.write_bytes(nal(b"\x65", ue(0) + ue(7)))
+        with pytest.raises(ValueError):
+            read_stream_metadata(path)
+
+
+class TestStreamIndex:
+    """Tests for the on-disk index"""
+
+    def test_cached_lookup(self, tmp_path):
+        """Test that streams are parsed once and the index persists"""
+        stream = tmp_path / "a.264"
+        stream.write_bytes(_h264_stream())
+        index_path = tmp_path / "index.json"
+        index = StreamIndex(index_path)
+        metadata = index.lookup("md5:abc", stream)
+        assert metadata.width == 1920
+        index.save()
+        stream.unlink()
+        assert StreamIndex(index_path).lookup("md5:abc", stream) == metadata
+        assert StreamIndex(index_path).lookup("md5:other", stream) is None
+
+    def test_version_mismatch(self, tmp_path):
+        """Test that entries of another index version are dropped"""
+        index_path = tmp_path / "index.json"
+        index_path.write_text(json.dumps({
+            "version": INDEX_VERSION + 1,
+            "streams": {"k": {"codec": "h264", "width": 64}}}))
+        assert len(StreamIndex(index_path)) == 0
+        index_path.write_text("not json")
+        assert StreamIndex(index_path).get("k") is None
+
+    def test_encode_source(self, tmp_path):
+        """Test the layout and frame count of a raw encode source"""
+        source = tmp_path / "src.yuv"
+        source.write_bytes(b"\x00" * (64 * 32 * 3 * 2 * 5))  # 5 frames
+        sample = EncodeTestSample.from_dict({
+            "name": "s", "codec": "h265", "source_url": "",
+            "source_checksum": "", "source_filepath": str(source),
+            "width": 64, "height": 32, "profile": "main10",
+            "extra_args": ["--inputChromaSubsampling", "444",
+                           "--inputBpp", "10"]})
+        metadata = StreamIndex(tmp_path / "i.json").lookup_source(sample)
+        assert metadata == StreamMetadata("h265", 64, 32, 5, 10, "444",
+                                          "main10")
+
+    def test_shared_encode_source(self, tmp_path):
+        """Test that samples reading one raw source in different layouts
+        get their own frame count, bit depth and profile"""
+        source = tmp_path / "src.yuv"
+        source.write_bytes(b"\x00" * (64 * 32 * 3 * 3))  # 3 P010 frames
+        base = {"codec": "h265", "source_url": "",
+                "source_checksum": "sha256:abc",
+                "source_filepath": str(source), "width": 64, "height": 32}
+        main = EncodeTestSample.from_dict(
+            {**base, "name": "main", "profile": "main"})
+        main10 = EncodeTestSample.from_dict(
+            {**base, "name": "main10", "profile": "main10",
+             "extra_args": ["--inputBpp", "10", "--inputNumPlanes", "2"]})
+        index_path = tmp_path / "i.json"
+        index = StreamIndex(index_path)
+        expected = (StreamMetadata("h265", 64, 32, 6, 8, "420", "main"),
+                    StreamMetadata("h265", 64, 32, 3, 10, "420", "main10"))
+        assert (index.lookup_source(main),
+                index.lookup_source(main10)) == expected
+        index.save()
+
+        source.unlink()
+        index = StreamIndex(index_path)
+        assert (index.lookup_source(main10),
+                index.lookup_source(main)) == expected[::-1]
+
+
+class TestFiltersAndCost:
+    """Tests for resource filters and cost estimates"""
+
+    META = StreamMetadata("h264", 3840, 2160, 600, 10)
+
+    def test_filter(self):
+        """Test each limit and unknown metadata"""
+        assert not MetadataFilter().active
+        size = MetadataFilter(1920, 1080)
+        assert size.reject_reason(self.META, 600) == \
+            "3840x2160 above 1920x1080"
+        frames = MetadataFilter(max_frames=300)
+        assert frames.reject_reason(self.META, 600) == \
+            "600 frames above 300"
+        assert frames.reject_reason(self.META, 300) == ""
+        depth = MetadataFilter(bit_depth=8)
+        assert depth.reject_reason(self.META, 1) == "10-bit, not 8-bit"
+        assert depth.reject_reason(None, 0) == "stream metadata unknown"
+
+    def test_cost(self):
+        """Test frame limits and decode loops in cost estimates"""
+        meta = StreamMetadata("h264", 1000, 1000, 10)
+        assert estimate_cost(meta, [], "decode") == 10.0
+        assert estimate_cost(meta, ["--maxFrameCount", "4", "--loop", "3"],
+                             "decode") == 12.0
+        assert estimate_cost(meta, ["--numFrames", "5", "--loop", "3"],
+                             "encode") == 5.0
+
+    def test_parse_resolution(self):
+        """Test WIDTHxHEIGHT values"""
+        assert parse_resolution("1920x1080") == (1920, 1080)
+        for text in ("1920", "0x10", "axb"):
+            with pytest.raises(ValueError):
+                parse_resolution(text)
@@ -0,0 +1,186 @@
+"""
+Unit tests for encoder output structure checks.
+
+Tests expectations from encoder arguments, picture types, slices and
+temporal ids read from small hand-made H.264, H.265 and AV1 streams, and
+the checks against each encoder option.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_structure import (
+    StructureExpectation,
+    check_stream_structure,
+    read_pictures,
+)
+from tests.unit_tests.stream_builders import ivf, nal, obu, ue
+
+H264_SLICE_TYPES = {"P": 5, "B": 6, "I": 7}
+H265_SLICE_TYPES = {"B": 0, "P": 1, "I": 2}
+
+
+def _h264_stream(types: str, slices: int = 1) -> bytes:
+    """H.264 stream of pictures of the given types; "K" is an IDR"""
+    data = b""
+    for picture in types:
+        key = picture == "K"
+        if key:
+            data += nal(b"\x67", "1") + nal(b"\x68", "1")
+        slice_type = H264_SLICE_TYPES["I" if key else picture]
+        for index in range(slices):
+            data += nal(bytes([0x65 if key else 0x41]),
+                        ue(index) + ue(slice_type))
+    return data
+
+
+def _h265_stream(types: str, temporal_ids=None) -> bytes:
+    """H.265 stream with 2 extra slice header bits; "K" is an IDR"""
+    data = b""
+    for index, picture in enumerate(types):
+        tid = temporal_ids[index] if temporal_ids else 0
+        key = picture == "K"
+        bits = "1"  # first_slice_segment_in_pic_flag
+        if key:
+            # PPS 0 of SPS 0 with num_extra_slice_header_bits 2
+            data += nal(b"\x40\x01", "1") + nal(b"\x42\x01", "1")
+            data += nal(b"\x44\x01", "1" + "1" + "00" + "010")
+            bits += "0"  # no_output_of_prior_pics_flag
+        slice_type = H265_SLICE_TYPES["I" if key else picture]
+        bits += ue(0) + "11" + ue(slice_type)
+        nal_type = 19 if key else 1
+        data += nal(bytes([nal_type << 1, tid + 1]), bits)
+    return data
+
+
+def _av1_ivf(frame_headers) -> bytes:
+    """AV1 IVF file with one frame OBU per temporal unit"""
+    frames = []
+    for index, header in enumerate(frame_headers):
+        frame = obu(2, b"")
+        if not index:
+            frame += obu(1, b"\x00\x00\x00")
+        frames.append(frame + obu(6, bytes([header, 0])))
+    return ivf(b"AV01", frames)
+
+
+def _check(tmp_path, data: bytes, args, name: str = "out.264") -> list:
+    """Failures of a stream against encoder arguments"""
+    path = tmp_path / name
+    path.write_bytes(data)
+    expected = StructureExpectation.from_args(args)
+    return check_stream_structure(path, None, expected).failures
+
+
+class TestExpectation:
+    """Tests for expectations from encoder arguments"""
+
+    def test_from_args(self):
+        """Test that given options are read and others left unchecked"""
+        expected = StructureExpectation.from_args(
+            ["--numFrames", "30", "--idrPeriod", "10", "--slices", "2",
+             "--intraRefreshMode", "picpartition"])
+        assert expected == StructureExpectation(
+            frames=30, idr_period=10, slices=2, intra_refresh=True)
+        assert StructureExpectation.from_args(None) == StructureExpectation()
+
+    def test_invalid_value(self):
+        """Test that a non-integer value is rejected"""
+        with pytest.raises(ValueError):
+            StructureExpectation.from_args(["--gopFrameCount", "many"])
+
+
+class TestPictures:
+    """Tests for pictures read from streams"""
+
+    def test_h264(self, tmp_path):
+        """Test H.264 slice types and slice counts"""
+        path = tmp_path / "a.264"
+        path.write_bytes(_h264_stream("KPBBI", slices=2))
+        report = read_pictures(path)
+        assert [p.type for p in report.pictures] == list("IPBBI")
+        assert {p.slices for p in report.pictures} == {2}
+        assert report.key_frames == [0]
+
+    def test_h265(self, tmp_path):
+        """Test H.265 slice types after extra header bits, and temporal
+        ids"""
+        path = tmp_path / "a.265"
+        path.write_bytes(_h265_stream("KBPK", temporal_ids=[0, 2, 1, 0]))
+        report = read_pictures(path)
+        assert [p.type for p in report.pictures] == list("IBPI")
+        assert [p.temporal_id for p in report.pictures] == [0, 2, 1, 0]
+        assert report.to_dict()["key_frames"] == [0, 3]
+
+    def test_av1(self, tmp_path):
+        """Test AV1 key, intra-only, inter and shown existing frames"""
+        path = tmp_path / "a.ivf"
+        path.write_bytes(_av1_ivf([0x10, 0x30, 0x40, 0x80]))
+        report = read_pictures(path)
+        assert [p.type for p in report.pictures] == ["I", "P", "I", ""]
+        assert report.key_frames == [0]
+
+
+class TestChecks:
+    """Tests for checks against encoder options"""
+
+    ARGS = ["--numFrames", "8", "--idrPeriod", "4", "--gopFrameCount", "2",
+            "--consecutiveBFrameCount", "1", "--slices", "1"]
+
+    def test_matching_stream(self, tmp_path):
+        """Test that a stream with the requested structure passes"""
+        assert _check(tmp_path, _h264_stream("KBIPKPIB"), self.ARGS) == []
+
+    def test_frame_count(self, tmp_path):
+        """Test that the frame count is checked only with --numFrames"""
+        failures = _check(tmp_path, _h264_stream("KPP"), ["--numFrames", "4"])
+        assert failures == ["3 frames, expected 4"]
+        assert _check(tmp_path, _h264_stream("KPP"), []) == []
+        assert _check(tmp_path, b"", []) == ["no frames"]
+
+    def test_idr_period(self, tmp_path):
+        """Test that key frames must follow the IDR period"""
+        failures = _check(tmp_path, _h264_stream("KIBIPKIB"), self.ARGS)
+        assert len(failures) == 1 and "key frames at [0, 5]" in failures[0]
+
+    def test_gop_and_b_frames(self, tmp_path):
+        """Test intra frame counts and runs of B frames"""
+        failures = _check(tmp_path, _h264_stream("KBBPKPIB"), self.ARGS)
+        assert failures == [
+            "3 intra frames, expected 4 (--gopFrameCount 2)",
+            "2 consecutive B frames, expected at most 1"]
+
+    def test_slices(self, tmp_path):
+        """Test slice counts, unless intra refresh changes them"""
+        args = ["--slices", "3"]
+        failures = _check(tmp_path, _h264_stream("KP", slices=2), args)
+        assert failures == ["frame 0 has 2 slices, expected 3"]
+        assert _check(tmp_path, _h264_stream("KP", slices=2),
+                      args + ["--intraRefreshMode", "picpartition"]) == []
+
+    def test_temporal_layers(self, tmp_path):
+        """Test that temporal ids stay below the layer count"""
+        data = _h265_stream("KPPP", temporal_ids=[0, 2, 1, 2])
+        args = ["--temporalLayerCount", "2"]
+        assert _check(tmp_path, data, args, "a.265") == [
+            "temporal id 2, expected fewer than 2 layers"]
+        assert _check(tmp_path, data, ["--temporalLayerCount", "3"],
+                      "a.265") == []
+
+    def test_first_key_frame(self, tmp_path):
+        """Test that a stream must start with a key frame"""
+        assert _check(tmp_path, _av1_ivf([0x30, 0x10]), [],
+                      "a.ivf") == ["first frame is not a key frame"]
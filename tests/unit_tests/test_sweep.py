@@ -0,0 +1,197 @@
+"""
+Unit tests for the encoder sweep.
+
+Tests expansion of the option matrix into encode samples, collection of
+the measured points and the speed/size Pareto front.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+
+import pytest
+
+from tests.libs.video_test_config_base import (
+    CodecType,
+    TestResult,
+    VideoTestStatus,
+)
+from tests.libs.video_test_framework_encode import EncodeTestSample
+from tests.libs.video_test_output_analyzer import (
+    EncodedFramesAnalyzer,
+    analyze_output,
+)
+from tests.libs.video_test_sweep import (
+    SPEED_SIZE_AND_QUALITY,
+    SweepPoint,
+    SweepSpec,
+    collect_points,
+    expand_sweep,
+    load_sweep,
+    pareto_front,
+)
+
+
+def _sample(name: str, extra_args=None) -> EncodeTestSample:
+    """Encode sample of a 352x288 source"""
+    return EncodeTestSample(name=name, codec=CodecType.H264,
+                            extra_args=extra_args, width=352, height=288,
+                            source_filepath="video/yuv/a.yuv")
+
+
+def _point(fps: float, bytes_per_frame: float,
+           sample: str = "a") -> SweepPoint:
+    """Measured point of 100 frames"""
+    return SweepPoint(sample=sample, codec="h264", params={"fps": fps},
+                      frames=100, seconds=100 / fps,
+                      output_bytes=int(100 * bytes_per_frame))
+
+
+class TestExpandSweep:
+    """Tests for load_sweep() and expand_sweep()"""
+
+    def test_combinations_per_sample(self):
+        """Test that each sample is copied once per combination"""
+        spec = SweepSpec(matrix={"qualityLevel": [0, 2],
+                                 "tuningMode": ["hq", "lowlatency"]})
+        configs, origins = expand_sweep(
+            [_sample("a", ["--gopFrameCount", "16"]), _sample("b")], spec)
+
+        assert len(configs) == 8
+        assert configs[0].name == "a_sweep000"
+        assert configs[0].extra_args == [
+            "--gopFrameCount", "16", "--qualityLevel", "0",
+            "--tuningMode", "hq"]
+        assert configs[0].width == 352
+        assert origins["b_sweep003"] == (
+            "b", {"qualityLevel": 2, "tuningMode": "lowlatency"})
+
+    def test_sample_selection(self):
+        """Test that the sweep file can restrict the samples"""
+        spec = SweepSpec(matrix={"qualityLevel": [0]}, samples=["b"])
+        configs, _ = expand_sweep([_sample("a"), _sample("b")], spec)
+        assert [c.name for c in configs] == ["b_sweep000"]
+
+    def test_load_sweep(self, tmp_path):
+        """Test loading and validation of sweep files"""
+        path = tmp_path / "sweep.json"
+        path.write_text(json.dumps({"samples": ["a"],
+                                    "matrix": {"qualityLevel": [0, 1]}}))
+        spec = load_sweep(str(path))
+        assert spec.samples == ["a"]
+        assert len(spec.combinations()) == 2
+
+        path.write_text(json.dumps({"matrix": {"qualityLevel": []}}))
+        with pytest.raises(ValueError):
+            load_sweep(str(path))
+
+
+class TestParetoFront:
+    """Tests for pareto_front()"""
+
+    def test_dominated_points_excluded(self):
+        """Test that slower and larger configurations are not on the
+        front"""
+        fast = _point(200, 700)
+        small = _point(100, 400)
+        balanced = _point(150, 500)
+        dominated = _point(120, 600)
+        front = pareto_front([small, dominated, fast, balanced])
+
+        assert front == [fast, balanced, small]
+        assert not dominated.on_front
+
+    def test_front_per_sample(self):
+        """Test that samples are not compared with each other"""
+        a = _point(100, 500, sample="a")
+        b = _point(50, 900, sample="b")
+        assert pareto_front([a, b]) == [a, b]
+
+    def test_unmeasured_points_ignored(self):
+        """Test that failed configurations are not on the front"""
+        failed = SweepPoint(sample="a", codec="h264", params={},
+                            error="crash")
+        point = _point(100, 500)
+        assert pareto_front([failed, point]) == [point]
+        assert not failed.on_front
+
+    def test_quality_objective(self):
+        """Test that a slower and larger configuration of higher quality
+        stays on the front when quality is an objective"""
+        fast = _point(200, 500)
+        fast.psnr_y = 36.0
+        better = _point(100, 600)
+        better.psnr_y = 40.0
+        assert pareto_front([fast, better]) == [fast]
+        assert pareto_front([fast, better],
+                            SPEED_SIZE_AND_QUALITY) == [fast, better]
+
+
+class TestCollectPoints:
+    """Tests for collect_points() and the encoder frame count"""
+
+    def test_points_from_results(self):
+        """Test that encode statistics and statuses become points"""
+        origins = {"a_sweep000": ("a", {"qualityLevel": 0}),
+                   "a_sweep001": ("a", {"qualityLevel": 1})}
+        ok = TestResult(config=_sample("a_sweep000"), returncode=0,
+                        execution_time=1, status=VideoTestStatus.SUCCESS)
+        ok.meta["encode_stats"] = {"frames": 30, "seconds": 0.5,
+                                   "output_bytes": 3000}
+        unsupported = TestResult(config=_sample("a_sweep001"),
+                                 returncode=69, execution_time=0.1,
+                                 status=VideoTestStatus.NOT_SUPPORTED)
+        other = TestResult(config=_sample("c"), returncode=0,
+                           execution_time=1, status=VideoTestStatus.SUCCESS)
+
+        points = collect_points([ok, unsupported, other], origins)
+        assert len(points) == 2
+        assert points[0].fps == 60
+        assert points[0].bytes_per_frame == 100
+        assert points[1].not_supported
+        assert not points[1].measured
+
+    def test_quality_from_results(self):
+        """Test that the luma PSNR is required when quality is measured"""
+        origins = {"a_sweep000": ("a", {}), "a_sweep001": ("a", {})}
+        results = []
+        for name in origins:
+            result = TestResult(config=_sample(name), returncode=0,
+                                execution_time=1,
+                                status=VideoTestStatus.SUCCESS)
+            result.meta["encode_stats"] = {"frames": 30, "seconds": 0.5,
+                                           "output_bytes": 3000}
+            results.append(result)
+        results[0].meta["quality"] = {"psnr": {"y": 38.5, "yuv": 40.1}}
+
+        points = collect_points(results, origins, quality=True)
+        assert points[0].psnr_y == 38.5
+        assert points[0].to_dict()["psnr_y"] == 38.5
+        assert not points[1].measured
+        assert "quality" in points[1].error
+
+    def test_encoded_frames_analyzer(self):
+        """Test that the frames of the last stage are summed over the
+        batches"""
+        stages = ("StartOfVideoCodingEncodeOrder", "ProcessDpb",
+                  "RecordVideoCodingCmd", "SubmitVideoCodingCmds",
+                  "AssembleBitstreamData")
+        output = "".join(
+            f"====== Total number of frames processed by {stage}: "
+            f"{count} : 0\n"
+            for count in (16, 16, 14) for stage in stages)
+        frames = EncodedFramesAnalyzer()
+        analyze_output(output, "", [frames])
+        assert frames.frames == 46
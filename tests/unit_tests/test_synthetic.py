@@ -0,0 +1,131 @@
+"""
+Unit tests for synthetic encode sources.
+
+Tests synthetic sample parsing, cache keys and paths, and the generated
+frames of each pattern in planar, semi-planar and Y4M layouts.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_frames import (
+    FrameLayout,
+    FrameReader,
+    layout_for_format,
+)
+from tests.libs.video_test_framework_encode import EncodeTestSample
+from tests.libs.video_test_synthetic import (
+    PATTERNS,
+    SYNTHETIC_DIR,
+    SyntheticSpec,
+    ensure_source,
+    source_path,
+    write_source,
+)
+
+LAYOUT = FrameLayout(width=64, height=32)
+
+
+class TestSyntheticSamples:
+    """Tests for encode samples with synthetic sources"""
+
+    def test_sample_without_download(self):
+        """Test that a synthetic sample needs no source fields"""
+        sample = EncodeTestSample.from_dict({
+            "name": "h264_synthetic", "codec": "h264", "source": "synthetic",
+            "synthetic": {"pattern": "noise", "frames": 8},
+            "width": 1920, "height": 1080,
+            "extra_args": ["--inputBpp", "10"]})
+        assert sample.synthetic == SyntheticSpec("noise", frames=8)
+        assert sample.source_url == ""
+        assert sample.full_yuv_path.parent == SYNTHETIC_DIR
+        assert sample.full_yuv_path.name.startswith(
+            "noise_1920x1080_420p10_8_")
+
+    def test_invalid_specs(self):
+        """Test that unknown sources, patterns and fields are rejected"""
+        base = {"name": "a", "codec": "h264", "width": 64, "height": 32}
+        for data in ({"source": "camera"},
+                     {"source": "synthetic", "synthetic": {"pattern": "x"}},
+                     {"source": "synthetic", "synthetic": {"fps": 30}},
+                     {"source": "synthetic", "synthetic": {"frames": 0}}):
+            with pytest.raises(ValueError):
+                EncodeTestSample.from_dict({**base, **data})
+
+    def test_field_types(self):
+        """Test that fields of the wrong type are rejected"""
+        for data in ({"frames": "30"}, {"seed": 1.5}, {"pattern": 1},
+                     {"scene_length": True}):
+            with pytest.raises(ValueError, match="must be of type"):
+                SyntheticSpec.from_dict(data)
+
+    def test_cache_key(self):
+        """Test that the path changes with every parameter"""
+        spec = SyntheticSpec()
+        paths = {source_path(spec, LAYOUT),
+                 source_path(spec, LAYOUT, y4m=True),
+                 source_path(SyntheticSpec(seed=1), LAYOUT),
+                 source_path(spec, layout_for_format("nv12", 64, 32))}
+        assert len(paths) == 4
+        assert source_path(spec, LAYOUT) == source_path(SyntheticSpec(),
+                                                        LAYOUT)
+
+
+class TestGenerator:
+    """Tests for generated frames"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_deterministic(self, tmp_path, pattern):
+        """Test that a pattern gives the same frames every time"""
+        spec = SyntheticSpec(pattern, frames=4, scene_length=2)
+        write_source(tmp_path / "a.yuv", spec, LAYOUT)
+        write_source(tmp_path / "b.yuv", spec, LAYOUT)
+        data = (tmp_path / "a.yuv").read_bytes()
+        assert len(data) == 4 * LAYOUT.frame_size
+        assert data == (tmp_path / "b.yuv").read_bytes()
+        # Consecutive frames differ
+        assert data[:LAYOUT.frame_size] != data[LAYOUT.frame_size:
+                                                2 * LAYOUT.frame_size]
+
+    def test_p010_layout(self, tmp_path):
+        """Test that P010 samples are MSB-aligned within the bit depth"""
+        layout = layout_for_format("p010", 64, 32)
+        path = ensure_source(SyntheticSpec(frames=2), layout,
+                             cache_dir=tmp_path)
+        with FrameReader(path, layout) as reader:
+            assert len(reader) == 2
+            y, u, _ = reader.planes(1)
+            assert (y & 0x3f).max() == 0
+            assert (y >> 6).max() <= 1023 and u.shape == (16, 32)
+
+    def test_y4m_cache(self, tmp_path):
+        """Test that a Y4M source is generated once and readable"""
+        layout = FrameLayout(64, 32, "422", 10)
+        path = ensure_source(SyntheticSpec(frames=3), layout, y4m=True,
+                             cache_dir=tmp_path)
+        mtime = path.stat().st_mtime_ns
+        assert ensure_source(SyntheticSpec(frames=3), layout, y4m=True,
+                             cache_dir=tmp_path) == path
+        assert path.stat().st_mtime_ns == mtime
+        with FrameReader(path) as reader:
+            assert reader.layout == layout and len(reader) == 3
+        with pytest.raises(ValueError):
+            ensure_source(SyntheticSpec(), layout_for_format("nv12", 64, 32),
+                          y4m=True, cache_dir=tmp_path)
@@ -0,0 +1,124 @@
+"""
+Unit tests for decode throughput.
+
+Tests extraction of the frame progress from decoder output, the derived
+frame rate, pixel rate and time per frame, and the per-codec summary.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs import video_test_config_base as config_base
+from tests.libs.video_test_output_analyzer import (
+    FrameProgressAnalyzer,
+    analyze_output,
+)
+from tests.libs.video_test_result_reporter import summarize_throughput
+from tests.libs.video_test_throughput import (
+    TIMING_DECODER,
+    TIMING_WALL,
+    compute_decode_throughput,
+    weighted_percentile,
+)
+
+DECODER_OUTPUT = (
+    "Video Input Information\n"
+    "\tCodec        : AVC/H.264\n"
+    "\tCoded size   : [1920, 1088]\n"
+    "\tDisplay area : [0, 0, 1920, 1080]\n"
+    "\t\tFrame 100, FPS: 100\n"
+    "\t\tFrame 200, FPS: 50\n"
+    "\t\tFrame 210, FPS: 100\n"
+)
+
+
+def _analyze(stdout: str) -> FrameProgressAnalyzer:
+    """Run a FrameProgressAnalyzer over decoder stdout"""
+    analyzer = FrameProgressAnalyzer()
+    analyze_output(stdout, "", [analyzer])
+    return analyzer
+
+
+class TestFrameProgress:
+    """Tests for FrameProgressAnalyzer and compute_decode_throughput()"""
+
+    def test_progress_lines(self):
+        """Test the frame count, rate and time per frame from progress"""
+        analyzer = _analyze(DECODER_OUTPUT)
+        assert analyzer.progress == [(100, 100.0), (200, 50.0), (210, 100.0)]
+        assert analyzer.resolution == (1920, 1080)
+
+        throughput = compute_decode_throughput(
+            analyzer.progress, analyzer.crc_frames, analyzer.resolution,
+            wall_seconds=10.0)
+        assert throughput.timing == TIMING_DECODER
+        assert throughput.frames == 210
+        # 100 frames at 10 ms, 100 at 20 ms and 10 at 10 ms
+        assert throughput.seconds == pytest.approx(3.1)
+        assert throughput.frame_ms_p50 == pytest.approx(10.0)
+        assert throughput.frame_ms_p95 == pytest.approx(20.0)
+        assert throughput.pixel_rate == pytest.approx(
+            1920 * 1080 * 210 / 3.1)
+
+    def test_crc_lines_with_wall_time(self):
+        """Test the fallback to CRC lines and the process wall time"""
+        analyzer = _analyze("\tCoded size   : [352, 288]\n" + "".join(
+            f"CRC Frame[{i}]:0x0000ABCD \n" for i in range(50)))
+        throughput = compute_decode_throughput(
+            analyzer.progress, analyzer.crc_frames, analyzer.resolution,
+            wall_seconds=2.0)
+        assert throughput.timing == TIMING_WALL
+        assert throughput.fps == 25.0
+        assert (throughput.width, throughput.height) == (352, 288)
+        assert "frame_ms" not in throughput.to_dict()
+
+    def test_no_frames(self):
+        """Test that output without frame information gives nothing"""
+        assert compute_decode_throughput([], 0, None, 1.0) is None
+
+    def test_weighted_percentile(self):
+        """Test nearest-rank percentiles of weighted values"""
+        values = [(5.0, 90), (50.0, 10)]
+        assert weighted_percentile(values, 90) == 5.0
+        assert weighted_percentile(values, 91) == 50.0
+
+
+def test_aggregate_per_codec():
+    """Test that rates are aggregated over frames and seconds"""
+    results = []
+    for codec, throughput in (
+            (config_base.CodecType.H264,
+             {"frames": 100, "seconds": 1.0, "width": 100,
+              "height": 100, "frame_ms": {"p95": 12.0}}),
+            (config_base.CodecType.H264,
+             {"frames": 300, "seconds": 1.0}),
+            (config_base.CodecType.AV1,
+             {"frames": 10, "seconds": 0.5})):
+        result = config_base.TestResult(
+            config=config_base.BaseTestConfig(name="a", codec=codec),
+            returncode=0, execution_time=1,
+            status=config_base.VideoTestStatus.SUCCESS)
+        result.meta["throughput"] = throughput
+        results.append(result)
+
+    summary = summarize_throughput(results)
+    assert summary["h264"]["frames"] == 400
+    assert summary["h264"]["fps"] == 200.0
+    # Only the test with a known resolution counts for the pixel rate
+    assert summary["h264"]["mpixels_per_s"] == 1.0
+    assert summary["h264"]["frame_ms_p95"] == 12.0
+    assert summary["av1"]["fps"] == 20.0
+    assert summary["av1"]["frame_ms_p95"] is None
@@ -0,0 +1,97 @@
+"""
+Unit tests for timeout policies.
+
+Tests the adaptive timeout derived from run history and the policy
+reported for timed-out tests.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_run_history import RunHistory
+from tests.libs.video_test_timeout import (
+    ADAPTIVE_CEILING,
+    ADAPTIVE_FLOOR,
+    POLICY_ADAPTIVE,
+    adaptive_timeout,
+    find_adaptive_timeout,
+    percentile,
+)
+
+NVIDIA = SystemInfo(gpu_name="RTX 3080", driver_name="NVIDIA",
+                    driver_version="550.120", os_name="Linux")
+
+
+class TestAdaptiveTimeout:
+    """Tests for adaptive_timeout()"""
+
+    def test_percentile_interpolation(self):
+        """Test linear interpolation between ranks"""
+        assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+        assert percentile([0.0, 10.0], 95) == pytest.approx(9.5)
+
+    def test_percentile_times_factor(self):
+        """Test a timeout well above the floor"""
+        decision = adaptive_timeout([20000.0] * 10, factor=3.0)
+        assert decision.policy == POLICY_ADAPTIVE
+        assert decision.seconds == 60.0
+        assert decision.basis_ms == 20000.0
+        assert decision.samples == 10
+
+    def test_floor_for_short_tests(self):
+        """Test that sub-second tests get the floor"""
+        decision = adaptive_timeout([200.0, 210.0, 190.0, 205.0, 220.0])
+        assert decision.seconds == ADAPTIVE_FLOOR
+
+    def test_ceiling_for_long_tests(self):
+        """Test that very slow tests are capped"""
+        decision = adaptive_timeout([600000.0] * 5)
+        assert decision.seconds == ADAPTIVE_CEILING
+
+    def test_unknown_test(self):
+        """Test that tests without enough history get no adaptive timeout"""
+        assert adaptive_timeout([200.0, 210.0]) is None
+
+    def test_describe(self):
+        """Test the description used in timeout error messages"""
+        decision = adaptive_timeout([4000.0] * 5)
+        assert decision.describe() == (
+            "adaptive timeout: 3 x p95 of 5 runs (4.00s)")
+
+
+def test_find_adaptive_timeout(tmp_path):
+    """Test that only successful runs on the same system are used"""
+    with RunHistory(str(tmp_path / "history.db")) as history:
+        for time_ms in (5000.0, 5100.0, 4900.0, 5050.0, 4950.0):
+            history.record_run("decode", NVIDIA, [{
+                "name": "decode_a", "codec": "h264", "status": "success",
+                "execution_time_ms": time_ms}],
+                driver="nvidia", binary_name="vk-video-dec-test")
+        history.record_run("decode", NVIDIA, [{
+            "name": "decode_a", "codec": "h264", "status": "error",
+            "execution_time_ms": 120000.0}],
+            driver="nvidia", binary_name="vk-video-dec-test")
+
+        decision = find_adaptive_timeout(
+            history, "decode_a", test_type="decode", driver="nvidia",
+            gpu_name="RTX 3080", binary_name="vk-video-dec-test")
+        assert decision.samples == 5
+        assert decision.seconds == pytest.approx(5090.0 * 3 / 1000)
+
+        assert find_adaptive_timeout(
+            history, "decode_a", test_type="decode", driver="anv",
+            gpu_name="RTX 3080", binary_name="vk-video-dec-test") is None
@@ -0,0 +1,121 @@
+"""
+Unit tests for timeline tracing.
+
+Tests TraceRecorder span recording and the Chrome trace-event export.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import threading
+
+from tests.libs.video_test_trace import (
+    CATEGORY_TEST,
+    TraceRecorder,
+    trace_span,
+)
+
+
+class TestTraceRecorder:
+    """Tests for TraceRecorder"""
+
+    def test_span_records_duration_and_args(self):
+        """Test that a span records its name, category and arguments"""
+        tracer = TraceRecorder()
+        with tracer.span("decode_a", CATEGORY_TEST, codec="h264") as args:
+            args["status"] = "success"
+
+        spans = tracer.spans
+        assert len(spans) == 1
+        assert spans[0].name == "decode_a"
+        assert spans[0].category == CATEGORY_TEST
+        assert spans[0].args == {"codec": "h264", "status": "success"}
+        assert spans[0].duration >= 0
+
+    def test_span_recorded_on_exception(self):
+        """Test that a span is recorded when its block raises"""
+        tracer = TraceRecorder()
+        try:
+            with tracer.span("execute"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert [s.name for s in tracer.spans] == ["execute"]
+
+    def test_threads_get_separate_tracks(self):
+        """Test that concurrent workers are recorded on their own tracks"""
+        tracer = TraceRecorder()
+        with tracer.span("main_span"):
+            pass
+        worker = threading.Thread(name="worker-1", target=_record_span,
+                                  args=(tracer, "worker_span"))
+        worker.start()
+        worker.join()
+
+        tracks = {s.name: s.track for s in tracer.spans}
+        assert tracks["main_span"] != tracks["worker_span"]
+
+        events = tracer.to_chrome_trace()["traceEvents"]
+        names = {e["args"]["name"] for e in events
+                 if e["name"] == "thread_name"}
+        assert names == {"main", "worker-1"}
+
+    def test_chrome_trace_format(self, tmp_path):
+        """Test the exported trace-event JSON"""
+        tracer = TraceRecorder()
+        with tracer.span("outer"):
+            with tracer.span("inner"):
+                pass
+
+        path = tmp_path / "trace.json"
+        assert tracer.write(str(path))
+        data = json.loads(path.read_text(encoding="utf-8"))
+        spans = [e for e in data["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in spans] == ["outer", "inner"]
+        outer, inner = spans
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    def test_phase_totals_skip_nested_phases(self):
+        """Test that nested phases are counted in their parent only"""
+        tracer = TraceRecorder()
+        with tracer.span("before"):
+            pass
+        mark = tracer.mark()
+        with tracer.span("test", CATEGORY_TEST):
+            with tracer.span("execute"):
+                pass
+            with tracer.span("decoder_validation"):
+                with tracer.span("execute"):
+                    pass
+            with tracer.span("cleanup"):
+                pass
+
+        totals = tracer.phase_totals(mark)
+        assert list(totals) == ["execute", "decoder_validation", "cleanup"]
+        spans = {s.name: s.duration for s in tracer.spans
+                 if s.name != "execute"}
+        assert totals["decoder_validation"] == spans["decoder_validation"]
+
+    def test_trace_span_without_tracer(self):
+        """Test that trace_span is a no-op without a recorder"""
+        with trace_span(None, "hash", file="a.yuv") as args:
+            assert args == {"file": "a.yuv"}
+
+
+def _record_span(tracer: TraceRecorder, name: str) -> None:
+    """Record an empty span from the calling thread"""
+    with tracer.span(name):
+        pass
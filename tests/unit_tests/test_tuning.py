@@ -0,0 +1,134 @@
+"""
+Unit tests for decoder tuning.
+
+Tests expansion of the search space, the grid and successive halving
+searches, and tuning profile files.
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from tests.libs.video_test_driver_detect import SystemInfo
+from tests.libs.video_test_tuning import (
+    expand_space,
+    grid_search,
+    load_profile_args,
+    load_space,
+    profile_path,
+    rank,
+    successive_halving,
+    write_profile,
+)
+
+SPACE = {
+    "decodeImagesInFlight": [2, 4, 8, 12],
+    "queueSize": [1, 5],
+    "enableHwLoadBalancing": [False, True],
+}
+
+
+def _fake_measure(calls: list):
+    """Measure function whose rate grows with the images in flight"""
+    def measure(candidate, runs):
+        calls.append((candidate.params["decodeImagesInFlight"], runs))
+        fps = 100 + candidate.params["decodeImagesInFlight"] * 10
+        if candidate.params["enableHwLoadBalancing"]:
+            fps += 5
+        candidate.frames += 100 * runs
+        candidate.seconds += 100 * runs / fps
+        candidate.cpu_seconds += 0.1 * runs
+        candidate.runs += runs
+    return measure
+
+
+class TestSearchSpace:
+    """Tests for expand_space() and candidate arguments"""
+
+    def test_all_combinations(self):
+        """Test that the grid covers every combination once"""
+        candidates = expand_space(SPACE)
+        assert len(candidates) == 16
+        assert candidates[0].params == {"decodeImagesInFlight": 2,
+                                        "queueSize": 1,
+                                        "enableHwLoadBalancing": False}
+
+    def test_flag_arguments(self):
+        """Test that booleans become flags and values become options"""
+        candidates = expand_space({"queueSize": [3],
+                                   "enableHwLoadBalancing": [False, True]})
+        assert candidates[0].args == ["--queueSize", "3"]
+        assert candidates[1].args == ["--queueSize", "3",
+                                      "--enableHwLoadBalancing"]
+
+    def test_invalid_space_file(self, tmp_path):
+        """Test that options without candidate values are rejected"""
+        path = tmp_path / "space.json"
+        path.write_text('{"queueSize": []}', encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_space(str(path))
+
+
+class TestSearch:
+    """Tests for grid_search() and successive_halving()"""
+
+    def test_grid_measures_everything(self):
+        """Test that the grid search measures each candidate once"""
+        calls = []
+        best = grid_search(expand_space(SPACE), _fake_measure(calls), 2)
+        assert len(calls) == 16
+        assert best.params["decodeImagesInFlight"] == 12
+        assert best.params["enableHwLoadBalancing"]
+
+    def test_halving_doubles_runs_of_survivors(self):
+        """Test rounds of 16, 8, 4 and 2 candidates"""
+        calls = []
+        best = successive_halving(expand_space(SPACE), _fake_measure(calls),
+                                  1)
+        expected = [1] * 16 + [2] * 8 + [4] * 4 + [8] * 2
+        assert [runs for _, runs in calls] == expected
+        assert best.params["decodeImagesInFlight"] == 12
+        assert best.params["enableHwLoadBalancing"]
+        assert best.runs == 15
+
+    def test_failed_candidates_are_dropped(self):
+        """Test that candidates with errors are never ranked"""
+        candidates = expand_space({"queueSize": [1, 2]})
+
+        def measure(candidate, runs):
+            if candidate.params["queueSize"] == 2:
+                candidate.error = "return code 1"
+                return
+            candidate.frames, candidate.seconds = 10, 1.0
+            candidate.runs += runs
+
+        assert successive_halving(candidates, measure, 1) is candidates[0]
+        assert rank(candidates) == [candidates[0]]
+
+
+def test_profile_round_trip(tmp_path):
+    """Test that the best arguments are read back from the profile"""
+    info = SystemInfo(gpu_name="NVIDIA GeForce RTX 3080",
+                      driver_name="NVIDIA", driver_version="550.120")
+    path = profile_path(tmp_path, "nvidia", info)
+    assert path.name == "decoder_nvidia_nvidia_geforce_rtx_3080.json"
+
+    candidates = expand_space(SPACE)
+    best = grid_search(candidates, _fake_measure([]), 1)
+    write_profile(path, best, candidates, driver="nvidia",
+                  system_info=info, samples=["decode_a"], search="grid")
+    assert load_profile_args(str(path)) == [
+        "--decodeImagesInFlight", "12", "--queueSize", "1",
+        "--enableHwLoadBalancing"]
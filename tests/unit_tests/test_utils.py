@@ -19,11 +19,12 @@ limitations under the License.
 """
 
 import hashlib
+import json
 import tempfile
 from pathlib import Path
 
 from tests.libs.video_test_utils import (
-    calculate_file_hash, verify_file_checksum)
+    calculate_file_hash, verify_file_checksum, write_json_atomic)
 
 
 class TestCalculateFileHash:
@@ -179,3 +180,13 @@ class TestVerifyFileChecksum:
             assert result is False
         finally:
             temp_path.unlink()
+
+
+def test_write_json_atomic(tmp_path):
+    """Test that the JSON file is created with its directory and replaced
+    without leaving the temporary file"""
+    path = tmp_path / "out" / "data.json"
+    write_json_atomic(path, {"a": 1})
+    write_json_atomic(str(path), {"a": 2})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 2}
+    assert [p.name for p in path.parent.iterdir()] == ["data.json"]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Run History Query Tool
+Query the SQLite run history written by vvs_test_runner.py --history-db.
+
+Usage:
+    python3 vvs_run_history.py --db history.db runs
+    python3 vvs_run_history.py --db history.db test decode_h264_clip_a
+    python3 vvs_run_history.py --db history.db driver nvidia
+
+Copyright 2025 Igalia S.L.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running both as package and as script
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from tests.libs.video_test_result_reporter import (  # noqa: E402
+    get_status_symbol_from_str,
+)
+from tests.libs.video_test_run_history import RunHistory  # noqa: E402
+
+
+def print_runs(history: RunHistory, limit: int) -> None:
+    """Print the most recent runs"""
+    runs = history.recent_runs(limit)
+    if not runs:
+        print("No runs recorded")
+        return
+    print(f"{'Run':>5} {'Started':<20} {'Type':<7} {'Driver':<8} "
+          f"{'Pass':>5} {'Fail':>5} {'Total':>6}  GPU")
+    print("-" * 78)
+    for run in runs:
+        print(f"{run['run_id']:>5} {run['started_at']:<20} "
+              f"{run['test_type']:<7} {run['driver']:<8} "
+              f"{run['passed'] or 0:>5} {run['failed'] or 0:>5} "
+              f"{run['total']:>6}  {run['gpu_name']}")
+
+
+def print_test_history(history: RunHistory, args: argparse.Namespace) -> None:
+    """Print the recent results of a single test"""
+    rows = history.test_history(args.name, driver=args.driver,
+                                gpu_name=args.gpu, limit=args.limit)
+    if not rows:
+        print(f"No history for test: {args.name}")
+        return
+    print(f"{'Run':>5} {'Recorded':<20} {'Status':<14} {'Time (ms)':>10} "
+          f"{'RC':>5} {'Driver':<8} Binary")
+    print("-" * 78)
+    for row in rows:
+        status = (f"{get_status_symbol_from_str(row['status'])} "
+                  f"{row['status']}")
+        returncode = row['returncode'] if row['returncode'] is not None else ""
+        print(f"{row['run_id']:>5} {row['recorded_at']:<20} {status:<14} "
+              f"{row['execution_time_ms']:>10.1f} {returncode:>5} "
+              f"{row['driver']:<8} {row['binary_hash'][:12]}")
+
+
+def print_driver_summary(history: RunHistory,
+                         args: argparse.Namespace) -> None:
+    """Print per-test statistics for a driver"""
+    rows = history.driver_summary(args.driver, gpu_name=args.gpu)
+    if not rows:
+        print(f"No history for driver: {args.driver}")
+        return
+    print(f"{'Test':<45} {'Runs':>5} {'Pass':>5} {'Fail':>5} "
+          f"{'Avg (ms)':>10} {'Max (ms)':>10}")
+    print("-" * 85)
+    for row in rows:
+        print(f"{row['name']:<45} {row['runs']:>5} {row['passed']:>5} "
+              f"{row['failed']:>5} {row['avg_ms']:>10.1f} "
+              f"{row['max_ms']:>10.1f}")
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create and configure the argument parser"""
+    parser = argparse.ArgumentParser(
+        description="Query the Vulkan Video test run history database")
+    parser.add_argument(
+        "--db", required=True, type=Path,
+        help="Path to the run history database (see --history-db)")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = subparsers.add_parser("runs", help="List recent runs")
+    runs_parser.add_argument("--limit", type=int, default=20,
+                             help="Number of runs to show (default: 20)")
+
+    test_parser = subparsers.add_parser(
+        "test", help="Show the history of a single test")
+    test_parser.add_argument(
+        "name", help="Test name including prefix (e.g. decode_h264_clip_a)")
+    test_parser.add_argument("--driver", help="Only show runs on this driver")
+    test_parser.add_argument("--gpu", help="Only show runs on this GPU")
+    test_parser.add_argument("--limit", type=int, default=50,
+                             help="Number of results to show (default: 50)")
+
+    driver_parser = subparsers.add_parser(
+        "driver", help="Show per-test statistics for a driver")
+    driver_parser.add_argument("driver", help="Driver name (e.g. nvidia)")
+    driver_parser.add_argument("--gpu", help="Only include this GPU")
+    return parser
+
+
+def main() -> int:
+    """Main entry point"""
+    args = create_argument_parser().parse_args()
+
+    if not args.db.exists():
+        print(f"✗ Run history database not found: {args.db}")
+        return 1
+
+    with RunHistory(str(args.db)) as history:
+        if args.command == "runs":
+            print_runs(history, args.limit)
+        elif args.command == "test":
+            print_test_history(history, args)
+        elif args.command == "driver":
+            print_driver_summary(history, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
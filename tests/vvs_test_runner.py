@@ -61,9 +61,31 @@ from tests.libs.video_test_framework_decode import (
 )
 
 from tests.libs.video_test_result_reporter import (
+    count_memory_leaks,
+    count_perf_regressions,
     get_status_symbol_from_str,
     print_final_summary,
+    summarize_resource_usage,
+    summarize_throughput,
 )
+from tests.libs.video_test_cli import (
+    create_argument_parser,
+    validate_arguments,
+)
+from tests.libs.video_test_mode_benchmark import run_benchmark_mode
+from tests.libs.video_test_mode_rd import run_rd_mode
+from tests.libs.video_test_mode_scaling import run_scaling_mode
+from tests.libs.video_test_mode_sweep import run_sweep_mode
+from tests.libs.video_test_mode_tuning import run_tuning_mode
+from tests.libs.video_test_convert import source_identity
+from tests.libs.video_test_stream_index import (
+    MetadataFilter,
+    StreamIndex,
+    estimate_cost,
+    parse_resolution,
+    processed_frames,
+)
+from tests.libs.video_test_trace import CATEGORY_SUITE, TraceRecorder
 
 
 @dataclass
@@ -79,6 +101,12 @@ class FrameworkConfig:  # pylint: disable=too-many-instance-attributes
     timeout: int = DEFAULT_TEST_TIMEOUT
 
 
+# Options passed through to both sub-frameworks as they are
+HISTORY_OPTIONS = ('resume', 'history_db', 'detect_regressions',
+                   'recheck_unsupported', 'memory_sample_interval',
+                   'adaptive_timeouts')
+
+
 class TestType(Enum):
     """Enumeration of test types for video codec testing"""
     ENCODER = "encoder"
@@ -115,6 +143,17 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
         else:
             self.skip_filter = SkipFilter.ENABLED
 
+        # Resource filters and ordering from the stream metadata index
+        max_width = max_height = None
+        if options.get('max_resolution'):
+            max_width, max_height = parse_resolution(
+                options['max_resolution'])
+        self.stream_filter = MetadataFilter(
+            max_width=max_width, max_height=max_height,
+            max_frames=options.get('max_frames'),
+            bit_depth=options.get('bitdepth'))
+        self.cheapest_first = options.get('cheapest_first', False)
+
         # Track if a test pattern filter is active (set in run_test_suite)
         self._test_pattern_active = False
 
@@ -126,6 +165,9 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
         self.results_dir = self.test_dir / "results"
         self.results_dir.mkdir(exist_ok=True)
 
+        # Timeline of both sub-frameworks (exported with --trace-file)
+        self.tracer = TraceRecorder()
+
         # Initialize specialized test frameworks
         self.encode_framework = None
         self.decode_framework = None
@@ -146,7 +188,12 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
             'codec_filter': options.get('codec_filter'),
             'test_pattern': options.get('test_pattern'),
             'validate': options.get('validate', False),
+            'tracer': self.tracer,
         }
+        # Run history and monitoring options keep the sub-framework
+        # defaults unless given
+        common_opts.update({key: options[key] for key in HISTORY_OPTIONS
+                            if key in options})
 
         if encoder_path and Path(encoder_path).exists():
             encoder_options = {
@@ -164,6 +211,12 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
             decoder_args = options.get('decoder_args')
             if decoder_args:
                 encoder_options['decoder_args'] = decoder_args
+            encoder_options['quality_metrics'] = options.get(
+                'encode_quality')
+            encoder_options['structure_check'] = options.get(
+                'structure_check', False)
+            encoder_options['decoder_sample_rate'] = options.get(
+                'decoder_sample_rate', 1.0)
 
             self.encode_framework = VulkanVideoEncodeTestFramework(
                 encoder_path=encoder_path,
@@ -176,6 +229,7 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
                 'test_suite': options.get('decode_test_suite'),
                 'display': options.get('decode_display', False),
                 'verify_md5': not options.get('no_verify_md5', False),
+                'tuning_args': options.get('tuning_args'),
             }
 
             self.decode_framework = VulkanVideoDecodeTestFramework(
@@ -216,11 +270,12 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
 
     def cleanup_results(self):
         """Clean up output artifacts if keep_files is False"""
-        if self.encode_framework:
-            self.encode_framework.cleanup_results("encode")
+        with self.tracer.span("cleanup_results", CATEGORY_SUITE):
+            if self.encode_framework:
+                self.encode_framework.cleanup_results("encode")
 
-        if self.decode_framework:
-            self.decode_framework.cleanup_results("decode")
+            if self.decode_framework:
+                self.decode_framework.cleanup_results("decode")
 
     def download_assets(self) -> bool:
         """Download test assets using the fetch scripts"""
@@ -301,15 +356,23 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
         # Check resource files only for the filtered test configs.
         # Pass empty list (not None) when a test type is excluded,
         # so check_resources skips it rather than downloading all.
-        if not self.check_resources(
-            auto_download=True,
-            encode_configs=encode_test_configs,
-            decode_configs=decode_test_configs,
-        ):
+        with self.tracer.span("check_resources", CATEGORY_SUITE):
+            resources_ok = self.check_resources(
+                auto_download=True,
+                encode_configs=encode_test_configs,
+                decode_configs=decode_test_configs,
+            )
+        if not resources_ok:
             print("✗ FATAL: Missing or corrupt resource files "
                   "could not be downloaded")
             return [], []
 
+        if self.stream_filter.active or self.cheapest_first:
+            with self.tracer.span("stream_index", CATEGORY_SUITE):
+                encode_test_configs, decode_test_configs = (
+                    self.select_by_metadata(encode_test_configs,
+                                            decode_test_configs))
+
         encode_results = []
         decode_results = []
 
@@ -335,6 +398,69 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
 
         return encode_results, decode_results
 
+    @staticmethod
+    def _stream_metadata(index: StreamIndex, config, test_type: str):
+        """Indexed metadata of a test's input, or None if unknown"""
+        if test_type == "encode":
+            return index.lookup_source(config)
+        try:
+            key = source_identity(config.full_path, config.source_checksum)
+        except OSError:
+            return None
+        return index.lookup(key, config.full_path, config.codec.value)
+
+    def _select_configs(self, index: StreamIndex, configs: list,
+                        test_type: str, excluded: list) -> Tuple[List, float]:
+        """Tests of one type within the resource filters, cheapest first
+        with --cheapest-first, and their total estimated cost; excluded
+        tests are added to excluded with the reason"""
+        kept = []
+        costs = {}
+        for config in configs:
+            meta = self._stream_metadata(index, config, test_type)
+            frames = (processed_frames(meta, config.extra_args, test_type)
+                      if meta else 0)
+            reason = (self.stream_filter.reject_reason(meta, frames)
+                      if self.stream_filter.active else "")
+            if reason:
+                excluded.append((config.display_name, reason))
+                continue
+            kept.append(config)
+            if meta:
+                costs[id(config)] = estimate_cost(
+                    meta, config.extra_args, test_type)
+        if self.cheapest_first:
+            kept.sort(key=lambda c: (id(c) not in costs,
+                                     costs.get(id(c), 0.0)))
+        return kept, sum(costs.values())
+
+    def select_by_metadata(self, encode_configs: list,
+                           decode_configs: list) -> Tuple[List, List]:
+        """Drop tests outside the resource filters and, with
+        --cheapest-first, order the rest by estimated cost (tests of
+        unknown cost last)"""
+        index = StreamIndex()
+        selected = []
+        excluded = []
+        total_cost = 0.0
+        for configs, test_type in ((encode_configs, "encode"),
+                                   (decode_configs, "decode")):
+            kept, cost = self._select_configs(index, configs, test_type,
+                                              excluded)
+            selected.append(kept)
+            total_cost += cost
+        index.save()
+
+        if excluded:
+            print(f"Stream filters excluded {len(excluded)} of "
+                  f"{len(encode_configs) + len(decode_configs)} tests")
+            if self.config.verbose:
+                for name, reason in excluded:
+                    print(f"  {name}: {reason}")
+        print(f"Estimated workload: {total_cost:.1f} Mpixels over "
+              f"{sum(len(configs) for configs in selected)} tests")
+        return selected[0], selected[1]
+
     def _count_skipped_tests(self) -> int:
         """Count skipped tests from both frameworks using skip list"""
         total_skipped = 0
@@ -441,6 +567,12 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
         print(f"Not Supported: {total_not_supported:3}")
         if total_skipped > 0:
             print(f"Skipped:       {total_skipped:3} (in skip list)")
+        total_regressed = count_perf_regressions(self.all_results)
+        if total_regressed > 0:
+            print(f"Perf Regress.: {total_regressed:3} (slower than history)")
+        total_leaks = count_memory_leaks(self.all_results)
+        if total_leaks > 0:
+            print(f"Memory Leaks:  {total_leaks:3} (growth across loops)")
         # Calculate success rate excluding not supported and skipped tests
         effective_total = total_tests - total_not_supported - total_skipped
         if effective_total > 0:
@@ -501,8 +633,27 @@ class VulkanVideoTestFramework:  # pylint: disable=too-many-instance-attributes
                         "failed": sum(
                             1 for r in combined_results
                             if r["status"] == "error"
-                        )
+                        ),
+                        "perf_regressions": sum(
+                            1 for r in combined_results
+                            if r.get("perf_status") == "regression"
+                        ),
+                        "memory_leaks": sum(
+                            1 for r in combined_results
+                            if (r.get("memory") or {}).get("leak")
+                        ),
+                    },
+                    "resource_usage": {
+                        test_type: summarize_resource_usage(framework.results)
+                        for test_type, framework in (
+                            ("encoder", self.encode_framework),
+                            ("decoder", self.decode_framework))
+                        if framework
                     },
+                    "throughput": (
+                        summarize_throughput(self.decode_framework.results)
+                        if self.decode_framework else {}
+                    ),
                     "results": combined_results
                 }, f, indent=2)
 
@@ -643,125 +794,6 @@ def list_all_samples(
           "(e.g., --test 'decode_h264_*')")
 
 
-def create_argument_parser() -> argparse.ArgumentParser:
-    """Create and configure the argument parser"""
-    parser = argparse.ArgumentParser(
-        description="Vulkan Video Samples Test Framework")
-
-    # Platform-specific default executable names using PlatformUtils
-    encoder_default = ("vk-video-enc-test" +
-                       PlatformUtils.get_executable_extension())
-    decoder_default = ("vk-video-dec-test" +
-                       PlatformUtils.get_executable_extension())
-
-    # General options
-    parser.add_argument(
-        "--work-dir", "-w",
-        help="Working directory for test files")
-    parser.add_argument(
-        "--export-json", "-j",
-        help="Export results to JSON file")
-    parser.add_argument(
-        "--export-csv",
-        help="Export results to CSV file")
-    parser.add_argument(
-        "--codec", "-c",
-        choices=["h264", "h265", "av1", "vp9"],
-        help="Test only specific codec")
-    parser.add_argument(
-        "--test", "-t",
-        help="Filter tests by name pattern (supports wildcards "
-             "like 'h264_*' or 'av1_*')")
-    parser.add_argument(
-        "--verbose", "-v", action="store_true",
-        help="Show command lines being executed")
-    parser.add_argument(
-        "--validate", action="store_true",
-        help="Enable the Vulkan validation layer for each test by exporting "
-             "VK_INSTANCE_LAYERS=VK_LAYER_KHRONOS_validation")
-    parser.add_argument(
-        "--keep-files", action="store_true",
-        help="Keep output artifacts after testing")
-    parser.add_argument(
-        "--no-auto-download", action="store_true",
-        help="Skip automatic download of missing/corrupt sample files")
-    parser.add_argument(
-        "--download-only", action="store_true",
-        help="Download all test resources (encode and decode) and exit "
-             "without running tests")
-    parser.add_argument(
-        "--deviceID",
-        help="Vulkan device ID to use for testing "
-             "(decimal or hex with 0x prefix)")
-    parser.add_argument(
-        "--list-samples", action="store_true",
-        help="List all available test samples and exit")
-    parser.add_argument(
-        "--skip-list",
-        help="Path to custom skip list JSON (default: skipped_samples.json)")
-    parser.add_argument(
-        "--ignore-skip-list", action="store_true",
-        help="Ignore the skip list and run all tests")
-    parser.add_argument(
-        "--only-skipped", action="store_true",
-        help="Run only skipped tests (excludes non-skipped tests)")
-    parser.add_argument(
-        "--show-skipped", action="store_true",
-        help="Show skipped tests in summary output")
-    parser.add_argument(
-        "--extended", action="store_true",
-        help="Include extended tests (e.g., resolution boundary tests with "
-             "large files)")
-    parser.add_argument(
-        "--timeout",
-        type=int,
-        default=DEFAULT_TEST_TIMEOUT,
-        help=f"Per-test timeout in seconds (default: {DEFAULT_TEST_TIMEOUT})")
-
-    # Encoder-specific options
-    encoder_group = parser.add_argument_group("encoder options")
-    encoder_group.add_argument(
-        "--encoder", "-e",
-        default=encoder_default,
-        help="Path to vk-video-enc-test executable")
-    encoder_group.add_argument(
-        "--encoder-only", action="store_true",
-        help="Run only encoder tests")
-    encoder_group.add_argument(
-        "--encode-test-suite",
-        help="Path to custom encode test suite JSON file")
-    encoder_group.add_argument(
-        "--no-validate-with-decoder", action="store_true",
-        help="Disable validation of encoder output with decoder "
-             "(validation enabled by default)")
-    encoder_group.add_argument(
-        "--decoder-args", nargs="+",
-        help="Additional arguments to pass to decoder during "
-             "encoder validation")
-
-    # Decoder-specific options
-    decoder_group = parser.add_argument_group("decoder options")
-    decoder_group.add_argument(
-        "--decoder", "-d",
-        default=decoder_default,
-        help="Path to vk-video-dec-test executable")
-    decoder_group.add_argument(
-        "--decoder-only", action="store_true",
-        help="Run only decoder tests")
-    decoder_group.add_argument(
-        "--decode-test-suite",
-        help="Path to custom decode test suite JSON file")
-    decoder_group.add_argument(
-        "--decode-display", action="store_true",
-        help="Enable display output for decode tests "
-             "(removes --noPresent from decoder commands)")
-    decoder_group.add_argument(
-        "--no-verify-md5", action="store_true",
-        help="Disable MD5 verification of decoded output "
-             "(enabled by default when expected_output_md5 is present)")
-    return parser
-
-
 def find_executables(args: argparse.Namespace) -> Tuple[str, str]:
     """Find and resolve executable paths"""
     encoder_path = args.encoder
@@ -849,22 +881,35 @@ def run_framework_tests(args: argparse.Namespace, encoder_path: str,
         no_verify_md5=args.no_verify_md5,
         no_validate_with_decoder=args.no_validate_with_decoder,
         decoder_args=args.decoder_args,
+        encode_quality=args.encode_quality,
+        structure_check=args.structure_check,
+        decoder_sample_rate=args.decoder_sample_rate,
+        max_resolution=args.max_resolution,
+        max_frames=args.max_frames,
+        bitdepth=args.bitdepth,
+        cheapest_first=args.cheapest_first,
         extended=args.extended,
         codec_filter=args.codec,
         test_pattern=args.test,
+        resume=args.resume,
+        history_db=args.history_db,
+        detect_regressions=args.detect_regressions,
+        recheck_unsupported=args.recheck_unsupported,
+        memory_sample_interval=args.memory_sample_interval,
+        adaptive_timeouts=args.adaptive_timeouts,
+        tuning_args=args.tuning_args,
     )
 
-    # Determine test type filter
-    # Both flags together means run everything (no filter)
-    test_type_filter = None
-    if args.encoder_only and not args.decoder_only:
-        test_type_filter = TestType.ENCODER
-    elif args.decoder_only and not args.encoder_only:
-        test_type_filter = TestType.DECODER
+    for option, run_mode in RUN_MODES:
+        if getattr(args, option):
+            success = run_mode(args, framework)
+            if args.trace_file:
+                framework.tracer.write(args.trace_file)
+            return success
 
     # Run tests
     encode_results, decode_results = framework.run_test_suite(
-        test_type_filter=test_type_filter,
+        test_type_filter=args.test_type_filter,
     )
 
     if not encode_results and not decode_results:
@@ -888,26 +933,46 @@ def run_framework_tests(args: argparse.Namespace, encoder_path: str,
         if not csv_path.is_absolute():
             csv_path = Path.cwd() / csv_path
         framework.export_results_csv(str(csv_path))
+    if args.trace_file:
+        framework.tracer.write(args.trace_file)
 
     return success
 
 
+# Run modes replacing the test suite, by the option that selects them, in
+# order of precedence
+RUN_MODES = (
+    ("rd_benchmark", run_rd_mode),
+    ("encode_sweep", run_sweep_mode),
+    ("tune_decoder", run_tuning_mode),
+    ("scaling_benchmark", run_scaling_mode),
+    ("benchmark", run_benchmark_mode),
+)
+
+
+def get_test_type_filter(args: argparse.Namespace) -> Optional[TestType]:
+    """Test type selected by --encoder-only and --decoder-only"""
+    # Both flags together means run everything (no filter)
+    if args.encoder_only and not args.decoder_only:
+        return TestType.ENCODER
+    if args.decoder_only and not args.encoder_only:
+        return TestType.DECODER
+    return None
+
+
 @safe_main_wrapper
 def main() -> int:
     """Main entry point for the video codec test framework"""
     parser = create_argument_parser()
 
     args = parser.parse_args()
+    validate_arguments(args, parser)
+    args.test_type_filter = get_test_type_filter(args)
 
     # Handle --list-samples option
     if args.list_samples:
         skip_list_path = args.skip_list or "skipped_samples.json"
-        test_type_filter = None
-        if args.encoder_only and not args.decoder_only:
-            test_type_filter = TestType.ENCODER
-        elif args.decoder_only and not args.encoder_only:
-            test_type_filter = TestType.DECODER
-        list_all_samples(skip_list_path, test_type_filter,
+        list_all_samples(skip_list_path, args.test_type_filter,
                          args.codec,
                          decode_test_suite=args.decode_test_suite,
                          encode_test_suite=args.encode_test_suite)